@@ -0,0 +1,95 @@
+"""
+Benchmark: pydantic Trade vs slotted TradeRecord
+
+Measures per-object memory and the cost of the operations the hot path
+performs (construction, attribute updates, model round-trip).
+
+Usage:
+    python scripts/benchmark_trade_record.py [--count 20000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models import Trade, TradeRecord
+
+OPEN_TIME = datetime.now().isoformat()
+
+
+def _kwargs(i):
+    return dict(
+        symbol="XAUUSD", entry=2650.0 + i, sl=2640.0, tp=2670.0, lot_size=0.05,
+        direction="buy", strategy="combinedlogic-1", open_time=OPEN_TIME,
+        original_entry=2650.0, original_sl_distance=10.0, order_type="PROFIT_TRAIL",
+        profit_chain_id="PROFIT_XAUUSD_1", profit_level=1
+    )
+
+
+def _time_per_op(fn, count):
+    start = time.perf_counter()
+    fn(count)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def _memory_per_object(cls, count):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [cls(**_kwargs(i)) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # Only the objects themselves (and their field values) should count
+    allocated -= sys.getsizeof(objects)
+    del objects
+    return allocated / count
+
+
+def run(count):
+    results = {}
+    for name, cls in (("Trade (pydantic)", Trade), ("TradeRecord (slots)", TradeRecord)):
+        def construct(n, cls=cls):
+            for i in range(n):
+                cls(**_kwargs(i))
+
+        sample = cls(**_kwargs(0))
+
+        def update(n, trade=sample):
+            for i in range(n):
+                trade.sl = 2641.0
+                trade.trade_id = i
+                trade.status = "open"
+
+        results[name] = {
+            "bytes_per_object": _memory_per_object(cls, count),
+            "construct_us": _time_per_op(construct, count),
+            "update_us": _time_per_op(update, count)
+        }
+
+    record = TradeRecord(**_kwargs(0))
+    record.v3_metadata = {"sl_source": "V3_SMART"}
+    model = record.to_model()
+    to_model_us = _time_per_op(lambda n: [record.to_model() for _ in range(n)], count)
+    from_model_us = _time_per_op(lambda n: [TradeRecord.from_model(model) for _ in range(n)], count)
+
+    print(f"Objects: {count}")
+    print(f"{'':22}{'bytes/obj':>12}{'construct us':>15}{'3 updates us':>15}")
+    for name, data in results.items():
+        print(f"{name:22}{data['bytes_per_object']:>12.0f}{data['construct_us']:>15.2f}{data['update_us']:>15.3f}")
+    print(f"TradeRecord.to_model():   {to_model_us:.2f} us")
+    print(f"TradeRecord.from_model(): {from_model_us:.2f} us")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=20000)
+    run(parser.parse_args().count)
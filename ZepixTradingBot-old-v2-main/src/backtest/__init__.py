@@ -0,0 +1 @@
+# Vectorized Backtesting
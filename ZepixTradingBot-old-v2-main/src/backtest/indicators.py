@@ -0,0 +1,288 @@
+"""
+Pine Script built-ins over NumPy arrays
+
+Each function takes whole price series and returns a float64 array of the
+same length, matching the TradingView ta.* semantics the ZEPIX indicator
+relies on: leading values are NaN until the look-back window is filled,
+ema/rma are seeded with the SMA of the first `length` values, and x[n]
+history references become shift(x, n).
+
+Linear recurrences (ema, rma) run through pandas' ewm in C. The few
+recurrences that are not linear (psar, fisher, vidya) are tight loops over
+plain float lists rather than per-bar objects.
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _f(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def shift(values, n: int = 1, fill=np.nan) -> np.ndarray:
+    """values[n] in Pine terms - the value n bars ago"""
+    values = np.asarray(values)
+    out = np.empty_like(values, dtype=np.float64 if fill is np.nan else values.dtype)
+    if n <= 0:
+        out[:] = values
+        return out
+    out[:n] = fill
+    out[n:] = values[:-n]
+    return out
+
+
+def change(values, n: int = 1) -> np.ndarray:
+    values = _f(values)
+    return values - shift(values, n)
+
+
+def rolling(values, length: int, func) -> np.ndarray:
+    """Apply a reducing func (np.max, np.sum ...) over each full window; NaN before"""
+    values = _f(values)
+    out = np.full(values.shape, np.nan)
+    if length <= 0 or len(values) < length:
+        return out
+    out[length - 1:] = func(sliding_window_view(values, length), axis=1)
+    return out
+
+
+def sma(values, length: int) -> np.ndarray:
+    values = _f(values)
+    out = np.full(values.shape, np.nan)
+    if len(values) < length:
+        return out
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    out[length - 1:] = (csum[length:] - csum[:-length]) / length
+    return out
+
+
+def rolling_sum(values, length: int) -> np.ndarray:
+    return sma(values, length) * length
+
+
+def highest(values, length: int) -> np.ndarray:
+    return rolling(values, length, np.max)
+
+
+def lowest(values, length: int) -> np.ndarray:
+    return rolling(values, length, np.min)
+
+
+def _seeded_ewm(values, length: int, alpha: float) -> np.ndarray:
+    """y = alpha*x + (1-alpha)*y[1], seeded with the SMA of the first `length` valid values"""
+    values = _f(values)
+    out = np.full(values.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == 0:
+        return out
+    start = valid[0]
+    seed_at = start + length - 1
+    if seed_at >= len(values):
+        return out
+    series = values[seed_at:].copy()
+    series[0] = values[start:seed_at + 1].mean()
+    out[seed_at:] = pd.Series(series).ewm(alpha=alpha, adjust=False, ignore_na=True).mean().to_numpy()
+    return out
+
+
+def ema(values, length: int) -> np.ndarray:
+    return _seeded_ewm(values, length, 2.0 / (length + 1))
+
+
+def rma(values, length: int) -> np.ndarray:
+    return _seeded_ewm(values, length, 1.0 / length)
+
+
+def true_range(high, low, close) -> np.ndarray:
+    high, low = _f(high), _f(low)
+    prev_close = shift(close, 1)
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    tr[0] = high[0] - low[0]
+    return tr
+
+
+def atr(high, low, close, length: int) -> np.ndarray:
+    return rma(true_range(high, low, close), length)
+
+
+def rsi(close, length: int = 14) -> np.ndarray:
+    delta = change(close)
+    gain = rma(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)), length)
+    loss = rma(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0)), length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + gain / loss)
+    out = np.where(loss == 0, 100.0, np.where(gain == 0, 0.0, out))
+    return np.where(np.isnan(gain) | np.isnan(loss), np.nan, out)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def stoch(source, high, low, length: int) -> np.ndarray:
+    hh, ll = highest(high, length), lowest(low, length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 * (_f(source) - ll) / (hh - ll)
+
+
+def dmi(high, low, close, di_length: int = 14, adx_smoothing: int = 14) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    up = change(high)
+    down = -change(low)
+    plus_dm = np.where(np.isnan(up), np.nan, np.where((up > down) & (up > 0), up, 0.0))
+    minus_dm = np.where(np.isnan(down), np.nan, np.where((down > up) & (down > 0), down, 0.0))
+    tr_rma = rma(true_range(high, low, close), di_length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus = 100.0 * rma(plus_dm, di_length) / tr_rma
+        minus = 100.0 * rma(minus_dm, di_length) / tr_rma
+        total = plus + minus
+        adx = 100.0 * rma(np.abs(plus - minus) / np.where(total == 0, 1.0, total), adx_smoothing)
+    return plus, minus, adx
+
+
+def mfi(high, low, close, volume, length: int = 14) -> np.ndarray:
+    typical = (_f(high) + _f(low) + _f(close)) / 3.0
+    delta = change(typical)
+    flow = _f(volume) * typical
+    upper = rolling_sum(np.where(delta > 0, flow, 0.0), length)
+    lower = rolling_sum(np.where(delta < 0, flow, 0.0), length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 - 100.0 / (1.0 + upper / lower)
+
+
+def crossover(a, b) -> np.ndarray:
+    a, b = np.broadcast_arrays(_f(a), _f(b))
+    return (a > b) & (shift(a) <= shift(b))
+
+
+def crossunder(a, b) -> np.ndarray:
+    a, b = np.broadcast_arrays(_f(a), _f(b))
+    return (a < b) & (shift(a) >= shift(b))
+
+
+def latch(set_up, set_down, initial: int = 0) -> np.ndarray:
+    """`var int state` that becomes 1 on set_up, -1 on set_down (down wins on the same bar), else holds"""
+    events = np.where(set_down, -1, np.where(set_up, 1, 0)).astype(np.int8)
+    idx = np.where(events != 0, np.arange(len(events)), -1)
+    np.maximum.accumulate(idx, out=idx)
+    return np.where(idx >= 0, events[np.maximum(idx, 0)], initial).astype(np.int8)
+
+
+def bars_since(condition) -> np.ndarray:
+    """Bars since condition was last true (0 on the bar itself, large before the first)"""
+    condition = np.asarray(condition, dtype=bool)
+    positions = np.arange(len(condition))
+    last = np.where(condition, positions, -1)
+    np.maximum.accumulate(last, out=last)
+    return np.where(last >= 0, positions - last, np.iinfo(np.int64).max // 2)
+
+
+def any_in_last(condition, start: int, end: int) -> np.ndarray:
+    """True where condition held on any of the bars [start, end] ago (inclusive)"""
+    condition = np.asarray(condition, dtype=np.int64)
+    csum = np.concatenate(([0], np.cumsum(condition)))
+    n = len(condition)
+    hi = np.clip(np.arange(n) - start + 1, 0, n)
+    lo = np.clip(np.arange(n) - end, 0, n)
+    return (csum[hi] - csum[lo]) > 0
+
+
+def pivot_high(values, left: int, right: int) -> np.ndarray:
+    """Pivot value on the bar it is confirmed (right bars later), NaN elsewhere"""
+    return _pivot(_f(values), left, right, np.greater)
+
+
+def pivot_low(values, left: int, right: int) -> np.ndarray:
+    return _pivot(_f(values), left, right, np.less)
+
+
+def _pivot(values, left: int, right: int, better) -> np.ndarray:
+    n = len(values)
+    out = np.full(n, np.nan)
+    width = left + right + 1
+    if n < width:
+        return out
+    windows = sliding_window_view(values, width)
+    center = windows[:, left]
+    # Strictly better than every other bar in the window
+    others = np.delete(windows, left, axis=1)
+    is_pivot = np.all(better(center[:, None], others), axis=1)
+    out[width - 1:] = np.where(is_pivot, center, np.nan)
+    return out
+
+
+def ffill_index(mask) -> np.ndarray:
+    """Index of the last True at or before each bar (-1 before the first)"""
+    mask = np.asarray(mask, dtype=bool)
+    idx = np.where(mask, np.arange(len(mask)), -1)
+    np.maximum.accumulate(idx, out=idx)
+    return idx
+
+
+def psar(high, low, start: float = 0.02, increment: float = 0.02, maximum: float = 0.2) -> np.ndarray:
+    """Parabolic SAR (ta.sar)"""
+    high_l, low_l = _f(high).tolist(), _f(low).tolist()
+    n = len(high_l)
+    out = [np.nan] * n
+    if n < 2:
+        return np.array(out)
+    uptrend = high_l[1] >= high_l[0]
+    sar = low_l[0] if uptrend else high_l[0]
+    extreme = high_l[1] if uptrend else low_l[1]
+    af = start
+    out[1] = sar
+    for i in range(2, n):
+        sar = sar + af * (extreme - sar)
+        if uptrend:
+            sar = min(sar, low_l[i - 1], low_l[i - 2])
+            if low_l[i] < sar:
+                uptrend, sar, extreme, af = False, extreme, low_l[i], start
+            elif high_l[i] > extreme:
+                extreme, af = high_l[i], min(af + increment, maximum)
+        else:
+            sar = max(sar, high_l[i - 1], high_l[i - 2])
+            if high_l[i] > sar:
+                uptrend, sar, extreme, af = True, extreme, high_l[i], start
+            elif low_l[i] < extreme:
+                extreme, af = low_l[i], min(af + increment, maximum)
+        out[i] = sar
+    return np.array(out)
+
+
+def fisher(high, low, length: int = 14) -> np.ndarray:
+    """ZEPIX Fisher transform on hl2 (fish1 in the Pine source)"""
+    hl2 = (_f(high) + _f(low)) / 2.0
+    hi, lo = highest(hl2, length), lowest(hl2, length)
+    rng = hi - lo
+    with np.errstate(divide="ignore", invalid="ignore"):
+        position = np.where(rng != 0, (hl2 - lo) / rng, 0.0) - 0.5
+    position = np.nan_to_num(position, nan=-0.5).tolist()
+    out = [0.0] * len(position)
+    value = fish = 0.0
+    for i, x in enumerate(position):
+        value = min(max(0.66 * x + 0.67 * value, -0.999), 0.999)
+        fish = 0.5 * np.log((1 + value) / (1 - value)) + 0.5 * fish
+        out[i] = fish
+    return np.array(out)
+
+
+def vidya(close, momentum_length: int = 10, smoothing: int = 15) -> np.ndarray:
+    """vidyaCalc(close, 1, momentum_length) from the ZEPIX consensus module"""
+    momentum = change(close)
+    pos = rolling_sum(np.where(momentum >= 0, momentum, 0.0), momentum_length)
+    neg = rolling_sum(np.where(momentum >= 0, 0.0, -np.nan_to_num(momentum)), momentum_length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = np.abs((pos - neg) / (pos + neg))
+    weight = np.nan_to_num(weight).tolist()
+    src = np.nan_to_num(_f(close)).tolist()
+    out = [0.0] * len(src)
+    value = 0.0
+    for i, (w, x) in enumerate(zip(weight, src)):
+        value = w * x + (1.0 - w) * value
+        out[i] = value
+    return sma(np.array(out), smoothing)
@@ -0,0 +1,592 @@
+"""
+Parameter Sweep - Parallel replay of profit booking and SL settings
+
+Fans a grid or random sample of config overrides (profit_booking_config,
+active_sl_system / sl_systems, symbol_sl_reductions, SL reduction strategy)
+across a process pool. Every worker replays the same cached history - bars
+per symbol plus the alert payloads that fired on them - through the bot's
+own order logic on an MT5Simulator broker:
+
+- Entry alerts open Order A (TP Trail) and Order B (Profit Trail).
+  Lots come from RiskManager, Order A's SL from PipCalculator (sl_systems,
+  symbol_sl_reductions) and Order B's SL from ProfitBookingSLCalculator,
+  exactly as DualOrderManager does.
+- Order B starts a profit booking chain. Orders are booked through
+  ProfitBookingManager.should_book_order. Once a level is fully closed the
+  chain progresses with multipliers[level] orders, and it stops on an
+  unrecovered loss or a disabled level.
+- An Order A TP continues the chain up to the autonomous max_levels, with
+  the SL from SLReductionOptimizer.calculate_next_level_sl. The trend check
+  uses the last entry alert's direction for the symbol.
+- Exit alerts close the opposite positions on their symbol.
+
+Not modelled: SL hunt recovery, reverse shield, daily loss validation.
+
+Results are appended to a JSONL file as each point finishes. --resume
+skips the points already in it, so an interrupted sweep picks up where
+it stopped.
+
+Usage:
+    history = build_history({"XAUUSD": rates}, tf_minutes=5)   # runs ZepixSignalEngine
+    save_history(history, "data/backtest/xauusd_m5.npz")
+
+    python -m src.backtest.param_sweep --history data/backtest/xauusd_m5.npz \\
+        --space sweep_space.json --workers 8 --output data/backtest/sweep.jsonl --resume
+"""
+
+import argparse
+import contextlib
+import copy
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.clients.mt5_simulator import MT5Simulator
+from src.config import Config
+from src.managers.profit_booking_manager import ProfitBookingManager
+from src.managers.risk_manager import RiskManager
+from src.managers.sl_reduction_optimizer import SLReductionOptimizer
+from src.models import TradeRecord
+from src.utils.pip_calculator import PipCalculator
+from src.utils.profit_sl_calculator import ProfitBookingSLCalculator
+
+# Dotted config path -> candidate values. Levels above 2 only matter when
+# profit_booking_config.enabled_levels allows them.
+DEFAULT_SPACE = {
+    "profit_booking_config.min_profit": [5.0, 7.0, 10.0],
+    "profit_booking_config.max_level": [2, 3, 4],
+    "profit_booking_config.multipliers": [[1, 2, 4, 8, 16], [1, 1, 2, 2, 4], [1, 2, 3, 4, 5]],
+    "active_sl_system": ["sl-1", "sl-2"],
+    "sl_reduction_optimization.current_strategy": ["AGGRESSIVE", "BALANCED", "CONSERVATIVE", "ADAPTIVE"],
+}
+
+# metric -> True when higher is better
+RANK_KEYS = {
+    "pnl": True,
+    "max_drawdown": False,
+    "pnl_to_drawdown": True,
+    "win_rate": True,
+    "max_chain_depth": True,
+}
+
+DEFAULT_OUTPUT = "data/backtest/sweep_results.jsonl"
+
+
+class SweepConfig(Config):
+    """In-memory Config for one sweep point - never written to config/config.json"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.config_file = None
+        self.default_config = {}
+        self.config = data
+        self._init_store()
+        self._mark_persisted()
+
+
+# ==================== SEARCH SPACE ====================
+
+def point_id(params: Dict[str, Any]) -> str:
+    """Stable id of a parameter set (used to resume)"""
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def grid_points(space: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Every combination of the space"""
+    keys = sorted(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_points(space: Dict[str, List[Any]], count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Up to `count` distinct random combinations (the whole grid if it is smaller)"""
+    keys = sorted(space)
+    total = 1
+    for key in keys:
+        total *= len(space[key])
+    if count >= total:
+        return grid_points(space)
+
+    rng = random.Random(seed)
+    points: Dict[str, Dict[str, Any]] = {}
+    while len(points) < count:
+        params = {key: rng.choice(space[key]) for key in keys}
+        points.setdefault(point_id(params), params)
+    return list(points.values())
+
+
+def apply_params(base: Dict[str, Any], params: Dict[str, Any]) -> SweepConfig:
+    config = SweepConfig(copy.deepcopy(base))
+    for path, value in params.items():
+        config.update_nested(path, copy.deepcopy(value))
+    return config
+
+
+# ==================== CACHED HISTORY ====================
+
+def build_history(rates_by_symbol: Dict[str, Any], tf_minutes: int, engine=None) -> Dict[str, Any]:
+    """Bars per symbol plus the ZEPIX payloads they produce, ready for save_history()"""
+    from src.backtest.zepix_engine import ZepixSignalEngine, _columns
+
+    engine = engine or ZepixSignalEngine()
+    bars, alerts = {}, []
+    for symbol, rates in rates_by_symbol.items():
+        columns = _columns(rates)
+        bars[symbol] = {key: columns[key] for key in ("time", "open", "high", "low", "close")}
+        alerts.extend(engine.to_payloads(engine.compute(columns, tf_minutes), symbol))
+    alerts.sort(key=lambda payload: payload["timestamp"])
+    return {"tf_minutes": tf_minutes, "bars": bars, "alerts": alerts}
+
+
+def save_history(history: Dict[str, Any], path: str):
+    arrays = {f"{symbol}__{key}": values
+              for symbol, columns in history["bars"].items() for key, values in columns.items()}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.savez_compressed(path, tf_minutes=history["tf_minutes"],
+                        alerts=np.array(json.dumps(history["alerts"])), **arrays)
+
+
+def load_history(path: str) -> Dict[str, Any]:
+    with np.load(path, allow_pickle=False) as data:
+        bars: Dict[str, Dict[str, np.ndarray]] = {}
+        for name in data.files:
+            if "__" in name:
+                symbol, key = name.rsplit("__", 1)
+                bars.setdefault(symbol, {})[key] = data[name]
+        return {"tf_minutes": int(data["tf_minutes"]), "bars": bars,
+                "alerts": json.loads(str(data["alerts"]))}
+
+
+# ==================== REPLAY ====================
+
+def _alert_epoch(payload: Dict[str, Any]) -> Optional[float]:
+    stamp = payload.get("timestamp")
+    if not stamp:
+        return None
+    try:
+        return datetime.fromisoformat(str(stamp).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _alert_logic(payload: Dict[str, Any]) -> str:
+    """Same routing as TradingEngine._route_v3_to_logic / the legacy tf mapping"""
+    tf = str(payload.get("tf", ""))
+    if payload.get("signal_type") in ("Screener_Full_Bullish", "Screener_Full_Bearish"):
+        return "combinedlogic-3"
+    if payload.get("signal_type") == "Golden_Pocket_Flip" and tf in ("60", "240"):
+        return "combinedlogic-3"
+    if tf in ("5", "5m"):
+        return "combinedlogic-1"
+    if tf in ("15", "15m"):
+        return "combinedlogic-2"
+    if tf in ("60", "240", "1h"):
+        return "combinedlogic-3"
+    return "combinedlogic-2"
+
+
+class ChainReplay:
+    """Replays one configuration over the cached history on a simulated broker"""
+
+    def __init__(self, config: Config, history: Dict[str, Any]):
+        self.config = config
+        self.history = history
+        self.broker = MT5Simulator(config, prices={}, latency_ms={}, seed=0)
+        self.start_balance = self.broker.balance
+
+        self.risk_manager = RiskManager(config)
+        self.pip_calculator = PipCalculator(config)
+        self.profit_sl_calculator = ProfitBookingSLCalculator(config)
+        self.sl_optimizer = SLReductionOptimizer(config)
+        self.profit_booking = ProfitBookingManager(config, None, self.pip_calculator, self.risk_manager, None)
+
+        profit_config = config.get("profit_booking_config", {})
+        self.allow_partial = profit_config.get("allow_partial_progression", False)
+        self.enabled_levels = profit_config.get("enabled_levels", {})
+        tp_config = (config.get("re_entry_config", {}).get("autonomous_config", {})
+                     .get("tp_continuation", {}))
+        self.tp_continuation = tp_config.get("enabled", True)
+        self.tp_max_levels = tp_config.get("max_levels", 5)
+        self.rr_ratio = config.get("rr_ratio", 1.0)
+
+        self.orders: Dict[int, Dict[str, Any]] = {}       # ticket -> {trade, kind, chain}
+        self.chains: Dict[str, List[Dict[str, Any]]] = {}  # symbol -> active profit chains
+        self.bias: Dict[str, str] = {}                     # symbol -> last entry direction
+        self.deals_seen = 0
+        self.stats = {
+            "alerts": 0, "entries": 0, "orders": 0, "rejected": 0,
+            "wins": 0, "losses": 0, "booked": 0,
+            "chains": 0, "chains_completed": 0, "chains_stopped": 0,
+            "max_chain_depth": 0, "chain_depth_total": 0, "max_tp_level": 0,
+        }
+
+    # ---------- orders ----------
+
+    def _place(self, symbol, direction, lot_size, sl, tp, strategy, kind, chain, level) -> bool:
+        broker = self.broker
+        request = {
+            "action": broker.TRADE_ACTION_DEAL, "symbol": symbol, "volume": lot_size,
+            "type": broker.ORDER_TYPE_BUY if direction == "buy" else broker.ORDER_TYPE_SELL,
+            "sl": sl or 0.0, "tp": tp or 0.0, "comment": f"{strategy}_{kind}{level}",
+        }
+        result = broker.order_send(request)
+        if result.retcode != broker.TRADE_RETCODE_DONE:
+            self.stats["rejected"] += 1
+            return False
+        trade = TradeRecord(symbol=symbol, entry=result.price, sl=sl, tp=tp, lot_size=lot_size,
+                            direction=direction, strategy=strategy, open_time=str(broker.now()),
+                            trade_id=result.order, profit_level=level)
+        self.orders[result.order] = {"trade": trade, "kind": kind, "chain": chain}
+        if chain is not None and kind == "B":
+            chain["open"].add(result.order)
+        self.stats["orders"] += 1
+        return True
+
+    def _close(self, ticket: int):
+        position = self.broker.positions.get(ticket)
+        if position is None:
+            return
+        broker = self.broker
+        close_type = broker.ORDER_TYPE_SELL if position["type"] == broker.ORDER_TYPE_BUY else broker.ORDER_TYPE_BUY
+        broker.order_send({"action": broker.TRADE_ACTION_DEAL, "symbol": position["symbol"],
+                           "position": ticket, "volume": position["volume"], "type": close_type})
+
+    # ---------- alerts ----------
+
+    def _on_alert(self, payload: Dict[str, Any]):
+        self.stats["alerts"] += 1
+        symbol = payload.get("symbol")
+        if symbol not in self.broker.ticks:
+            return
+        alert_type = payload.get("type")
+
+        if alert_type == "exit_v3":
+            close_direction = {"Bullish_Exit": "sell", "Bearish_Exit": "buy"}.get(payload.get("signal_type"))
+            for ticket, order in list(self.orders.items()):
+                trade = order["trade"]
+                if trade.symbol == symbol and trade.direction == close_direction:
+                    self._close(ticket)
+            return
+
+        if alert_type == "entry_v3":
+            direction = payload.get("direction")
+        elif alert_type == "entry":
+            direction = payload.get("signal")
+        else:
+            return
+        if direction not in ("buy", "sell"):
+            return
+        self.bias[symbol] = direction
+        self.stats["entries"] += 1
+        self._open_dual_orders(symbol, direction, _alert_logic(payload))
+
+    def _open_dual_orders(self, symbol: str, direction: str, strategy: str):
+        balance = self.broker.balance
+        price = self.broker.ticks[symbol].bid
+        lot_size = self.risk_manager.get_lot_size_for_logic(balance, logic=strategy)
+        if lot_size <= 0:
+            return
+
+        sl_a, sl_distance_a = self.pip_calculator.calculate_sl_price(
+            symbol, price, direction, lot_size, balance, logic=strategy)
+        tp_a = self.pip_calculator.calculate_tp_price(price, sl_a, direction, self.rr_ratio)
+        pip_size = self.pip_calculator.get_pip_size(symbol)
+        tp_chain = {"level": 1, "base_sl_pips": sl_distance_a / pip_size, "strategy": strategy}
+        if self._place(symbol, direction, lot_size, sl_a, tp_a, strategy, "A", tp_chain, 1):
+            self.stats["max_tp_level"] = max(self.stats["max_tp_level"], 1)
+
+        sl_b, _ = self.profit_sl_calculator.calculate_sl_price(price, direction, symbol, lot_size, strategy)
+        tp_b = self.pip_calculator.calculate_tp_price(price, sl_b, direction, self.rr_ratio)
+        chain = {"symbol": symbol, "direction": direction, "strategy": strategy,
+                 "level": 0, "open": set(), "loss": False}
+        if self._place(symbol, direction, lot_size, sl_b, tp_b, strategy, "B", chain, 0):
+            self.chains.setdefault(symbol, []).append(chain)
+            self.stats["chains"] += 1
+
+    # ---------- chains ----------
+
+    def _book_profits(self, symbol: str, price: float):
+        for chain in self.chains.get(symbol, ()):
+            if chain["level"] >= self.profit_booking.max_level:
+                continue                                    # Max level orders run to SL/TP
+            for ticket in list(chain["open"]):
+                if self.profit_booking.should_book_order(self.orders[ticket]["trade"], price):
+                    self.stats["booked"] += 1
+                    self._close(ticket)
+
+    def _process_deals(self):
+        deals = self.broker.deals
+        while self.deals_seen < len(deals):
+            deal = deals[self.deals_seen]
+            self.deals_seen += 1
+            if deal.entry != self.broker.DEAL_ENTRY_OUT:
+                continue
+            order = self.orders.pop(deal.position_id, None)
+            if order is None:
+                continue
+            self.stats["wins" if deal.profit > 0 else "losses"] += 1
+            if order["kind"] == "A":
+                if deal.reason == self.broker.DEAL_REASON_TP:
+                    self._continue_tp_chain(order)
+            else:
+                self._on_profit_order_closed(order["chain"], deal)
+
+    def _continue_tp_chain(self, order: Dict[str, Any]):
+        chain, trade = order["chain"], order["trade"]
+        if not self.tp_continuation or chain["level"] >= self.tp_max_levels:
+            return
+        if self.bias.get(trade.symbol) != trade.direction:
+            return
+        price = self.broker.ticks[trade.symbol].bid
+        sl_pips = self.sl_optimizer.calculate_next_level_sl(trade.symbol, chain["level"], chain["base_sl_pips"])
+        distance = sl_pips * self.pip_calculator.get_pip_size(trade.symbol)
+        if trade.direction == "buy":
+            sl, tp = price - distance, price + distance * self.rr_ratio
+        else:
+            sl, tp = price + distance, price - distance * self.rr_ratio
+        lot_size = self.risk_manager.get_fixed_lot_size(self.broker.balance)
+        next_chain = dict(chain, level=chain["level"] + 1)
+        if self._place(trade.symbol, trade.direction, lot_size, sl, tp, chain["strategy"], "A",
+                       next_chain, next_chain["level"]):
+            self.stats["max_tp_level"] = max(self.stats["max_tp_level"], next_chain["level"])
+
+    def _on_profit_order_closed(self, chain: Dict[str, Any], deal):
+        chain["open"].discard(deal.position_id)
+        if deal.profit < 0:
+            chain["loss"] = True
+        if chain["open"]:
+            return
+
+        # Level fully closed - same rules as ProfitBookingManager.check_and_progress_chain
+        next_level = chain["level"] + 1
+        if chain["level"] >= self.profit_booking.max_level:
+            self._end_chain(chain, "chains_completed")
+        elif chain["loss"] and not self.allow_partial:
+            self._end_chain(chain, "chains_stopped")
+        elif not self.enabled_levels.get(str(next_level), True):
+            self._end_chain(chain, "chains_stopped")
+        else:
+            symbol, direction, strategy = chain["symbol"], chain["direction"], chain["strategy"]
+            price = self.broker.ticks[symbol].bid
+            lot_size = self.risk_manager.get_lot_size_for_logic(self.broker.balance, logic=strategy)
+            sl, _ = self.profit_sl_calculator.calculate_sl_price(price, direction, symbol, lot_size, strategy)
+            tp = self.pip_calculator.calculate_tp_price(price, sl, direction, self.rr_ratio)
+            chain["level"], chain["loss"] = next_level, False
+            for _ in range(self.profit_booking.get_order_multiplier(next_level)):
+                self._place(symbol, direction, lot_size, sl, tp, strategy, "B", chain, next_level)
+            if not chain["open"]:
+                self._end_chain(chain, "chains_stopped")
+
+    def _end_chain(self, chain: Dict[str, Any], outcome: str):
+        self.stats[outcome] += 1
+        self.stats["max_chain_depth"] = max(self.stats["max_chain_depth"], chain["level"])
+        self.stats["chain_depth_total"] += chain["level"]
+        self.chains[chain["symbol"]].remove(chain)
+
+    # ---------- main loop ----------
+
+    def run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        history = self.history
+        bar_seconds = history["tf_minutes"] * 60
+        symbols = list(history["bars"])
+        for symbol in symbols:
+            bars = history["bars"][symbol]
+            if len(bars["close"]):
+                self.broker.set_price(symbol, float(bars["open"][0]), when=float(bars["time"][0]))
+
+        # Global bar order by close time; alerts (stamped at bar close) run before the next bar
+        times = np.concatenate([history["bars"][s]["time"] for s in symbols]).astype(np.int64) + bar_seconds
+        owner = np.concatenate([np.full(len(history["bars"][s]["time"]), k) for k, s in enumerate(symbols)])
+        index = np.concatenate([np.arange(len(history["bars"][s]["time"])) for s in symbols])
+        order = np.argsort(times, kind="stable")
+        alerts = sorted(((t, p) for p in history["alerts"] if (t := _alert_epoch(p)) is not None),
+                        key=lambda item: item[0])
+        skipped = len(history["alerts"]) - len(alerts)
+        next_alert = 0
+
+        peak = self.start_balance
+        max_drawdown = 0.0
+        for close_time, k, i in zip(times[order].tolist(), owner[order].tolist(), index[order].tolist()):
+            while next_alert < len(alerts) and alerts[next_alert][0] < close_time:
+                self._on_alert(alerts[next_alert][1])
+                self._process_deals()
+                next_alert += 1
+
+            symbol = symbols[k]
+            bars = history["bars"][symbol]
+            o, h, l, c = (float(bars[key][i]) for key in ("open", "high", "low", "close"))
+            path = (o, l, h, c) if c >= o else (o, h, l, c)
+            start = close_time - bar_seconds
+            for step, price in enumerate(path):
+                self.broker.set_price(symbol, price, when=start + step * bar_seconds / 4)
+                self._process_deals()
+                self._book_profits(symbol, price)
+                self._process_deals()
+
+            equity = self.broker.account_info().equity if self.broker.positions else self.broker.balance
+            peak = max(peak, equity)
+            max_drawdown = max(max_drawdown, peak - equity)
+
+        while next_alert < len(alerts):
+            self._on_alert(alerts[next_alert][1])
+            self._process_deals()
+            next_alert += 1
+
+        # Flatten so PnL is fully realized
+        for ticket in list(self.broker.positions):
+            self._close(ticket)
+        self._process_deals()
+        for chains in self.chains.values():
+            for chain in chains:
+                self.stats["max_chain_depth"] = max(self.stats["max_chain_depth"], chain["level"])
+                self.stats["chain_depth_total"] += chain["level"]
+
+        stats = self.stats
+        closed = stats["wins"] + stats["losses"]
+        pnl = round(self.broker.balance - self.start_balance, 2)
+        return {
+            "pnl": pnl,
+            "max_drawdown": round(max_drawdown, 2),
+            "pnl_to_drawdown": round(pnl / max_drawdown, 3) if max_drawdown else (pnl if pnl > 0 else 0.0),
+            "win_rate": round(stats["wins"] / closed * 100, 1) if closed else 0.0,
+            "avg_chain_depth": round(stats["chain_depth_total"] / stats["chains"], 2) if stats["chains"] else 0.0,
+            "alerts_skipped": skipped,
+            "elapsed_sec": round(time.perf_counter() - started, 3),
+            **stats,
+        }
+
+
+# ==================== PARALLEL SWEEP ====================
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(base_config: Dict[str, Any], history_path: str):
+    _WORKER["base"] = base_config
+    _WORKER["history"] = load_history(history_path)
+
+
+def _run_point(params: Dict[str, Any]) -> Dict[str, Any]:
+    # Calculators print per-order diagnostics; keep worker output clean
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        metrics = ChainReplay(apply_params(_WORKER["base"], params), _WORKER["history"]).run()
+    return {"id": point_id(params), "params": params, "metrics": metrics}
+
+
+def load_results(path: str) -> List[Dict[str, Any]]:
+    """Results written so far (a line cut off by an interrupted run is ignored)"""
+    results = []
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    results.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return results
+
+
+def run_sweep(points: List[Dict[str, Any]], history_path: str, base_config: Dict[str, Any],
+              output: Optional[str] = None, workers: Optional[int] = None, resume: bool = False,
+              progress: Optional[Callable[[int, int, Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    """
+    Run every point (skipping ones already in `output` when resuming) and
+    return all results. workers=1 runs in-process.
+    """
+    done = {r["id"]: r for r in load_results(output)} if resume else {}
+    pending = [p for p in points if point_id(p) not in done]
+    results = list(done.values())
+
+    sink = None
+    if output:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        # Rewrite with the valid lines so a half-written one cannot swallow the next result
+        sink = open(output, "w", encoding="utf-8")
+        for result in results:
+            sink.write(json.dumps(result) + "\n")
+        sink.flush()
+
+    def record(result):
+        results.append(result)
+        if sink:
+            sink.write(json.dumps(result) + "\n")
+            sink.flush()
+        if progress:
+            progress(len(results), len(done) + len(pending), result)
+
+    try:
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            _init_worker(base_config, history_path)
+            for params in pending:
+                record(_run_point(params))
+        elif pending:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(base_config, history_path)) as pool:
+                for future in as_completed([pool.submit(_run_point, p) for p in pending]):
+                    record(future.result())
+    finally:
+        if sink:
+            sink.close()
+    return results
+
+
+def rank_results(results: List[Dict[str, Any]], by: str = "pnl") -> List[Dict[str, Any]]:
+    descending = RANK_KEYS[by]
+    return sorted(results, key=lambda r: (r["metrics"][by] * (-1 if descending else 1),
+                                          -r["metrics"]["pnl"]))
+
+
+def format_table(ranked: List[Dict[str, Any]], limit: int = 20) -> str:
+    lines = [
+        f"{'#':>3} {'PnL':>10} {'MaxDD':>9} {'Depth':>5} {'TP Lvl':>6} {'Orders':>6} {'Win%':>5}  Params",
+        "-" * 100,
+    ]
+    for rank, result in enumerate(ranked[:limit], 1):
+        m = result["metrics"]
+        params = ", ".join(f"{key.split('.')[-1]}={value}" for key, value in sorted(result["params"].items()))
+        lines.append(f"{rank:>3} {m['pnl']:>10.2f} {m['max_drawdown']:>9.2f} {m['max_chain_depth']:>5} "
+                     f"{m['max_tp_level']:>6} {m['orders']:>6} {m['win_rate']:>5.1f}  {params}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Sweep profit booking / SL settings over a cached history")
+    parser.add_argument("--history", required=True, help="History .npz written by save_history()")
+    parser.add_argument("--space", help="JSON file: dotted config path -> list of values")
+    parser.add_argument("--random", type=int, help="Sample this many points instead of the full grid")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, help="Processes (default: all cores)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Results JSONL")
+    parser.add_argument("--resume", action="store_true", help="Skip points already in --output")
+    parser.add_argument("--rank-by", choices=sorted(RANK_KEYS), default="pnl")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    space = DEFAULT_SPACE
+    if args.space:
+        with open(args.space, encoding="utf-8") as f:
+            space = json.load(f)
+    points = random_points(space, args.random, args.seed) if args.random else grid_points(space)
+
+    def progress(finished, total, result):
+        print(f"[{finished}/{total}] {result['id']} PnL=${result['metrics']['pnl']:.2f} "
+              f"DD=${result['metrics']['max_drawdown']:.2f}", flush=True)
+
+    print(f"Sweeping {len(points)} points with {args.workers or os.cpu_count()} workers -> {args.output}")
+    results = run_sweep(points, args.history, Config().config, output=args.output,
+                        workers=args.workers, resume=args.resume, progress=progress)
+    print(format_table(rank_results(results, args.rank_by), args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,673 @@
+"""
+ZEPIX Signal Engine - Vectorized port of ZEPIX_ULTIMATE_BOT_v3 for backtesting
+
+Computes the indicator's state for a whole OHLCV history at once (market
+structure, order blocks, fair value gaps, equal highs/lows, ZLEMA trend,
+nine-indicator consensus score, volume delta, breakouts, MTF trends and the
+signal set) and turns the bars where the Pine alert would fire into the
+exact JSON payloads the webhook receives, so they can be replayed through
+TradingEngine.process_alert offline.
+
+tests/pine_logic_engine.py remains the bar-by-bar reference; this module
+works on NumPy arrays. Only three pieces keep a scalar loop because they are
+genuine state machines: the BOS/CHoCH structure tracker, Parabolic SAR
+(indicators.psar, each bar's stop depends on the previous one) and the trade
+state (exits 5/6 depend on the open trade), which loops over entries, not bars.
+Order blocks and FVGs are handled per zone with array slices.
+
+Differences from the Pine source (kept deliberately):
+- Trendlines are measured in bars, not chart time (no weekend gaps).
+- Zones expire after `zone_max_age` bars (Pine's CALCULATION_WINDOW) instead
+  of freezing once MAX_OB_ARRAY zones, broken or not, have been stored.
+- Higher-timeframe trends use the last completed HTF bar (no lookahead).
+- mtf_trends is sent as the six values the bot parses (1m,5m,15m,1H,4H,1D),
+  squeeze/pulse payloads carry direction "neutral" and a consensus score so
+  they validate as ZepixV3Alert, and every payload has a bar timestamp.
+
+Usage:
+    engine = ZepixSignalEngine()
+    frame = engine.compute(rates, tf_minutes=5)        # MT5 copy_rates_* array, DataFrame or dict
+    payloads = engine.to_payloads(frame, "XAUUSD")
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.backtest import indicators as ta
+
+DEFAULT_SETTINGS = {
+    # Smart money
+    "ms_len": 5,
+    "ob_lookback": 300,
+    "ob_mitigation": "Close",       # Close / Wick / Avg
+    "zone_max_age": 2000,
+    "ehl_pos": 2,
+    "ehl_threshold": 0.1,
+    # Consensus engine
+    "signal_sensitivity": 50,
+    "band_mult": 1.0,
+    # Breakout system
+    "trend_period": 10,
+    "breakout_period": 5,
+    "max_breakout_len": 200,
+    "min_tests": 2,
+    # Risk management
+    "risk_reward1": 1.5,
+    "risk_reward2": 3.0,
+    "atr_mult_sl": 1.5,
+    # Conflict resolution
+    "require_mtf_align": True,
+    "require_vol_confirm": True,
+    "volume_delta_threshold": 1.5,
+    "block_ehl_trades": True,
+    "min_confluence_score": 6,
+}
+
+MTF_MINUTES = (1, 5, 15, 60, 240, 1440)
+MTF_LABELS = ("1", "5", "15", "60", "240", "1D")
+
+# Pine alert if/else chain order: (frame key, type, signal_type, direction)
+SIGNAL_TABLE = (
+    ("signal1_bull", "entry_v3", "Institutional_Launchpad", "buy"),
+    ("signal1_bear", "entry_v3", "Institutional_Launchpad", "sell"),
+    ("signal2_bull", "entry_v3", "Liquidity_Trap_Reversal", "buy"),
+    ("signal2_bear", "entry_v3", "Liquidity_Trap_Reversal", "sell"),
+    ("signal3_bull", "entry_v3", "Momentum_Breakout", "buy"),
+    ("signal3_bear", "entry_v3", "Momentum_Breakout", "sell"),
+    ("signal4_bull", "entry_v3", "Mitigation_Test_Entry", "buy"),
+    ("signal4_bear", "entry_v3", "Mitigation_Test_Entry", "sell"),
+    ("signal12_bull", "entry_v3", "Sideways_Breakout", "buy"),
+    ("signal12_bear", "entry_v3", "Sideways_Breakout", "sell"),
+    ("signal5_exit", "exit_v3", "Bullish_Exit", "sell"),
+    ("signal6_exit", "exit_v3", "Bearish_Exit", "buy"),
+    ("signal7_bull", "entry_v3", "Golden_Pocket_Flip", "buy"),
+    ("signal7_bear", "entry_v3", "Golden_Pocket_Flip", "sell"),
+    ("signal8_squeeze", "squeeze_v3", "Volatility_Squeeze", "neutral"),
+    ("signal9_bull", "entry_v3", "Screener_Full_Bullish", "buy"),
+    ("signal10_bear", "entry_v3", "Screener_Full_Bearish", "sell"),
+    ("trend_pulse", "trend_pulse_v3", "Trend_Pulse", "neutral"),
+)
+
+_PRICE_IN_OB_SIGNALS = {"Institutional_Launchpad", "Liquidity_Trap_Reversal", "Mitigation_Test_Entry",
+                        "Golden_Pocket_Flip"}
+
+
+def _columns(data) -> Dict[str, np.ndarray]:
+    """time/open/high/low/close/volume arrays from a dict, DataFrame or MT5 rates array"""
+    names = data.dtype.names if hasattr(data, "dtype") and data.dtype.names else list(data.keys())
+    volume_key = "volume" if "volume" in names else "tick_volume"
+    return {
+        "time": np.asarray(data["time"], dtype=np.int64),
+        "open": np.asarray(data["open"], dtype=np.float64),
+        "high": np.asarray(data["high"], dtype=np.float64),
+        "low": np.asarray(data["low"], dtype=np.float64),
+        "close": np.asarray(data["close"], dtype=np.float64),
+        "volume": np.asarray(data[volume_key], dtype=np.float64),
+    }
+
+
+def _tf_label(tf_minutes: int) -> str:
+    return "D" if tf_minutes >= 1440 else str(tf_minutes)
+
+
+class ZepixSignalEngine:
+    """Computes ZEPIX v3 signals over an OHLCV history"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update(settings or {})
+
+    # ==================== PUBLIC API ====================
+
+    def compute(self, data, tf_minutes: int = 5) -> Dict[str, Any]:
+        """All per-bar series (dict of arrays, same length as the input) plus the simulated trades"""
+        bars = _columns(data)
+        o, h, l, c, v = bars["open"], bars["high"], bars["low"], bars["close"], bars["volume"]
+        frame: Dict[str, Any] = dict(bars)
+        frame["tf_minutes"] = tf_minutes
+
+        frame["atr"] = ta.atr(h, l, c, 200)
+        self._structure(frame)
+        self._order_blocks(frame)
+        self._fair_value_gaps(frame)
+        self._equal_highs_lows(frame)
+        frame["bull_sweep"] = (l < ta.shift(l)) & (c > ta.shift(l))
+        frame["bear_sweep"] = (h > ta.shift(h)) & (c < ta.shift(h))
+
+        zl_trend, zlema = self.zl_trend(h, l, c)
+        frame["zl_trend"], frame["zlema"] = zl_trend, zlema
+        self._consensus(frame)
+        self._volume_delta(frame)
+        self._trendline_breaks(frame)
+        self._pattern_breakouts(frame)
+        self._risk_levels(frame)
+        self._mtf_trends(frame)
+        self._signals(frame)
+        self._trade_state(frame)
+
+        codes = np.zeros(len(c), dtype=np.int16)
+        for code in range(len(SIGNAL_TABLE), 0, -1):   # Earliest entry in the chain wins
+            codes[frame[SIGNAL_TABLE[code - 1][0]]] = code
+        frame["signal_code"] = codes
+        return frame
+
+    def to_payloads(self, frame: Dict[str, Any], symbol: str) -> List[Dict[str, Any]]:
+        """Webhook payloads for every bar where the consolidated Pine alert fires"""
+        tf = _tf_label(frame["tf_minutes"])
+        bar_seconds = frame["tf_minutes"] * 60
+        payloads = []
+        for i in np.flatnonzero(frame["signal_code"]):
+            key, alert_type, signal_type, direction = SIGNAL_TABLE[frame["signal_code"][i] - 1]
+            payload = {
+                "type": alert_type,
+                "signal_type": signal_type,
+                "symbol": symbol,
+                "direction": direction,
+                "tf": tf,
+                "price": float(frame["close"][i]),
+                "consensus_score": int(frame["consensus_score"][i]),
+            }
+            market_trend = int(frame["market_trend"][i])
+            trends = frame["mtf"][i].tolist()
+
+            if alert_type == "entry_v3":
+                side = "long" if direction == "buy" else "short"
+                payload.update({
+                    "sl_price": round(float(frame[f"stop_{side}"][i]), 5),
+                    "tp1_price": round(float(frame[f"tp1_{side}"][i]), 5),
+                    "tp2_price": round(float(frame[f"tp2_{side}"][i]), 5),
+                    "mtf_trends": ",".join(map(str, trends)),
+                    "market_trend": market_trend,
+                    "volume_delta_ratio": round(float(frame["volume_delta_ratio"][i]), 4),
+                    "price_in_ob": signal_type in _PRICE_IN_OB_SIGNALS,
+                    "position_multiplier": float(frame["position_multiplier"][i]),
+                })
+                if signal_type == "Golden_Pocket_Flip":
+                    payload["fib_level"] = round(float(frame["fib_level"][i]), 4)
+                if signal_type.startswith("Screener_Full"):
+                    full_bull = direction == "buy"
+                    payload.update({"consensus_score": 9 if full_bull else 0,
+                                    "market_trend": 1 if full_bull else -1,
+                                    "full_alignment": True, "position_multiplier": 1.0})
+            elif alert_type == "exit_v3":
+                payload.update({"market_trend": market_trend,
+                                "reason": "TP_hit_or_reversal_or_momentum_loss"})
+            elif alert_type == "squeeze_v3":
+                payload.update({"market_trend": market_trend,
+                                "message": "Big move expected - prepare for breakout"})
+            else:
+                previous = frame["mtf"][i - 1].tolist()
+                changed = [k for k in range(len(trends)) if trends[k] != previous[k]]
+                payload.update({
+                    "current_trends": ",".join(map(str, trends)),
+                    "previous_trends": ",".join(map(str, previous)),
+                    "changed_timeframes": "".join(f"{MTF_LABELS[k]}," for k in changed),
+                    "change_details": "".join(f"{MTF_LABELS[k]}:{trends[k]};" for k in changed),
+                    "trend_labels": "1m,5m,15m,1H,4H,1D",
+                    "market_trend": market_trend,
+                })
+
+            close_time = int(frame["time"][i]) + bar_seconds
+            payload["timestamp"] = datetime.fromtimestamp(close_time, tz=timezone.utc).isoformat()
+            payloads.append(payload)
+        return payloads
+
+    @staticmethod
+    def save_payloads(payloads: List[Dict[str, Any]], path: str):
+        """JSONL, one payload per line (the format tests/benchmarks/replay_benchmark.py loads)"""
+        with open(path, "w", encoding="utf-8") as f:
+            for payload in payloads:
+                f.write(json.dumps(payload) + "\n")
+
+    def zl_trend(self, h, l, c):
+        """ZLEMA trend (+1/-1/0) and the ZLEMA line - also used per higher timeframe"""
+        length = self.settings["signal_sensitivity"]
+        lag = (length - 1) // 2
+        zlema = ta.ema(c + (c - ta.shift(c, lag)), length)
+        volatility = ta.highest(ta.atr(h, l, c, length), length * 3) * self.settings["band_mult"]
+        trend = ta.latch(ta.crossover(c, zlema + volatility), ta.crossunder(c, zlema - volatility))
+        return trend, zlema
+
+    # ==================== SMART MONEY ====================
+
+    def _structure(self, frame):
+        """Section 6.1 - BOS/CHoCH tracker (sequential: every break resets the reference range)"""
+        o, h, l, c = (frame[k].tolist() for k in ("open", "high", "low", "close"))
+        n = len(c)
+        min_bar = self.settings["ms_len"] * 2
+        trend_out = [0] * n
+        bull = [False] * n
+        bear = [False] * n
+        bos = [False] * n
+        choch = [False] * n
+        up, dn, trend = (h[0], l[0], 0) if n else (0.0, 0.0, 0)
+        for i in range(n):
+            cross_up = h[i] > up
+            if cross_up:
+                up, dn = h[i], l[i]
+            cross_dn = l[i] < dn
+            if cross_dn:
+                up, dn = h[i], l[i]
+            if i > min_bar:
+                if cross_up and c[i] > o[i] and c[i - 1] > o[i - 1]:
+                    if trend == -1:
+                        choch[i] = True
+                    else:
+                        bos[i] = True
+                    trend = 1
+                    bull[i] = True
+                if cross_dn and c[i] < o[i] and c[i - 1] < o[i - 1]:
+                    if trend == 1:
+                        choch[i] = True
+                    else:
+                        bos[i] = True
+                    trend = -1
+                    bear[i] = True
+            trend_out[i] = trend
+        frame["market_trend"] = np.array(trend_out, dtype=np.int8)
+        frame["bullish_structure"] = np.array(bull)
+        frame["bearish_structure"] = np.array(bear)
+        frame["is_bos"] = np.array(bos)
+        frame["is_choch"] = np.array(choch)
+
+    def _order_blocks(self, frame):
+        """Section 6.2/6.6/16 - OB creation, price-in-OB (unbroken) and mitigation"""
+        o, h, l, c = frame["open"], frame["high"], frame["low"], frame["close"]
+        n = len(c)
+        lookback = self.settings["ob_lookback"]
+        method = self.settings["ob_mitigation"]
+        bar = np.arange(n)
+
+        for side, structure, origin, sign in (("bull", "bullish_structure", c < o, 1),
+                                              ("bear", "bearish_structure", c > o, -1)):
+            # Last opposite candle strictly before the structure break, within the lookback
+            origin_idx = ta.shift(ta.ffill_index(origin), 1, fill=-1).astype(np.int64)
+            new_ob = frame[structure] & (origin_idx >= 0) & (bar - origin_idx <= lookback)
+            starts = np.flatnonzero(new_ob)
+            tops, btms = h[origin_idx[starts]], l[origin_idx[starts]]
+
+            if sign == 1:
+                breach = {"Close": np.minimum(c, o), "Wick": l, "Avg": l}[method]
+                levels = (tops + btms) / 2 if method == "Avg" else btms
+            else:
+                breach = {"Close": np.maximum(c, o), "Wick": h, "Avg": h}[method]
+                levels = (tops + btms) / 2 if method == "Avg" else tops
+
+            inside, touched_btm, touched_top = self._zone_touches(
+                frame, starts, tops, btms, breach, levels, sign)
+            frame[f"new_{side}_ob"] = new_ob
+            frame[f"{side}_ob_top"] = np.where(new_ob, h[np.maximum(origin_idx, 0)], np.nan)
+            frame[f"{side}_ob_btm"] = np.where(new_ob, l[np.maximum(origin_idx, 0)], np.nan)
+            frame[f"price_in_{side}_ob"] = inside
+            frame[f"{side}_ob_touch_btm"] = touched_btm
+            frame[f"{side}_ob_touch_top"] = touched_top
+
+    def _fair_value_gaps(self, frame):
+        """Section 6.3 - FVG creation and price-in-FVG until the gap is filled (wick beyond it)"""
+        h, l, c = frame["high"], frame["low"], frame["close"]
+        h2, l2 = ta.shift(h, 2), ta.shift(l, 2)
+        new_bull = (l > h2) & (ta.shift(c) > ta.shift(l))
+        new_bear = (h < l2) & (ta.shift(c) < ta.shift(h))
+        frame["new_bull_fvg"], frame["new_bear_fvg"] = new_bull, new_bear
+
+        starts = np.flatnonzero(new_bull)
+        frame["price_in_bull_fvg"] = self._zone_touches(frame, starts, l[starts], h2[starts], l, h2[starts], 1)[0]
+        starts = np.flatnonzero(new_bear)
+        frame["price_in_bear_fvg"] = self._zone_touches(frame, starts, l2[starts], h[starts], h, l2[starts], -1)[0]
+
+    def _zone_touches(self, frame, starts, tops, btms, breach, levels, sign):
+        """
+        For each zone (created at bar starts[k]) mark the bars whose range
+        overlaps it while it is unbroken. A zone breaks on the first bar
+        (creation bar included) where breach crosses its level; it still
+        counts on that bar since the Pine mitigation runs after the signals.
+        The newest touched zone wins the touch_btm/touch_top columns.
+        """
+        h, l = frame["high"], frame["low"]
+        n = len(h)
+        max_age = self.settings["zone_max_age"]
+        inside = np.zeros(n, dtype=bool)
+        touch_btm = np.full(n, np.nan)
+        touch_top = np.full(n, np.nan)
+        for start, top, btm, level in zip(starts.tolist(), tops.tolist(), btms.tolist(), np.broadcast_to(levels, starts.shape).tolist()):
+            end = min(n, start + max_age)
+            window = breach[start:end]
+            broken = window < level if sign == 1 else window > level
+            first = int(broken.argmax())
+            if broken[first]:
+                end = start + first + 1
+            touch = (l[start:end] <= top) & (h[start:end] >= btm)
+            inside[start:end] |= touch
+            touch_btm[start:end][touch] = btm
+            touch_top[start:end][touch] = top
+        return inside, touch_btm, touch_top
+
+    def _equal_highs_lows(self, frame):
+        """Section 6.4 - pivot matches the previous pivot within atr * threshold"""
+        pos, thresh = self.settings["ehl_pos"], self.settings["ehl_threshold"]
+        tolerance = frame["atr"] * thresh
+        for key, src, pivot in (("is_eqh", frame["high"], ta.pivot_high), ("is_eql", frame["low"], ta.pivot_low)):
+            pivots = pivot(src, pos, pos)
+            found = ~np.isnan(pivots)
+            previous_idx = ta.shift(ta.ffill_index(found), 1, fill=-1).astype(np.int64)
+            previous = np.where(previous_idx >= 0, pivots[np.maximum(previous_idx, 0)], np.nan)
+            frame[key] = found & (np.abs(pivots - previous) < tolerance)
+
+    # ==================== CONSENSUS ENGINE ====================
+
+    def _consensus(self, frame):
+        """Section 7.2/7.3 - nine-indicator vote, momentum indicators weighted 2"""
+        h, l, c, v = frame["high"], frame["low"], frame["close"], frame["volume"]
+        macd_line, signal_line, _ = ta.macd(c, 12, 26, 9)
+        mom = ta.change(c, 14)
+        rsi = ta.rsi(c, 14)
+        stoch_k = ta.sma(ta.stoch(rsi, rsi, rsi, 14), 3)
+        stoch_d = ta.sma(stoch_k, 3)
+        vmp = ta.rolling_sum(np.abs(h - ta.shift(l)), 14)
+        vmm = ta.rolling_sum(np.abs(l - ta.shift(h)), 14)
+        di_plus, di_minus, adx = ta.dmi(h, l, c, 14, 14)
+        psar = ta.psar(h, l, 0.02, 0.02, 0.2)
+        mfi = ta.mfi(h, l, c, v, 14)
+        fish = ta.fisher(h, l, 14)
+
+        votes = (
+            (2, macd_line > signal_line, macd_line < signal_line),
+            (2, mom > ta.shift(mom), mom < ta.shift(mom)),
+            (2, rsi > ta.shift(rsi), rsi < ta.shift(rsi)),
+            (1, stoch_k > stoch_d, stoch_k < stoch_d),
+            (1, vmp > vmm, vmp < vmm),                      # VIP > VIM (same true-range divisor)
+            (1, di_plus > di_minus, di_plus < di_minus),
+            (1, c > psar, c < psar),
+            (1, mfi > ta.shift(mfi), mfi < ta.shift(mfi)),
+            (1, fish > ta.shift(fish), fish < ta.shift(fish)),
+        )
+        bull_score = np.zeros(len(c), dtype=np.int16)
+        bear_score = np.zeros(len(c), dtype=np.int16)
+        for weight, bull, bear in votes:
+            bull_score += weight * bull
+            bear_score += weight * bear
+        frame["bull_score"], frame["bear_score"] = bull_score, bear_score
+        frame["consensus_score"] = np.floor(bull_score * 9 / 12 + 0.5).astype(np.int8)   # Pine math.round
+        frame["adx"] = adx
+
+    def _volume_delta(self, frame):
+        """Section 7.4 - up/down volume accumulated since the last VIDYA trend flip"""
+        h, l, c, o, v = frame["high"], frame["low"], frame["close"], frame["open"], frame["volume"]
+        vidya = ta.vidya(c, 10, 15)
+        atr = frame["atr"]
+        trend_up = ta.latch(ta.crossover(c, vidya + atr), ta.crossunder(c, vidya - atr)) == 1
+        prev_up = np.concatenate(([False], trend_up[:-1]))
+        reset = trend_up != prev_up
+
+        def since_reset(values):
+            csum = np.cumsum(values)
+            last = ta.ffill_index(reset)
+            return np.where(last >= 0, csum - csum[np.maximum(last, 0)], csum)
+
+        up = since_reset(np.where(c > o, v, 0.0))
+        down = since_reset(np.where(c < o, v, 0.0))
+        average = (up + down) / 2
+        minimum = ta.sma(v, 20) * 0.5
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(average > minimum, (up - down) / average, 0.0)
+        frame["volume_delta_ratio"] = np.nan_to_num(ratio)
+
+    # ==================== BREAKOUT SYSTEM ====================
+
+    def _trendline_breaks(self, frame):
+        """Section 8.1 - close crossing the line through the last two trend pivots"""
+        h, l, c = frame["high"], frame["low"], frame["close"]
+        period = self.settings["trend_period"]
+        right = period // 2
+        n = len(c)
+        bar = np.arange(n)
+        zband = ta.shift(np.fmin(ta.atr(h, l, c, 30) * 0.3, c * 0.003), 20) / 2
+        offset = np.nan_to_num(zband * 0.1)
+
+        for key, src, pivot in (("trend_long_break", h, ta.pivot_high), ("trend_short_break", l, ta.pivot_low)):
+            pivots = pivot(src, period, right)
+            found = np.flatnonzero(~np.isnan(pivots))
+            line_value = np.full(n, np.nan)
+            line_prev = np.full(n, np.nan)
+            slope_at = np.full(n, np.nan)
+            recent = np.zeros(n, dtype=bool)
+            if len(found) >= 2:
+                x = (found - right).astype(np.float64)
+                y = pivots[found]
+                slope = np.diff(y) / np.diff(x)                 # Line k runs from pivot k to k+1
+                line_id = np.searchsorted(found[1:], bar, side="right") - 1
+                valid = line_id >= 0
+                k = np.maximum(line_id, 0)
+                line_value = np.where(valid, y[k] + (bar - x[k]) * slope[k], np.nan)
+                line_prev = np.where(valid, y[k] + (bar - 1 - x[k]) * slope[k], np.nan)
+                slope_at = np.where(valid, slope[k], np.nan)
+                recent = valid & (bar - found[1:][k] < period)
+            prev_close = ta.shift(c)
+            if key == "trend_long_break":
+                cross = (prev_close < line_prev) & (c > line_value)
+                frame[key] = recent & cross & (slope_at <= 0)
+            else:
+                up_cross = (prev_close < line_prev) & (c > line_value)
+                cross = ~up_cross & (prev_close > line_prev - offset) & (c < line_value - offset)
+                frame[key] = recent & cross & (slope_at >= 0)
+
+    def _pattern_breakouts(self, frame):
+        """Section 8.2 - close through a cluster of >= min_tests pivot highs/lows (walked on candidate bars only)"""
+        o, h, l, c = frame["open"], frame["high"], frame["low"], frame["close"]
+        n = len(c)
+        period = self.settings["breakout_period"]
+        max_len = self.settings["max_breakout_len"]
+        min_tests = self.settings["min_tests"]
+        chwidth = (ta.highest(h, 300) - ta.lowest(l, 300)) * 0.04
+
+        for key, src, pivot, sign in (("bullish_breakout", h, ta.pivot_high, 1),
+                                      ("bearish_breakdown", l, ta.pivot_low, -1)):
+            out = np.zeros(n, dtype=bool)
+            pivots = pivot(src, period, period)
+            confirmed = np.flatnonzero(~np.isnan(pivots))
+            values = pivots[confirmed]
+            locations = confirmed - period
+            if sign == 1:
+                extreme = ta.shift(ta.highest(h, period))
+                candidates = np.flatnonzero((c > o) & (c > extreme) & ~np.isnan(chwidth))
+            else:
+                extreme = ta.shift(ta.lowest(l, period))
+                candidates = np.flatnonzero((c < o) & (c < extreme) & ~np.isnan(chwidth))
+
+            for i in candidates.tolist():
+                hi = np.searchsorted(confirmed, i, side="right")
+                lo = np.searchsorted(locations, i - max_len, side="left")
+                if hi - lo < min_tests:
+                    continue
+                recent = values[lo:hi][::-1] * sign             # Newest first; lows mirrored to highs
+                beyond = recent >= c[i] * sign
+                run = int(np.argmax(beyond)) if beyond.any() else len(recent)
+                if run - 1 < min_tests or run == 0:
+                    continue
+                bound = recent[:run].max()
+                if o[i] * sign > bound:
+                    continue
+                tests = int(np.count_nonzero(recent[:run] >= bound - chwidth[i]))
+                if tests >= min_tests and extreme[i] * sign < bound:
+                    out[i] = True
+            frame[key] = out
+
+    # ==================== RISK / MTF / SIGNALS ====================
+
+    def _risk_levels(self, frame):
+        """Section 9 - position multiplier, OB-aware smart stops and R-multiple targets"""
+        c = frame["close"]
+        score = frame["consensus_score"]
+        frame["position_multiplier"] = np.select(
+            [score >= 9, score >= 7, score >= 5, score >= 3], [1.0, 0.8, 0.6, 0.4], 0.2)
+        atr_sl = frame["atr"] * self.settings["atr_mult_sl"]
+        base_long, base_short = c - atr_sl, c + atr_sl
+        frame["stop_long"] = np.where(np.isnan(frame["bull_ob_touch_btm"]), base_long,
+                                      np.minimum(frame["bull_ob_touch_btm"] - atr_sl * 0.5, base_long))
+        frame["stop_short"] = np.where(np.isnan(frame["bear_ob_touch_top"]), base_short,
+                                       np.maximum(frame["bear_ob_touch_top"] + atr_sl * 0.5, base_short))
+        rr1, rr2 = self.settings["risk_reward1"], self.settings["risk_reward2"]
+        frame["tp1_long"] = c + (c - frame["stop_long"]) * rr1
+        frame["tp2_long"] = c + (c - frame["stop_long"]) * rr2
+        frame["tp1_short"] = c - (frame["stop_short"] - c) * rr1
+        frame["tp2_short"] = c - (frame["stop_short"] - c) * rr2
+
+    def _mtf_trends(self, frame):
+        """Section 10.1/10.2 - ZLEMA trend per timeframe from the last completed HTF bar"""
+        time, tf = frame["time"], frame["tf_minutes"]
+        n = len(time)
+        columns = []
+        for minutes in MTF_MINUTES:
+            if minutes <= tf:
+                columns.append(frame["zl_trend"])
+                continue
+            bucket = time // (minutes * 60)
+            starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+            ends = np.concatenate((starts[1:], [n])) - 1
+            htf_high = np.maximum.reduceat(frame["high"], starts)
+            htf_low = np.minimum.reduceat(frame["low"], starts)
+            htf_close = frame["close"][ends]
+            htf_trend, _ = self.zl_trend(htf_high, htf_low, htf_close)
+            group = np.cumsum(np.concatenate(([True], bucket[1:] != bucket[:-1]))) - 1
+            completed = np.where(np.arange(n) == ends[group], group, group - 1)
+            columns.append(np.where(completed >= 0, htf_trend[np.maximum(completed, 0)], 0).astype(np.int8))
+
+        trends = np.stack(columns, axis=1)                      # n x 6
+        frame["mtf"] = trends
+        frame["mtf_bull_count"] = (trends[:, 1:] == 1).sum(axis=1)
+        frame["mtf_bear_count"] = (trends[:, 1:] == -1).sum(axis=1)
+        frame["trend_pulse"] = np.concatenate(([False], (trends[1:] != trends[:-1]).any(axis=1)))
+
+    def _signals(self, frame):
+        """Section 10.3/11 - conflict resolution and the entry/squeeze signals"""
+        s = self.settings
+        o, h, l, c, v = frame["open"], frame["high"], frame["low"], frame["close"], frame["volume"]
+        trend = frame["market_trend"]
+        score = frame["consensus_score"]
+        ratio = frame["volume_delta_ratio"]
+        bull_trend, bear_trend = trend == 1, trend == -1
+
+        atr14 = ta.atr(h, l, c, 14)
+        squeeze = ((atr14 < ta.shift(atr14) * 0.7) & (ta.shift(atr14) < ta.shift(atr14, 2) * 0.7)
+                   & (v < ta.sma(v, 20) * 0.5) & (ta.highest(h, 20) - ta.lowest(l, 20) < atr14 * 2.0))
+
+        mtf_bull, mtf_bear = frame["mtf_bull_count"] >= 3, frame["mtf_bear_count"] >= 3
+        volume_confirmed = v > ta.sma(v, 20) * 1.2
+        volume_delta_ok = ((bull_trend & (ratio > s["volume_delta_threshold"]))
+                           | (bear_trend & (ratio < -s["volume_delta_threshold"])))
+        mtf_ok = ~np.bool_(s["require_mtf_align"]) | (bull_trend & mtf_bull) | (bear_trend & mtf_bear)
+        volume_ok = ~np.bool_(s["require_vol_confirm"]) | volume_confirmed | volume_delta_ok
+        not_in_zone = ~np.bool_(s["block_ehl_trades"]) | (~frame["is_eqh"] & ~frame["is_eql"])
+        bull_allowed = mtf_ok & volume_ok & not_in_zone & (score >= s["min_confluence_score"])
+        bear_allowed = mtf_ok & volume_ok & not_in_zone & ((9 - score) >= s["min_confluence_score"])
+
+        in_bull_ob, in_bear_ob = frame["price_in_bull_ob"], frame["price_in_bear_ob"]
+        long_break, short_break = frame["trend_long_break"], frame["trend_short_break"]
+
+        frame["signal1_bull"] = (in_bull_ob & (score >= 7) & (frame["bullish_breakout"] | long_break)
+                                 & bull_trend & volume_ok & bull_allowed)
+        frame["signal1_bear"] = (in_bear_ob & (score <= 2) & (frame["bearish_breakdown"] | short_break)
+                                 & bear_trend & volume_ok & bear_allowed)
+        frame["signal2_bull"] = frame["bull_sweep"] & in_bull_ob & volume_ok & bull_trend & bull_allowed
+        frame["signal2_bear"] = frame["bear_sweep"] & in_bear_ob & volume_ok & bear_trend & bear_allowed
+        frame["signal3_bull"] = long_break & (score >= 7) & volume_ok & bull_allowed
+        frame["signal3_bear"] = short_break & (score <= 2) & volume_ok & bear_allowed
+        frame["signal4_bull"] = in_bull_ob & ~frame["new_bull_ob"] & (c > o) & volume_ok & bull_trend & bull_allowed
+        frame["signal4_bear"] = in_bear_ob & ~frame["new_bear_ob"] & (c < o) & volume_ok & bear_trend & bear_allowed
+
+        fib_high, fib_low = ta.highest(h, 20), ta.lowest(l, 20)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fib = np.where(fib_high != fib_low, (c - fib_low) / (fib_high - fib_low), 0.0)
+        frame["fib_level"] = np.nan_to_num(fib)
+        structure = frame["is_choch"] | frame["is_bos"]
+        frame["signal7_bull"] = structure & (fib >= 0.618) & (fib <= 0.786) & in_bull_ob & volume_ok & bull_allowed
+        frame["signal7_bear"] = structure & (fib >= 0.214) & (fib <= 0.382) & in_bear_ob & volume_ok & bear_allowed
+
+        frame["signal8_squeeze"] = squeeze & (score >= 4) & (score <= 5)
+        frame["signal9_bull"] = ((score == 9) & mtf_bull & bull_trend & (ratio > 2.0)
+                                 & ~in_bear_ob & ~frame["is_eqh"])
+        frame["signal10_bear"] = ((score == 0) & mtf_bear & bear_trend & (ratio < -2.0)
+                                  & ~in_bull_ob & ~frame["is_eql"])
+
+        # Signal 12 - sideways (squeeze/neutral in the last 8 bars) then a ZLEMA flip
+        sideways = (ta.any_in_last(frame["signal8_squeeze"], 1, 8)
+                    | ta.any_in_last((score >= 4) & (score <= 5), 1, 8))
+        zl = frame["zl_trend"]
+        prev_zl = ta.shift(zl, 1, fill=0)
+        start_bull = ((zl == 1) & (prev_zl != 1)) | ta.crossover(c, frame["zlema"])
+        start_bear = ((zl == -1) & (prev_zl != -1)) | ta.crossunder(c, frame["zlema"])
+        frame["signal12_bull"] = sideways & start_bull & volume_ok
+        frame["signal12_bear"] = sideways & start_bear & volume_ok
+
+        # Nothing fires until ATR(200) is defined - Pine would send "NaN" stop/target levels
+        ready = ~np.isnan(frame["atr"])
+        for key, _, _, _ in SIGNAL_TABLE:
+            if key in frame:
+                frame[key] = frame[key] & ready
+
+    def _trade_state(self, frame):
+        """
+        Section 12 - the indicator's own trade: entries on signals 1/2/3/4/7/9
+        (10 for shorts) while flat, exits on signal 5/6, the stop, or TP1.
+        Loops over entries; each exit is found with one vectorized search.
+        """
+        h, l = frame["high"], frame["low"]
+        n = len(h)
+        long_entry = (frame["signal1_bull"] | frame["signal2_bull"] | frame["signal3_bull"]
+                      | frame["signal4_bull"] | frame["signal7_bull"] | frame["signal9_bull"])
+        short_entry = (frame["signal1_bear"] | frame["signal2_bear"] | frame["signal3_bear"]
+                       | frame["signal4_bear"] | frame["signal7_bear"] | frame["signal10_bear"])
+        long_exit = frame["price_in_bear_ob"] | (frame["consensus_score"] <= 3)
+        short_exit = frame["price_in_bull_ob"] | (frame["consensus_score"] >= 6)
+        candidates = np.flatnonzero(long_entry | short_entry)
+
+        signal5 = np.zeros(n, dtype=bool)
+        signal6 = np.zeros(n, dtype=bool)
+        trades = []
+        cursor = 0
+        while True:
+            k = np.searchsorted(candidates, cursor)
+            if k >= len(candidates):
+                break
+            entry = int(candidates[k])
+            is_long = not short_entry[entry]                    # Pine sets short second, so it wins
+            side = "long" if is_long else "short"
+            stop, tp1 = frame[f"stop_{side}"][entry], frame[f"tp1_{side}"][entry]
+
+            if is_long:
+                signal_hit = long_exit[entry + 1:] | (h[entry + 1:] >= tp1)
+                stop_hit = l[entry:] <= stop
+            else:
+                signal_hit = short_exit[entry + 1:] | (l[entry + 1:] <= tp1)
+                stop_hit = h[entry:] >= stop
+            closing = stop_hit.copy()
+            closing[1:] |= signal_hit
+            if closing.any():
+                offset = int(np.argmax(closing))
+                exit_bar = entry + offset
+                by_signal = offset > 0 and bool(signal_hit[offset - 1])
+                if by_signal:
+                    (signal5 if is_long else signal6)[exit_bar] = True
+                reason = "signal" if by_signal else "stop"
+            else:
+                exit_bar, reason = None, "open"
+
+            trades.append({
+                "entry_bar": entry,
+                "exit_bar": exit_bar,
+                "direction": "buy" if is_long else "sell",
+                "entry_price": float(frame["close"][entry]),
+                "sl_price": float(stop),
+                "tp1_price": float(tp1),
+                "tp2_price": float(frame[f"tp2_{side}"][entry]),
+                "exit_reason": reason,
+            })
+            if exit_bar is None:
+                break
+            cursor = exit_bar + 1
+
+        frame["signal5_exit"], frame["signal6_exit"] = signal5, signal6
+        frame["trades"] = trades
@@ -0,0 +1,315 @@
+"""
+Async MT5 Client - Awaitable facade over MT5Client
+
+The MetaTrader5 package is blocking and not thread-safe, so every terminal
+call is queued onto ONE dedicated worker thread. Coroutines await the result
+with a per-call timeout instead of freezing the event loop, and the facade
+reports queue depth plus queue-wait / execution latency per method.
+
+Synchronous MT5Client methods are routed onto the same worker by
+on_mt5_worker, so code that still calls MT5Client directly never talks to
+the terminal concurrently with the facade.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.optimized_logger import logger
+
+
+class MT5CallTimeout(asyncio.TimeoutError):
+    """Raised when a terminal call does not finish within its timeout"""
+
+
+class AsyncMT5Client:
+    """
+    Runs MT5Client calls on a single worker thread
+
+    Use AsyncMT5Client.for_client(mt5_client) so every component shares the
+    same worker - two workers would mean two threads talking to the terminal.
+    """
+
+    _facade_lock = threading.Lock()  # for_client may race between threads on first use
+
+    def __init__(self, mt5_client, default_timeout: Optional[float] = None,
+                 order_timeout: Optional[float] = None):
+        self.mt5_client = mt5_client
+
+        executor_config = {}
+        config = getattr(mt5_client, "config", None)
+        if config is not None and hasattr(config, "get"):
+            executor_config = config.get("mt5_executor", {}) or {}
+
+        self.default_timeout = default_timeout or executor_config.get("call_timeout_seconds", 10.0)
+        self.order_timeout = order_timeout or executor_config.get("order_timeout_seconds", 20.0)
+
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mt5-worker")
+        self.worker_thread_id: Optional[int] = None
+        self.closed = False
+
+        self._lock = threading.Lock()
+        self._terminal_lock = threading.RLock()  # Held while a call is inside the terminal
+        self.queue_depth = 0     # Submitted, not yet started
+        self.in_flight = 0       # Currently executing (0 or 1)
+        self.max_queue_depth = 0
+        self.stats = {
+            "calls": 0,
+            "completed": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "dropped": 0,
+            "overran": 0
+        }
+        self.latency: Dict[str, Dict[str, float]] = {}
+
+    @classmethod
+    def for_client(cls, mt5_client) -> "AsyncMT5Client":
+        """Return the shared facade for this MT5Client (created on first use)"""
+        facade = vars(mt5_client).get("_async_facade")
+        if facade is None:
+            with cls._facade_lock:
+                facade = vars(mt5_client).get("_async_facade")
+                if facade is None:
+                    facade = cls(mt5_client)
+                    mt5_client._async_facade = facade
+        return facade
+
+    def on_worker(self) -> bool:
+        """True when called from the MT5 worker thread itself"""
+        return self.worker_thread_id == threading.get_ident()
+
+    # ==================== CORE DISPATCH ====================
+
+    def _submit(self, func: Callable, args, kwargs, label: str):
+        """Queue func on the worker, tracking queue depth and latency"""
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            self.stats["calls"] += 1
+
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self.queue_depth -= 1
+                self.in_flight += 1
+            self.worker_thread_id = threading.get_ident()
+            try:
+                with self._terminal_lock:
+                    return func(*args, **kwargs)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.in_flight -= 1
+                    self._record_latency(label, started - submitted, finished - started)
+
+        return self.executor.submit(job)
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None,
+                  label: Optional[str] = None, wait_if_started: bool = False, **kwargs) -> Any:
+        """
+        Execute func(*args, **kwargs) on the MT5 worker thread
+
+        Raises MT5CallTimeout if the call does not complete within timeout.
+        A call still waiting in the queue is dropped; one already running
+        cannot be aborted - it finishes on the worker and its result is
+        discarded, unless wait_if_started is set, in which case the caller
+        keeps waiting for it (used for orders, which may fill regardless).
+        """
+        label = label or getattr(func, "__name__", "call")
+        timeout = self.default_timeout if timeout is None else timeout
+
+        if self.on_worker() or self.closed:
+            # Nested call on the worker (queueing would deadlock) or worker stopped
+            return self._inline(func, args, kwargs)
+
+        pending = self._submit(func, args, kwargs, label)
+        waiter = asyncio.wrap_future(pending)
+        try:
+            done, _ = await asyncio.wait({waiter}, timeout=timeout)
+            if not done:
+                if pending.cancel():
+                    # Never started - dropped from the queue, not sent to the terminal
+                    with self._lock:
+                        self.stats["timeouts"] += 1
+                        self.queue_depth -= 1
+                        self.stats["dropped"] += 1
+                    raise self._timeout(label, timeout)
+                if not wait_if_started:
+                    with self._lock:
+                        self.stats["timeouts"] += 1
+                    waiter.cancel()
+                    raise self._timeout(label, timeout)
+                with self._lock:
+                    self.stats["overran"] += 1
+                logger.warning(
+                    f"MT5 call {label} still running after {timeout:.1f}s - waiting for the terminal result"
+                )
+            result = await waiter
+        except MT5CallTimeout:
+            raise
+        except Exception:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+
+        with self._lock:
+            self.stats["completed"] += 1
+        return result
+
+    def call(self, func: Callable, *args, label: Optional[str] = None, **kwargs) -> Any:
+        """
+        Blocking version of run() for synchronous callers - no timeout, like
+        the direct terminal call it replaces
+        """
+        if self.on_worker() or self.closed:
+            return self._inline(func, args, kwargs)
+
+        pending = self._submit(func, args, kwargs, label or getattr(func, "__name__", "call"))
+        try:
+            result = pending.result()
+        except Exception:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+
+        with self._lock:
+            self.stats["completed"] += 1
+        return result
+
+    def _inline(self, func: Callable, args, kwargs) -> Any:
+        with self._terminal_lock:  # After shutdown: wait for a call still running on the worker
+            return func(*args, **kwargs)
+
+    def _timeout(self, label: str, timeout: float) -> MT5CallTimeout:
+        logger.error(
+            f"MT5 call {label} timed out after {timeout:.1f}s "
+            f"(queue depth {self.queue_depth})"
+        )
+        return MT5CallTimeout(f"MT5 call {label} timed out after {timeout:.1f}s")
+
+    def _record_latency(self, label: str, wait: float, execution: float):
+        entry = self.latency.get(label)
+        if entry is None:
+            entry = self.latency[label] = {
+                "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                "last_ms": 0.0, "wait_total_ms": 0.0, "wait_max_ms": 0.0
+            }
+        execution_ms = execution * 1000
+        wait_ms = wait * 1000
+        entry["count"] += 1
+        entry["total_ms"] += execution_ms
+        entry["last_ms"] = execution_ms
+        entry["max_ms"] = max(entry["max_ms"], execution_ms)
+        entry["wait_total_ms"] += wait_ms
+        entry["wait_max_ms"] = max(entry["wait_max_ms"], wait_ms)
+
+    # ==================== TERMINAL OPERATIONS ====================
+
+    async def place_order(self, symbol: str, order_type: str, lot_size: float,
+                          price: float, sl: float, tp: float = None,
+                          comment: str = "", timeout: Optional[float] = None) -> Optional[int]:
+        # Only an order still queued is dropped on timeout; one already sent
+        # may fill, so its ticket is always awaited rather than abandoned
+        return await self.run(
+            self.mt5_client.place_order, symbol=symbol, order_type=order_type,
+            lot_size=lot_size, price=price, sl=sl, tp=tp, comment=comment,
+            timeout=self.order_timeout if timeout is None else timeout, label="place_order",
+            wait_if_started=True
+        )
+
+    async def close_position(self, position_id: int, percentage: Optional[float] = None,
+                             timeout: Optional[float] = None) -> bool:
+        args = (position_id,) if percentage is None else (position_id, percentage)
+        return await self.run(
+            self.mt5_client.close_position, *args,
+            timeout=self.order_timeout if timeout is None else timeout, label="close_position"
+        )
+
+    async def modify_position(self, ticket: int, sl: float = None, tp: float = None,
+                              timeout: Optional[float] = None) -> bool:
+        return await self.run(
+            self.mt5_client.modify_position, ticket, sl=sl, tp=tp,
+            timeout=self.order_timeout if timeout is None else timeout, label="modify_position"
+        )
+
+    async def positions_get(self, symbol: Optional[str] = None,
+                            timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        return await self.run(self.mt5_client.get_positions, symbol,
+                              timeout=timeout, label="positions_get")
+
+    async def get_position(self, ticket: int, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        return await self.run(self.mt5_client.get_position, ticket,
+                              timeout=timeout, label="get_position")
+
+    async def history_deals_get(self, date_from=None, date_to=None, position: Optional[int] = None,
+                                timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        return await self.run(self.mt5_client.get_history_deals, date_from, date_to, position,
+                              timeout=timeout, label="history_deals_get")
+
+    async def get_closed_trade_profit(self, ticket_id: int,
+                                      timeout: Optional[float] = None) -> Optional[float]:
+        return await self.run(self.mt5_client.get_closed_trade_profit, ticket_id,
+                              timeout=timeout, label="get_closed_trade_profit")
+
+    async def get_account_balance(self, timeout: Optional[float] = None) -> float:
+        return await self.run(self.mt5_client.get_account_balance,
+                              timeout=timeout, label="get_account_balance")
+
+    async def refresh_ticks(self, timeout: Optional[float] = None) -> int:
+        return await self.run(self.mt5_client.refresh_ticks,
+                              timeout=timeout, label="refresh_ticks")
+
+    # ==================== LIFECYCLE / STATUS ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            methods = {}
+            for label, entry in self.latency.items():
+                count = entry["count"] or 1
+                methods[label] = {
+                    "count": entry["count"],
+                    "avg_ms": round(entry["total_ms"] / count, 3),
+                    "max_ms": round(entry["max_ms"], 3),
+                    "last_ms": round(entry["last_ms"], 3),
+                    "avg_wait_ms": round(entry["wait_total_ms"] / count, 3),
+                    "max_wait_ms": round(entry["wait_max_ms"], 3)
+                }
+            return {
+                "queue_depth": self.queue_depth,
+                "in_flight": self.in_flight,
+                "max_queue_depth": self.max_queue_depth,
+                "stats": dict(self.stats),
+                "methods": methods
+            }
+
+    def shutdown(self, wait: bool = False, cancel_pending: Optional[bool] = None):
+        """
+        Stop the worker; queued calls are cancelled unless waiting for them
+
+        Later calls run inline on the caller - once the worker has stopped
+        there is no second thread left to race with.
+        """
+        self.closed = True
+        cancel = (not wait) if cancel_pending is None else cancel_pending
+        self.executor.shutdown(wait=wait, cancel_futures=cancel)
+
+
+def on_mt5_worker(method: Callable) -> Callable:
+    """
+    Run an MT5Client method on the shared MT5 worker thread
+
+    Synchronous callers block for the result exactly as they did on the
+    terminal call itself; calls already on the worker run inline.
+    """
+    @functools.wraps(method)
+    def wrapper(client, *args, **kwargs):
+        if not client.mt5_available:
+            return method(client, *args, **kwargs)  # No terminal to protect
+        facade = AsyncMT5Client.for_client(client)
+        return facade.call(method, client, *args, label=method.__name__, **kwargs)
+    return wrapper
@@ -2,14 +2,18 @@ try:
     import MetaTrader5 as mt5
     MT5_AVAILABLE = True
 except ImportError:
+    mt5 = None
     MT5_AVAILABLE = False
     print("WARNING: MetaTrader5 not available (Windows only). Running in simulation mode.")
 
 import time
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable
+from src.clients.async_mt5_client import on_mt5_worker
 from src.config import Config
 from src.models import Trade
+from src.services.candle_store import CandleStore, MT5_TIMEFRAMES, normalize_timeframe
 from src.utils.optimized_logger import logger as opt_logger
 
 logger = logging.getLogger(__name__)
@@ -27,6 +31,38 @@ class MT5Client:
         self.connection_errors = 0
         self.max_connection_errors = 5
         self.telegram_bot = None  # Will be set externally after initialization
+        
+        # Terminal backend - the MetaTrader5 module, or the in-process simulator
+        self.backend = config.get("mt5_backend", "terminal")
+        if self.backend == "simulator":
+            from src.clients.mt5_simulator import MT5Simulator
+            self.mt5 = MT5Simulator(config)
+            self.mt5_available = True
+        else:
+            self.mt5 = mt5
+            self.mt5_available = MT5_AVAILABLE
+        
+        # Shared tick cache - one background refresher serves every monitor loop
+        tick_cache_config = config.get("tick_cache", {})
+        self.tick_cache_enabled = tick_cache_config.get("enabled", True)
+        self.tick_refresh_interval = tick_cache_config.get("refresh_interval_ms", 250) / 1000.0
+        self.tick_max_staleness = tick_cache_config.get("max_staleness_ms", 1000) / 1000.0
+        self.tick_cache: Dict[str, Dict[str, float]] = {}  # symbol -> {bid, ask, mid, time, received}
+        self.subscribed_symbols = set()
+        self.tick_refresher_task = None
+        self.tick_cache_stats = {
+            "hits": 0,
+            "misses": 0,
+            "refresh_cycles": 0,
+            "refresh_errors": 0
+        }
+        
+        # Local OHLCV bars built from the tick cache - TrendAnalyzer reads trends from here
+        candle_config = config.get("candle_store", {})
+        self.candle_store = CandleStore.from_config(config)
+        self.candle_backfill_bars = candle_config.get("backfill_bars", 200)
+        self.candle_backfill_retry = candle_config.get("backfill_retry_seconds", 60.0)
+        self.candle_backfills: Dict[tuple, float] = {}  # (symbol, timeframe) -> last attempt (monotonic)
 
     def _map_symbol(self, symbol: str) -> str:
         """
@@ -51,16 +87,23 @@ class MT5Client:
         
         return mapped
 
+    @on_mt5_worker
     def initialize(self) -> bool:
         """Initialize MT5 connection with retry logic"""
-        if not MT5_AVAILABLE:
+        if self.backend == "simulator":
+            self.mt5.initialize()
+            self.initialized = True
+            print("SUCCESS: MT5 simulator backend initialized")
+            return True
+        
+        if not self.mt5_available:
             print("WARNING: Running in simulation mode (MT5 not available on this platform)")
             self.initialized = True
             return True
             
         for i in range(self.config["mt5_retries"]):
             try:
-                if not mt5.initialize():
+                if not self.mt5.initialize():
                     print(f"MT5 initialization failed, retry {i+1}/{self.config['mt5_retries']}")
                     time.sleep(self.config["mt5_wait"])
                     continue
@@ -75,18 +118,18 @@ class MT5Client:
                     time.sleep(self.config["mt5_wait"])
                     continue
                 
-                authorized = mt5.login(login, password, server)
+                authorized = self.mt5.login(login, password, server)
                 
                 if authorized:
                     self.initialized = True
                     print("SUCCESS: MT5 connection established")
-                    account_info = mt5.account_info()
+                    account_info = self.mt5.account_info()
                     if account_info:
                         print(f"Account Balance: ${account_info.balance:.2f}")
                         print(f"Account: {account_info.login} | Server: {account_info.server}")
                     return True
                 else:
-                    error = mt5.last_error()
+                    error = self.mt5.last_error()
                     print(f"MT5 login failed, retry {i+1}/{self.config['mt5_retries']}")
                     print(f"ERROR: MT5 login error: {error}")
                     time.sleep(self.config["mt5_wait"])
@@ -116,12 +159,12 @@ class MT5Client:
         Returns True if connection is healthy, False otherwise
         """
         # Skip health check in simulation mode
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", False):
+        if not self.mt5_available or self.config.get("simulate_orders", False):
             return True
         
         try:
-            # Check if MT5 is still initialized
-            if not mt5.initialize():
+            # Check if MT5 is still initialized (on the MT5 worker - terminal is single-threaded)
+            if not self._terminal_initialize():
                 self.connection_errors += 1
                 opt_logger.error(f"MT5 connection lost - attempt #{self.connection_errors}")
                 
@@ -148,6 +191,11 @@ class MT5Client:
             opt_logger.error(f"MT5 health check error: {str(e)}", exc_info=True)
             return False
 
+    @on_mt5_worker
+    def _terminal_initialize(self) -> bool:
+        return self.mt5.initialize()
+
+    @on_mt5_worker
     def validate_order_parameters(self, symbol: str, order_type: str, 
                                   price: float, sl_price: float, 
                                   tp_price: Optional[float] = None) -> tuple:
@@ -162,7 +210,7 @@ class MT5Client:
         )
         
         # Skip validation in simulation mode
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+        if not self.mt5_available or self.config.get("simulate_orders", True):
             logger.info("VALIDATION: Skipped (simulation mode)")
             return True, "Validation passed (simulation mode)"
         
@@ -173,7 +221,7 @@ class MT5Client:
         
         try:
             # Get symbol info from MT5
-            symbol_info = mt5.symbol_info(mt5_symbol)
+            symbol_info = self.mt5.symbol_info(mt5_symbol)
             if symbol_info is None:
                 error_msg = f"Symbol {mt5_symbol} not found in MT5"
                 logger.error(f"VALIDATION FAILED: {error_msg}")
@@ -201,7 +249,7 @@ class MT5Client:
             )
             
             # Determine order direction
-            if order_type == "buy" or order_type == mt5.ORDER_TYPE_BUY:
+            if order_type == "buy" or order_type == self.mt5.ORDER_TYPE_BUY:
                 # BUY order: SL should be below entry, TP above entry
                 if sl_price >= price:
                     error_msg = f"BUY order SL {sl_price} must be below entry {price}"
@@ -229,7 +277,7 @@ class MT5Client:
                         logger.error(f"VALIDATION FAILED: {error_msg}")
                         return False, error_msg
                     
-            elif order_type == "sell" or order_type == mt5.ORDER_TYPE_SELL:
+            elif order_type == "sell" or order_type == self.mt5.ORDER_TYPE_SELL:
                 # SELL order: SL should be above entry, TP below entry
                 if sl_price <= price:
                     error_msg = f"SELL order SL {sl_price} must be above entry {price}"
@@ -267,6 +315,7 @@ class MT5Client:
             logger.error(f"VALIDATION EXCEPTION TRACEBACK: {traceback.format_exc()}")
             return False, error_msg
 
+    @on_mt5_worker
     def place_order(self, symbol: str, order_type: str, lot_size: float, 
                    price: float, sl: float, tp: float = None, 
                    comment: str = "") -> Optional[int]:
@@ -279,7 +328,7 @@ class MT5Client:
                 return None
         
         # Simulation mode
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+        if not self.mt5_available or self.config.get("simulate_orders", True):
             import random
             simulated_ticket = random.randint(100000, 999999)
             print(f"SIMULATED ORDER: {order_type.upper()} {lot_size} lots {symbol} @ {price}, SL={sl}, TP={tp} (Ticket #{simulated_ticket})")
@@ -290,24 +339,24 @@ class MT5Client:
         
         try:
             # Get symbol info using the mapped broker symbol
-            symbol_info = mt5.symbol_info(mt5_symbol)
+            symbol_info = self.mt5.symbol_info(mt5_symbol)
             if symbol_info is None:
                 print(f"ERROR: Symbol {mt5_symbol} not found in MT5")
                 return None
                 
             if not symbol_info.visible:
                 print(f"Symbol {mt5_symbol} is not visible, attempting to enable")
-                if not mt5.symbol_select(mt5_symbol, True):
+                if not self.mt5.symbol_select(mt5_symbol, True):
                     print(f"ERROR: Failed to enable symbol {mt5_symbol}")
                     return None
             
             # Determine order type and get current price
             if order_type == "buy":
-                order_type_mt5 = mt5.ORDER_TYPE_BUY
-                price = mt5.symbol_info_tick(mt5_symbol).ask
+                order_type_mt5 = self.mt5.ORDER_TYPE_BUY
+                price = self.mt5.symbol_info_tick(mt5_symbol).ask
             else:
-                order_type_mt5 = mt5.ORDER_TYPE_SELL
-                price = mt5.symbol_info_tick(mt5_symbol).bid
+                order_type_mt5 = self.mt5.ORDER_TYPE_SELL
+                price = self.mt5.symbol_info_tick(mt5_symbol).bid
             
             # Round prices to symbol's digit precision
             digits = symbol_info.digits
@@ -325,7 +374,7 @@ class MT5Client:
             
             # Prepare order request with mapped symbol
             request = {
-                "action": mt5.TRADE_ACTION_DEAL,
+                "action": self.mt5.TRADE_ACTION_DEAL,
                 "symbol": mt5_symbol,  # Use broker's symbol name
                 "volume": lot_size,
                 "type": order_type_mt5,
@@ -334,8 +383,8 @@ class MT5Client:
                 "deviation": 20,
                 "magic": 234000,
                 "comment": comment,
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_IOC,
+                "type_time": self.mt5.ORDER_TIME_GTC,
+                "type_filling": self.mt5.ORDER_FILLING_IOC,
             }
             
             # Add TP if provided
@@ -343,9 +392,9 @@ class MT5Client:
                 request["tp"] = tp
             
             # Send order to MT5
-            result = mt5.order_send(request)
+            result = self.mt5.order_send(request)
             
-            if result.retcode != mt5.TRADE_RETCODE_DONE:
+            if result.retcode != self.mt5.TRADE_RETCODE_DONE:
                 print(f"ERROR: Order failed: {result.comment} (Error code: {result.retcode})")
                 print(f"Request details: Symbol={mt5_symbol}, Lot={lot_size}, Price={price}, SL={sl}, TP={tp}")
                 return None
@@ -359,6 +408,7 @@ class MT5Client:
             traceback.print_exc()
             return None
 
+    @on_mt5_worker
     def close_position(self, position_id: int, percentage: float = 100):
         """Close a position completely"""
         if not self.initialized:
@@ -366,17 +416,17 @@ class MT5Client:
                 return False
         
         # Simulation mode - always return success
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+        if not self.mt5_available or self.config.get("simulate_orders", True):
             print(f"SIMULATED CLOSE: Position #{position_id}")
             return True
         
         try:
             # Get position by ticket
-            positions = mt5.positions_get(ticket=position_id)
+            positions = self.mt5.positions_get(ticket=position_id)
             
             # Check if it's an API error vs position not found
             if positions is None:
-                error = mt5.last_error()
+                error = self.mt5.last_error()
                 print(f"ERROR: MT5 API error when getting position {position_id}: {error}")
                 return False  # API error - don't mark as closed
             
@@ -387,17 +437,17 @@ class MT5Client:
             position = positions[0]
             
             # Prepare close request
-            symbol_info = mt5.symbol_info(position.symbol)
+            symbol_info = self.mt5.symbol_info(position.symbol)
             
-            if position.type == mt5.ORDER_TYPE_BUY:
-                order_type = mt5.ORDER_TYPE_SELL
-                price = mt5.symbol_info_tick(position.symbol).bid
+            if position.type == self.mt5.ORDER_TYPE_BUY:
+                order_type = self.mt5.ORDER_TYPE_SELL
+                price = self.mt5.symbol_info_tick(position.symbol).bid
             else:
-                order_type = mt5.ORDER_TYPE_BUY
-                price = mt5.symbol_info_tick(position.symbol).ask
+                order_type = self.mt5.ORDER_TYPE_BUY
+                price = self.mt5.symbol_info_tick(position.symbol).ask
             
             request = {
-                "action": mt5.TRADE_ACTION_DEAL,
+                "action": self.mt5.TRADE_ACTION_DEAL,
                 "position": position_id,
                 "symbol": position.symbol,
                 "volume": position.volume,
@@ -406,13 +456,13 @@ class MT5Client:
                 "deviation": 20,
                 "magic": 234000,
                 "comment": f"Close_{percentage}%",
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_IOC,
+                "type_time": self.mt5.ORDER_TIME_GTC,
+                "type_filling": self.mt5.ORDER_FILLING_IOC,
             }
             
-            result = mt5.order_send(request)
+            result = self.mt5.order_send(request)
             
-            if result.retcode == mt5.TRADE_RETCODE_DONE:
+            if result.retcode == self.mt5.TRADE_RETCODE_DONE:
                 print(f"SUCCESS: Position {position_id} closed successfully")
                 return True
             else:
@@ -427,32 +477,271 @@ class MT5Client:
         """
         Get current price for a symbol with automatic mapping support
         Handles both TradingView symbols and broker symbols
+        Served from the shared tick cache; falls back to a single terminal
+        read (which also seeds the cache) when the entry is missing or stale
         Returns None if price cannot be fetched
         """
+        tick = self.get_symbol_tick(symbol)
+        if tick:
+            return tick["mid"]
+        return None
+
+    def get_symbol_tick(self, symbol: str) -> Optional[Dict[str, float]]:
+        """
+        Get bid/ask/mid/time for a symbol
+        Uses the cache when fresh, otherwise fetches once and subscribes the
+        symbol so the background refresher keeps it warm from now on
+        """
         if not self.initialized:
             if not self.initialize():
                 return None
-        
+
+        tick = self.get_tick(symbol)
+        if tick:
+            return tick
+
+        if self.tick_cache_enabled:
+            self.subscribed_symbols.add(symbol)
+
+        raw_tick = self._fetch_tick(symbol)
+        if raw_tick is None:
+            return None
+        entry = self._store_tick(symbol, raw_tick)
+        return dict(entry, age_ms=0.0)
+
+    def get_tick(self, symbol: str, max_age: Optional[float] = None) -> Optional[Dict[str, float]]:
+        """
+        Read a tick from the cache only - never touches the terminal
+
+        Args:
+            symbol: TradingView symbol
+            max_age: Staleness bound in seconds (defaults to tick_cache.max_staleness_ms)
+
+        Returns:
+            Copy of {bid, ask, mid, time, received, age_ms} or None on miss/stale
+        """
+        if not self.tick_cache_enabled:
+            return None
+
+        entry = self.tick_cache.get(symbol)
+        max_age = self.tick_max_staleness if max_age is None else max_age
+
+        if entry is None:
+            self.tick_cache_stats["misses"] += 1
+            return None
+
+        age = time.monotonic() - entry["received"]
+        if age > max_age:
+            self.tick_cache_stats["misses"] += 1
+            return None
+
+        self.tick_cache_stats["hits"] += 1
+        return dict(entry, age_ms=age * 1000)
+
+    @on_mt5_worker
+    def _fetch_tick(self, symbol: str) -> Optional[Dict[str, float]]:
+        """Single terminal read for one symbol (simulation returns dummy prices)"""
         # Simulation mode - return dummy prices
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+        if not self.mt5_available or self.config.get("simulate_orders", True):
             dummy_prices = {
                 "XAUUSD": 2650.0, "GOLD": 2650.0,
                 "EURUSD": 1.0850, "GBPUSD": 1.2650,
                 "USDJPY": 149.50, "USDCAD": 1.3550
             }
-            return dummy_prices.get(symbol, 1.0)
-        
+            price = dummy_prices.get(symbol, 1.0)
+            return {"bid": price, "ask": price, "time": time.time()}
+
         # Map symbol to broker's format
         mt5_symbol = self._map_symbol(symbol)
-        
+
         try:
-            tick = mt5.symbol_info_tick(mt5_symbol)
+            tick = self.mt5.symbol_info_tick(mt5_symbol)
             if tick:
-                return (tick.ask + tick.bid) / 2
+                tick_time = getattr(tick, "time_msc", 0) / 1000.0 or float(tick.time)
+                return {"bid": tick.bid, "ask": tick.ask, "time": tick_time}
             return None
         except:
             return None
 
+    def _store_tick(self, symbol: str, raw_tick: Dict[str, float]) -> Dict[str, float]:
+        """Store a fetched tick in the shared cache"""
+        entry = {
+            "bid": raw_tick["bid"],
+            "ask": raw_tick["ask"],
+            "mid": (raw_tick["ask"] + raw_tick["bid"]) / 2,
+            "time": raw_tick["time"],
+            "received": time.monotonic()
+        }
+        previous = self.tick_cache.get(symbol)
+        if self.tick_cache_enabled:
+            self.tick_cache[symbol] = entry
+        if self.candle_store is not None and (previous is None or previous["time"] != entry["time"]):
+            # Refreshes that return the same terminal tick are not new volume
+            self.candle_store.on_tick(symbol, entry["mid"], entry["time"])
+        return entry
+
+    @on_mt5_worker
+    def _copy_rates(self, symbol: str, timeframe: str, count: int):
+        """One copy_rates_from_pos read ending at the forming bar (None in simulation/on error)"""
+        if not self.mt5_available or self.config.get("simulate_orders", True):
+            return None
+
+        name, code = MT5_TIMEFRAMES[timeframe]
+        try:
+            return self.mt5.copy_rates_from_pos(
+                self._map_symbol(symbol), getattr(self.mt5, name, code), 0, count
+            )
+        except Exception as e:
+            logger.error(f"copy_rates_from_pos failed for {symbol} {timeframe}: {str(e)}")
+            return None
+
+    def backfill_candles(self, symbol: str, timeframe: Optional[str] = None,
+                         force: bool = False) -> int:
+        """
+        Bulk load bar history into the candle store from the terminal
+
+        Each symbol/timeframe is requested at most once per
+        candle_store.backfill_retry_seconds unless forced.
+        Returns number of bars loaded
+        """
+        if self.candle_store is None:
+            return 0
+        if not self.initialized:
+            if not self.initialize():
+                return 0
+
+        timeframes = [normalize_timeframe(timeframe)] if timeframe else self.candle_store.timeframes
+        now = time.monotonic()
+        loaded = 0
+        for tf in timeframes:
+            key = (symbol, tf)
+            last_attempt = self.candle_backfills.get(key)
+            if not force and last_attempt is not None and now - last_attempt < self.candle_backfill_retry:
+                continue
+            self.candle_backfills[key] = now
+            rates = self._copy_rates(symbol, tf, self.candle_backfill_bars)
+            loaded += self.candle_store.load(symbol, tf, rates)
+        return loaded
+
+    def get_candles(self, symbol: str, timeframe: str, count: int) -> List[Dict[str, float]]:
+        """
+        Last `count` bars (oldest first, forming bar last) as
+        {time, open, high, low, close, volume} dicts
+        Served from the candle store, backfilled on first use
+        """
+        timeframe = normalize_timeframe(timeframe)
+        if self.candle_store is None:
+            rates = self._copy_rates(symbol, timeframe, count)
+            if rates is None:
+                return []
+            volume = "tick_volume" if "tick_volume" in rates.dtype.names else "volume"
+            return [
+                {"time": float(r["time"]), "open": float(r["open"]), "high": float(r["high"]),
+                 "low": float(r["low"]), "close": float(r["close"]), "volume": float(r[volume])}
+                for r in rates
+            ]
+
+        if self.candle_store.bar_count(symbol, timeframe) < count - 1:
+            self.backfill_candles(symbol, timeframe)
+        return self.candle_store.get_candles(symbol, timeframe, count)
+
+    def subscribe_symbols(self, symbols: Iterable[str]):
+        """Add symbols to the background tick refresher"""
+        self.subscribed_symbols.update(symbols)
+
+    def unsubscribe_symbol(self, symbol: str):
+        """Stop refreshing a symbol and drop its cached tick"""
+        self.subscribed_symbols.discard(symbol)
+        self.tick_cache.pop(symbol, None)
+
+    @on_mt5_worker
+    def refresh_ticks(self) -> int:
+        """
+        Refresh every subscribed symbol with one terminal read each
+        Returns number of symbols refreshed
+        """
+        refreshed = 0
+        for symbol in list(self.subscribed_symbols):
+            raw_tick = self._fetch_tick(symbol)
+            if raw_tick is None:
+                self.tick_cache_stats["refresh_errors"] += 1
+                continue
+            self._store_tick(symbol, raw_tick)
+            refreshed += 1
+        self.tick_cache_stats["refresh_cycles"] += 1
+        return refreshed
+
+    async def start_tick_refresher(self, symbols: Optional[Iterable[str]] = None):
+        """Start the single background task that keeps the tick cache warm"""
+        if not self.tick_cache_enabled:
+            logger.info("Tick cache disabled - prices will be fetched per call")
+            return
+
+        if symbols:
+            self.subscribe_symbols(symbols)
+
+        if self.tick_refresher_task and not self.tick_refresher_task.done():
+            return
+
+        self.tick_refresher_task = asyncio.create_task(self._tick_refresh_loop())
+        logger.info(
+            f"Tick refresher started - {len(self.subscribed_symbols)} symbols, "
+            f"interval {self.tick_refresh_interval * 1000:.0f}ms, "
+            f"staleness bound {self.tick_max_staleness * 1000:.0f}ms"
+        )
+
+    async def stop_tick_refresher(self):
+        """Stop the background tick refresher"""
+        if self.tick_refresher_task:
+            self.tick_refresher_task.cancel()
+            try:
+                await self.tick_refresher_task
+            except asyncio.CancelledError:
+                pass
+            self.tick_refresher_task = None
+
+    async def _tick_refresh_loop(self):
+        """Background loop - refreshes all subscribed symbols every interval"""
+        while True:
+            try:
+                if self.initialized:
+                    facade = vars(self).get("_async_facade")
+                    if facade is not None:
+                        # Terminal is single-threaded - refresh on the MT5 worker
+                        await facade.refresh_ticks()
+                    else:
+                        self.refresh_ticks()
+                await asyncio.sleep(self.tick_refresh_interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.tick_cache_stats["refresh_errors"] += 1
+                logger.error(f"Tick refresher error: {str(e)}")
+                await asyncio.sleep(self.tick_refresh_interval)
+
+    def get_tick_cache_stats(self) -> Dict[str, Any]:
+        """Cache hit rate and per-symbol tick age for diagnostics"""
+        hits = self.tick_cache_stats["hits"]
+        misses = self.tick_cache_stats["misses"]
+        total = hits + misses
+        now = time.monotonic()
+
+        return {
+            "enabled": self.tick_cache_enabled,
+            "refresher_running": self.tick_refresher_task is not None and not self.tick_refresher_task.done(),
+            "subscribed_symbols": sorted(self.subscribed_symbols),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / total) if total else 0.0,
+            "refresh_cycles": self.tick_cache_stats["refresh_cycles"],
+            "refresh_errors": self.tick_cache_stats["refresh_errors"],
+            "tick_age_ms": {
+                symbol: round((now - entry["received"]) * 1000, 1)
+                for symbol, entry in list(self.tick_cache.items())  # Writers add symbols concurrently
+            }
+        }
+
+    @on_mt5_worker
     def get_account_balance(self) -> float:
         """Get current account balance"""
         if not self.initialized:
@@ -460,17 +749,18 @@ class MT5Client:
                 return 0.0
         
         # Simulation mode - return dummy balance
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+        if not self.mt5_available or self.config.get("simulate_orders", True):
             return 10000.0
         
         try:
-            account_info = mt5.account_info()
+            account_info = self.mt5.account_info()
             if account_info:
                 return account_info.balance
             return 0.0
         except:
             return 0.0
 
+    @on_mt5_worker
     def get_positions(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Get all positions from MT5, optionally filtered by symbol
@@ -481,7 +771,7 @@ class MT5Client:
                 return []
         
         # Simulation mode - return empty list
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+        if not self.mt5_available or self.config.get("simulate_orders", True):
             return []
         
         try:
@@ -490,9 +780,9 @@ class MT5Client:
             
             # Get positions from MT5
             if mt5_symbol:
-                positions = mt5.positions_get(symbol=mt5_symbol)
+                positions = self.mt5.positions_get(symbol=mt5_symbol)
             else:
-                positions = mt5.positions_get()
+                positions = self.mt5.positions_get()
             
             if positions is None:
                 return []
@@ -518,6 +808,7 @@ class MT5Client:
             logger.error(f"Error getting positions: {str(e)}")
             return []
 
+    @on_mt5_worker
     def get_position(self, ticket: int) -> Optional[Dict[str, Any]]:
         """
         Get a specific position by ticket number
@@ -528,11 +819,11 @@ class MT5Client:
                 return None
         
         # Simulation mode - return None
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+        if not self.mt5_available or self.config.get("simulate_orders", True):
             return None
         
         try:
-            positions = mt5.positions_get(ticket=ticket)
+            positions = self.mt5.positions_get(ticket=ticket)
             
             if positions is None or len(positions) == 0:
                 return None
@@ -554,6 +845,7 @@ class MT5Client:
             logger.error(f"Error getting position {ticket}: {str(e)}")
             return None
 
+    @on_mt5_worker
     def get_account_info_detailed(self) -> Dict[str, float]:
         """Get detailed account info including margins and equity"""
         if not self.initialized:
@@ -561,7 +853,7 @@ class MT5Client:
                 return {}
         
         # Simulation mode - return dummy values
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+        if not self.mt5_available or self.config.get("simulate_orders", True):
             return {
                 "balance": 10000.0,
                 "equity": 10000.0,
@@ -571,7 +863,7 @@ class MT5Client:
             }
         
         try:
-            account_info = mt5.account_info()
+            account_info = self.mt5.account_info()
             if account_info:
                 return {
                     "balance": account_info.balance,
@@ -601,6 +893,7 @@ class MT5Client:
         info = self.get_account_info_detailed()
         return info.get("margin_level", 0.0)
 
+    @on_mt5_worker
     def modify_position(self, ticket: int, sl: float = None, tp: float = None) -> bool:
         """
         Modify Stop Loss and Take Profit for an existing position
@@ -610,14 +903,14 @@ class MT5Client:
                 return False
         
         # Simulation mode
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+        if not self.mt5_available or self.config.get("simulate_orders", True):
             print(f"SIMULATED MODIFY: Ticket {ticket} -> SL={sl}, TP={tp}")
             return True
             
         try:
             # Prepare request
             request = {
-                "action": mt5.TRADE_ACTION_SLTP,
+                "action": self.mt5.TRADE_ACTION_SLTP,
                 "position": ticket,
                 "symbol": self.get_position(ticket)['symbol'], # Helper get_position needed or use existing
                 "sl": sl,
@@ -633,8 +926,8 @@ class MT5Client:
             
             request["symbol"] = pos_info["symbol"]
             
-            result = mt5.order_send(request)
-            if result.retcode == mt5.TRADE_RETCODE_DONE:
+            result = self.mt5.order_send(request)
+            if result.retcode == self.mt5.TRADE_RETCODE_DONE:
                 logger.info(f"SUCCESS: Position {ticket} modified. SL={sl}, TP={tp}")
                 return True
             else:
@@ -645,6 +938,7 @@ class MT5Client:
             logger.error(f"Modify position error: {str(e)}")
             return False
 
+    @on_mt5_worker
     def get_required_margin_for_order(self, symbol: str, lot_size: float) -> float:
         """
         Calculate required margin for a position
@@ -655,7 +949,7 @@ class MT5Client:
                 return 0.0
         
         # Simulation mode
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+        if not self.mt5_available or self.config.get("simulate_orders", True):
             # Dummy calculation
             return lot_size * 100 * 10  # Rough estimate
         
@@ -664,13 +958,13 @@ class MT5Client:
             mt5_symbol = self._map_symbol(symbol)
             
             # Get symbol info to get pip value and leverage
-            symbol_info = mt5.symbol_info(mt5_symbol)
+            symbol_info = self.mt5.symbol_info(mt5_symbol)
             if not symbol_info:
                 print(f"WARNING: Could not get symbol info for {mt5_symbol}")
                 return 0.0
             
             # Get account leverage
-            account_info = mt5.account_info()
+            account_info = self.mt5.account_info()
             if not account_info:
                 return 0.0
             
@@ -678,7 +972,7 @@ class MT5Client:
             
             # Approximate required margin per lot based on pip value
             # This is a simplified calculation - actual margin may vary
-            tick = mt5.symbol_info_tick(mt5_symbol)
+            tick = self.mt5.symbol_info_tick(mt5_symbol)
             if tick:
                 pip_value = symbol_info.point * 10  # 1 pip in currency value per 1 lot
                 required_margin = (pip_value * lot_size * 100) / leverage  # Rough estimate
@@ -708,11 +1002,58 @@ class MT5Client:
 
     def shutdown(self):
         """Shutdown MT5 connection gracefully"""
+        if self.tick_refresher_task:
+            self.tick_refresher_task.cancel()
+            self.tick_refresher_task = None
+        facade = vars(self).get("_async_facade")
+        if facade is not None:
+            # Drop queued calls but let the running one finish before the terminal goes away
+            facade.shutdown(wait=True, cancel_pending=True)
         if self.initialized:
-            mt5.shutdown()
+            self.mt5.shutdown()
             self.initialized = False
             print("MT5 connection closed")
 
+    @on_mt5_worker
+    def get_history_deals(self, date_from=None, date_to=None,
+                          position: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get closed deals from MT5 history, either for one position or a date range
+        Returns list of deal dictionaries with ticket, position_id, symbol, profit, etc.
+        """
+        if not self.initialized or not self.mt5_available:
+            return []
+        
+        try:
+            if position is not None:
+                deals = self.mt5.history_deals_get(position=position)
+            else:
+                deals = self.mt5.history_deals_get(date_from, date_to)
+            
+            if deals is None:
+                return []
+            
+            return [{
+                'ticket': deal.ticket,
+                'order': deal.order,
+                'position_id': deal.position_id,
+                'symbol': deal.symbol,
+                'type': deal.type,
+                'entry': deal.entry,
+                'volume': deal.volume,
+                'price': deal.price,
+                'profit': deal.profit,
+                'commission': deal.commission,
+                'swap': deal.swap,
+                'time': deal.time,
+                'comment': deal.comment
+            } for deal in deals]
+            
+        except Exception as e:
+            logger.error(f"Error getting history deals: {str(e)}")
+            return []
+
+    @on_mt5_worker
     def get_closed_trade_profit(self, ticket_id: int) -> Optional[float]:
         """
         Fetch ACTUAL profit from MT5 history for a closed position.
@@ -724,14 +1065,14 @@ class MT5Client:
         Returns:
             Actual profit/loss in account currency (e.g., USD), or None if not found
         """
-        if not self.initialized or not MT5_AVAILABLE:
+        if not self.initialized or not self.mt5_available:
             logger.warning(f"Cannot fetch profit for ticket {ticket_id}: MT5 not initialized")
             return None
         
         try:
             # Request trade history for this specific position
             # We need to look in deals (not positions, since it's closed)
-            deals = mt5.history_deals_get(position=ticket_id)
+            deals = self.mt5.history_deals_get(position=ticket_id)
             
             if not deals:
                 logger.warning(f"No history found for ticket {ticket_id}")
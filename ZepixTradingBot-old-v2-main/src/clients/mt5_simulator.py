@@ -0,0 +1,534 @@
+"""
+MT5 Simulator - In-process simulated broker with the MetaTrader5 module surface
+
+Select it with "mt5_backend": "simulator" (and "simulate_orders": false) and
+MT5Client drives it through exactly the same calls it makes against a real
+terminal: symbol_info_tick, order_send, positions_get, history_deals_get,
+account_info. Prices come from a replayable stream (records or CSV), open
+positions are auto-filled at their SL/TP as ticks cross them, margin is
+tracked against leverage and every call can carry configurable latency -
+so reconciliation, profit booking and recovery paths run at realistic load
+on any platform.
+"""
+
+import csv
+import math
+import random
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Starting prices when no stream / explicit price has been supplied yet
+DEFAULT_PRICES = {
+    "XAUUSD": 2650.0, "GOLD": 2650.0,
+    "EURUSD": 1.0850, "GBPUSD": 1.2650,
+    "USDJPY": 149.50, "USDCAD": 1.3550,
+    "AUDUSD": 0.6550, "NZDUSD": 0.6000,
+    "EURJPY": 162.00, "GBPJPY": 189.00, "AUDJPY": 98.00
+}
+
+
+class MT5Simulator:
+    """
+    Simulated MT5 terminal + broker
+
+    Ticket numbers are shared by orders and positions (hedging account
+    behaviour, as MT5Client expects result.order to be the position ticket).
+    """
+
+    # MetaTrader5 constants used by MT5Client
+    ORDER_TYPE_BUY = 0
+    ORDER_TYPE_SELL = 1
+    TRADE_ACTION_DEAL = 1
+    TRADE_ACTION_SLTP = 6
+    ORDER_TIME_GTC = 0
+    ORDER_FILLING_IOC = 1
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_INVALID = 10013
+    TRADE_RETCODE_INVALID_VOLUME = 10014
+    TRADE_RETCODE_INVALID_STOPS = 10016
+    TRADE_RETCODE_NO_MONEY = 10019
+    DEAL_TYPE_BUY = 0
+    DEAL_TYPE_SELL = 1
+    DEAL_ENTRY_IN = 0
+    DEAL_ENTRY_OUT = 1
+    DEAL_REASON_CLIENT = 0
+    DEAL_REASON_SL = 4
+    DEAL_REASON_TP = 5
+    TIMEFRAME_M1 = 1
+    TIMEFRAME_M5 = 5
+    TIMEFRAME_M15 = 15
+    TIMEFRAME_H1 = 16385
+    TIMEFRAME_H4 = 16388
+    TIMEFRAME_D1 = 16408
+
+    # copy_rates_* structured array layout
+    RATES_DTYPE = [
+        ("time", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"),
+        ("close", "<f8"), ("tick_volume", "<u8"), ("spread", "<i4"), ("real_volume", "<u8")
+    ]
+
+    def __init__(self, config=None, prices: Optional[Dict[str, float]] = None,
+                 balance: Optional[float] = None, leverage: Optional[int] = None,
+                 latency_ms: Optional[Dict[str, float]] = None, seed: Optional[int] = None):
+        sim_config = (config.get("mt5_simulator", {}) if config is not None else {}) or {}
+
+        self.balance = balance if balance is not None else sim_config.get("balance", 10000.0)
+        self.leverage = leverage or sim_config.get("leverage", 100)
+        self.spread_pips = sim_config.get("spread_pips", 1.0)
+        self.commission_per_lot = sim_config.get("commission_per_lot", 0.0)
+        self.latency_ms = dict(sim_config.get("latency_ms", {}) if latency_ms is None else latency_ms)
+        self.latency_jitter_ms = sim_config.get("latency_jitter_ms", 0.0)
+        self._random = random.Random(seed if seed is not None else sim_config.get("seed"))
+
+        # Symbol specs from symbol_config, keyed by broker symbol
+        self.symbols: Dict[str, Dict[str, Any]] = {}
+        if config is not None:
+            mapping = config.get("symbol_mapping", {}) or {}
+            for tv_symbol, spec in (config.get("symbol_config", {}) or {}).items():
+                self._add_symbol(mapping.get(tv_symbol, tv_symbol), tv_symbol,
+                                 spec.get("pip_size"), spec.get("contract_size"))
+
+        self.ticks: Dict[str, SimpleNamespace] = {}
+        self.rates: Dict[Tuple[str, int], Any] = {}  # (symbol, timeframe) -> bars, oldest first
+        self.positions: Dict[int, Dict[str, Any]] = {}
+        self.deals: List[SimpleNamespace] = []
+        self._next_ticket = 100000
+        self._error: Tuple[int, str] = (1, "Success")
+        self._lock = threading.RLock()
+
+        self.clock: Optional[float] = None  # Stream time; None = wall clock
+        self.stream: Optional[Iterator] = None
+        self.stats = {
+            "calls": 0,
+            "orders": 0,
+            "rejected": 0,
+            "closed": 0,
+            "sl_fills": 0,
+            "tp_fills": 0,
+            "ticks": 0
+        }
+
+        for symbol, price in (prices or DEFAULT_PRICES).items():
+            self.set_price(symbol, price)
+
+        if sim_config.get("price_stream_file"):
+            self.load_price_stream_csv(sim_config["price_stream_file"])
+
+    # ==================== SYMBOLS / PRICES ====================
+
+    def _add_symbol(self, symbol: str, tv_symbol: Optional[str] = None,
+                    pip_size: Optional[float] = None, contract_size: Optional[float] = None):
+        tv_symbol = tv_symbol or symbol
+        if pip_size is None:
+            pip_size = 0.01 if ("JPY" in tv_symbol or "XAU" in tv_symbol or symbol == "GOLD") else 0.0001
+        if contract_size is None:
+            contract_size = 100 if ("XAU" in tv_symbol or symbol == "GOLD") else 100000
+        point = pip_size / 10
+        self.symbols[symbol] = {
+            "name": symbol,
+            "pip_size": pip_size,
+            "point": point,
+            "digits": max(0, int(round(-math.log10(point)))),
+            "contract_size": contract_size,
+            # USD-based pairs (USDJPY, USDCAD) quote PnL in the counter currency
+            "usd_base": tv_symbol.startswith("USD") and len(tv_symbol) == 6
+        }
+        return self.symbols[symbol]
+
+    def _spec(self, symbol: str) -> Dict[str, Any]:
+        return self.symbols.get(symbol) or self._add_symbol(symbol)
+
+    def now(self) -> float:
+        return self.clock if self.clock is not None else time.time()
+
+    def set_price(self, symbol: str, bid: float, ask: Optional[float] = None,
+                  when: Optional[float] = None):
+        """Apply one tick (SL/TP of open positions on the symbol are checked)"""
+        with self._lock:
+            spec = self._spec(symbol)
+            if ask is None:
+                ask = bid + self.spread_pips * spec["pip_size"]
+            if when is not None:
+                self.clock = when
+            now = self.now()
+            self.ticks[symbol] = SimpleNamespace(
+                bid=bid, ask=ask, last=bid, time=int(now), time_msc=int(now * 1000)
+            )
+            self.stats["ticks"] += 1
+            self._check_stops(symbol)
+
+    def load_price_stream(self, records: Iterable):
+        """
+        Queue a replayable price stream
+
+        Records are dicts {time, symbol, bid[, ask]} or tuples (time, symbol, bid[, ask])
+        """
+        self.stream = iter(records)
+
+    def load_price_stream_csv(self, path: str):
+        """Queue a CSV stream with columns time,symbol,bid[,ask]"""
+        with open(path, newline="") as handle:
+            rows = list(csv.DictReader(handle))
+        self.load_price_stream(rows)
+
+    def step(self) -> Optional[Tuple[float, str, float, float]]:
+        """Apply the next stream record; returns it or None when exhausted"""
+        if self.stream is None:
+            return None
+        record = next(self.stream, None)
+        if record is None:
+            return None
+
+        if isinstance(record, dict):
+            when = float(record["time"])
+            symbol = record["symbol"]
+            bid = float(record["bid"])
+            ask = float(record["ask"]) if record.get("ask") not in (None, "") else None
+        else:
+            when, symbol, bid = float(record[0]), record[1], float(record[2])
+            ask = float(record[3]) if len(record) > 3 and record[3] is not None else None
+
+        self.set_price(symbol, bid, ask, when=when)
+        tick = self.ticks[symbol]
+        return when, symbol, tick.bid, tick.ask
+
+    def replay(self, steps: Optional[int] = None) -> int:
+        """Apply up to `steps` stream records (all when None); returns count applied"""
+        applied = 0
+        while steps is None or applied < steps:
+            if self.step() is None:
+                break
+            applied += 1
+        return applied
+
+    def load_rates(self, symbol: str, timeframe: int, rates):
+        """
+        Set the bar history served by copy_rates_from_pos
+
+        rates is a structured array or a dict of columns (time, open, high,
+        low, close and optionally tick_volume/volume), oldest bar first.
+        """
+        times = np.asarray(rates["time"])
+        bars = np.zeros(len(times), dtype=self.RATES_DTYPE)
+        names = getattr(getattr(rates, "dtype", None), "names", None) or tuple(rates)
+        for column in ("time", "open", "high", "low", "close"):
+            bars[column] = rates[column]
+        volume = "tick_volume" if "tick_volume" in names else "volume"
+        if volume in names:
+            bars["tick_volume"] = rates[volume]
+        with self._lock:
+            self.rates[(symbol, timeframe)] = bars
+
+    # ==================== LATENCY ====================
+
+    def _delay(self, method: str):
+        self.stats["calls"] += 1
+        delay_ms = self.latency_ms.get(method, self.latency_ms.get("default", 0.0))
+        if self.latency_jitter_ms:
+            delay_ms += self._random.uniform(0, self.latency_jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+
+    # ==================== TERMINAL API ====================
+
+    def initialize(self, *args, **kwargs) -> bool:
+        self._delay("initialize")
+        return True
+
+    def login(self, *args, **kwargs) -> bool:
+        self._delay("login")
+        return True
+
+    def shutdown(self):
+        return None
+
+    def last_error(self) -> Tuple[int, str]:
+        return self._error
+
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        return symbol in self.ticks
+
+    def symbol_info(self, symbol: str) -> Optional[SimpleNamespace]:
+        self._delay("symbol_info")
+        if symbol not in self.ticks:
+            return None
+        spec = self.symbols[symbol]
+        tick = self.ticks[symbol]
+        return SimpleNamespace(
+            name=symbol, visible=True, digits=spec["digits"], point=spec["point"],
+            trade_stops_level=0, trade_contract_size=spec["contract_size"],
+            volume_min=0.01, volume_max=100.0, volume_step=0.01,
+            spread=int(round((tick.ask - tick.bid) / spec["point"])),
+            bid=tick.bid, ask=tick.ask
+        )
+
+    def symbol_info_tick(self, symbol: str) -> Optional[SimpleNamespace]:
+        self._delay("symbol_info_tick")
+        with self._lock:
+            tick = self.ticks.get(symbol)
+            return SimpleNamespace(**vars(tick)) if tick else None
+
+    def copy_rates_from_pos(self, symbol: str, timeframe: int, start_pos: int, count: int):
+        """Bars ending start_pos bars before the newest (None when no history is loaded)"""
+        self._delay("copy_rates_from_pos")
+        with self._lock:
+            bars = self.rates.get((symbol, timeframe))
+            if bars is None or count <= 0 or start_pos >= len(bars):
+                self._error = (-1, "Terminal: Call failed")
+                return None
+            end = len(bars) - start_pos
+            return bars[max(0, end - count):end].copy()
+
+    def account_info(self) -> SimpleNamespace:
+        self._delay("account_info")
+        return self._account_snapshot()
+
+    def _account_snapshot(self) -> SimpleNamespace:
+        with self._lock:
+            floating = sum(self._position_profit(p) for p in self.positions.values())
+            margin = sum(p["margin"] for p in self.positions.values())
+            equity = self.balance + floating
+            return SimpleNamespace(
+                login=0, server="Simulator", currency="USD", leverage=self.leverage,
+                balance=round(self.balance, 2), equity=round(equity, 2),
+                profit=round(floating, 2), margin=round(margin, 2),
+                margin_free=round(equity - margin, 2),
+                margin_level=round(equity / margin * 100, 2) if margin else 0.0
+            )
+
+    def positions_get(self, symbol: Optional[str] = None, ticket: Optional[int] = None,
+                      group: Optional[str] = None) -> Tuple[SimpleNamespace, ...]:
+        self._delay("positions_get")
+        with self._lock:
+            if ticket is not None:
+                position = self.positions.get(ticket)
+                selected = [position] if position else []
+            else:
+                selected = [p for p in self.positions.values()
+                            if symbol is None or p["symbol"] == symbol]
+            return tuple(self._position_view(p) for p in selected)
+
+    def positions_total(self) -> int:
+        return len(self.positions)
+
+    def history_deals_get(self, date_from=None, date_to=None, group: Optional[str] = None,
+                          position: Optional[int] = None,
+                          ticket: Optional[int] = None) -> Tuple[SimpleNamespace, ...]:
+        self._delay("history_deals_get")
+        start = self._as_epoch(date_from)
+        end = self._as_epoch(date_to)
+        with self._lock:
+            deals = self.deals
+            if position is not None:
+                deals = [d for d in deals if d.position_id == position]
+            elif ticket is not None:
+                deals = [d for d in deals if d.ticket == ticket]
+            else:
+                deals = [d for d in deals
+                         if (start is None or d.time >= start) and (end is None or d.time <= end)]
+            return tuple(deals)
+
+    def order_send(self, request: Dict[str, Any]) -> SimpleNamespace:
+        self._delay("order_send")
+        with self._lock:
+            action = request.get("action")
+            if action == self.TRADE_ACTION_SLTP:
+                return self._modify(request)
+            if action != self.TRADE_ACTION_DEAL:
+                return self._reject(request, self.TRADE_RETCODE_INVALID, "Unsupported action")
+            if request.get("position"):
+                return self._close(request)
+            return self._open(request)
+
+    # ==================== ORDER HANDLING ====================
+
+    def _ticket(self) -> int:
+        self._next_ticket += 1
+        return self._next_ticket
+
+    def _result(self, request, retcode, comment, order=0, deal=0, volume=0.0, price=0.0):
+        tick = self.ticks.get(request.get("symbol"))
+        return SimpleNamespace(
+            retcode=retcode, comment=comment, order=order, deal=deal,
+            volume=volume, price=price,
+            bid=tick.bid if tick else 0.0, ask=tick.ask if tick else 0.0,
+            request=request
+        )
+
+    def _reject(self, request, retcode, comment):
+        self.stats["rejected"] += 1
+        self._error = (retcode, comment)
+        return self._result(request, retcode, comment)
+
+    def _open(self, request):
+        symbol = request.get("symbol")
+        tick = self.ticks.get(symbol)
+        if tick is None:
+            return self._reject(request, self.TRADE_RETCODE_INVALID, f"Unknown symbol {symbol}")
+
+        volume = float(request.get("volume") or 0)
+        if volume <= 0:
+            return self._reject(request, self.TRADE_RETCODE_INVALID_VOLUME, "Invalid volume")
+
+        order_type = request.get("type")
+        is_buy = order_type == self.ORDER_TYPE_BUY
+        price = tick.ask if is_buy else tick.bid
+        sl = request.get("sl") or 0.0
+        tp = request.get("tp") or 0.0
+        if (sl and ((is_buy and sl >= price) or (not is_buy and sl <= price))) or \
+           (tp and ((is_buy and tp <= price) or (not is_buy and tp >= price))):
+            return self._reject(request, self.TRADE_RETCODE_INVALID_STOPS, "Invalid stops")
+
+        spec = self.symbols[symbol]
+        margin = volume * spec["contract_size"] * price / self.leverage
+        if spec["usd_base"]:
+            margin /= price
+        if margin > self._account_snapshot().margin_free:
+            return self._reject(request, self.TRADE_RETCODE_NO_MONEY, "No money")
+
+        ticket = self._ticket()
+        now = self.now()
+        self.positions[ticket] = {
+            "ticket": ticket, "symbol": symbol, "type": order_type, "volume": volume,
+            "price_open": price, "sl": sl, "tp": tp, "margin": margin,
+            "comment": request.get("comment", ""), "magic": request.get("magic", 0),
+            "time": int(now)
+        }
+        deal = self._record_deal(ticket, symbol, order_type, self.DEAL_ENTRY_IN, volume, price,
+                                 0.0, self.DEAL_REASON_CLIENT, request.get("comment", ""))
+        self.stats["orders"] += 1
+        self._error = (1, "Success")
+        return self._result(request, self.TRADE_RETCODE_DONE, "Request executed",
+                            order=ticket, deal=deal.ticket, volume=volume, price=price)
+
+    def _close(self, request):
+        position = self.positions.get(request["position"])
+        if position is None:
+            return self._reject(request, self.TRADE_RETCODE_INVALID, "Position not found")
+
+        tick = self.ticks[position["symbol"]]
+        price = tick.bid if position["type"] == self.ORDER_TYPE_BUY else tick.ask
+        volume = min(float(request.get("volume") or position["volume"]), position["volume"])
+        deal = self._close_volume(position, volume, price, self.DEAL_REASON_CLIENT,
+                                  request.get("comment", ""))
+        self._error = (1, "Success")
+        return self._result(request, self.TRADE_RETCODE_DONE, "Request executed",
+                            order=self._ticket(), deal=deal.ticket, volume=volume, price=price)
+
+    def _modify(self, request):
+        position = self.positions.get(request.get("position"))
+        if position is None:
+            return self._reject(request, self.TRADE_RETCODE_INVALID, "Position not found")
+        if request.get("sl") is not None:
+            position["sl"] = request["sl"]
+        if request.get("tp") is not None:
+            position["tp"] = request["tp"]
+        self._error = (1, "Success")
+        return self._result(request, self.TRADE_RETCODE_DONE, "Request executed",
+                            order=position["ticket"])
+
+    def _close_volume(self, position, volume, price, reason, comment=""):
+        close_type = self.ORDER_TYPE_SELL if position["type"] == self.ORDER_TYPE_BUY else self.ORDER_TYPE_BUY
+        profit = self._profit(position, price, volume)
+        commission = -self.commission_per_lot * volume
+        self.balance += profit + commission
+
+        deal = self._record_deal(position["ticket"], position["symbol"], close_type,
+                                 self.DEAL_ENTRY_OUT, volume, price, profit, reason,
+                                 comment, commission)
+
+        remaining = round(position["volume"] - volume, 8)
+        if remaining <= 0:
+            del self.positions[position["ticket"]]
+            self.stats["closed"] += 1
+        else:
+            position["margin"] *= remaining / position["volume"]
+            position["volume"] = remaining
+        return deal
+
+    def _record_deal(self, position_id, symbol, deal_type, entry, volume, price,
+                     profit, reason, comment="", commission=0.0):
+        now = self.now()
+        deal = SimpleNamespace(
+            ticket=self._ticket(), order=position_id, position_id=position_id,
+            symbol=symbol, type=deal_type, entry=entry, volume=volume, price=price,
+            profit=round(profit, 2), commission=round(commission, 2), swap=0.0, fee=0.0,
+            time=int(now), time_msc=int(now * 1000), reason=reason,
+            comment=comment, magic=0
+        )
+        self.deals.append(deal)
+        return deal
+
+    def _check_stops(self, symbol: str):
+        """Fill SL/TP of every position on this symbol crossed by the current tick"""
+        tick = self.ticks[symbol]
+        for position in [p for p in self.positions.values() if p["symbol"] == symbol]:
+            if position["type"] == self.ORDER_TYPE_BUY:
+                price = tick.bid
+                sl_hit = position["sl"] and price <= position["sl"]
+                tp_hit = position["tp"] and price >= position["tp"]
+            else:
+                price = tick.ask
+                sl_hit = position["sl"] and price >= position["sl"]
+                tp_hit = position["tp"] and price <= position["tp"]
+
+            if sl_hit:
+                self._close_volume(position, position["volume"], position["sl"],
+                                   self.DEAL_REASON_SL, "[sl]")
+                self.stats["sl_fills"] += 1
+            elif tp_hit:
+                self._close_volume(position, position["volume"], position["tp"],
+                                   self.DEAL_REASON_TP, "[tp]")
+                self.stats["tp_fills"] += 1
+
+    def _profit(self, position, close_price, volume) -> float:
+        spec = self.symbols[position["symbol"]]
+        diff = close_price - position["price_open"]
+        if position["type"] == self.ORDER_TYPE_SELL:
+            diff = -diff
+        profit = diff * volume * spec["contract_size"]
+        if spec["usd_base"]:
+            profit /= close_price
+        return profit
+
+    def _position_profit(self, position) -> float:
+        tick = self.ticks[position["symbol"]]
+        price = tick.bid if position["type"] == self.ORDER_TYPE_BUY else tick.ask
+        return self._profit(position, price, position["volume"])
+
+    def _position_view(self, position) -> SimpleNamespace:
+        tick = self.ticks[position["symbol"]]
+        price = tick.bid if position["type"] == self.ORDER_TYPE_BUY else tick.ask
+        return SimpleNamespace(
+            ticket=position["ticket"], identifier=position["ticket"],
+            symbol=position["symbol"], type=position["type"], volume=position["volume"],
+            price_open=position["price_open"], price_current=price,
+            sl=position["sl"], tp=position["tp"],
+            profit=round(self._profit(position, price, position["volume"]), 2),
+            swap=0.0, comment=position["comment"], magic=position["magic"],
+            time=position["time"]
+        )
+
+    @staticmethod
+    def _as_epoch(value) -> Optional[float]:
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return value.timestamp()
+        return float(value)
+
+    def get_status(self) -> Dict[str, Any]:
+        info = self._account_snapshot()
+        return {
+            "positions": len(self.positions),
+            "deals": len(self.deals),
+            "balance": info.balance,
+            "equity": info.equity,
+            "margin_level": info.margin_level,
+            "stats": dict(self.stats)
+        }
@@ -1,4 +1,5 @@
 import requests
+import asyncio
 import json
 import threading
 import time
@@ -13,6 +14,7 @@ from src.managers.timeframe_trend_manager import TimeframeTrendManager
 from src.clients.menu_callback_handler import MenuCallbackHandler
 from src.menu.fine_tune_menu_handler import FineTuneMenuHandler
 from src.menu.menu_constants import REPLY_MENU_MAP
+from src.clients.telegram_outbound_queue import TelegramOutboundQueue, PRIORITY_HIGH, REJECTED
 
 if TYPE_CHECKING:
     from src.core.trading_engine import TradingEngine
@@ -28,6 +30,13 @@ class TelegramBot:
         # Connection pooling for faster API requests
         self.session = requests.Session()
         
+        # Outbound queue: messages sent from inside the event loop are delivered
+        # by a background worker instead of blocking on requests.post
+        queue_config = config.get("telegram_queue", {}) or {}
+        self.outbound_queue = None
+        if queue_config.get("enabled", True):
+            self.outbound_queue = TelegramOutboundQueue.from_config(self._deliver_payload, queue_config)
+        
         self.trend_manager = None
         self.polling_stop_event = threading.Event()
         self.polling_thread = None
@@ -41,6 +50,7 @@ class TelegramBot:
             "/resume": self.handle_resume,
             "/performance": self.handle_performance,
             "/stats": self.handle_stats,
+            "/latency": self.handle_latency,
             "/trades": self.handle_trades,
             "/logic1_on": self.handle_logic1_on,
             "/logic1_off": self.handle_logic1_off,
@@ -361,19 +371,39 @@ class TelegramBot:
     
 
 
-    def send_message(self, message: str, reply_markup: dict = None, add_menu_button: bool = True, parse_mode: str = "HTML"):
+    def _build_reply_markup(self, reply_markup: dict = None, add_menu_button: bool = True):
+        """Use custom keyboard if provided, otherwise add menu button if requested"""
+        if reply_markup:
+            return reply_markup
+        if add_menu_button:
+            keyboard = [[{"text": "🏠 MAIN MENU", "callback_data": "menu_main"}]]
+            return {"inline_keyboard": keyboard}
+        return None
+    
+    def send_message(self, message: str, reply_markup: dict = None, add_menu_button: bool = True, parse_mode: str = "HTML",
+                     priority: int = None, coalesce_key: str = None):
         """Send message to Telegram with optional menu button and custom keyboard
         
+        Called from inside a running event loop the message is queued on the
+        outbound worker (returns True) so the loop never waits on HTTP.
+        
         Args:
             message: Message text
             reply_markup: Custom inline keyboard (if provided, overrides add_menu_button)
             add_menu_button: Add default menu button if no custom keyboard
             parse_mode: Formatting mode - "HTML", "Markdown", or None
+            priority: Queue priority (PRIORITY_HIGH default, PRIORITY_INFO for updates)
+            coalesce_key: Queued messages sharing this key are merged into one digest
         """
         if not self.token or not self.chat_id:
             print("WARNING: Telegram credentials not configured - message not sent")
             return False
         
+        if self._in_event_loop():
+            return self.queue_message(message, priority=priority, coalesce_key=coalesce_key,
+                                      reply_markup=reply_markup, add_menu_button=add_menu_button,
+                                      parse_mode=parse_mode)
+        
         try:
             url = f"{self.base_url}/sendMessage"
             payload = {
@@ -382,12 +412,9 @@ class TelegramBot:
                 "parse_mode": parse_mode
             }
             
-            # Use custom keyboard if provided, otherwise add menu button if requested
-            if reply_markup:
-                payload["reply_markup"] = reply_markup
-            elif add_menu_button:
-                keyboard = [[{"text": "🏠 MAIN MENU", "callback_data": "menu_main"}]]
-                payload["reply_markup"] = {"inline_keyboard": keyboard}
+            markup = self._build_reply_markup(reply_markup, add_menu_button)
+            if markup:
+                payload["reply_markup"] = markup
             
             response = requests.post(url, json=payload, timeout=2)
             if response.status_code == 200:
@@ -413,6 +440,63 @@ class TelegramBot:
             print(f"WARNING: Telegram send_message error: {str(e)}")
             return False
     
+    def _in_event_loop(self) -> bool:
+        if self.outbound_queue is None:
+            return False
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+    
+    def queue_message(self, message: str, priority: int = None, coalesce_key: str = None,
+                      reply_markup: dict = None, add_menu_button: bool = True, parse_mode: str = "HTML"):
+        """Queue a message for background delivery (never blocks on the network)"""
+        if not self.token or not self.chat_id:
+            print("WARNING: Telegram credentials not configured - message not sent")
+            return False
+        if self.outbound_queue is None:
+            return self.send_message(message, reply_markup=reply_markup,
+                                     add_menu_button=add_menu_button, parse_mode=parse_mode)
+        return self.outbound_queue.enqueue(
+            self.chat_id, message,
+            priority=PRIORITY_HIGH if priority is None else priority,
+            coalesce_key=coalesce_key, parse_mode=parse_mode,
+            reply_markup=self._build_reply_markup(reply_markup, add_menu_button)
+        )
+    
+    def _deliver_payload(self, payload: dict):
+        """Outbound worker transport: returns (delivered, retry_after_seconds or REJECTED)"""
+        url = f"{self.base_url}/sendMessage"
+        try:
+            response = self.session.post(url, json=payload, timeout=10)
+            if response.status_code == 200:
+                return True, None
+            if response.status_code == 429:
+                try:
+                    retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                except ValueError:
+                    retry_after = 1
+                return False, float(retry_after)
+            if response.status_code == 400 and "parse_mode" in payload:
+                print(f"WARNING: Parse mode '{payload['parse_mode']}' error, retrying without formatting...")
+                payload = {k: v for k, v in payload.items() if k != "parse_mode"}
+                response = self.session.post(url, json=payload, timeout=10)
+                if response.status_code == 200:
+                    return True, None
+            print(f"WARNING: Telegram API error: Status {response.status_code}, Response: {response.text}")
+            if 400 <= response.status_code < 500:
+                return False, REJECTED  # Bad request / token / chat - resending cannot help
+            return False, None
+        except requests.exceptions.RequestException as e:
+            print(f"WARNING: Telegram API request failed: {str(e)}")
+            return False, None
+    
+    def get_outbound_stats(self) -> Dict[str, Any]:
+        if self.outbound_queue is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.outbound_queue.get_stats()}
+    
     def send_document(self, document, filename=None, caption=None):
         """Send a document to the user"""
         if not self.token or not self.chat_id:
@@ -1178,6 +1262,15 @@ class TelegramBot:
         )
         self.send_message(risk_msg)
 
+    def handle_latency(self, message):
+        """Handle /latency command - alert-to-order stage percentiles"""
+        self._ensure_dependencies()
+        tracer = getattr(self.trading_engine, "latency_tracer", None) if self.trading_engine else None
+        if tracer is None:
+            self.send_message("❌ Bot still initializing. Please wait a moment.")
+            return
+        self.send_message(tracer.format_report())
+
     def handle_trades(self, message):
         """Handle /trades command"""
         self._ensure_dependencies()
@@ -1726,12 +1819,12 @@ class TelegramBot:
             
             if mode == "on":
                 re_entry_config["tp_reentry_enabled"] = True
-                self.config["re_entry_config"] = re_entry_config
+                self.config.update("re_entry_config", re_entry_config)
                 self.send_message("✅ *TP Re-entry System ENABLED*\n\nTP re-entries will now be monitored.")
                 return
             elif mode == "off":
                 re_entry_config["tp_reentry_enabled"] = False
-                self.config["re_entry_config"] = re_entry_config
+                self.config.update("re_entry_config", re_entry_config)
                 self.send_message("❌ *TP Re-entry System DISABLED*\n\nTP re-entries stopped.")
                 return
             
@@ -1876,12 +1969,12 @@ class TelegramBot:
             
             if mode == "on":
                 re_entry_config["sl_hunt_reentry_enabled"] = True
-                self.config["re_entry_config"] = re_entry_config
+                self.config.update("re_entry_config", re_entry_config)
                 self.send_message("✅ *SL Hunt Re-entry System ENABLED*\n\nSL hunt monitoring started.")
                 return
             elif mode == "off":
                 re_entry_config["sl_hunt_reentry_enabled"] = False
-                self.config["re_entry_config"] = re_entry_config
+                self.config.update("re_entry_config", re_entry_config)
                 self.send_message("❌ *SL Hunt Re-entry System DISABLED*\n\nSL hunt stopped.")
                 return
             
@@ -1918,12 +2011,12 @@ class TelegramBot:
             
             if mode == "on":
                 re_entry_config["exit_continuation_enabled"] = True
-                self.config["re_entry_config"] = re_entry_config
+                self.config.update("re_entry_config", re_entry_config)
                 self.send_message("✅ *Exit Continuation System ENABLED*\n\nExit continuation monitoring started.")
                 return
             elif mode == "off":
                 re_entry_config["exit_continuation_enabled"] = False
-                self.config["re_entry_config"] = re_entry_config
+                self.config.update("re_entry_config", re_entry_config)
                 self.send_message("❌ *Exit Continuation System DISABLED*\n\nExit continuation stopped.")
                 return
             
@@ -4663,14 +4756,14 @@ _Use /dashboard to return to main view_"""
             
             text = "📈 <b>OPEN TRADES</b>\n═══════════════\n\n"
             keyboard = []
+            pnl_by_ticket = {
+                td.get('trade_id'): td.get('live_pnl', 0.0)
+                for td in live_pnl_data.get('trade_details', [])
+            }
             
             for trade in open_trades:
-                # Find matching trade in live data
-                trade_pnl = 0.0
-                for td in live_pnl_data.get('trade_details', []):
-                    if td.get('symbol') == trade.symbol and td.get('direction', '').upper() == trade.direction.upper():
-                        trade_pnl = td.get('live_pnl', 0.0)
-                        break
+                # Match live data by ticket (several trades can share symbol + direction)
+                trade_pnl = pnl_by_ticket.get(trade.trade_id, 0.0)
                 
                 pnl_text = self.risk_manager.format_pnl_value(trade_pnl) if self.risk_manager else f"${trade_pnl:.2f}"
                 
@@ -4922,6 +5015,8 @@ _Use /dashboard to return to main view_"""
             self.polling_thread.join(timeout=5)
             self.logger.info("[POLLING] Polling thread stopped")
             self.polling_thread = None
+        if self.outbound_queue is not None:
+            self.outbound_queue.stop()
 
     def _cleanup_webhook_before_polling(self):
         """Ensure any existing webhook is deleted before polling starts"""
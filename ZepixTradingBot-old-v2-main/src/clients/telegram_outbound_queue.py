@@ -0,0 +1,315 @@
+"""
+Telegram Outbound Queue - Non-blocking notification delivery
+
+Notifications raised from async code are enqueued and delivered by ONE
+background thread over the bot's pooled requests.Session. The worker honours
+Telegram's rate limits (per-chat and global token buckets, plus retry_after
+on HTTP 429), sends higher priority messages first and merges bursts of
+messages that share a coalesce key into a single digest. Network errors and
+5xx are retried with backoff; other 4xx responses fail the message at once.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Lower value = delivered first
+PRIORITY_HIGH = 0   # Trade fills / closes / errors
+PRIORITY_INFO = 1   # Trend, bias and status updates
+PRIORITY_LOW = 2    # Diagnostics
+
+TELEGRAM_MAX_LENGTH = 4096
+
+# deliver() returns this as retry_after when Telegram refused the message for good
+# (4xx other than 429) - retrying would only burn rate-limit tokens
+REJECTED = object()
+
+# deliver(payload) -> (delivered, retry_after_seconds | REJECTED)
+DeliverFunc = Callable[[Dict[str, Any]], Tuple[bool, Any]]
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `burst` stored"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until one token is available (0 = send now)"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class OutboundMessage:
+    __slots__ = ("seq", "chat_id", "texts", "priority", "coalesce_key",
+                 "parse_mode", "reply_markup", "created", "ready_at", "attempts")
+
+    def __init__(self, seq: int, chat_id: Any, text: str, priority: int,
+                 coalesce_key: Optional[str], parse_mode: Optional[str],
+                 reply_markup: Optional[dict], ready_at: float):
+        self.seq = seq
+        self.chat_id = chat_id
+        self.texts = [text]
+        self.priority = priority
+        self.coalesce_key = coalesce_key
+        self.parse_mode = parse_mode
+        self.reply_markup = reply_markup
+        self.created = time.monotonic()
+        self.ready_at = ready_at
+        self.attempts = 0
+
+    @property
+    def text(self) -> str:
+        if len(self.texts) == 1:
+            return self.texts[0]
+        return f"📦 {len(self.texts)} updates\n\n" + "\n\n".join(self.texts)
+
+    def payload(self) -> Dict[str, Any]:
+        payload = {"chat_id": self.chat_id, "text": self.text}
+        if self.parse_mode:
+            payload["parse_mode"] = self.parse_mode
+        if self.reply_markup:
+            payload["reply_markup"] = self.reply_markup
+        return payload
+
+
+class TelegramOutboundQueue:
+    """
+    Priority queue of outgoing messages drained by a daemon worker thread
+
+    enqueue() never blocks on the network. When the queue is full the newest
+    lowest-priority message is dropped, so trade notifications always get in.
+    """
+
+    def __init__(self, deliver: DeliverFunc, per_chat_per_second: float = 1.0,
+                 burst: int = 3, global_per_second: float = 25.0,
+                 coalesce_window_ms: float = 1500, max_queue_size: int = 500,
+                 max_retries: int = 3):
+        self.deliver = deliver
+        self.per_chat_per_second = per_chat_per_second
+        self.burst = burst
+        self.coalesce_window = coalesce_window_ms / 1000.0
+        self.max_queue_size = max_queue_size
+        self.max_retries = max_retries
+
+        self._cond = threading.Condition()
+        self._pending: List[OutboundMessage] = []
+        self._in_flight: Optional[OutboundMessage] = None
+        self._seq = 0
+        self._global_bucket = TokenBucket(global_per_second, global_per_second)
+        self._chat_buckets: Dict[Any, TokenBucket] = {}
+        self._chat_blocked_until: Dict[Any, float] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._stopping = False
+        self._expedite = 0  # >0 while flush()/stop() wants coalesce windows ignored
+
+        self.max_depth = 0
+        self.stats = {
+            "enqueued": 0,
+            "sent": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "failed": 0,
+            "retries": 0,
+            "rate_limited": 0
+        }
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @classmethod
+    def from_config(cls, deliver: DeliverFunc, queue_config: Dict[str, Any]) -> "TelegramOutboundQueue":
+        return cls(
+            deliver,
+            per_chat_per_second=queue_config.get("per_chat_per_second", 1.0),
+            burst=queue_config.get("burst", 3),
+            global_per_second=queue_config.get("global_per_second", 25.0),
+            coalesce_window_ms=queue_config.get("coalesce_window_ms", 1500),
+            max_queue_size=queue_config.get("max_queue_size", 500),
+            max_retries=queue_config.get("max_retries", 3)
+        )
+
+    # ==================== PRODUCER SIDE ====================
+
+    def enqueue(self, chat_id: Any, text: str, priority: int = PRIORITY_HIGH,
+                coalesce_key: Optional[str] = None, parse_mode: Optional[str] = "HTML",
+                reply_markup: Optional[dict] = None) -> bool:
+        """Queue a message; returns False if it was dropped"""
+        now = time.monotonic()
+        with self._cond:
+            if self._stopping:
+                self.stats["dropped"] += 1
+                return False
+            self.stats["enqueued"] += 1
+
+            if coalesce_key and self._coalesce(chat_id, text, coalesce_key, parse_mode, reply_markup):
+                self.stats["coalesced"] += 1
+                return True
+
+            if len(self._pending) >= self.max_queue_size and not self._make_room(priority):
+                self.stats["dropped"] += 1
+                return False
+
+            self._seq += 1
+            ready_at = now + self.coalesce_window if coalesce_key else now
+            self._pending.append(OutboundMessage(
+                self._seq, chat_id, text, priority, coalesce_key, parse_mode, reply_markup, ready_at
+            ))
+            self.max_depth = max(self.max_depth, len(self._pending))
+            self._ensure_worker()
+            self._cond.notify_all()
+        return True
+
+    def _coalesce(self, chat_id, text, coalesce_key, parse_mode, reply_markup) -> bool:
+        for item in self._pending:
+            if (item.coalesce_key == coalesce_key and item.chat_id == chat_id
+                    and item.parse_mode == parse_mode and item.reply_markup == reply_markup):
+                if len(item.text) + len(text) + 40 > TELEGRAM_MAX_LENGTH:
+                    return False
+                item.texts.append(text)
+                return True
+        return False
+
+    def _make_room(self, priority: int) -> bool:
+        """Evict the newest message of the lowest priority below `priority`"""
+        victim = max(self._pending, key=lambda item: (item.priority, item.seq))
+        if victim.priority <= priority:
+            return False
+        self._pending.remove(victim)
+        self.stats["dropped"] += 1
+        return True
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="telegram-outbound", daemon=True)
+            self._worker.start()
+
+    # ==================== WORKER SIDE ====================
+
+    def _pick(self, now: float) -> Tuple[Optional[OutboundMessage], Optional[float]]:
+        """Best sendable message, or (None, seconds to wait / None = idle)"""
+        if not self._pending:
+            return None, None
+
+        wait = None
+        candidates = sorted(self._pending, key=lambda item: (item.priority, item.seq))
+        for item in candidates:
+            delay = 0.0
+            if not self._expedite:
+                delay = max(delay, item.ready_at - now)
+            delay = max(delay, self._chat_blocked_until.get(item.chat_id, 0.0) - now)
+            bucket = self._chat_buckets.get(item.chat_id)
+            if bucket is None:
+                bucket = self._chat_buckets[item.chat_id] = TokenBucket(self.per_chat_per_second, self.burst)
+            delay = max(delay, bucket.delay(now))
+            if delay <= 0:
+                global_delay = self._global_bucket.delay(now)
+                if global_delay > 0:
+                    return None, global_delay
+                bucket.consume(now)
+                self._global_bucket.consume(now)
+                return item, None
+            wait = delay if wait is None else min(wait, delay)
+        return None, wait
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping and not self._pending:
+                        self._cond.notify_all()
+                        return
+                    item, wait = self._pick(time.monotonic())
+                    if item is not None:
+                        self._pending.remove(item)
+                        self._in_flight = item
+                        break
+                    self._cond.wait(timeout=wait)
+
+            waited = time.monotonic() - item.created
+            try:
+                delivered, retry_after = self.deliver(item.payload())
+            except Exception as e:
+                print(f"WARNING: Telegram outbound delivery error: {str(e)}")
+                delivered, retry_after = False, None
+
+            with self._cond:
+                self._in_flight = None
+                now = time.monotonic()
+                if delivered:
+                    self.stats["sent"] += 1
+                    self._wait_total += waited
+                    self._wait_max = max(self._wait_max, waited)
+                elif retry_after is REJECTED:
+                    self.stats["failed"] += 1
+                elif retry_after and not self._stopping:
+                    # 429 - pause this chat and put the message back untouched
+                    self.stats["rate_limited"] += 1
+                    self._chat_blocked_until[item.chat_id] = now + retry_after
+                    self._pending.append(item)
+                elif item.attempts < self.max_retries and not self._stopping:
+                    item.attempts += 1
+                    item.ready_at = now + 0.5 * (2 ** item.attempts)
+                    self.stats["retries"] += 1
+                    self._pending.append(item)
+                else:
+                    self.stats["failed"] += 1
+                self._cond.notify_all()
+
+    # ==================== LIFECYCLE / STATUS ====================
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until everything queued so far is delivered (or timeout)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._expedite += 1
+            self._cond.notify_all()
+            try:
+                while self._pending or self._in_flight is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(timeout=remaining)
+                return True
+            finally:
+                self._expedite -= 1
+
+    def stop(self, timeout: float = 5.0):
+        """Deliver what is queued (up to timeout), then stop the worker"""
+        self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self.stats["dropped"] += len(self._pending)
+            self._pending.clear()
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout=timeout)
+            self._worker = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            sent = self.stats["sent"] or 1
+            by_priority: Dict[int, int] = {}
+            for item in self._pending:
+                by_priority[item.priority] = by_priority.get(item.priority, 0) + 1
+            return {
+                "queue_depth": len(self._pending),
+                "in_flight": self._in_flight is not None,
+                "max_depth": self.max_depth,
+                "depth_by_priority": by_priority,
+                "avg_wait_ms": round(self._wait_total / sent * 1000, 1),
+                "max_wait_ms": round(self._wait_max * 1000, 1),
+                **self.stats
+            }
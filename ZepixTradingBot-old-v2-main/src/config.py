@@ -1,6 +1,32 @@
+import atexit
 import json
 import os
-from typing import Dict, Any
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.symbol_specs import SPEC_KEYS, SymbolSpecTable
+
+# Journal/snapshot writes of every Config instance on the same file share one lock
+_FILE_LOCKS: Dict[str, threading.Lock] = {}
+_FILE_LOCKS_GUARD = threading.Lock()
+
+
+def _file_lock(path: str) -> threading.Lock:
+    with _FILE_LOCKS_GUARD:
+        return _FILE_LOCKS.setdefault(path, threading.Lock())
+
+
+# Live Config instances flushed at interpreter exit (weak, so discarded instances can be collected)
+_OPEN_CONFIGS: "weakref.WeakSet[Config]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_configs():
+    for config in list(_OPEN_CONFIGS):
+        config.flush()
+
 
 def safe_int_from_env(env_var: str, default: int = 0) -> int:
     """Safely parse integer from environment variable with normalization"""
@@ -22,7 +48,8 @@ def safe_int_from_env(env_var: str, default: int = 0) -> int:
 
 class Config:
     def __init__(self):
-        self.config_file = "config/config.json"
+        # Absolute so the background writer is unaffected by later chdir
+        self.config_file = os.path.abspath("config/config.json")
         self.default_config = {
             "telegram_token": os.getenv("TELEGRAM_TOKEN", ""),
             "telegram_chat_id": safe_int_from_env("TELEGRAM_CHAT_ID", 0),
@@ -58,6 +85,16 @@ class Config:
             "mt5_retries": 3,
             "mt5_wait": 5,
             "simulate_orders": False,
+            "mt5_backend": "terminal",  # "terminal" or "simulator" (in-process broker, needs simulate_orders off)
+            "mt5_simulator": {
+                "balance": 10000.0,
+                "leverage": 100,
+                "spread_pips": 1.0,
+                "commission_per_lot": 0.0,
+                "latency_ms": {"default": 0, "order_send": 0},
+                "latency_jitter_ms": 0,
+                "price_stream_file": None
+            },
             "debug": True,
             "strategies": ["combinedlogic-1", "combinedlogic-2", "combinedlogic-3"],
             "daily_reset_time": "03:35",
@@ -67,6 +104,69 @@ class Config:
                 "default_time_exit_hours": 4.0,
                 "check_interval_seconds": 5
             },
+            "tick_cache": {
+                "enabled": True,
+                "refresh_interval_ms": 250,
+                "max_staleness_ms": 1000
+            },
+            "portfolio_pnl": {
+                "max_age_ms": 1000
+            },
+            "config_persistence": {
+                "debounce_ms": 250,
+                "snapshot_interval_seconds": 5.0
+            },
+            "candle_store": {
+                "enabled": True,
+                "timeframes": ["1m", "5m", "15m", "1h", "4h", "1d"],
+                "capacity": 500,
+                "backfill_bars": 200,
+                "backfill_retry_seconds": 60.0
+            },
+            "telegram_queue": {
+                "enabled": True,
+                "per_chat_per_second": 1.0,
+                "burst": 3,
+                "global_per_second": 25.0,
+                "coalesce_window_ms": 1500,
+                "max_queue_size": 500,
+                "max_retries": 3
+            },
+            "reconciliation": {
+                "history_lookback_hours": 24.0
+            },
+            "loop_watchdog": {
+                "enabled": True,
+                "interval_ms": 100,
+                "threshold_ms": 100.0,
+                "stack_depth": 12,
+                "max_sites": 50,
+                "log_cooldown_seconds": 30.0
+            },
+            "latency_tracing": {
+                "enabled": True,
+                "window": 1024,
+                "slow_alert_ms": 1000.0,
+                "keep_slow_traces": 20,
+                "http_enabled": False,
+                "http_host": "127.0.0.1",
+                "http_port": 8765
+            },
+            "alert_pipeline": {
+                "enabled": True,
+                "max_workers": 4,
+                "max_queue_per_symbol": 50,
+                "overflow_policy": "block",
+                "enqueue_timeout_seconds": 5.0
+            },
+            "alert_dedup": {
+                "default_window_seconds": 300,
+                "windows": {}
+            },
+            "mt5_executor": {
+                "call_timeout_seconds": 10.0,
+                "order_timeout_seconds": 20.0
+            },
             "dual_order_config": {
                 "enabled": True
             },
@@ -118,12 +218,15 @@ class Config:
                 }
             }
         }
+        self._init_store()
         self.load_config()
+        _OPEN_CONFIGS.add(self)
 
     def load_config(self):
         if os.path.exists(self.config_file):
             with open(self.config_file, 'r', encoding='utf-8') as f:
                 self.config = json.load(f)
+            replayed = self._replay_journal()
             
             # Environment variables ALWAYS override config.json (highest priority)
             # If env var is SET (even if empty), it takes precedence
@@ -152,6 +255,11 @@ class Config:
             if "profit_booking_config" not in self.config:
                 self.config["profit_booking_config"] = self.default_config["profit_booking_config"]
             
+            self.refresh_symbol_specs()
+            self._mark_persisted()
+            if replayed:
+                self.save_snapshot()
+            
             # Debug: Show loaded credentials (mask password)
             if self.config.get("debug", False):
                 try:
@@ -160,54 +268,297 @@ class Config:
                     print(f"Config loaded - MT5 Login: {self.config['mt5_login']}, Server: {self.config['mt5_server']}")
         else:
             self.config = self.default_config
-            self.save_config()
+            self.refresh_symbol_specs()
+            self._mark_persisted()
+            self.save_snapshot()
 
     def save_config(self):
-        """Save config to file with error handling (optimized for speed)"""
-        try:
-            import os
-            import tempfile
-            
-            # Use atomic write with temp file (faster than backup copy)
-            # Write to temp file first, then rename (atomic operation)
+        """
+        Persist sections edited in place since the last save
+        
+        Changed sections are found by comparing each one against its last
+        persisted form; only those are journaled and announced to subscribers.
+        config.json itself is rewritten later by the debounced snapshot.
+        """
+        for section in self._changed_sections():
+            self._changed(section, section)
+
+    def save_snapshot(self):
+        """Fold the journal into config.json atomically (temp file + rename), then drop the journal"""
+        if not self.config_file:
+            return
+        with _file_lock(self.config_file):
             temp_file = f"{self.config_file}.tmp"
-            
-            # Write config to temp file
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
-            
-            # Atomic rename (faster than copy)
-            # On Windows, need to remove existing file first
-            if os.path.exists(self.config_file):
+            try:
+                with self._store_lock:
+                    self._snapshot_dirty = False
+                    sections = dict(self._persisted)
+                
+                # Start from the file on disk so sections saved by other Config
+                # instances survive, then apply every journaled change in order
+                if os.path.exists(self.config_file):
+                    with open(self.config_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                else:
+                    data = {key: json.loads(value) for key, value in sections.items()}
+                self._apply_records(data, self._read_journal())
+                payload = json.dumps(data, indent=4, ensure_ascii=False)
+                
+                # Write to temp file first, then rename (atomic operation)
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
                 os.replace(temp_file, self.config_file)  # Atomic on POSIX, near-atomic on Windows
-            else:
-                os.rename(temp_file, self.config_file)
                 
+                if os.path.exists(self.journal_file):
+                    os.remove(self.journal_file)
+                self._last_snapshot = time.monotonic()
+                self.persist_stats["snapshots"] += 1
+            except Exception as e:
+                print(f"[CONFIG SAVE ERROR] Failed to save config: {e}", flush=True)
+                import traceback
+                traceback.print_exc()
+                # Clean up temp file if it exists
+                try:
+                    if os.path.exists(temp_file):
+                        os.remove(temp_file)
+                except:
+                    pass
+    
+    # ==================== INCREMENTAL PERSISTENCE ====================
+    
+    def _init_store(self):
+        """Dirty tracking, snapshot writer and change listeners (no file I/O)"""
+        self._store_lock = threading.RLock()  # Guards persisted forms and listeners
+        self._persisted: Dict[str, str] = {}  # section -> last persisted JSON
+        self._snapshot_dirty = False          # Journaled but not yet in the snapshot
+        self._last_snapshot = time.monotonic()
+        self._listeners: Dict[str, List[Callable[[str, Any], None]]] = {}
+        self._wakeup = threading.Event()
+        self._flusher = None
+        self._closed = False
+        self.persist_stats = {
+            "updates": 0,
+            "events": 0,
+            "journal_records": 0,
+            "snapshots": 0
+        }
+    
+    @property
+    def journal_file(self) -> Optional[str]:
+        return f"{self.config_file}.journal" if self.config_file else None
+    
+    def _persistence_setting(self, key: str, default: float) -> float:
+        settings = self.config.get("config_persistence") or self.default_config.get("config_persistence", {})
+        return settings.get(key, default)
+    
+    @staticmethod
+    def _serialize(value) -> str:
+        return json.dumps(value, ensure_ascii=False)
+    
+    def _mark_persisted(self):
+        """Take the current sections as the on-disk baseline"""
+        with self._store_lock:
+            self._persisted = {key: self._serialize(value) for key, value in self.config.items()}
+    
+    def _changed_sections(self) -> List[str]:
+        """Sections whose content differs from their persisted form (added/removed included)"""
+        with self._store_lock:
+            persisted = dict(self._persisted)
+        changed = [key for key, value in list(self.config.items())
+                   if persisted.get(key) != self._serialize(value)]
+        changed.extend(key for key in persisted if key not in self.config)
+        return changed
+    
+    def _changed(self, path: str, section: Optional[str] = None):
+        """Record a change at `path` (inside top-level `section`), journal it and notify subscribers"""
+        section = section or path.split(".")[0]
+        with self._store_lock:
+            if section in self.config:
+                try:
+                    value = self._serialize(self.config[section])
+                except (TypeError, ValueError) as e:
+                    print(f"[CONFIG SAVE ERROR] Section {section} is not JSON serializable: {e}", flush=True)
+                    return
+                self._persisted[section] = value
+                record = f'{{"section": {json.dumps(section)}, "value": {value}}}'
+            else:
+                self._persisted.pop(section, None)
+                record = json.dumps({"section": section, "deleted": True})
+            self.persist_stats["updates"] += 1
+        
+        if self.config_file:
+            self._append_journal(record)
+            self._schedule_snapshot()
+        if section in SPEC_KEYS:
+            self.refresh_symbol_specs()
+        self._publish(path)
+    
+    def _append_journal(self, record: str):
+        """Append one changed section to the journal (a few hundred bytes, not the whole file)"""
+        with _file_lock(self.config_file):
+            try:
+                with open(self.journal_file, 'a', encoding='utf-8') as f:
+                    f.write(record + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.persist_stats["journal_records"] += 1
+                self._snapshot_dirty = True
+            except Exception as e:
+                print(f"[CONFIG SAVE ERROR] Failed to write config journal {self.journal_file}: {e}", flush=True)
+    
+    def _schedule_snapshot(self):
+        with self._store_lock:
+            if self._flusher is None and not self._closed:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="config-flusher", daemon=True
+                )
+                self._flusher.start()
+        self._wakeup.set()
+    
+    def _flush_loop(self):
+        debounce = self._persistence_setting("debounce_ms", 250) / 1000.0
+        snapshot_interval = self._persistence_setting("snapshot_interval_seconds", 5.0)
+        while not self._closed:
+            woken = self._wakeup.wait(timeout=snapshot_interval)
+            if self._closed:
+                break
+            if woken:
+                time.sleep(debounce)  # Let the burst finish, then write once
+                self._wakeup.clear()
+            if self._snapshot_dirty and time.monotonic() - self._last_snapshot >= snapshot_interval:
+                self.save_snapshot()
+    
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        if not self.journal_file or not os.path.exists(self.journal_file):
+            return []
+        records = []
+        try:
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break  # Torn final write - everything before it is intact
         except Exception as e:
-            print(f"[CONFIG SAVE ERROR] Failed to save config: {e}", flush=True)
-            import traceback
-            traceback.print_exc()
-            # Clean up temp file if it exists
+            print(f"WARNING: Could not read config journal {self.journal_file}: {e}")
+        return records
+    
+    @staticmethod
+    def _apply_records(data: Dict[str, Any], records: List[Dict[str, Any]]):
+        for record in records:
+            if record.get("deleted"):
+                data.pop(record["section"], None)
+            else:
+                data[record["section"]] = record["value"]
+    
+    def _replay_journal(self) -> int:
+        """Apply journal records left by a crash (compacted into the snapshot by load_config)"""
+        records = self._read_journal()
+        self._apply_records(self.config, records)
+        if records:
+            print(f"SUCCESS: Replayed {len(records)} config journal records")
+        return len(records)
+    
+    def flush(self):
+        """Write everything saved so far into config.json now (shutdown / explicit barrier)"""
+        if self._snapshot_dirty:
+            self.save_snapshot()
+    
+    def close(self):
+        """Stop the flusher and write the final snapshot"""
+        self._closed = True
+        self._wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5.0)
+            self._flusher = None
+        self.flush()
+    
+    def get_persistence_stats(self) -> Dict[str, Any]:
+        with self._store_lock:
+            stats = dict(self.persist_stats)
+            stats["snapshot_dirty"] = self._snapshot_dirty
+        stats["flusher_running"] = self._flusher is not None and self._flusher.is_alive()
+        return stats
+    
+    # ==================== CHANGE EVENTS ====================
+    
+    def subscribe(self, path: str, callback: Callable[[str, Any], None]) -> Callable[[str, Any], None]:
+        """
+        Call callback(changed_path, new_value) when `path` changes
+        
+        A subscriber to "profit_booking_config" hears about
+        "profit_booking_config.enabled" and vice versa - a change to a parent
+        or a child of the subscribed path counts. Returns the callback.
+        """
+        with self._store_lock:
+            self._listeners.setdefault(path, []).append(callback)
+        return callback
+    
+    def unsubscribe(self, path: str, callback: Callable[[str, Any], None]):
+        with self._store_lock:
+            listeners = self._listeners.get(path, [])
+            if callback in listeners:
+                listeners.remove(callback)
+    
+    def _publish(self, path: str):
+        with self._store_lock:
+            targets = [callback for key, callbacks in self._listeners.items()
+                       if key == path or key.startswith(path + ".") or path.startswith(key + ".")
+                       for callback in callbacks]
+        if not targets:
+            return
+        value = self.get_nested(path)
+        for callback in targets:
+            self.persist_stats["events"] += 1
             try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            except:
-                pass
-            raise  # Re-raise to be caught by caller
+                callback(path, value)
+            except Exception as e:
+                print(f"WARNING: Config listener for {path} failed: {e}")
+    
+    def get_nested(self, path: str, default=None):
+        """Read a value by dot path (a top-level key containing dots is matched first)"""
+        if path in self.config:
+            return self.config[path]
+        current = self.config
+        for key in path.split("."):
+            if not isinstance(current, dict) or key not in current:
+                return default
+            current = current[key]
+        return current
 
     def __getitem__(self, key):
         return self.config.get(key)
     
+    def __setitem__(self, key, value):
+        self.update(key, value)
+    
     def get(self, key, default=None):
         return self.config.get(key, default)
     
+    @property
+    def symbol_specs(self) -> SymbolSpecTable:
+        """Compiled per-symbol pip/SL table (see src/utils/symbol_specs.py)"""
+        specs = vars(self).get("_symbol_specs")
+        if specs is None:
+            specs = self.refresh_symbol_specs()
+        return specs
+
+    def refresh_symbol_specs(self) -> SymbolSpecTable:
+        """Recompile the symbol spec table and swap it in"""
+        specs = SymbolSpecTable.from_config(self)
+        self._symbol_specs = specs
+        return specs
+
     def update(self, key, value):
+        """Set a top-level section, journal it and notify subscribers"""
         self.config[key] = value
-        self.save_config()
+        self._changed(key, key)
     
     def update_nested(self, path: str, value):
         """
-        Update nested config value using dot notation
+        Update nested config value using dot notation (persisted like update())
         
         Args:
             path: Dot-separated path (e.g., "re_entry_config.autonomous_config.enabled")
@@ -224,6 +575,7 @@ class Config:
         
         # Set the final value
         current[keys[-1]] = value
+        self._changed(path)
     
     def save(self):
         """Alias for save_config() for compatibility"""
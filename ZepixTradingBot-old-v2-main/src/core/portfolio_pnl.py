@@ -0,0 +1,221 @@
+"""
+Portfolio PnL - Live unrealized PnL for every open trade in one NumPy pass
+
+Built on OpenTradeArrays: entry, direction sign and symbol index are already
+columns there. Per-symbol pip size and pip value per standard lot are held in
+tables indexed like OpenTradeArrays.symbols, so one price read per symbol
+yields the PnL of every trade:
+
+    pnl = sign * (price[symbol] - entry) / pip_size[symbol] * pip_value[symbol] * lots
+
+and bincount over interned group codes gives the per-symbol, re-entry chain,
+profit chain level and session totals. The result is cached until the price
+vector or the trade set changes (bounded by max_age), so RiskManager, the
+profit booking manager and the Telegram dashboard share one computation per
+tick.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.symbol_specs import specs_for
+
+# Pip size used when a symbol has no symbol_config entry (PipCalculator.get_pip_size default)
+DEFAULT_PIP_SIZE = 0.0001
+
+
+class PnLSnapshot:
+    """
+    PnL of all open trades at one price snapshot
+
+    Arrays are in OpenTradeArrays row order. pnl is NaN for trades without a
+    price or pip value; those are left out of every total.
+    """
+
+    def __init__(self, trades: List[Any], prices: np.ndarray, pips: np.ndarray, pnl: np.ndarray,
+                 valid: np.ndarray, by_symbol: Dict[str, float], by_chain: Dict[str, float],
+                 by_profit_chain: Dict[Tuple[str, int], float], by_session: Dict[str, float]):
+        self.trades = trades
+        self.prices = prices
+        self.pips = pips
+        self.pnl = pnl
+        self.valid = valid
+        self.total = float(pnl[valid].sum())
+        self.by_symbol = by_symbol
+        self.by_chain = by_chain
+        self.by_profit_chain = by_profit_chain
+        self.by_session = by_session
+        self.computed_at = time.time()
+        self._rows = {id(trade): row for row, trade in enumerate(trades)}
+
+    def trade_pnl(self, trade) -> Optional[float]:
+        """Live PnL of one trade (None if not open or not priced)"""
+        row = self._rows.get(id(trade))
+        if row is None or not self.valid[row]:
+            return None
+        return float(self.pnl[row])
+
+    def profit_chain_pnl(self, chain_id: str, level: int) -> float:
+        """Combined PnL of a profit booking chain's orders at one level"""
+        return self.by_profit_chain.get((chain_id, level), 0.0)
+
+    def trade_details(self) -> List[Dict[str, Any]]:
+        """Per-trade rows in the RiskManager.get_live_open_trades_pnl format"""
+        details = []
+        for row in np.flatnonzero(self.valid):
+            trade = self.trades[row]
+            details.append({
+                'symbol': trade.symbol,
+                'direction': trade.direction.upper(),
+                'live_pnl': float(self.pnl[row]),
+                'entry_price': trade.entry,
+                'current_price': float(self.prices[row]),
+                'sl_price': trade.sl,
+                'tp_price': trade.tp,
+                'lot_size': trade.lot_size,
+                'trade_id': getattr(trade, 'trade_id', None)
+            })
+        return details
+
+
+class PortfolioPnL:
+    """
+    Cached portfolio PnL over an OpenTradeArrays mirror
+
+    Group fields (chain_id, profit_chain_id, profit_level, session_id) and
+    lot sizes are assigned in place across the codebase, so they are re-read
+    on each recompute rather than trusted from registry events.
+    """
+
+    def __init__(self, config, trade_arrays, price_of: Optional[Callable[[str], Optional[float]]] = None,
+                 registry=None, max_age: Optional[float] = None):
+        self.config = config
+        self.arrays = trade_arrays
+        self.price_of = price_of
+        self.registry = registry
+        if max_age is None:
+            max_age = config.get("portfolio_pnl", {}).get("max_age_ms", 1000) / 1000.0
+        self.max_age = max_age
+
+        # Pip tables indexed like trade_arrays.symbols, built from the compiled symbol specs
+        self.pip_size = np.empty(0, dtype=np.float64)
+        self.pip_value = np.empty(0, dtype=np.float64)
+        self._specs = None
+
+        self._cached: Optional[PnLSnapshot] = None
+        self._cache_key = None
+        self._cache_time = 0.0
+        self.stats = {
+            "computes": 0,
+            "cache_hits": 0,
+            "table_builds": 0
+        }
+
+    # ==================== PIP TABLES ====================
+
+    def _build_tables(self, specs):
+        symbols = self.arrays.symbols
+        self.pip_size = np.fromiter(
+            (specs.pip_size(s, DEFAULT_PIP_SIZE) for s in symbols),
+            dtype=np.float64, count=len(symbols)
+        )
+        # Unknown symbols have no pip value - their trades stay unpriced (NaN)
+        self.pip_value = np.fromiter(
+            (specs[s].pip_value_per_std_lot if s in specs else np.nan for s in symbols),
+            dtype=np.float64, count=len(symbols)
+        )
+        self._specs = specs
+        self.stats["table_builds"] += 1
+
+    def invalidate_tables(self):
+        """Rebuild pip tables on next compute (also done when Config swaps in new specs)"""
+        self.pip_size = np.empty(0, dtype=np.float64)
+        self._cache_key = None
+
+    # ==================== COMPUTE ====================
+
+    def snapshot(self, prices: Optional[np.ndarray] = None) -> PnLSnapshot:
+        """
+        PnL for every open trade at `prices` (indexed like trade_arrays.symbols)
+
+        Without prices, one price read per symbol is taken through price_of.
+        Returns the cached snapshot when neither prices nor trades changed.
+        """
+        if prices is None:
+            prices = self.arrays.price_vector(self.price_of) if self.price_of else \
+                np.full(len(self.arrays.symbols), np.nan)
+
+        key = (self.arrays.revision, prices.tobytes())
+        now = time.monotonic()
+        if self._cached is not None and key == self._cache_key and now - self._cache_time <= self.max_age:
+            self.stats["cache_hits"] += 1
+            return self._cached
+
+        result = self._compute(prices)
+        self._cached, self._cache_key, self._cache_time = result, key, now
+        return result
+
+    def _compute(self, prices: np.ndarray) -> PnLSnapshot:
+        self.stats["computes"] += 1
+        arrays = self.arrays
+        n = len(arrays)
+        specs = specs_for(self.config)
+        if specs is not self._specs or len(self.pip_size) != len(arrays.symbols):
+            self._build_tables(specs)
+
+        trades = list(arrays.trades)
+        symbol_idx = arrays.symbol_idx[:n]
+        sign = arrays.sign[:n].astype(np.float64)
+
+        # One pass over the trade objects for fields that change in place
+        lots = np.empty(n, dtype=np.float64)
+        is_open = np.empty(n, dtype=bool)
+        chain_codes = np.empty(n, dtype=np.int64)
+        profit_codes = np.empty(n, dtype=np.int64)
+        session_codes = np.empty(n, dtype=np.int64)
+        chains: Dict[str, int] = {}
+        profit_chains: Dict[Tuple[str, int], int] = {}
+        sessions: Dict[str, int] = {}
+        for row, trade in enumerate(trades):
+            lots[row] = trade.lot_size or 0.0
+            is_open[row] = trade.status == "open"
+            chain = trade.chain_id
+            chain_codes[row] = chains.setdefault(chain, len(chains)) if chain else -1
+            profit_chain = trade.profit_chain_id
+            profit_codes[row] = profit_chains.setdefault(
+                (profit_chain, trade.profit_level), len(profit_chains)
+            ) if profit_chain else -1
+            session = trade.session_id
+            session_codes[row] = sessions.setdefault(session, len(sessions)) if session else -1
+
+        price = prices[symbol_idx] if n else np.empty(0)
+        with np.errstate(invalid="ignore"):
+            pips = sign * (price - arrays.entry[:n]) / self.pip_size[symbol_idx]
+            pnl = pips * self.pip_value[symbol_idx] * lots
+        valid = is_open & ~np.isnan(pnl) & (sign != 0)
+        weights = np.where(valid, pnl, 0.0)
+
+        by_symbol = self._group(symbol_idx, arrays.symbols, weights, valid)
+        by_chain = self._group(chain_codes, list(chains), weights, valid)
+        by_profit_chain = self._group(profit_codes, list(profit_chains), weights, valid)
+        by_session = self._group(session_codes, list(sessions), weights, valid)
+
+        return PnLSnapshot(trades, price, pips, pnl, valid, by_symbol, by_chain, by_profit_chain, by_session)
+
+    @staticmethod
+    def _group(codes: np.ndarray, keys: List[Any], weights: np.ndarray, valid: np.ndarray) -> Dict[Any, float]:
+        """Sum of valid weights per key (keys present only when they own a valid trade)"""
+        mask = valid & (codes >= 0)
+        if not mask.any():
+            return {}
+        sums = np.bincount(codes[mask], weights=weights[mask], minlength=len(keys))
+        present = np.bincount(codes[mask], minlength=len(keys)) > 0
+        return {keys[i]: float(sums[i]) for i in np.flatnonzero(present)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["trades"] = len(self.arrays)
+        stats["cached_age_ms"] = round((time.monotonic() - self._cache_time) * 1000, 1) if self._cached else None
+        return stats
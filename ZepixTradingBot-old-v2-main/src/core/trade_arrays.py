@@ -0,0 +1,292 @@
+"""
+Open Trade Arrays - NumPy mirror of the open-trade registry for exit sweeps
+
+Every open trade owns one row in a set of column arrays (entry, sl, tp,
+direction sign, symbol index, strategy index, open epoch). Rows are kept in
+sync through OpenTradeRegistry events, so open_time is parsed once when a
+trade opens instead of on every monitor pass.
+
+sweep() evaluates SL hits, TP hits and the trend-reversal grace period for
+all trades in one vectorized pass against a per-symbol price snapshot.
+check_logic_alignment() is called once per distinct (symbol, strategy) pair
+that is past its grace period, and only the rows that must close are handed
+back to Python. When the caller passes the trend manager's alignment_version,
+pair directions are reused across sweeps until the version moves.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.trade_registry import TRADE_ADDED, TRADE_REMOVED, TRADE_UPDATED
+
+logger = logging.getLogger(__name__)
+
+EXIT_SL_HIT = "SL_HIT"
+EXIT_TP_HIT = "TP_HIT"
+EXIT_TREND_REVERSAL = "TREND_REVERSAL"
+
+# Trades younger than this never exit on trend reversal (signals still arriving)
+TREND_EXIT_GRACE_SECONDS = 5 * 60
+
+_INITIAL_CAPACITY = 64
+
+
+def _direction_sign(direction: str) -> int:
+    """+1 buy, -1 sell (any case - V3 orders use BUY/SELL), 0 for anything else"""
+    direction = str(direction).lower()
+    if direction == "buy":
+        return 1
+    if direction == "sell":
+        return -1
+    return 0
+
+
+def _open_epoch(open_time) -> float:
+    """Epoch seconds of open_time; 0.0 (grace already over) if it cannot be parsed"""
+    try:
+        return datetime.fromisoformat(open_time).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class OpenTradeArrays:
+    """Column-oriented mirror of open trades, maintained from registry events"""
+
+    def __init__(self, registry=None, grace_seconds: float = TREND_EXIT_GRACE_SECONDS):
+        self.grace_seconds = grace_seconds
+        self._capacity = _INITIAL_CAPACITY
+        self._size = 0
+        self._alloc(self._capacity)
+
+        self._trades: List[Any] = []           # row -> trade
+        self._rows: Dict[int, int] = {}        # id(trade) -> row
+        self._next_seq = 0
+        self.revision = 0                      # Bumped on every add/remove/refresh
+
+        self.symbols: List[str] = []
+        self._symbol_index: Dict[str, int] = {}
+        self.strategies: List[str] = []
+        self._strategy_index: Dict[str, int] = {}
+
+        # (symbol, strategy) -> trend direction, valid while alignment_version is unchanged
+        self._pair_directions: Dict[Tuple[str, str], int] = {}
+        self._alignment_version = None
+
+        self.stats = {
+            "sweeps": 0,
+            "rows_evaluated": 0,
+            "sl_hits": 0,
+            "tp_hits": 0,
+            "trend_exits": 0,
+            "alignment_checks": 0
+        }
+
+        if registry is not None:
+            self.attach(registry)
+
+    def _alloc(self, capacity: int):
+        self.entry = np.zeros(capacity, dtype=np.float64)
+        self.sl = np.zeros(capacity, dtype=np.float64)
+        self.tp = np.zeros(capacity, dtype=np.float64)
+        self.sign = np.zeros(capacity, dtype=np.int8)
+        self.symbol_idx = np.zeros(capacity, dtype=np.int32)
+        self.strategy_idx = np.zeros(capacity, dtype=np.int32)
+        self.open_epoch = np.zeros(capacity, dtype=np.float64)
+        self.seq = np.zeros(capacity, dtype=np.int64)
+
+    _COLUMNS = ("entry", "sl", "tp", "sign", "symbol_idx", "strategy_idx", "open_epoch", "seq")
+
+    def _grow(self):
+        old = {name: getattr(self, name) for name in self._COLUMNS}
+        self._capacity *= 2
+        self._alloc(self._capacity)
+        for name, column in old.items():
+            getattr(self, name)[:self._size] = column[:self._size]
+
+    # ==================== REGISTRY SYNC ====================
+
+    def attach(self, registry):
+        """Mirror every trade already in `registry` and follow its events"""
+        for trade in registry:
+            self.add(trade)
+        registry.subscribe(self._on_trade_event)
+
+    def _on_trade_event(self, event: str, trade):
+        if event == TRADE_ADDED:
+            self.add(trade)
+        elif event == TRADE_REMOVED:
+            self.remove(trade)
+        elif event == TRADE_UPDATED:
+            self.refresh(trade)
+
+    def _intern(self, value: str, names: List[str], index: Dict[str, int]) -> int:
+        idx = index.get(value)
+        if idx is None:
+            idx = index[value] = len(names)
+            names.append(value)
+        return idx
+
+    def _write_row(self, row: int, trade):
+        self.entry[row] = trade.entry
+        self.sl[row] = trade.sl
+        self.tp[row] = trade.tp
+        self.sign[row] = _direction_sign(trade.direction)
+        self.symbol_idx[row] = self._intern(trade.symbol, self.symbols, self._symbol_index)
+        self.strategy_idx[row] = self._intern(trade.strategy, self.strategies, self._strategy_index)
+        self.open_epoch[row] = _open_epoch(trade.open_time)
+
+    def add(self, trade):
+        if id(trade) in self._rows:
+            return
+        if self._size == self._capacity:
+            self._grow()
+        row = self._size
+        self._size += 1
+        self._write_row(row, trade)
+        self.seq[row] = self._next_seq
+        self._next_seq += 1
+        self._trades.append(trade)
+        self._rows[id(trade)] = row
+        self.revision += 1
+
+    def remove(self, trade):
+        """Swap-remove: the last row moves into the freed slot"""
+        row = self._rows.pop(id(trade), None)
+        if row is None:
+            return
+        last = self._size - 1
+        if row != last:
+            for name in self._COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+            moved = self._trades[last]
+            self._trades[row] = moved
+            self._rows[id(moved)] = row
+        self._trades.pop()
+        self._size = last
+        self.revision += 1
+
+    def refresh(self, trade):
+        row = self._rows.get(id(trade))
+        if row is not None:
+            self._write_row(row, trade)
+            self.revision += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def trades(self) -> List[Any]:
+        """Trades in row order (row i of every column belongs to trades[i])"""
+        return self._trades
+
+    # ==================== SWEEP ====================
+
+    def price_vector(self, price_of: Callable[[str], Optional[float]]) -> np.ndarray:
+        """One price read per symbol; missing/zero prices become NaN (rows skipped)"""
+        prices = np.full(len(self.symbols), np.nan, dtype=np.float64)
+        live = np.unique(self.symbol_idx[:self._size])
+        for idx in live:
+            price = price_of(self.symbols[idx])
+            if price:
+                prices[idx] = price
+        return prices
+
+    def _sync_levels(self):
+        # SL/TP are moved in place (break-even locks, manual edits), so these two
+        # columns are re-read each sweep; everything else only changes via events
+        n = self._size
+        self.sl[:n] = np.fromiter((trade.sl for trade in self._trades), dtype=np.float64, count=n)
+        self.tp[:n] = np.fromiter((trade.tp for trade in self._trades), dtype=np.float64, count=n)
+
+    def sweep(self, prices: np.ndarray, alignment_of: Optional[Callable[[str, str], Dict[str, Any]]] = None,
+              now: Optional[float] = None, alignment_version: Optional[int] = None) -> List[Tuple[Any, str, float]]:
+        """
+        Evaluate all rows against `prices` (indexed like self.symbols)
+
+        Returns (trade, reason, price) for rows that must close, in the order
+        the trades were opened. SL is checked before TP; trend reversal is
+        only considered for rows with neither hit, past the grace period.
+        alignment_version (optional) lets alignment results carry over to the
+        next sweep while it stays the same.
+        """
+        n = self._size
+        self.stats["sweeps"] += 1
+        if n == 0:
+            return []
+        self._sync_levels()
+        now = time.time() if now is None else now
+
+        sign = self.sign[:n].astype(np.float64)
+        price = prices[self.symbol_idx[:n]]
+        valid = ~np.isnan(price) & (sign != 0)
+
+        sl_hit = valid & (sign * (price - self.sl[:n]) <= 0)
+        tp_hit = valid & ~sl_hit & (sign * (price - self.tp[:n]) >= 0)
+        trend_exit = np.zeros(n, dtype=bool)
+
+        if alignment_of is not None:
+            candidates = valid & ~sl_hit & ~tp_hit & (now - self.open_epoch[:n] >= self.grace_seconds)
+            if candidates.any():
+                trend_exit = self._trend_exits(candidates, alignment_of, alignment_version)
+
+        self.stats["rows_evaluated"] += n
+        self.stats["sl_hits"] += int(sl_hit.sum())
+        self.stats["tp_hits"] += int(tp_hit.sum())
+        self.stats["trend_exits"] += int(trend_exit.sum())
+
+        reasons = np.zeros(n, dtype=np.int8)
+        reasons[trend_exit] = 3
+        reasons[tp_hit] = 2
+        reasons[sl_hit] = 1
+        rows = np.flatnonzero(reasons)
+        if rows.size == 0:
+            return []
+        rows = rows[np.argsort(self.seq[rows], kind="stable")]
+        labels = (None, EXIT_SL_HIT, EXIT_TP_HIT, EXIT_TREND_REVERSAL)
+        return [(self._trades[row], labels[reasons[row]], float(price[row])) for row in rows]
+
+    def _trend_exits(self, candidates: np.ndarray, alignment_of, alignment_version=None) -> np.ndarray:
+        """One alignment lookup per distinct (symbol, strategy) among candidate rows"""
+        if alignment_version is None or alignment_version != self._alignment_version:
+            self._pair_directions.clear()
+            self._alignment_version = alignment_version
+
+        n = self._size
+        n_strategies = max(len(self.strategies), 1)
+        pair = self.symbol_idx[:n].astype(np.int64) * n_strategies + self.strategy_idx[:n]
+        pairs = np.unique(pair[candidates])
+
+        # +1 BULLISH, -1 BEARISH, 0 not aligned / neutral
+        pair_direction = {}
+        for key in pairs:
+            symbol = self.symbols[key // n_strategies]
+            strategy = self.strategies[key % n_strategies]
+            direction = self._pair_directions.get((symbol, strategy))
+            if direction is None:
+                alignment = alignment_of(symbol, strategy)
+                self.stats["alignment_checks"] += 1
+                direction = 0
+                if alignment.get("aligned"):
+                    direction = {"BULLISH": 1, "BEARISH": -1}.get(alignment.get("direction"), 0)
+                if alignment_version is not None:
+                    self._pair_directions[(symbol, strategy)] = direction
+            pair_direction[int(key)] = direction
+
+        keys = np.fromiter(pair_direction.keys(), dtype=np.int64, count=len(pair_direction))
+        values = np.fromiter(pair_direction.values(), dtype=np.int8, count=len(pair_direction))
+        trend = np.zeros(n, dtype=np.int8)
+        positions = np.searchsorted(keys, pair[candidates])
+        trend[candidates] = values[positions]
+        # Exit only on a clear opposite trend - neutral never closes a trade
+        return candidates & (trend != 0) & (trend != self.sign[:n])
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["rows"] = self._size
+        stats["symbols"] = len(self.symbols)
+        return stats
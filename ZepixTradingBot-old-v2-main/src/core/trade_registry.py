@@ -0,0 +1,206 @@
+"""
+Open Trade Registry - Indexed container for TradingEngine.open_trades
+
+Trades are stored by identity in an insertion-ordered dict with secondary
+indexes by ticket, symbol, chain_id, profit_chain_id and session_id, so add,
+remove, membership and keyed lookups are O(1) instead of list scans with
+pydantic __eq__. Iteration walks an immutable snapshot, so callers may close
+or add trades while looping. Subscribers receive ("added" | "removed" |
+"updated", trade) events.
+
+The registry keeps the list surface the rest of the codebase uses
+(append/remove/in/len/iteration/slicing) so existing callers keep working.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TRADE_ADDED = "added"
+TRADE_REMOVED = "removed"
+TRADE_UPDATED = "updated"
+
+# Attribute name -> index name
+INDEXED_FIELDS = ("symbol", "chain_id", "profit_chain_id", "session_id")
+
+TradeListener = Callable[[str, Any], None]
+
+
+class OpenTradeRegistry:
+    """Identity-keyed, indexed set of open trades with change events"""
+
+    def __init__(self, trades=None):
+        self._trades: Dict[int, Any] = {}
+        self._by_ticket: Dict[int, Any] = {}
+        self._indexes: Dict[str, Dict[Any, Dict[int, Any]]] = {field: {} for field in INDEXED_FIELDS}
+        # Keys each trade was indexed under, so removal does not depend on current attribute values
+        self._indexed_keys: Dict[int, Tuple[Optional[int], Tuple[Any, ...]]] = {}
+        self._listeners: List[TradeListener] = []
+        self._snapshot: Optional[Tuple[Any, ...]] = None
+        for trade in trades or []:
+            self.add(trade)
+
+    # ==================== MUTATION ====================
+
+    def add(self, trade) -> bool:
+        """Add a trade (no-op if this object is already registered)"""
+        key = id(trade)
+        if key in self._trades:
+            return False
+        self._trades[key] = trade
+        self._index(key, trade)
+        self._snapshot = None
+        self._emit(TRADE_ADDED, trade)
+        return True
+
+    def discard(self, trade) -> bool:
+        """Remove a trade if present; returns True if it was registered"""
+        key = id(trade)
+        if key not in self._trades:
+            return False
+        del self._trades[key]
+        self._unindex(key)
+        self._snapshot = None
+        self._emit(TRADE_REMOVED, trade)
+        return True
+
+    def reindex(self, trade):
+        """Refresh index entries after ticket/symbol/chain fields changed"""
+        key = id(trade)
+        if key not in self._trades:
+            return
+        self._unindex(key)
+        self._index(key, trade)
+        self._emit(TRADE_UPDATED, trade)
+
+    def prune_closed(self) -> List[Any]:
+        """Remove every trade whose status is 'closed'; returns the removed trades"""
+        closed = [trade for trade in self.snapshot() if trade.status == "closed"]
+        for trade in closed:
+            self.discard(trade)
+        return closed
+
+    def replace(self, trades):
+        """Make the registry hold exactly `trades` (events for the difference only)"""
+        wanted = {id(trade): trade for trade in trades}
+        for trade in self.snapshot():
+            if id(trade) not in wanted:
+                self.discard(trade)
+        for trade in wanted.values():
+            self.add(trade)
+
+    def clear(self):
+        for trade in self.snapshot():
+            self.discard(trade)
+
+    # list-compatible aliases
+    def append(self, trade):
+        self.add(trade)
+
+    def extend(self, trades):
+        for trade in trades:
+            self.add(trade)
+
+    def remove(self, trade):
+        if not self.discard(trade):
+            raise ValueError("trade not in registry")
+
+    # ==================== INDEXES ====================
+
+    def _index(self, key: int, trade):
+        ticket = getattr(trade, "trade_id", None)
+        if ticket is not None:
+            self._by_ticket[ticket] = trade
+        values = []
+        for field in INDEXED_FIELDS:
+            value = getattr(trade, field, None)
+            values.append(value)
+            if value is not None:
+                self._indexes[field].setdefault(value, {})[key] = trade
+        self._indexed_keys[key] = (ticket, tuple(values))
+
+    def _unindex(self, key: int):
+        ticket, values = self._indexed_keys.pop(key)
+        if ticket is not None and id(self._by_ticket.get(ticket)) == key:
+            del self._by_ticket[ticket]
+        for field, value in zip(INDEXED_FIELDS, values):
+            if value is None:
+                continue
+            bucket = self._indexes[field].get(value)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._indexes[field][value]
+
+    def _lookup(self, field: str, value) -> List[Any]:
+        bucket = self._indexes[field].get(value)
+        if not bucket:
+            return []
+        # Re-check the live attribute: a field changed without reindex() must not match
+        return [trade for trade in bucket.values() if getattr(trade, field, None) == value]
+
+    def get_by_ticket(self, ticket: int):
+        trade = self._by_ticket.get(ticket)
+        if trade is not None and getattr(trade, "trade_id", None) == ticket:
+            return trade
+        return None
+
+    def by_symbol(self, symbol: str) -> List[Any]:
+        return self._lookup("symbol", symbol)
+
+    def by_chain(self, chain_id: str) -> List[Any]:
+        return self._lookup("chain_id", chain_id)
+
+    def by_profit_chain(self, profit_chain_id: str) -> List[Any]:
+        return self._lookup("profit_chain_id", profit_chain_id)
+
+    def by_session(self, session_id: str) -> List[Any]:
+        return self._lookup("session_id", session_id)
+
+    def symbols(self) -> List[str]:
+        return list(self._indexes["symbol"].keys())
+
+    # ==================== EVENTS ====================
+
+    def subscribe(self, listener: TradeListener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: TradeListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, event: str, trade):
+        for listener in tuple(self._listeners):
+            try:
+                listener(event, trade)
+            except Exception as e:
+                logger.error(f"Trade registry listener error on {event}: {str(e)}")
+
+    # ==================== READ / LIST SURFACE ====================
+
+    def snapshot(self) -> Tuple[Any, ...]:
+        """Immutable view in insertion order (cached until the next change)"""
+        if self._snapshot is None:
+            self._snapshot = tuple(self._trades.values())
+        return self._snapshot
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.snapshot())
+
+    def __len__(self) -> int:
+        return len(self._trades)
+
+    def __bool__(self) -> bool:
+        return bool(self._trades)
+
+    def __contains__(self, trade) -> bool:
+        return id(trade) in self._trades
+
+    def __getitem__(self, item):
+        result = self.snapshot()[item]
+        return list(result) if isinstance(item, slice) else result
+
+    def __repr__(self) -> str:
+        return f"OpenTradeRegistry({len(self._trades)} trades)"
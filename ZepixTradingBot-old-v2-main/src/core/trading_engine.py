@@ -1,13 +1,16 @@
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import time
-from src.models import Alert, Trade, ReEntryChain, ProfitBookingChain
+from src.models import Alert, Trade, TradeRecord, ReEntryChain, ProfitBookingChain
 from src.v3_alert_models import ZepixV3Alert, V3AlertResponse
 from src.config import Config
 from src.managers.risk_manager import RiskManager
 from src.clients.mt5_client import MT5Client
+from src.clients.async_mt5_client import AsyncMT5Client
+from src.clients.telegram_outbound_queue import PRIORITY_INFO
 from src.processors.alert_processor import AlertProcessor
+from src.processors.symbol_alert_pipeline import SymbolAlertPipeline
 from src.database import TradeDatabase
 from src.utils.pip_calculator import PipCalculator
 from src.managers.timeframe_trend_manager import TimeframeTrendManager
@@ -19,7 +22,14 @@ from src.managers.profit_booking_manager import ProfitBookingManager
 from src.managers.profit_booking_reentry_manager import ProfitBookingReEntryManager
 # from src.managers.session_manager import SessionManager # Removed in favor of src.modules.session_manager in TelegramBot
 from src.managers.autonomous_system_manager import AutonomousSystemManager
+from src.services.price_trigger_engine import PriceTriggerEngine
+from src.services.mt5_reconciler import MT5Reconciler
+from src.core.trade_registry import OpenTradeRegistry
+from src.core.trade_arrays import OpenTradeArrays, EXIT_SL_HIT, EXIT_TP_HIT
+from src.core.portfolio_pnl import PortfolioPnL
 from src.utils.optimized_logger import logger
+from src.utils.latency_tracer import LatencyTracer, start_latency_server
+from src.utils.loop_watchdog import EventLoopWatchdog
 from src.core.plugin_system.plugin_registry import PluginRegistry
 from src.core.plugin_system.service_api import ServiceAPI
 import json
@@ -32,6 +42,8 @@ class TradingEngine:
         self.config = config
         self.risk_manager = risk_manager
         self.mt5_client = mt5_client
+        # Awaitable facade - terminal calls run on the single MT5 worker thread
+        self.async_mt5 = AsyncMT5Client.for_client(mt5_client)
         self.telegram_bot = telegram_bot
         self.alert_processor = alert_processor
         
@@ -72,11 +84,37 @@ class TradingEngine:
             config, self.profit_booking_manager, mt5_client, self.reentry_manager.trend_analyzer
         )
 
+        # Event-driven price triggers (shared by all recovery/continuation monitors)
+        self.price_trigger_engine = PriceTriggerEngine(
+            mt5_client,
+            interval_seconds=config.get("tick_cache", {}).get("refresh_interval_ms", 250) / 1000.0
+        )
+
+        # Bulk reconciliation: one positions_get + one ranged history query per cycle
+        reconcile_config = config.get("reconciliation", {})
+        self.reconciler = MT5Reconciler(
+            mt5_client, self.async_mt5,
+            lookback_hours=reconcile_config.get("history_lookback_hours", 24.0)
+        )
+
+        # Alert-to-order stage timings (Telegram /latency, optional local JSON endpoint)
+        self.latency_tracer = LatencyTracer.from_config(config)
+        self.latency_server = None
+        
+        # Event-loop lag measurement with blocking call-site attribution
+        self.loop_watchdog = EventLoopWatchdog.from_config(config)
+        
+        # Per-symbol ordered alert ingestion (symbols run in parallel)
+        pipeline_config = config.get("alert_pipeline", {})
+        self.alert_pipeline = None
+        if pipeline_config.get("enabled", True):
+            self.alert_pipeline = SymbolAlertPipeline.from_config(self._dispatch_alert, pipeline_config)
+
         # Initialize Autonomous System Manager
         self.autonomous_manager = AutonomousSystemManager(
             config, self.reentry_manager, self.profit_booking_manager,
             self.profit_booking_reentry_manager, mt5_client, telegram_bot,
-            self.risk_manager
+            self.risk_manager, price_trigger_engine=self.price_trigger_engine
         )
         
         # NEW: Advanced re-entry and exit handlers
@@ -94,7 +132,17 @@ class TradingEngine:
         # Initialize logger
         self.logger = logger
         
-        self.open_trades: List[Trade] = []
+        # Indexed open-trade registry (list-compatible); managers subscribe to its events
+        self._open_trades = OpenTradeRegistry()
+        self.risk_manager.attach_trade_registry(self._open_trades)
+        self.profit_booking_manager.attach_trade_registry(self._open_trades)
+        # NumPy mirror of open trades for the per-pass SL/TP/trend-exit sweep
+        self.trade_arrays = OpenTradeArrays(self._open_trades)
+        # Live PnL of every open trade from one price snapshot (risk, profit booking, dashboard)
+        self.portfolio_pnl = PortfolioPnL(
+            config, self.trade_arrays, mt5_client.get_current_price, registry=self._open_trades
+        )
+        self.profit_booking_manager.attach_portfolio_pnl(self.portfolio_pnl)
         self.is_paused = False
         self.trade_count = 0
         
@@ -110,6 +158,16 @@ class TradingEngine:
             service_api=self.service_api
         )
     
+    @property
+    def open_trades(self) -> OpenTradeRegistry:
+        return self._open_trades
+
+    @open_trades.setter
+    def open_trades(self, trades):
+        """Assigning a list replaces the registry contents (events fire for the difference)"""
+        if trades is not self._open_trades:
+            self._open_trades.replace(list(trades))
+
     def get_open_trades(self) -> List[Trade]:
         """Get list of currently open trades"""
         return self.open_trades
@@ -132,6 +190,21 @@ class TradingEngine:
 
             self.telegram_bot.set_trend_manager(self.trend_manager)
             
+            # Start shared tick cache refresher (one terminal read per symbol per interval)
+            await self.mt5_client.start_tick_refresher(self.config.get("symbol_config", {}).keys())
+            await self.price_trigger_engine.start()
+            
+            if self.config.get("loop_watchdog", {}).get("enabled", True):
+                await self.loop_watchdog.start()
+            
+            latency_config = self.config.get("latency_tracing", {})
+            if latency_config.get("http_enabled", False) and self.latency_server is None:
+                self.latency_server = start_latency_server(
+                    self.latency_tracer,
+                    host=latency_config.get("http_host", "127.0.0.1"),
+                    port=latency_config.get("http_port", 8765)
+                )
+            
             # DIAGNOSTIC: Log re-entry configuration on startup
             re_entry_config = self.config.get("re_entry_config", {})
             import logging
@@ -182,6 +255,22 @@ class TradingEngine:
             }
 
     async def process_alert(self, data: Dict[str, Any]) -> bool:
+        """
+        Queue the alert on its symbol's lane and wait for the result
+        
+        Alerts for one symbol are handled strictly in arrival order; other
+        symbols are processed concurrently by the pipeline workers.
+        """
+        if self.alert_pipeline is None:
+            return await self._dispatch_alert(data)
+        return await self.alert_pipeline.process(data)
+
+    async def _dispatch_alert(self, data: Dict[str, Any]) -> bool:
+        """Route the alert under a latency trace (stage timings per alert)"""
+        with self.latency_tracer.trace(data):
+            return await self._route_alert(data)
+
+    async def _route_alert(self, data: Dict[str, Any]) -> bool:
         """Enhanced alert router with v3 support"""
         
         # PLUGIN HOOK: on_signal_received
@@ -194,7 +283,8 @@ class TradingEngine:
                  except:
                      pass
                      
-             modified_data = await self.plugin_registry.execute_hook("signal_received", data)
+             with self.latency_tracer.stage("plugin_hooks"):
+                 modified_data = await self.plugin_registry.execute_hook("signal_received", data)
              if modified_data is False:
                  logger.info("Signal rejected by a plugin hook 'on_signal_received'.")
                  return False
@@ -209,11 +299,13 @@ class TradingEngine:
                 logger.info("🚀 V3 Entry Signal - BYPASSING Trend Manager")
                 logger.info("   Reason: V3 has pre-validated 5-layer confluence")
                 
-                v3_alert = ZepixV3Alert(**data)
+                with self.latency_tracer.stage("parse"):
+                    v3_alert = ZepixV3Alert(**data)
                 
                 # Update MTF trends in background
                 if v3_alert.mtf_trends:
-                    self.alert_processor.process_mtf_trends(v3_alert.mtf_trends, v3_alert.symbol)
+                    with self.latency_tracer.stage("mtf_trends"):
+                        self.alert_processor.process_mtf_trends(v3_alert.mtf_trends, v3_alert.symbol)
                 
                 # Check if this is an aggressive reversal signal
                 AGGRESSIVE_SIGNALS = [
@@ -225,7 +317,8 @@ class TradingEngine:
                 
                 if v3_alert.signal_type in AGGRESSIVE_SIGNALS or v3_alert.consensus_score >= 7:
                     # Handle aggressive reversal first (close conflicting positions)
-                    reversal_result = await self.handle_v3_reversal(v3_alert)
+                    with self.latency_tracer.stage("reversal"):
+                        reversal_result = await self.handle_v3_reversal(v3_alert)
                     logger.info(f"Reversal result: {reversal_result.get('status')}")
                 
                 # Execute WITHOUT checking trend alignment
@@ -248,7 +341,8 @@ class TradingEngine:
                     f"🔔 Volatility Squeeze Detected\n"
                     f"Symbol: {v3_alert.symbol}\n"
                     f"Timeframe: {v3_alert.tf}\n"
-                    f"Big move expected - prepare for breakout!"
+                    f"Big move expected - prepare for breakout!",
+                    priority=PRIORITY_INFO, coalesce_key="squeeze"
                 )
                 return True
             
@@ -259,7 +353,8 @@ class TradingEngine:
                 return True
             
             # LEGACY ALERTS (existing code)
-            alert = Alert(**data)
+            with self.latency_tracer.stage("parse"):
+                alert = Alert(**data)
             symbol = alert.symbol
             
             # Initialize symbol signals if not exists
@@ -282,8 +377,7 @@ class TradingEngine:
                         close_info['exit_reason']
                     )
                     # Remove from open trades
-                    if close_info['trade'] in self.open_trades:
-                        self.open_trades.remove(close_info['trade'])
+                    if self.open_trades.discard(close_info['trade']):
                         self.risk_manager.remove_open_trade(close_info['trade'])
                     
                     # Stop TP continuation monitoring for this symbol (opposite signal received)
@@ -303,14 +397,16 @@ class TradingEngine:
                     self.telegram_bot.send_message(
                         f"🔒 {symbol} {alert.tf.upper()} Signal Received: {alert.signal.upper()}\n"
                         f"Trend Locked: {current_trend} (Manual Mode)\n"
-                        f"Signal ignored - trend will not change"
+                        f"Signal ignored - trend will not change",
+                        priority=PRIORITY_INFO, coalesce_key="trend_update"
                     )
                 else:
                     # Auto mode - update trend and notify
                     self.trend_manager.update_trend(symbol, alert.tf, alert.signal)
                     self.current_signals[symbol][alert.tf] = alert.signal
                     self.telegram_bot.send_message(
-                        f"📊 {symbol} {alert.tf.upper()} Bias Updated: {alert.signal.upper()}"
+                        f"📊 {symbol} {alert.tf.upper()} Bias Updated: {alert.signal.upper()}",
+                        priority=PRIORITY_INFO, coalesce_key="trend_update"
                     )
                 
             elif alert.type == 'trend':
@@ -323,14 +419,16 @@ class TradingEngine:
                     self.telegram_bot.send_message(
                         f"🔒 {symbol} {alert.tf.upper()} Signal Received: {alert.signal.upper()}\n"
                         f"Trend Locked: {current_trend} (Manual Mode)\n"
-                        f"Signal ignored - trend will not change"
+                        f"Signal ignored - trend will not change",
+                        priority=PRIORITY_INFO, coalesce_key="trend_update"
                     )
                 else:
                     # Auto mode - update trend and notify
                     self.trend_manager.update_trend(symbol, alert.tf, alert.signal)
                     self.current_signals[symbol][alert.tf] = alert.signal
                     self.telegram_bot.send_message(
-                        f"📊 {symbol} {alert.tf.upper()} Trend Updated: {alert.signal.upper()}"
+                        f"📊 {symbol} {alert.tf.upper()} Trend Updated: {alert.signal.upper()}",
+                        priority=PRIORITY_INFO, coalesce_key="trend_update"
                     )
             
             elif alert.type == 'entry':
@@ -347,12 +445,18 @@ class TradingEngine:
             
             elif alert.type == 'reversal':
                 # Reversal alerts are handled above in exit check
-                self.telegram_bot.send_message(f"🔄 {symbol} Reversal Signal: {alert.signal.upper()}")
+                self.telegram_bot.send_message(
+                    f"🔄 {symbol} Reversal Signal: {alert.signal.upper()}",
+                    priority=PRIORITY_INFO, coalesce_key="signal_info"
+                )
             
             elif alert.type == 'exit':
                 # Exit Appeared alerts are handled above in exit check
                 exit_direction = "Bullish" if alert.signal == 'bull' else "Bearish"
-                self.telegram_bot.send_message(f"⚠️ {symbol} Exit Appeared: {exit_direction}")
+                self.telegram_bot.send_message(
+                    f"⚠️ {symbol} Exit Appeared: {exit_direction}",
+                    priority=PRIORITY_INFO, coalesce_key="signal_info"
+                )
             
             return True
             
@@ -384,6 +488,8 @@ class TradingEngine:
                 f"Signal={alert.signal_type} | Score={alert.consensus_score}/9"
             )
             
+            sizing_started = time.perf_counter()
+            
             # Step 1: Get base lot
             account_balance = self.mt5_client.get_account_balance()
             base_lot = self.risk_manager.get_fixed_lot_size(account_balance)
@@ -413,6 +519,7 @@ class TradingEngine:
                 f"📊 Final Lots: Order A={order_a_lot:.2f} | Order B={order_b_lot:.2f} | "
                 f"Total={final_base_lot:.2f}"
             )
+            self.latency_tracer.record("lot_sizing", (time.perf_counter() - sizing_started) * 1000.0)
             
             # Step 5: Place hybrid dual orders
             result = await self._place_hybrid_dual_orders_v3(
@@ -474,6 +581,8 @@ class TradingEngine:
         CRITICAL RULE: Order B MUST preserve pyramid system
         """
         try:
+            calc_started = time.perf_counter()
+            
             # Generate shared chain ID for dual orders
             chain_id = f"{alert.symbol}_{uuid.uuid4().hex[:8]}"
             
@@ -502,7 +611,7 @@ class TradingEngine:
                 logger.warning(f"⚠️ Order A: v3 TP missing, using bot TP = {tp_price_a:.2f}")
             
             # Create Order A
-            order_a = Trade(
+            order_a = TradeRecord(
                 symbol=alert.symbol,
                 entry=alert.price,
                 sl=sl_price_a,
@@ -549,7 +658,7 @@ class TradingEngine:
                 )
             
             # Create Order B
-            order_b = Trade(
+            order_b = TradeRecord(
                 symbol=alert.symbol,
                 entry=alert.price,
                 sl=sl_price_b,
@@ -571,6 +680,7 @@ class TradingEngine:
                 "market_trend": alert.market_trend,
                 "sl_source": "FIXED_PYRAMID"
             }
+            self.latency_tracer.record("sl_tp_calc", (time.perf_counter() - calc_started) * 1000.0)
             
             # Place both orders
             order_a_placed = False
@@ -578,29 +688,31 @@ class TradingEngine:
             
             if not self.config.get("simulate_orders", False):
                 # Place Order A
-                trade_id_a = self.mt5_client.place_order(
-                    symbol=alert.symbol,
-                    order_type=alert.direction,
-                    lot_size=order_a_lot,
-                    price=alert.price,
-                    sl=sl_price_a,
-                    tp=tp_price_a,
-                    comment=f"{logic_type}_V3_A"
-                )
+                with self.latency_tracer.stage("order_send"):
+                    trade_id_a = await self.async_mt5.place_order(
+                        symbol=alert.symbol,
+                        order_type=alert.direction,
+                        lot_size=order_a_lot,
+                        price=alert.price,
+                        sl=sl_price_a,
+                        tp=tp_price_a,
+                        comment=f"{logic_type}_V3_A"
+                    )
                 if trade_id_a:
                     order_a.trade_id = trade_id_a
                     order_a_placed = True
                 
                 # Place Order B
-                trade_id_b = self.mt5_client.place_order(
-                    symbol=alert.symbol,
-                    order_type=alert.direction,
-                    lot_size=order_b_lot,
-                    price=alert.price,
-                    sl=sl_price_b,
-                    tp=tp_price_b,
-                    comment=f"{logic_type}_V3_B"
-                )
+                with self.latency_tracer.stage("order_send"):
+                    trade_id_b = await self.async_mt5.place_order(
+                        symbol=alert.symbol,
+                        order_type=alert.direction,
+                        lot_size=order_b_lot,
+                        price=alert.price,
+                        sl=sl_price_b,
+                        tp=tp_price_b,
+                        comment=f"{logic_type}_V3_B"
+                    )
                 if trade_id_b:
                     order_b.trade_id = trade_id_b
                     order_b_placed = True
@@ -612,6 +724,7 @@ class TradingEngine:
                 order_b_placed = True
             
             # Store trades and create chains
+            registration_started = time.perf_counter()
             if order_a_placed:
                 self.open_trades.append(order_a)
                 self.risk_manager.add_open_trade(order_a)
@@ -622,22 +735,25 @@ class TradingEngine:
                     self.price_monitor.register_sl_hunt(order_a, logic_type)
             
             if order_b_placed:
-                self.open_trades.append(order_b)
-                self.risk_manager.add_open_trade(order_b)
-                self.db.save_trade(order_b)
-                
-                # Register profit chain for Order B
+                # Register profit chain for Order B (before it is added - the
+                # trade registry indexes profit_chain_id on add)
                 if self.profit_booking_manager.is_enabled():
                     profit_chain = self.profit_booking_manager.create_profit_chain(order_b)
                     if profit_chain:
                         order_b.profit_chain_id = profit_chain.chain_id
                         order_b.profit_level = 0
                 
+                self.open_trades.append(order_b)
+                self.risk_manager.add_open_trade(order_b)
+                self.db.save_trade(order_b)
+                
                 # Register for SL hunt
                 if self.config.get("re_entry_config", {}).get("sl_hunt_reentry_enabled", True):
                     self.price_monitor.register_sl_hunt(order_b, logic_type)
+            self.latency_tracer.record("registration", (time.perf_counter() - registration_started) * 1000.0)
             
             # Send notification
+            notify_started = time.perf_counter()
             if order_a_placed and order_b_placed:
                 message = (
                     f"🎯 V3 DUAL ORDER PLACED\n"
@@ -673,6 +789,7 @@ class TradingEngine:
                     f"❌ V3 Order: Both orders failed\n"
                     f"Signal: {alert.signal_type}"
                 )
+            self.latency_tracer.record("notify", (time.perf_counter() - notify_started) * 1000.0)
             
             logger.info(
                 f"✅ Hybrid V3 Dual Orders Result:\n"
@@ -725,8 +842,8 @@ class TradingEngine:
             
             # Get positions to close
             positions_to_close = [
-                trade for trade in self.open_trades
-                if trade.symbol == symbol and trade.direction == close_direction
+                trade for trade in self.open_trades.by_symbol(symbol)
+                if trade.direction == close_direction
             ]
             
             if not positions_to_close:
@@ -745,22 +862,21 @@ class TradingEngine:
                     # Get current profit before closing
                     current_profit = 0
                     try:
-                        position_info = self.mt5_client.get_position(trade.trade_id)
+                        position_info = await self.async_mt5.get_position(trade.trade_id)
                         if position_info:
                             current_profit = position_info.get('profit', 0)
                     except Exception as e:
                         logger.warning(f"Could not get profit for trade #{trade.trade_id}: {e}")
                     
                     # Close position
-                    success = self.mt5_client.close_position(trade.trade_id)
+                    success = await self.async_mt5.close_position(trade.trade_id)
                     
                     if success:
                         trade.status = "closed"
                         trade.close_reason = alert.signal_type
                         
                         # Remove from open trades
-                        if trade in self.open_trades:
-                            self.open_trades.remove(trade)
+                        self.open_trades.discard(trade)
                         self.risk_manager.remove_open_trade(trade)
                         
                         # Update database
@@ -882,14 +998,13 @@ class TradingEngine:
             
             # Get conflicting positions
             conflicting_trades = []
-            for trade in self.open_trades:
-                if trade.symbol == symbol:
-                    is_conflict = (
-                        (trade.direction == "BUY" and alert.direction == "sell") or
-                        (trade.direction == "SELL" and alert.direction == "buy")
-                    )
-                    if is_conflict:
-                        conflicting_trades.append(trade)
+            for trade in self.open_trades.by_symbol(symbol):
+                is_conflict = (
+                    (trade.direction == "BUY" and alert.direction == "sell") or
+                    (trade.direction == "SELL" and alert.direction == "buy")
+                )
+                if is_conflict:
+                    conflicting_trades.append(trade)
             
             if not conflicting_trades:
                 logger.info(f"No conflicting positions for aggressive reversal")
@@ -910,21 +1025,20 @@ class TradingEngine:
                     # Get profit before closing
                     current_profit = 0
                     try:
-                        position_info = self.mt5_client.get_position(trade.trade_id)
+                        position_info = await self.async_mt5.get_position(trade.trade_id)
                         if position_info:
                             current_profit = position_info.get('profit', 0)
                             total_profit += current_profit
                     except Exception as e:
                         logger.warning(f"Could not get profit: {e}")
                     
-                    success = self.mt5_client.close_position(trade.trade_id)
+                    success = await self.async_mt5.close_position(trade.trade_id)
                     
                     if success:
                         trade.status = "closed"
                         trade.close_reason = "v3_aggressive_reversal"
                         
-                        if trade in self.open_trades:
-                            self.open_trades.remove(trade)
+                        self.open_trades.discard(trade)
                         self.risk_manager.remove_open_trade(trade)
                         self.db.save_trade(trade)
                         
@@ -1204,10 +1318,12 @@ class TradingEngine:
                     async def check_order_b_quick_close():
                         await asyncio.sleep(3)  # Non-blocking wait for 3 seconds
                         
-                        import MetaTrader5 as mt5
-                        position_b = mt5.positions_get(ticket=order_b_trade_id)
+                        if self.config.get("simulate_orders", False):
+                            return
+                        
+                        position_b = await self.async_mt5.get_position(order_b_trade_id)
                         
-                        if not position_b or len(position_b) == 0:
+                        if not position_b:
                             # Order B closed within 3 seconds - send follow-up notification
                             self.telegram_bot.send_message(
                                 f"⚠️ ORDER B UPDATE: #{order_b_trade_id}\n"
@@ -1326,7 +1442,7 @@ class TradingEngine:
                 self.telegram_bot.send_message(warning)
             
             # Create trade object
-            trade = Trade(
+            trade = TradeRecord(
                 symbol=alert.symbol,
                 entry=alert.price,
                 sl=sl_price,
@@ -1342,7 +1458,7 @@ class TradingEngine:
             
             # Execute trade
             if not self.config.get("simulate_orders", False):
-                trade_id = self.mt5_client.place_order(
+                trade_id = await self.async_mt5.place_order(
                     symbol=alert.symbol,
                     order_type=alert.signal,
                     lot_size=lot_size,
@@ -1448,7 +1564,7 @@ class TradingEngine:
             # Check if dual orders enabled
             if self.dual_order_manager.is_enabled():
                 # Create Order A (TP Trail) for re-entry
-                order_a = Trade(
+                order_a = TradeRecord(
                     symbol=alert.symbol,
                     entry=alert.price,
                     sl=sl_price,
@@ -1469,7 +1585,7 @@ class TradingEngine:
                 # Place Order A
                 order_a_placed = False
                 if not self.config.get("simulate_orders", False):
-                    trade_id_a = self.mt5_client.place_order(
+                    trade_id_a = await self.async_mt5.place_order(
                         symbol=alert.symbol,
                         order_type=alert.signal,
                         lot_size=lot_size,
@@ -1487,7 +1603,7 @@ class TradingEngine:
                     order_a_placed = True
                 
                 # Create Order B (Profit Trail) for re-entry
-                order_b = Trade(
+                order_b = TradeRecord(
                     symbol=alert.symbol,
                     entry=alert.price,
                     sl=sl_price,
@@ -1508,7 +1624,7 @@ class TradingEngine:
                 # Place Order B independently
                 order_b_placed = False
                 if not self.config.get("simulate_orders", False):
-                    trade_id_b = self.mt5_client.place_order(
+                    trade_id_b = await self.async_mt5.place_order(
                         symbol=alert.symbol,
                         order_type=alert.signal,
                         lot_size=lot_size,
@@ -1603,7 +1719,7 @@ class TradingEngine:
             
             # Fallback: Single order (if dual orders disabled)
             # Create trade object
-            trade = Trade(
+            trade = TradeRecord(
                 symbol=alert.symbol,
                 entry=alert.price,
                 sl=sl_price,
@@ -1621,7 +1737,7 @@ class TradingEngine:
             
             # Execute trade
             if not self.config.get("simulate_orders", False):
-                trade_id = self.mt5_client.place_order(
+                trade_id = await self.async_mt5.place_order(
                     symbol=alert.symbol,
                     order_type=alert.signal,
                     lot_size=lot_size,
@@ -1675,144 +1791,127 @@ class TradingEngine:
     async def reconcile_with_mt5(self):
         """Sync bot's trade list with MT5 positions - auto-close orphaned trades"""
         try:
-            import MetaTrader5 as mt5
+            # Diff ticket sets and resolve PnL for every missing position in bulk
+            closed_positions = await self.reconciler.find_closed(self.open_trades)
             
-            # Get all open positions from MT5
-            mt5_positions = mt5.positions_get()
-            mt5_ticket_ids = {pos.ticket for pos in mt5_positions} if mt5_positions else set()
-            
-            # Check each bot trade against MT5
-            for trade in self.open_trades[:]:  # Use slice to avoid modifying list during iteration
-                if trade.status == "closed":
-                    continue
-                    
-                if trade.trade_id and trade.trade_id not in mt5_ticket_ids:
-                    # Position doesn't exist in MT5 - was auto-closed by TP/SL
-                    current_price = self.mt5_client.get_current_price(trade.symbol)
-                    
-                    # FIX #8: Determine close reason from PnL (positive = TP, negative = SL)
-                    # Use actual profit from MT5 history if available
-                    pnl = self.mt5_client.get_closed_trade_profit(trade.trade_id)
-                    
-                    if pnl is None:
-                        # Fallback: Manual calculation (only if history fetch fails)
-                        pnl = (current_price - trade.entry) * trade.lot_size * 100 if trade.direction == "buy" else (trade.entry - current_price) * trade.lot_size * 100
-                    
-                    if pnl > 0:
-                        close_reason = "TP_HIT_AUTO_CLOSED"
-                        print(f"Auto-reconciliation: Position {trade.trade_id} closed by Take Profit (PnL: ${pnl:.2f})")
-                    else:
-                        close_reason = "SL_HIT_AUTO_CLOSED"
-                        print(f"Auto-reconciliation: Position {trade.trade_id} closed by Stop Loss (PnL: ${pnl:.2f})")
-                    
-                    await self.close_trade(trade, close_reason, current_price)
-                    
-                    # NEW: Check for Profit Order SL Hit
-                    if close_reason == "SL_HIT_AUTO_CLOSED" and trade.profit_chain_id:
-                        # Register for recovery re-entry
-                        self.profit_booking_reentry_manager.register_sl_hit(
-                            trade.profit_chain_id,
-                            trade.symbol,
-                            trade.direction,
-                            trade.profit_level,
-                            trade.sl,
-                            pnl # Negative value
-                        )
-                        # Notify
-                        self.telegram_bot.send_profit_hunt_notification(
-                            trade.symbol, 
-                            trade.profit_chain_id, 
-                            trade.profit_level, 
-                            pnl, 
-                            abs(current_price - trade.sl)/self.pip_calculator.get_pip_size(trade.symbol)
-                        )
+            for closed in closed_positions:
+                trade = closed["trade"]
+                pnl = closed["pnl"]
+                current_price = closed["close_price"] or self.mt5_client.get_current_price(trade.symbol)
+                
+                if pnl is None:
+                    # Fallback: Manual calculation (only if history has no deals yet)
+                    pnl = (current_price - trade.entry) * trade.lot_size * 100 if trade.direction == "buy" else (trade.entry - current_price) * trade.lot_size * 100
+                
+                # FIX #8: Determine close reason from PnL (positive = TP, negative = SL)
+                if pnl > 0:
+                    close_reason = "TP_HIT_AUTO_CLOSED"
+                    print(f"Auto-reconciliation: Position {trade.trade_id} closed by Take Profit (PnL: ${pnl:.2f})")
+                else:
+                    close_reason = "SL_HIT_AUTO_CLOSED"
+                    print(f"Auto-reconciliation: Position {trade.trade_id} closed by Stop Loss (PnL: ${pnl:.2f})")
+                
+                # Position and PnL already known - close_trade must not query MT5 again
+                await self.close_trade(trade, close_reason, current_price,
+                                       closed_pnl=pnl, position_closed=True)
+                
+                # NEW: Check for Profit Order SL Hit
+                if close_reason == "SL_HIT_AUTO_CLOSED" and trade.profit_chain_id:
+                    # Register for recovery re-entry
+                    self.profit_booking_reentry_manager.register_sl_hit(
+                        trade.profit_chain_id,
+                        trade.symbol,
+                        trade.direction,
+                        trade.profit_level,
+                        trade.sl,
+                        pnl # Negative value
+                    )
+                    # Notify
+                    self.telegram_bot.send_profit_hunt_notification(
+                        trade.symbol, 
+                        trade.profit_chain_id, 
+                        trade.profit_level, 
+                        pnl, 
+                        abs(current_price - trade.sl)/self.pip_calculator.get_pip_size(trade.symbol)
+                    )
                     
         except Exception as e:
             print(f"WARNING: Reconciliation error: {e}")
     
+    async def run_monitor_cycle(self):
+        """One pass of the trade monitor: reconcile, autonomous checks, session end, exits"""
+        # MT5 Reconciliation - Check if positions still exist in MT5
+        if not self.config["simulate_orders"]:
+            await self.reconcile_with_mt5()
+        
+        # 🔄 RUN AUTONOMOUS CHECKS (TP Continuation, Profit Checks)
+        if hasattr(self, 'autonomous_manager') and self.autonomous_manager:
+            await self.autonomous_manager.run_autonomous_checks(self.open_trades, self)
+        
+        # Remove closed trades from list
+        self.open_trades.prune_closed()
+        
+        # Check if session should end (all positions closed)
+        closed_session = self.session_manager.check_session_end(self.open_trades)
+        
+        if closed_session:
+            pnl = closed_session.get('total_pnl', 0)
+            win_rate = closed_session.get('breakdown', {}).get('win_rate', 0)
+            s_id = closed_session.get('session_id')
+            icon = "💰" if pnl > 0 else "❌"
+            
+            self.telegram_bot.send_message(
+                f"{icon} <b>SESSION COMPLETED #{s_id.split('_')[-1]}</b>\n"
+                f"━━━━━━━━━━━━━━━━━━━━━━━━\n"
+                f"💵 P&L: ${pnl:.2f}\n"
+                f"🎯 Win Rate: {win_rate:.1f}%\n"
+                f"📝 Trades: {closed_session.get('total_trades', 0)}\n\n"
+                f"See report: /session_report_{s_id}"
+            )
+            
+            # CRITICAL FIX #5: Zombie Chains
+            # When session ends, clear all background monitoring
+            self.price_monitor.clear_all_monitoring()
+            logger.info("✅ Session Closed -> Monitoring Cleared (Clean Slate)")
+        
+        # One price read per symbol, then SL/TP/trend checks for every trade in one pass
+        prices = self.trade_arrays.price_vector(self.mt5_client.get_current_price)
+        exits = self.trade_arrays.sweep(
+            prices, self.trend_manager.check_logic_alignment,
+            alignment_version=self.trend_manager.alignment_version
+        )
+        
+        for trade, reason, current_price in exits:
+            if trade.status == "closed":
+                continue
+            
+            await self.close_trade(trade, reason, current_price)
+            
+            if reason == EXIT_SL_HIT:
+                self.reentry_manager.record_sl_hit(trade)
+                
+                # NEW: Register for SL hunt re-entry monitoring via AUTONOMOUS SYSTEM
+                # REROUTED: Uses 1s precision monitor & symbol-specific windows
+                if hasattr(self, 'autonomous_manager') and self.autonomous_manager:
+                    self.autonomous_manager.register_sl_recovery(trade, trade.strategy)
+                # Fallback for legacy support
+                elif self.config["re_entry_config"]["sl_hunt_reentry_enabled"]:
+                    self.price_monitor.register_sl_hunt(trade, trade.strategy)
+            
+            elif reason == EXIT_TP_HIT:
+                # BACKGROUND LOOP - Silenced for clean logs (only Telegram notification sent)
+                self.reentry_manager.record_tp_hit(trade, current_price)
+                
+                # Register for TP continuation re-entry monitoring if enabled
+                tp_reentry_enabled = self.config["re_entry_config"].get("tp_reentry_enabled", False)
+                if tp_reentry_enabled:
+                    self.price_monitor.register_tp_continuation(trade, current_price, trade.strategy)
+
     async def manage_open_trades(self):
         """Monitor and manage open trades with circuit breaker"""
         while True:
             try:
-                # MT5 Reconciliation - Check if positions still exist in MT5
-                if not self.config["simulate_orders"]:
-                    await self.reconcile_with_mt5()
-                
-                # 🔄 RUN AUTONOMOUS CHECKS (TP Continuation, Profit Checks)
-                if hasattr(self, 'autonomous_manager') and self.autonomous_manager:
-                    await self.autonomous_manager.run_autonomous_checks(self.open_trades, self)
-                
-                # Remove closed trades from list
-                self.open_trades = [t for t in self.open_trades if t.status != "closed"]
-                
-                # Check if session should end (all positions closed)
-                closed_session = self.session_manager.check_session_end(self.open_trades)
-                
-                if closed_session:
-                    pnl = closed_session.get('total_pnl', 0)
-                    win_rate = closed_session.get('breakdown', {}).get('win_rate', 0)
-                    s_id = closed_session.get('session_id')
-                    icon = "💰" if pnl > 0 else "❌"
-                    
-                    self.telegram_bot.send_message(
-                        f"{icon} <b>SESSION COMPLETED #{s_id.split('_')[-1]}</b>\n"
-                        f"━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                        f"💵 P&L: ${pnl:.2f}\n"
-                        f"🎯 Win Rate: {win_rate:.1f}%\n"
-                        f"📝 Trades: {closed_session.get('total_trades', 0)}\n\n"
-                        f"See report: /session_report_{s_id}"
-                    )
-                    
-                    # CRITICAL FIX #5: Zombie Chains
-                    # When session ends, clear all background monitoring
-                    self.price_monitor.clear_all_monitoring()
-                    logger.info("✅ Session Closed -> Monitoring Cleared (Clean Slate)")
-                
-                for trade in self.open_trades:
-                    if trade.status == "closed":
-                        continue
-                    
-                    # Get current price
-                    current_price = self.mt5_client.get_current_price(trade.symbol)
-                    if current_price == 0:
-                        continue
-                    
-                    # Check SL hit
-                    if ((trade.direction == "buy" and current_price <= trade.sl) or
-                        (trade.direction == "sell" and current_price >= trade.sl)):
-                        await self.close_trade(trade, "SL_HIT", current_price)
-                        self.reentry_manager.record_sl_hit(trade)
-                        
-                        # NEW: Register for SL hunt re-entry monitoring via AUTONOMOUS SYSTEM
-                        # REROUTED: Uses 1s precision monitor & symbol-specific windows
-                        # NEW: Register for SL hunt re-entry monitoring via AUTONOMOUS SYSTEM
-                        # REROUTED: Uses 1s precision monitor & symbol-specific windows
-                        if hasattr(self, 'autonomous_manager') and self.autonomous_manager:
-                            self.autonomous_manager.register_sl_recovery(trade, trade.strategy)
-                        # Fallback for legacy support
-                        elif self.config["re_entry_config"]["sl_hunt_reentry_enabled"]:
-                            self.price_monitor.register_sl_hunt(trade, trade.strategy)
-                        continue
-                    
-                    # Check TP hit
-                    if ((trade.direction == "buy" and current_price >= trade.tp) or
-                        (trade.direction == "sell" and current_price <= trade.tp)):
-                        # BACKGROUND LOOP - Silenced for clean logs (only Telegram notification sent)
-                        # TP hit detected, closing trade and processing re-entry if enabled
-                        
-                        await self.close_trade(trade, "TP_HIT", current_price)
-                        self.reentry_manager.record_tp_hit(trade, current_price)
-                        
-                        # Register for TP continuation re-entry monitoring if enabled
-                        tp_reentry_enabled = self.config["re_entry_config"].get("tp_reentry_enabled", False)
-                        if tp_reentry_enabled:
-                            self.price_monitor.register_tp_continuation(trade, current_price, trade.strategy)
-                        continue
-                    
-                    # Check trend reversal exit
-                    if self.should_exit_by_trend_reversal(trade):
-                        await self.close_trade(trade, "TREND_REVERSAL", current_price)
-                        continue
+                await self.run_monitor_cycle()
                 
                 await asyncio.sleep(5)
                 self.monitor_error_count = 0  # Reset on success
@@ -1850,53 +1949,64 @@ class TradingEngine:
         if not alignment["aligned"]:
             return False  # Don't exit on neutral - only on clear reversal
         
-        trade_direction = "BULLISH" if trade.direction == "buy" else "BEARISH"
+        trade_direction = "BULLISH" if str(trade.direction).lower() == "buy" else "BEARISH"
         if alignment["direction"] != trade_direction:
             return True  # Exit on OPPOSITE direction
         
         return False
 
-    async def close_trade(self, trade: Trade, reason: str, current_price: float):
-        """Close a trade"""
+    def _notify_external_close(self, trade: Trade, current_price: float, closed_profit: Optional[float]):
+        """Telegram notice for a position that was closed outside the bot"""
+        print(f"Position {trade.trade_id} already closed externally")
+        pnl_text = f"${closed_profit:.2f}" if closed_profit is not None else "N/A"
+        self.telegram_bot.send_message(
+            f"📊 MANUAL CLOSE DETECTED\n"
+            f"Order: #{trade.trade_id}\n"
+            f"Symbol: {trade.symbol}\n"
+            f"Direction: {trade.direction.upper()}\n"
+            f"Entry: {trade.entry:.5f}\n"
+            f"Close: {current_price:.5f}\n"
+            f"PnL: {pnl_text}\n"
+            f"Reason: Closed outside bot (MT5 app)"
+        )
+
+    async def close_trade(self, trade: Trade, reason: str, current_price: float,
+                          closed_pnl: Optional[float] = None, position_closed: bool = False):
+        """Close a trade
+        
+        position_closed/closed_pnl let the reconciler hand over a close it has
+        already resolved from MT5 history, so no further terminal calls are made.
+        """
         notification_sent = False
         try:
+            if position_closed and not self.config["simulate_orders"] and trade.trade_id:
+                # 🆕 SEND TELEGRAM NOTIFICATION FOR MANUAL CLOSE
+                self._notify_external_close(trade, current_price, closed_pnl)
+                notification_sent = True
+            
             # FIX #5: Add retry logic with exponential backoff for MT5 close
-            if not self.config["simulate_orders"] and trade.trade_id:
-                import MetaTrader5 as mt5
-                import asyncio
-                
+            elif not self.config["simulate_orders"] and trade.trade_id:
                 max_retries = 3
                 retry_delay = 1  # seconds
                 success = False
                 
                 for attempt in range(max_retries):
                     # Check if position still exists before attempting close
-                    position = mt5.positions_get(ticket=trade.trade_id)
+                    position = await self.async_mt5.get_position(trade.trade_id)
                     
                     if not position:
                         # Get actual PnL from MT5 history
-                        closed_profit = self.mt5_client.get_closed_trade_profit(trade.trade_id)
-                        
-                        print(f"Position {trade.trade_id} already closed externally")
+                        closed_pnl = await self.async_mt5.get_closed_trade_profit(trade.trade_id)
                         
                         # 🆕 SEND TELEGRAM NOTIFICATION FOR MANUAL CLOSE
-                        self.telegram_bot.send_message(
-                            f"📊 MANUAL CLOSE DETECTED\n"
-                            f"Order: #{trade.trade_id}\n"
-                            f"Symbol: {trade.symbol}\n"
-                            f"Direction: {trade.direction.upper()}\n"
-                            f"Entry: {trade.entry:.5f}\n"
-                            f"Close: {current_price:.5f}\n"
-                            f"PnL: ${closed_profit:.2f}\n"
-                            f"Reason: Closed outside bot (MT5 app)"
-                        )
+                        self._notify_external_close(trade, current_price, closed_pnl)
                         notification_sent = True
                         
                         success = True  # Position already closed, consider it success
                         break
                     
                     # Attempt to close
-                    success = self.mt5_client.close_position(trade.trade_id)
+                    success = await self.async_mt5.close_position(trade.trade_id)
                     
                     if success:
                         print(f"Position {trade.trade_id} closed successfully")
@@ -1927,14 +2037,15 @@ class TradingEngine:
                 self.autonomous_manager.reverse_shield_manager.on_shield_close(trade.trade_id)
             
             # Remove from open trades list immediately
-            if trade in self.open_trades:
-                self.open_trades.remove(trade)
+            self.open_trades.discard(trade)
             
             # Calculate PnL: Use ACTUAL profit from MT5 history
             # This ensures we account for commission, swap, and broker-specific contract sizes
             if trade.trade_id and not self.config["simulate_orders"]:
-                # Fetch real profit from MT5 history
-                pnl = self.mt5_client.get_closed_trade_profit(trade.trade_id)
+                # Fetch real profit from MT5 history (unless already resolved)
+                pnl = closed_pnl
+                if pnl is None:
+                    pnl = await self.async_mt5.get_closed_trade_profit(trade.trade_id)
                 
                 if pnl is None:
                     # Fallback: Try to get from last position info if history deal missing
@@ -1962,8 +2073,9 @@ class TradingEngine:
             # Update risk manager
             self.risk_manager.update_pnl(pnl)
             
-            # Update trade in database
+            # Update trade in database - closes are durable before we move on
             self.db.save_trade(trade)
+            self.db.flush()
             
             # FIX #3: Add order_type label to distinguish Order A vs Order B
             order_label = ""
@@ -1,16 +1,221 @@
+import atexit
+import logging
+import queue
 import sqlite3
-from datetime import datetime, date
+import threading
+import time
+from datetime import datetime, date, timedelta
 from src.models import Trade, ReEntryChain
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Write-behind queue item kinds
+_WRITE = "write"
+_BARRIER = "barrier"
+_STOP = "stop"
+
 
 class TradeDatabase:
-    def __init__(self):
-        self.conn = sqlite3.connect('data/trading_bot.db', check_same_thread=False)
+    _writer = None  # Subclasses that skip __init__ write synchronously
+    
+    def __init__(self, db_path: str = 'data/trading_bot.db', write_behind: bool = True,
+                 batch_interval_ms: float = 50, batch_max_rows: int = 200):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._configure_connection(self._conn)
         self.create_tables()
+        
+        # Write-behind queue: one writer thread groups writes into one
+        # transaction per batch_interval_ms or batch_max_rows
+        self.batch_interval = batch_interval_ms / 1000.0
+        self.batch_max_rows = batch_max_rows
+        self.write_stats = {
+            "enqueued": 0,
+            "rows_written": 0,
+            "batches": 0,
+            "max_batch_size": 0,
+            "last_lag_ms": 0.0,
+            "max_lag_ms": 0.0,
+            "errors": 0,
+            "flushes": 0
+        }
+        self._writer = None
+        if write_behind:
+            self._write_queue = queue.Queue()
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="db-writer", daemon=True
+            )
+            self._writer.start()
+            atexit.register(self.close)
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Shared connection for reads - pending writes are flushed first (read-your-writes)"""
+        if self._writer is not None and self._write_queue.unfinished_tasks:
+            self.flush()
+        return self._conn
+    
+    @conn.setter
+    def conn(self, connection):
+        self._conn = connection
+    
+    # ==================== WRITE-BEHIND QUEUE ====================
+    
+    def _execute_write(self, sql: str, params: Tuple = ()):
+        """Queue a write (or execute + commit immediately when write-behind is off)"""
+        if self._writer is None:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+            return
+        self.write_stats["enqueued"] += 1
+        self._write_queue.put((_WRITE, (sql, params), time.monotonic()))
+    
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Durability barrier - block until every write queued so far is committed
+        Returns False if the writer did not catch up within timeout
+        """
+        if self._writer is None or not self._writer.is_alive():
+            return True
+        done = threading.Event()
+        self._write_queue.put((_BARRIER, done, time.monotonic()))
+        self.write_stats["flushes"] += 1
+        return done.wait(timeout)
+    
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        if self._writer is None or not self._writer.is_alive():
+            return
+        self._write_queue.put((_STOP, None, time.monotonic()))
+        self._writer.join(timeout=10.0)
+    
+    def _writer_loop(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._configure_connection(conn)
+        running = True
+        while running:
+            batch = [self._write_queue.get()]
+            deadline = time.monotonic() + self.batch_interval
+            
+            # Keep collecting rows until the window closes, the batch is full
+            # or a barrier/stop arrives
+            while batch[-1][0] == _WRITE and len(batch) < self.batch_max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            writes = [item for item in batch if item[0] == _WRITE]
+            if writes:
+                self._commit_batch(conn, writes)
+            
+            for kind, payload, _ in batch:
+                if kind == _BARRIER:
+                    payload.set()
+                elif kind == _STOP:
+                    running = False
+                self._write_queue.task_done()
+        conn.close()
+    
+    def _commit_batch(self, conn: sqlite3.Connection, writes: List):
+        try:
+            with conn:  # One transaction for the whole batch
+                for _, (sql, params), _ in writes:
+                    conn.execute(sql, params)
+        except sqlite3.Error as e:
+            # Retry row by row so one bad statement does not lose the batch
+            logger.error(f"Batch write failed ({len(writes)} rows), retrying individually: {e}")
+            for _, (sql, params), _ in writes:
+                try:
+                    with conn:
+                        conn.execute(sql, params)
+                except sqlite3.Error as row_error:
+                    self.write_stats["errors"] += 1
+                    logger.error(f"Database write failed: {row_error}")
+        
+        lag_ms = (time.monotonic() - writes[0][2]) * 1000
+        self.write_stats["rows_written"] += len(writes)
+        self.write_stats["batches"] += 1
+        self.write_stats["max_batch_size"] = max(self.write_stats["max_batch_size"], len(writes))
+        self.write_stats["last_lag_ms"] = lag_ms
+        self.write_stats["max_lag_ms"] = max(self.write_stats["max_lag_ms"], lag_ms)
+    
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Write-behind metrics: queue depth, batch sizes and commit lag"""
+        stats = dict(self.write_stats)
+        stats["queue_depth"] = self._write_queue.qsize() if self._writer is not None else 0
+        stats["avg_batch_size"] = (
+            stats["rows_written"] / stats["batches"] if stats["batches"] else 0.0
+        )
+        stats["write_behind"] = self._writer is not None
+        return stats
+
+    # Ordered schema migrations - (version, description, method name).
+    # Append new entries; never edit an applied one.
+    MIGRATIONS = [
+        (1, "base schema", "_migrate_base_schema"),
+        (2, "secondary indexes", "_migrate_indexes"),
+    ]
+
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection):
+        """WAL journal + pragmas tuned for one writer thread and concurrent readers"""
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoint, safe with WAL
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-8000")  # ~8MB page cache
 
     def create_tables(self):
-        cursor = self.conn.cursor()
-        
+        """Bring the schema up to date by applying pending migrations"""
+        self.migrate()
+
+    def get_schema_version(self) -> int:
+        cursor = self._conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at DATETIME
+            )
+        ''')
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        return cursor.fetchone()[0]
+
+    def migrate(self) -> int:
+        """Apply every migration newer than schema_version; returns the resulting version"""
+        current = self.get_schema_version()
+        for version, description, method in self.MIGRATIONS:
+            if version <= current:
+                continue
+            with self._conn:  # Each migration commits atomically with its version row
+                cursor = self._conn.cursor()
+                cursor.execute("BEGIN")  # DDL would otherwise autocommit statement by statement
+                getattr(self, method)(cursor)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                    (version, description, datetime.now().isoformat())
+                )
+            print(f"Database migrated to schema v{version}: {description}")
+            current = version
+        return current
+
+    @staticmethod
+    def _ensure_columns(cursor: sqlite3.Cursor, table: str, columns: List[Tuple[str, str]]):
+        """Add columns missing from an older database (one PRAGMA probe per table)"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing_columns = {info[1] for info in cursor.fetchall()}
+        for col_name, col_type in columns:
+            if col_name not in existing_columns:
+                print(f"Migrating database: Adding {col_name} to {table} table...")
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}")
+
+    def _migrate_base_schema(self, cursor: sqlite3.Cursor):
+        """v1 - base tables, plus columns that older databases are missing"""
         # Main trades table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS trades (
@@ -50,54 +255,6 @@ class TradeDatabase:
             )
         ''')
         
-        # Add new columns if they don't exist (for existing databases)
-        try:
-            cursor.execute('ALTER TABLE trades ADD COLUMN order_type TEXT')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        try:
-            cursor.execute('ALTER TABLE trades ADD COLUMN profit_chain_id TEXT')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        try:
-            cursor.execute('ALTER TABLE trades ADD COLUMN profit_level INTEGER DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        try:
-            cursor.execute('ALTER TABLE trades ADD COLUMN session_id TEXT')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-
-        # Add new columns for timeframe logic if they don't exist
-        db_columns_to_add = [
-            ("commission", "REAL"),
-            ("swap", "REAL"),
-            ("comment", "TEXT"),
-            ("sl_adjusted", "INTEGER DEFAULT 0"),
-            ("original_sl_distance", "REAL DEFAULT 0.0"),
-            ("logic_type", "TEXT"),
-            ("base_lot_size", "REAL DEFAULT 0.0"),
-            ("final_lot_size", "REAL DEFAULT 0.0"),
-            ("base_sl_pips", "REAL DEFAULT 0.0"),
-            ("final_sl_pips", "REAL DEFAULT 0.0"),
-            ("lot_multiplier", "REAL DEFAULT 1.0"),
-            ("sl_multiplier", "REAL DEFAULT 1.0")
-        ]
-        
-        cursor.execute("PRAGMA table_info(trades)")
-        existing_columns = [info[1] for info in cursor.fetchall()]
-
-        for col_name, col_type in db_columns_to_add:
-            if col_name not in existing_columns:
-                print(f"Migrating database: Adding {col_name} to trades table...")
-                try:
-                    cursor.execute(f"ALTER TABLE trades ADD COLUMN {col_name} {col_type}")
-                except sqlite3.OperationalError as e:
-                    print(f"Error adding column {col_name}: {e}")
-        
         # Re-entry chains table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS reentry_chains (
@@ -224,12 +381,55 @@ class TradeDatabase:
             )
         ''')
         
-        self.conn.commit()
+        self._ensure_columns(cursor, "trades", [
+            ("commission", "REAL"),
+            ("swap", "REAL"),
+            ("comment", "TEXT"),
+            ("order_type", "TEXT"),
+            ("profit_chain_id", "TEXT"),
+            ("profit_level", "INTEGER DEFAULT 0"),
+            ("session_id", "TEXT"),
+            ("sl_adjusted", "INTEGER DEFAULT 0"),
+            ("original_sl_distance", "REAL DEFAULT 0.0"),
+            ("logic_type", "TEXT"),
+            ("base_lot_size", "REAL DEFAULT 0.0"),
+            ("final_lot_size", "REAL DEFAULT 0.0"),
+            ("base_sl_pips", "REAL DEFAULT 0.0"),
+            ("final_sl_pips", "REAL DEFAULT 0.0"),
+            ("lot_multiplier", "REAL DEFAULT 1.0"),
+            ("sl_multiplier", "REAL DEFAULT 1.0")
+        ])
+        self._ensure_columns(cursor, "trading_sessions", [("metadata", "TEXT")])
+
+    def _migrate_indexes(self, cursor: sqlite3.Cursor):
+        """v2 - secondary indexes for every filtered query (see EXPLAIN QUERY PLAN test)"""
+        for statement in [
+            # get_trade_history / get_trades_by_date / risk stats
+            "CREATE INDEX IF NOT EXISTS idx_trades_close_time ON trades(close_time)",
+            "CREATE INDEX IF NOT EXISTS idx_trades_status_close_time ON trades(status, close_time)",
+            # update_session_stats / get_session_details
+            "CREATE INDEX IF NOT EXISTS idx_trades_session_status ON trades(session_id, status)",
+            # chain reports and reconciliation lookups
+            "CREATE INDEX IF NOT EXISTS idx_trades_chain_id ON trades(chain_id)",
+            "CREATE INDEX IF NOT EXISTS idx_trades_profit_chain_id ON trades(profit_chain_id)",
+            "CREATE INDEX IF NOT EXISTS idx_trades_trade_id ON trades(trade_id)",
+            # get_active_session (with and without symbol) / get_sessions_by_date
+            "CREATE INDEX IF NOT EXISTS idx_sessions_status_start ON trading_sessions(status, start_time)",
+            "CREATE INDEX IF NOT EXISTS idx_sessions_symbol_status_start ON trading_sessions(symbol, status, start_time)",
+            "CREATE INDEX IF NOT EXISTS idx_sessions_start_time ON trading_sessions(start_time)",
+            # get_active_profit_chains
+            "CREATE INDEX IF NOT EXISTS idx_profit_chains_status ON profit_booking_chains(status)",
+            "CREATE INDEX IF NOT EXISTS idx_profit_orders_chain_id ON profit_booking_orders(chain_id)",
+            "CREATE INDEX IF NOT EXISTS idx_profit_events_chain_id ON profit_booking_events(chain_id)",
+            # 30-day stats windows
+            "CREATE INDEX IF NOT EXISTS idx_sl_events_hit_time ON sl_events(hit_time)",
+            "CREATE INDEX IF NOT EXISTS idx_tp_reentry_events_timestamp ON tp_reentry_events(timestamp)",
+            "CREATE INDEX IF NOT EXISTS idx_reversal_exit_events_timestamp ON reversal_exit_events(timestamp)",
+        ]:
+            cursor.execute(statement)
 
     def save_trade(self, trade: Trade):
         try:
-            cursor = self.conn.cursor()
-            
             # Extract timeframe logic details if available
             logic_type = getattr(trade, 'logic_type', None)
             # Default to current values if base values not available
@@ -253,7 +453,7 @@ class TradeDatabase:
             # Get close_price if exists
             close_price = getattr(trade, 'close_price', None)
             
-            cursor.execute("""
+            self._execute_write("""
                 INSERT OR REPLACE INTO trades (
                     trade_id, symbol, entry_price, exit_price, sl_price, tp_price, lot_size, direction, 
                     strategy, pnl, commission, swap, comment, status, open_time, close_time, 
@@ -272,29 +472,24 @@ class TradeDatabase:
                 getattr(trade, 'sl_adjusted', 0), getattr(trade, 'original_sl_distance', 0.0),
                 logic_type, base_lot, final_lot, base_sl_pips, final_sl_pips, lot_mult, sl_mult
             ))
-            self.conn.commit()
         except Exception as e:
             print(f"Error saving trade: {e}")
 
     def save_chain(self, chain: ReEntryChain):
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        self._execute_write('''
             INSERT OR REPLACE INTO reentry_chains VALUES (?,?,?,?,?,?,?,?,?,?)
         ''', (chain.chain_id, chain.symbol, chain.direction, 
               chain.original_entry, chain.original_sl_distance,
               chain.current_level, chain.total_profit, chain.status,
               chain.created_at, datetime.now().isoformat() if chain.status == "completed" else None))
-        self.conn.commit()
 
     def save_sl_event(self, trade_id: str, symbol: str, sl_price: float, 
                      original_entry: float, recovery_attempted: bool = False,
                      recovery_successful: bool = False):
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        self._execute_write('''
             INSERT INTO sl_events VALUES (?,?,?,?,?,?,?,?)
         ''', (None, trade_id, symbol, sl_price, original_entry, 
               datetime.now().isoformat(), recovery_attempted, recovery_successful))
-        self.conn.commit()
 
     def get_trade_history(self, days=30) -> List[Dict[str, Any]]:
         cursor = self.conn.cursor()
@@ -345,11 +540,9 @@ class TradeDatabase:
     
     def clear_lifetime_losses(self):
         """Reset lifetime loss counter (database side)"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        self._execute_write('''
             UPDATE system_state SET value = '0', updated_at = ? WHERE key = 'lifetime_loss'
         ''', (datetime.now().isoformat(),))
-        self.conn.commit()
         
     def get_tp_reentry_stats(self) -> Dict[str, Any]:
         """Get TP re-entry statistics"""
@@ -390,9 +583,9 @@ class TradeDatabase:
             cursor = self.conn.cursor()
             cursor.execute('''
                 SELECT * FROM trades 
-                WHERE DATE(close_time) = DATE(?) AND status = 'closed'
+                WHERE status = 'closed' AND close_time >= ? AND close_time < ?
                 ORDER BY close_time DESC
-            ''', (target_date.isoformat(),))
+            ''', self._day_bounds(target_date))
             
             columns = [description[0] for description in cursor.description]
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -400,6 +593,11 @@ class TradeDatabase:
             print(f"Error getting trades by date: {e}")
             return []
     
+    @staticmethod
+    def _day_bounds(target_date: date) -> Tuple[str, str]:
+        """[day, next day) ISO bounds - index-friendly replacement for DATE(col) = DATE(?)"""
+        return target_date.isoformat(), (target_date + timedelta(days=1)).isoformat()
+    
     def test_connection(self) -> bool:
         """
         Test database connection
@@ -415,8 +613,7 @@ class TradeDatabase:
     
     def save_profit_chain(self, chain):
         """Save profit booking chain to database"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        self._execute_write('''
             INSERT OR REPLACE INTO profit_booking_chains 
             (chain_id, symbol, direction, base_lot, current_level, total_profit, status, created_at, updated_at)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -431,7 +628,6 @@ class TradeDatabase:
             chain.created_at,
             chain.updated_at
         ))
-        self.conn.commit()
     
     def get_active_profit_chains(self) -> List[Dict[str, Any]]:
         """Get all active profit booking chains from database"""
@@ -446,24 +642,20 @@ class TradeDatabase:
     def save_profit_booking_order(self, order_id: str, chain_id: str, level: int, 
                                   profit_target: float, sl_reduction: int, status: str):
         """Save profit booking order to database"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        self._execute_write('''
             INSERT OR REPLACE INTO profit_booking_orders
             (order_id, chain_id, level, profit_target, sl_reduction, status, created_at)
             VALUES (?, ?, ?, ?, ?, ?, ?)
         ''', (order_id, chain_id, level, profit_target, sl_reduction, status, datetime.now().isoformat()))
-        self.conn.commit()
     
     def save_profit_booking_event(self, chain_id: str, level: int, profit_booked: float,
                                   orders_closed: int, orders_placed: int):
         """Save profit booking event to database"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        self._execute_write('''
             INSERT INTO profit_booking_events
             (chain_id, level, profit_booked, orders_closed, orders_placed, timestamp)
             VALUES (?, ?, ?, ?, ?, ?)
         ''', (chain_id, level, profit_booked, orders_closed, orders_placed, datetime.now().isoformat()))
-        self.conn.commit()
     
     def get_profit_chain_stats(self) -> Dict[str, Any]:
         """Get profit booking chain statistics"""
@@ -486,41 +678,35 @@ class TradeDatabase:
     
     def create_session(self, session_id: str, symbol: str, direction: str, entry_signal: str):
         """Create new trading session"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        self._execute_write('''
             INSERT INTO trading_sessions 
             (session_id, symbol, direction, entry_signal, start_time, status)
             VALUES (?, ?, ?, ?, ?, 'ACTIVE')
         ''', (session_id, symbol, direction, entry_signal, datetime.now().isoformat()))
-        self.conn.commit()
     
     def close_session(self, session_id: str, exit_reason: str):
         """Close trading session"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        self._execute_write('''
             UPDATE trading_sessions
             SET status = 'COMPLETED', end_time = ?, exit_reason = ?
             WHERE session_id = ?
         ''', (datetime.now().isoformat(), exit_reason, session_id))
-        self.conn.commit()
     
     def update_session_stats(self, session_id: str):
         """Recalculate session total_pnl and total_trades from trades table"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT COUNT(*), COALESCE(SUM(pnl), 0)
-            FROM trades
-            WHERE session_id = ? AND status = 'closed'
-        ''', (session_id,))
-        
-        total_trades, total_pnl = cursor.fetchone()
-        
-        cursor.execute('''
+        # Single statement so it can run on the writer after any queued trade saves
+        self._execute_write('''
             UPDATE trading_sessions
-            SET total_pnl = ?, total_trades = ?
+            SET total_pnl = (
+                    SELECT COALESCE(SUM(pnl), 0) FROM trades
+                    WHERE session_id = ? AND status = 'closed'
+                ),
+                total_trades = (
+                    SELECT COUNT(*) FROM trades
+                    WHERE session_id = ? AND status = 'closed'
+                )
             WHERE session_id = ?
-        ''', (total_pnl, total_trades, session_id))
-        self.conn.commit()
+        ''', (session_id, session_id, session_id))
     
     def get_active_session(self, symbol: str = None) -> Dict[str, Any]:
         """Get active session for symbol (or any active session if symbol is None)"""
@@ -549,9 +735,9 @@ class TradeDatabase:
         cursor = self.conn.cursor()
         cursor.execute('''
             SELECT * FROM trading_sessions
-            WHERE DATE(start_time) = DATE(?)
+            WHERE start_time >= ? AND start_time < ?
             ORDER BY start_time DESC
-        ''', (target_date.isoformat(),))
+        ''', self._day_bounds(target_date))
         
         columns = [desc[0] for desc in cursor.description]
         return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -9,7 +9,8 @@ Handles all autonomous trading operations:
 
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-from src.models import Trade, ReEntryChain, ProfitBookingChain
+from src.models import Trade, TradeRecord, ReEntryChain, ProfitBookingChain
+from src.clients.async_mt5_client import AsyncMT5Client
 import asyncio
 import time
 
@@ -22,14 +23,16 @@ class AutonomousSystemManager:
     
     def __init__(self, config, reentry_manager, profit_booking_manager, 
                  profit_booking_reentry_manager, mt5_client, telegram_bot,
-                 risk_manager=None):
+                 risk_manager=None, price_trigger_engine=None):
         self.config = config
         self.reentry_manager = reentry_manager
         self.profit_booking_manager = profit_booking_manager
         self.profit_booking_reentry_manager = profit_booking_reentry_manager
         self.mt5_client = mt5_client
+        self.async_mt5 = AsyncMT5Client.for_client(mt5_client)  # Shared MT5 worker thread
         self.telegram_bot = telegram_bot
         self.risk_manager = risk_manager
+        self.price_trigger_engine = price_trigger_engine  # Event-driven price triggers (optional)
         
         # Initialize Fine-Tune managers
         try:
@@ -456,12 +459,12 @@ class AutonomousSystemManager:
                 tp_price = current_price - (new_sl_distance * self.config.get("rr_ratio", 1.5))
             
             # Get lot size
-            account_balance = self.mt5_client.get_account_balance()
+            account_balance = await self.async_mt5.get_account_balance()
             from src.managers.risk_manager import RiskManager
             lot_size = trading_engine.risk_manager.get_fixed_lot_size(account_balance)
             
             # Create trade object
-            trade = Trade(
+            trade = TradeRecord(
                 symbol=chain.symbol,
                 entry=current_price,
                 sl=sl_price,
@@ -480,7 +483,7 @@ class AutonomousSystemManager:
             
             # Place order
             if not self.config.get("simulate_orders", False):
-                trade_id = self.mt5_client.place_order(
+                trade_id = await self.async_mt5.place_order(
                     symbol=chain.symbol,
                     order_type=chain.direction,
                     lot_size=lot_size,
@@ -534,11 +537,11 @@ class AutonomousSystemManager:
                 tp_price = current_price - (sl_distance * self.config.get("rr_ratio", 1.5))
             
             # Get lot size
-            account_balance = self.mt5_client.get_account_balance()
+            account_balance = await self.async_mt5.get_account_balance()
             lot_size = trading_engine.risk_manager.get_fixed_lot_size(account_balance)
             
             # Create trade object
-            trade = Trade(
+            trade = TradeRecord(
                 symbol=chain.symbol,
                 entry=current_price,
                 sl=tight_sl_price,
@@ -557,7 +560,7 @@ class AutonomousSystemManager:
             
             # Place order
             if not self.config.get("simulate_orders", False):
-                trade_id = self.mt5_client.place_order(
+                trade_id = await self.async_mt5.place_order(
                     symbol=chain.symbol,
                     order_type=chain.direction,
                     lot_size=lot_size,
@@ -690,11 +693,11 @@ class AutonomousSystemManager:
                     tp_price = current_price - default_distance
             
             # Get lot size
-            account_balance = self.mt5_client.get_account_balance()
+            account_balance = await self.async_mt5.get_account_balance()
             lot_size = trading_engine.risk_manager.get_fixed_lot_size(account_balance)
             
             # Create recovery trade
-            recovery_trade = Trade(
+            recovery_trade = TradeRecord(
                 symbol=order.symbol,
                 entry=current_price,
                 sl=sl_price,
@@ -714,7 +717,7 @@ class AutonomousSystemManager:
             
             # Place order
             if not self.config.get("simulate_orders", False):
-                trade_id = self.mt5_client.place_order(
+                trade_id = await self.async_mt5.place_order(
                     symbol=order.symbol,
                     order_type=order.direction,
                     lot_size=lot_size,
@@ -1,5 +1,5 @@
 from typing import Dict, Any, List, Tuple, Optional
-from src.models import Trade, Alert
+from src.models import Trade, TradeRecord, Alert
 from src.config import Config
 from src.managers.risk_manager import RiskManager
 from src.clients.mt5_client import MT5Client
@@ -135,8 +135,8 @@ class DualOrderManager:
         """
         Create Order A (TP Trail) and Order B (Profit Trail) with same lot size
         Returns: {
-            "order_a": Trade object or None,
-            "order_b": Trade object or None,
+            "order_a": TradeRecord or None,
+            "order_b": TradeRecord or None,
             "order_a_placed": bool,
             "order_b_placed": bool,
             "errors": List[str]
@@ -236,7 +236,7 @@ class DualOrderManager:
                 )
             
             # Create Order A (TP Trail) - uses existing SL system
-            order_a = Trade(
+            order_a = TradeRecord(
                 symbol=alert.symbol,
                 entry=alert.price,
                 sl=sl_price_a,
@@ -251,7 +251,7 @@ class DualOrderManager:
             )
             
             # Create Order B (Profit Trail) - uses independent $10 fixed SL
-            order_b = Trade(
+            order_b = TradeRecord(
                 symbol=alert.symbol,
                 entry=alert.price,
                 sl=sl_price_b,  # Independent $10 fixed SL
@@ -15,8 +15,9 @@ Similar to RecoveryWindowMonitor but for exit scenarios instead of SL hunts.
 import asyncio
 from datetime import datetime
 from typing import Dict, Any, Optional
-from src.models import Trade
+from src.models import Trade, TradeRecord
 from src.utils.optimized_logger import logger
+from src.services.price_trigger_engine import cross_direction
 import time
 
 
@@ -99,9 +100,27 @@ class ExitContinuationMonitor:
         
         self.active_monitors[exit_id] = monitor_data
         
-        # Start monitoring task
-        task = asyncio.create_task(self._monitor_loop(exit_id))
-        self.monitoring_tasks[exit_id] = task
+        trigger_engine = getattr(self.manager, 'price_trigger_engine', None)
+        if trigger_engine is not None:
+            # Event-driven: fire once price reverts min_reversion_pips past the exit
+            pip_size = self.config.get("symbol_config", {}).get(trade.symbol, {}).get("pip_size", 0.0001)
+            reversion = self.min_reversion_pips * pip_size
+            level = exit_price + reversion if trade.direction == "buy" else exit_price - reversion
+            monitor_data["trigger_id"] = trigger_engine.add_trigger(
+                symbol=trade.symbol,
+                level=level,
+                direction=cross_direction(trade.direction),
+                callback=self._on_reversion_trigger,
+                expires_at=time.time() + self.monitor_duration,
+                on_expire=self._on_window_expired,
+                payload=exit_id,
+                retry_interval=self.check_interval,
+                trigger_id=exit_id
+            )
+        else:
+            # Start monitoring task
+            task = asyncio.create_task(self._monitor_loop(exit_id))
+            self.monitoring_tasks[exit_id] = task
         
         # Send notification
         self._send_monitoring_start_notification(monitor_data)
@@ -183,6 +202,34 @@ class ExitContinuationMonitor:
             if exit_id in self.monitoring_tasks:
                 del self.monitoring_tasks[exit_id]
     
+    async def _on_reversion_trigger(self, trigger, current_price: float) -> bool:
+        """
+        Price trigger callback - price reverted past the exit level
+        Returns False while trend is not aligned so the trigger re-arms
+        """
+        exit_id = trigger.payload
+        monitor_data = self.active_monitors.get(exit_id)
+        if not monitor_data:
+            return True
+        
+        monitor_data["check_count"] += 1
+        if not await self._check_continuation_conditions(monitor_data, current_price):
+            return False
+        
+        elapsed = (datetime.now() - monitor_data["start_time"]).total_seconds()
+        await self._handle_continuation(exit_id, current_price, elapsed)
+        return True
+    
+    def _on_window_expired(self, trigger):
+        """Price trigger expiry - monitoring window elapsed"""
+        exit_id = trigger.payload
+        monitor_data = self.active_monitors.get(exit_id)
+        if not monitor_data:
+            return
+        
+        elapsed = (datetime.now() - monitor_data["start_time"]).total_seconds()
+        self._handle_timeout(exit_id, elapsed)
+    
     async def _check_continuation_conditions(self, monitor_data: Dict[str, Any], 
                                             current_price: float) -> bool:
         """
@@ -351,8 +398,7 @@ class ExitContinuationMonitor:
                 tp_price = entry_price - original_tp_distance
             
             # Create new trade object
-            from src.models import Trade
-            new_trade = Trade(
+            new_trade = TradeRecord(
                 symbol=symbol,
                 entry=entry_price,
                 sl=sl_price,
@@ -366,7 +412,7 @@ class ExitContinuationMonitor:
                 order_type="TP_TRAIL",  # Same as Order A
                 # Preserve chain info if it exists
                 chain_id=getattr(original_trade, 'chain_id', None),
-                profit_level=getattr(original_trade, 'profit_level', None)
+                profit_level=getattr(original_trade, 'profit_level', 0)
             )
             
             # Place order via MT5
@@ -383,7 +429,7 @@ class ExitContinuationMonitor:
                 
                 if trade_id:
                     new_trade.trade_id = trade_id
-                    logger.success(
+                    logger.info(
                         f"✅ Exit continuation order placed: {symbol} {direction.upper()} "
                         f"@ {entry_price} (ID: {trade_id})"
                     )
@@ -517,6 +563,10 @@ Monitoring stopped.
         for task in self.monitoring_tasks.values():
             if not task.done():
                 task.cancel()
+        trigger_engine = getattr(self.manager, 'price_trigger_engine', None)
+        if trigger_engine is not None:
+            for monitor_data in self.active_monitors.values():
+                trigger_engine.remove_trigger(monitor_data.get("trigger_id"))
         self.active_monitors.clear()
         self.monitoring_tasks.clear()
         logger.info("✅ All exit continuation monitors stopped")
@@ -1,6 +1,6 @@
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from src.models import Trade, ProfitBookingChain
+from src.models import Trade, TradeRecord, ProfitBookingChain
 from src.config import Config
 from src.database import TradeDatabase
 from src.clients.mt5_client import MT5Client
@@ -33,13 +33,10 @@ class ProfitBookingManager:
         # Active profit booking chains
         self.active_chains: Dict[str, ProfitBookingChain] = {}
         
-        # Get configuration
-        self.profit_config = config.get("profit_booking_config", {})
-        self.enabled = self.profit_config.get("enabled", True)
-        # NEW: Fixed $7 minimum profit for all levels (replaces progressive targets)
-        self.min_profit = self.profit_config.get("min_profit", 7.0)  # $7 minimum per order
-        self.multipliers = self.profit_config.get("multipliers", [1, 2, 4, 8, 16])
-        self.max_level = self.profit_config.get("max_level", 4)
+        # Get configuration (re-read when profit_booking_config changes)
+        self._load_profit_config()
+        if isinstance(config, Config):
+            config.subscribe("profit_booking_config", self._on_profit_config_changed)
         
         # Import profit booking SL calculator
         from src.utils.profit_sl_calculator import ProfitBookingSLCalculator
@@ -50,8 +47,22 @@ class ProfitBookingManager:
         
         # Error deduplication: Track missing order checks to prevent spam
         self.checked_missing_orders: Dict[str, int] = {}  # order_id -> check_count
+        self.chain_open_orders: Dict[str, set] = {}  # chain_id -> open tickets (registry events)
         self.last_error_log_time: Dict[str, float] = {}  # order_id -> last_log_timestamp
         self.stale_chains: set = set()  # Chains marked as stale
+        self.portfolio_pnl = None  # Shared PortfolioPnL (set by the engine)
+    
+    def _load_profit_config(self):
+        self.profit_config = self.config.get("profit_booking_config", {})
+        self.enabled = self.profit_config.get("enabled", True)
+        # NEW: Fixed $7 minimum profit for all levels (replaces progressive targets)
+        self.min_profit = self.profit_config.get("min_profit", 7.0)  # $7 minimum per order
+        self.multipliers = self.profit_config.get("multipliers", [1, 2, 4, 8, 16])
+        self.max_level = self.profit_config.get("max_level", 4)
+    
+    def _on_profit_config_changed(self, path: str, value):
+        """Config change event - refresh the cached profit booking settings"""
+        self._load_profit_config()
     
     def is_enabled(self) -> bool:
         """Check if profit booking system is enabled"""
@@ -150,6 +161,47 @@ class ProfitBookingManager:
         # Always return 0 - profit booking uses fixed $10 SL, no reductions
         return 0.0
     
+    def attach_trade_registry(self, registry):
+        """
+        Subscribe to the engine's OpenTradeRegistry: open order tickets per chain
+        are kept current from add/remove events instead of rescanning open_trades
+        """
+        self.chain_open_orders = {}
+        for trade in registry:
+            self._on_trade_event("added", trade)
+        registry.subscribe(self._on_trade_event)
+    
+    def attach_portfolio_pnl(self, portfolio_pnl):
+        """Serve combined chain PnL from the engine's cached PnL snapshot"""
+        self.portfolio_pnl = portfolio_pnl
+    
+    def _on_trade_event(self, event: str, trade):
+        chain_id = getattr(trade, 'profit_chain_id', None)
+        if not chain_id or not trade.trade_id:
+            return
+        if event == "added":
+            self.chain_open_orders.setdefault(chain_id, set()).add(trade.trade_id)
+        elif event == "removed":
+            orders = self.chain_open_orders.get(chain_id)
+            if orders is not None:
+                orders.discard(trade.trade_id)
+                if not orders:
+                    del self.chain_open_orders[chain_id]
+    
+    def get_chain_open_orders(self, chain_id: str) -> set:
+        return set(self.chain_open_orders.get(chain_id, ()))
+    
+    def _chain_trades(self, open_trades, chain_id: str, level: Optional[int] = None) -> List[Trade]:
+        """Open trades of a chain (optionally one level) via the registry index when available"""
+        lookup = getattr(open_trades, 'by_profit_chain', None)
+        candidates = lookup(chain_id) if lookup else open_trades
+        return [
+            t for t in candidates
+            if t.profit_chain_id == chain_id
+            and (level is None or t.profit_level == level)
+            and t.status == "open"
+        ]
+    
     def calculate_combined_pnl(self, chain: ProfitBookingChain, 
                                open_trades: List[Trade]) -> float:
         """
@@ -157,13 +209,12 @@ class ProfitBookingManager:
         Returns total PnL in dollars
         """
         try:
+            # Same trade set the engine snapshot covers - read the per-level total
+            if self.portfolio_pnl is not None and open_trades is self.portfolio_pnl.registry:
+                return self.portfolio_pnl.snapshot().profit_chain_pnl(chain.chain_id, chain.current_level)
+            
             # Get all trades for this chain at current level
-            chain_trades = [
-                t for t in open_trades
-                if t.profit_chain_id == chain.chain_id 
-                and t.profit_level == chain.current_level
-                and t.status == "open"
-            ]
+            chain_trades = self._chain_trades(open_trades, chain.chain_id, chain.current_level)
             
             if not chain_trades:
                 return 0.0
@@ -266,12 +317,7 @@ class ProfitBookingManager:
             return orders_to_book
         
         # Get all trades for this chain at current level
-        chain_trades = [
-            t for t in open_trades
-            if t.profit_chain_id == chain.chain_id 
-            and t.profit_level == chain.current_level
-            and t.status == "open"
-        ]
+        chain_trades = self._chain_trades(open_trades, chain.chain_id, chain.current_level)
         
         # If no trades found in open_trades, check if orders exist in MT5
         # This handles cases where orders were auto-closed or not tracked
@@ -282,12 +328,7 @@ class ProfitBookingManager:
                 recovered = self.recover_chain_from_mt5(chain.chain_id)
                 if recovered:
                     # After recovery, re-check for trades
-                    chain_trades = [
-                        t for t in open_trades
-                        if t.profit_chain_id == chain.chain_id 
-                        and t.profit_level == chain.current_level
-                        and t.status == "open"
-                    ]
+                    chain_trades = self._chain_trades(open_trades, chain.chain_id, chain.current_level)
             
             if not chain_trades:
                 return orders_to_book
@@ -373,12 +414,7 @@ class ProfitBookingManager:
                 return True
             
             # Check if all orders in current level are closed
-            current_level_trades = [
-                t for t in open_trades
-                if t.profit_chain_id == chain.chain_id 
-                and t.profit_level == chain.current_level
-                and t.status == "open"
-            ]
+            current_level_trades = self._chain_trades(open_trades, chain.chain_id, chain.current_level)
             
             # If there are still open orders, don't progress yet
             if current_level_trades:
@@ -393,8 +429,7 @@ class ProfitBookingManager:
             # --- STRICT SUCCESS CHECK (Enhanced with Recovery Consideration) ---
             has_loss = chain.metadata.get(f"loss_level_{chain.current_level}", False)
             was_recovered = chain.metadata.get(f"loss_level_{chain.current_level}_recovered", False)
-            profit_config = self.config.get("profit_booking_config", {})
-            allow_partial = profit_config.get("allow_partial_progression", False)
+            allow_partial = self.profit_config.get("allow_partial_progression", False)
             
             if has_loss and not allow_partial:
                 if was_recovered:
@@ -494,7 +529,7 @@ class ProfitBookingManager:
             
             for i in range(next_order_count):
                 # Create trade object
-                new_trade = Trade(
+                new_trade = TradeRecord(
                     symbol=chain.symbol,
                     entry=current_price,
                     sl=sl_price,
@@ -598,12 +633,7 @@ class ProfitBookingManager:
                 return True
             
             # Get all trades for current level
-            current_level_trades = [
-                t for t in open_trades
-                if t.profit_chain_id == chain.chain_id 
-                and t.profit_level == chain.current_level
-                and t.status == "open"
-            ]
+            current_level_trades = self._chain_trades(open_trades, chain.chain_id, chain.current_level)
             
             if not current_level_trades:
                 self.logger.warning(f"No open trades found for chain {chain.chain_id} level {chain.current_level}")
@@ -668,7 +698,7 @@ class ProfitBookingManager:
             new_trade_ids = []
             for i in range(next_order_count):
                 # Create trade object
-                new_trade = Trade(
+                new_trade = TradeRecord(
                     symbol=chain.symbol,
                     entry=current_price,
                     sl=sl_price,
@@ -805,11 +835,7 @@ class ProfitBookingManager:
                     )
                     
                     # Find active orders for this chain
-                    chain_orders = [
-                        t.trade_id for t in open_trades
-                        if t.profit_chain_id == chain.chain_id
-                        and t.status == "open"
-                    ]
+                    chain_orders = [t.trade_id for t in self._chain_trades(open_trades, chain.chain_id)]
                     chain.active_orders = chain_orders
                     
                     self.active_chains[chain.chain_id] = chain
@@ -900,10 +926,15 @@ class ProfitBookingManager:
             
             # Check if all active orders still exist
             for order_id in chain.active_orders:
-                order_exists = any(
-                    t.trade_id == order_id and t.status == "open"
-                    for t in open_trades
-                )
+                get_by_ticket = getattr(open_trades, 'get_by_ticket', None)
+                if get_by_ticket:
+                    order = get_by_ticket(order_id)
+                    order_exists = order is not None and order.status == "open"
+                else:
+                    order_exists = any(
+                        t.trade_id == order_id and t.status == "open"
+                        for t in open_trades
+                    )
                 
                 if not order_exists:
                     missing_orders.append(order_id)
@@ -965,6 +996,8 @@ class ProfitBookingManager:
                     # Orphaned order - clear profit_chain_id
                     trade.profit_chain_id = None
                     trade.profit_level = 0
+                    if hasattr(open_trades, 'reindex'):
+                        open_trades.reindex(trade)
                     self.logger.warning(
                         f"Cleared orphaned order: {trade.trade_id} "
                         f"from missing chain: {trade.profit_chain_id}"
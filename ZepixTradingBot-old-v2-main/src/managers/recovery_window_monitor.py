@@ -4,10 +4,11 @@ Monitors price movements in real-time and triggers immediate recovery actions
 """
 
 import asyncio
+import time
 from datetime import datetime
 from typing import Dict, Optional, Any
-import MetaTrader5 as mt5
 import logging
+from src.services.price_trigger_engine import cross_direction
 
 logger = logging.getLogger(__name__)
 
@@ -151,10 +152,47 @@ Max Window: {recovery_window_minutes} minutes
 Checking every {self.MONITORING_INTERVAL}s...
         """)
         
+        # Event-driven path: one shared trigger index instead of a polling task
+        trigger_engine = getattr(self.autonomous_manager, 'price_trigger_engine', None)
+        if trigger_engine is not None:
+            monitor_data["trigger_id"] = trigger_engine.add_trigger(
+                symbol=symbol,
+                level=recovery_price,
+                direction=cross_direction(direction),
+                callback=self._on_recovery_trigger,
+                expires_at=time.time() + monitor_data["max_duration_seconds"],
+                on_expire=self._on_recovery_expired,
+                payload=order_id,
+                trigger_id=f"RECOVERY_{order_id}"
+            )
+            return
+        
         # Start monitoring task
         task = asyncio.create_task(self._monitor_loop(order_id))
         self.monitor_tasks[order_id] = task
     
+    async def _on_recovery_trigger(self, trigger, current_price: float) -> bool:
+        """Price trigger callback - recovery level crossed"""
+        order_id = trigger.payload
+        monitor_data = self.active_monitors.get(order_id)
+        if not monitor_data:
+            return True
+        
+        monitor_data["check_count"] += 1
+        elapsed = (datetime.now() - monitor_data["start_time"]).total_seconds()
+        await self._handle_recovery(order_id, current_price, elapsed)
+        return True
+    
+    async def _on_recovery_expired(self, trigger) -> None:
+        """Price trigger expiry - recovery window elapsed without recovery"""
+        order_id = trigger.payload
+        monitor_data = self.active_monitors.get(order_id)
+        if not monitor_data:
+            return
+        
+        elapsed = (datetime.now() - monitor_data["start_time"]).total_seconds()
+        await self._handle_timeout(order_id, elapsed)
+    
     async def start_monitoring_with_shield(
         self,
         order_id: int,
@@ -366,7 +404,7 @@ Checking every {self.MONITORING_INTERVAL}s...
         symbol = monitor_data["symbol"]
         check_count = monitor_data["check_count"]
         
-        logger.success(f"""
+        logger.info(f"""
 ✅ PRICE RECOVERED - IMMEDIATE ACTION!
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 Order: #{order_id}
@@ -461,7 +499,7 @@ Status: FAILED - No recovery detected
             )
             
             if recovery_order:
-                logger.success(f"""
+                logger.info(f"""
 🛡️ SL HUNT RECOVERY ORDER PLACED
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 Recovery For: #{monitor_data['order_id']}
@@ -510,7 +548,10 @@ Recovery attempt in progress...
         """
         
         if order_id in self.active_monitors:
-            del self.active_monitors[order_id]
+            monitor_data = self.active_monitors.pop(order_id)
+            trigger_engine = getattr(self.autonomous_manager, 'price_trigger_engine', None)
+            if trigger_engine is not None and monitor_data.get("trigger_id"):
+                trigger_engine.remove_trigger(monitor_data["trigger_id"])
         
         if order_id in self.monitor_tasks:
             task = self.monitor_tasks[order_id]
@@ -551,6 +592,9 @@ Recovery attempt in progress...
         """
         Get current market price for symbol
         
+        Reads the MT5 client's shared tick cache (mid price) instead of
+        querying the terminal directly, so N monitors cost one refresh
+        
         Args:
             symbol: Trading symbol
         
@@ -559,12 +603,11 @@ Recovery attempt in progress...
         """
         
         try:
-            tick = mt5.symbol_info_tick(symbol)
-            if tick is None:
+            mt5_client = getattr(self.autonomous_manager, 'mt5_client', None)
+            if mt5_client is None:
                 return None
             
-            # Use bid for SELL, ask for BUY (but for monitoring we use mid price)
-            return (tick.bid + tick.ask) / 2
+            return mt5_client.get_current_price(symbol)
         
         except Exception as e:
             logger.error(f"Error getting price for {symbol}: {e}")
@@ -2,6 +2,7 @@ from typing import Dict, Optional, List, Any
 from datetime import datetime, timedelta
 from src.models import Trade, ReEntryChain
 from src.utils.trend_analyzer import TrendAnalyzer
+from src.utils.symbol_specs import specs_for
 import uuid
 
 class ReEntryManager:
@@ -41,10 +42,11 @@ class ReEntryManager:
             trade_ids = [sim_id]
             print(f"INFO: Simulation mode: Using pseudo trade ID {sim_id}")
         
-        # Get active SL system and reduction info
-        active_system = self.config.get("active_sl_system", "sl-1")
-        symbol_reductions = self.config.get("symbol_sl_reductions", {})
-        symbol_reduction = symbol_reductions.get(trade.symbol, 0)
+        # Get active SL system and reduction info from the compiled symbol specs
+        specs = specs_for(self.config)
+        spec = specs[trade.symbol]
+        active_system = specs.active_sl_system
+        symbol_reduction = spec.reduction_percent or 0
         
         # Get ORIGINAL unreduced SL pips from dual system config
         # Determine account tier based on balance
@@ -61,7 +63,7 @@ class ReEntryManager:
             tier = "100000"
         
         # Fetch original SL pips from the active system config
-        original_sl_pips = self.config["sl_systems"][active_system]["symbols"][trade.symbol][tier]["sl_pips"]
+        original_sl_pips = spec.sl_pips[(active_system, tier)]
         
         # Calculate applied SL pips (what was actually used on the trade)
         applied_sl_pips = original_sl_pips * (1 - symbol_reduction / 100) if symbol_reduction > 0 else original_sl_pips
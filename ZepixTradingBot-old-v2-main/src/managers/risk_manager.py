@@ -1,9 +1,10 @@
 import json
 import os
 import logging
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import Dict, Any, List
 from src.config import Config
+from src.utils.symbol_specs import specs_for
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,7 @@ class RiskManager:
         self.total_trades = 0
         self.winning_trades = 0
         self.open_trades = []
+        self.open_lots_by_symbol: Dict[str, float] = {}
         self.mt5_client = None
         self.load_stats()
         
@@ -175,20 +177,18 @@ class RiskManager:
         # Get base lot size
         base_lot = self.get_fixed_lot_size(balance)
         
-        # Apply timeframe multiplier
+        # Apply timeframe multiplier (compiled table only holds logics while enabled)
         try:
-            timeframe_config = self.config.get("timeframe_specific_config", {})
-            if timeframe_config.get("enabled", False) and logic:
-                logic_config = timeframe_config.get(logic)
-                if logic_config:
-                    multiplier = logic_config.get("lot_multiplier", 1.0)
-                    adjusted_lot = base_lot * multiplier
-                    
-                    # Sanity Check: Min lot 0.01
-                    adjusted_lot = max(0.01, round(adjusted_lot, 3))
-                    
-                    # print(f"Timeframe Config: {logic} Lot x{multiplier} -> {adjusted_lot} lots")
-                    return adjusted_lot
+            lot_multipliers = specs_for(self.config).logic_lot_multipliers
+            if logic in lot_multipliers:
+                multiplier = lot_multipliers[logic]
+                adjusted_lot = base_lot * multiplier
+                
+                # Sanity Check: Min lot 0.01
+                adjusted_lot = max(0.01, round(adjusted_lot, 3))
+                
+                # print(f"Timeframe Config: {logic} Lot x{multiplier} -> {adjusted_lot} lots")
+                return adjusted_lot
         except Exception as e:
             print(f"Error applying timeframe lot multiplier: {e}")
                 
@@ -241,12 +241,49 @@ class RiskManager:
         
         self.save_stats()
     
+    def attach_trade_registry(self, registry):
+        """
+        Share the engine's OpenTradeRegistry instead of keeping a second list.
+        Exposure per symbol is maintained from registry events (no rescans).
+        """
+        self.open_trades = registry
+        self.open_lots_by_symbol = {}
+        for trade in registry:
+            self._on_trade_event("added", trade)
+        registry.subscribe(self._on_trade_event)
+    
+    def _on_trade_event(self, event: str, trade):
+        if event not in ("added", "removed"):
+            return
+        lots = getattr(trade, 'lot_size', 0.0) or 0.0
+        if event == "removed":
+            lots = -lots
+        symbol = getattr(trade, 'symbol', None)
+        total = self.open_lots_by_symbol.get(symbol, 0.0) + lots
+        if abs(total) < 1e-9:
+            self.open_lots_by_symbol.pop(symbol, None)
+        else:
+            self.open_lots_by_symbol[symbol] = total
+    
     def add_open_trade(self, trade):
         """Add trade to open trades list"""
+        if hasattr(self.open_trades, 'add'):
+            self.open_trades.add(trade)  # Registry: idempotent, usually already added by the engine
+            return
         self.open_trades.append(trade)
     
     def remove_open_trade(self, trade):
         """Remove trade from open trades list"""
+        if hasattr(self.open_trades, 'discard'):
+            if self.open_trades.discard(trade):
+                return
+            # Not the registered object (e.g. a copy reloaded from the DB) - match by ticket
+            trade_id = getattr(trade, 'trade_id', None)
+            if trade_id is not None:
+                for t in self.open_trades.snapshot():
+                    if getattr(t, 'trade_id', None) == trade_id:
+                        self.open_trades.discard(t)
+            return
         self.open_trades = [t for t in self.open_trades 
                           if getattr(t, 'trade_id', None) != getattr(trade, 'trade_id', None)]
     
@@ -398,12 +435,12 @@ class RiskManager:
         try:
             today = date.today()
             
-            # Query database for trades closed today
+            # Query database for trades closed today (range form uses the close_time index)
             cursor = db.conn.cursor()
             cursor.execute('''
                 SELECT pnl FROM trades 
-                WHERE DATE(close_time) = DATE(?) AND status = 'closed'
-            ''', (today.isoformat(),))
+                WHERE status = 'closed' AND close_time >= ? AND close_time < ?
+            ''', (today.isoformat(), (today + timedelta(days=1)).isoformat()))
             
             today_trades = cursor.fetchall()
             
@@ -429,6 +466,15 @@ class RiskManager:
         Returns: {"total_live_pnl": float, "trade_details": List[Dict]}
         """
         try:
+            # Engine-wide cached snapshot: one price read per symbol, one vectorized pass
+            portfolio_pnl = vars(trading_engine).get('portfolio_pnl')
+            if portfolio_pnl is not None:
+                snapshot = portfolio_pnl.snapshot()
+                return {
+                    'total_live_pnl': snapshot.total,
+                    'trade_details': snapshot.trade_details()
+                }
+            
             open_trades = trading_engine.get_open_trades()
             total_live_pnl = 0.0
             trade_details = []
@@ -1,13 +1,77 @@
+import atexit
 import json
 import os
 import pathlib
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+# Per-symbol trend state is packed 2 bits per timeframe (bit offset = 2 * index)
+MASK_TIMEFRAMES = ("15m", "1h", "4h", "1d")
+TREND_CODES = {"NEUTRAL": 0, "BULLISH": 1, "BEARISH": 2}
+TREND_NAMES = ("NEUTRAL", "BULLISH", "BEARISH", "NEUTRAL")
+
+# Logic -> (bias timeframe, trend timeframe); both must agree and be non-neutral
+LOGIC_TIMEFRAMES = {
+    "combinedlogic-1": ("1h", "15m"),  # 1H bias + 15M trend for 5M entries
+    "combinedlogic-2": ("1h", "15m"),  # 1H bias + 15M trend for 15M entries
+    "combinedlogic-3": ("1d", "1h"),   # 1D bias + 1H trend for 1H entries
+}
+
+
+def _build_alignment_table() -> Dict[str, Tuple[Dict[str, Any], ...]]:
+    """Alignment result for every logic and every possible trend bitmask"""
+    table = {}
+    for logic, (bias_tf, trend_tf) in LOGIC_TIMEFRAMES.items():
+        bias_shift = 2 * MASK_TIMEFRAMES.index(bias_tf)
+        trend_shift = 2 * MASK_TIMEFRAMES.index(trend_tf)
+        results = []
+        for mask in range(1 << (2 * len(MASK_TIMEFRAMES))):
+            bias = TREND_NAMES[(mask >> bias_shift) & 3]
+            trend = TREND_NAMES[(mask >> trend_shift) & 3]
+            result = {
+                "aligned": False,
+                "direction": "NEUTRAL",
+                "details": {bias_tf: bias, trend_tf: trend},
+                "failure_reason": None
+            }
+            if bias == "NEUTRAL":
+                result["failure_reason"] = f"{bias_tf.upper()} trend is NEUTRAL"
+            elif trend == "NEUTRAL":
+                result["failure_reason"] = f"{trend_tf.upper()} trend is NEUTRAL"
+            elif bias != trend:
+                result["failure_reason"] = (
+                    f"Trends don't match: {bias_tf.upper()}={bias} != {trend_tf.upper()}={trend}"
+                )
+            else:
+                result["aligned"] = True
+                result["direction"] = bias
+            results.append(result)
+        table[logic] = tuple(results)
+    return table
+
+
+ALIGNMENT_TABLE = _build_alignment_table()
+
 
 class TimeframeTrendManager:
-    """Manage trends per timeframe instead of per logic"""
+    """
+    Manage trends per timeframe instead of per logic
+    
+    Trend state lives in memory. Updates only mark it dirty; a background
+    flusher coalesces bursts (debounce_ms), appends the changed entries to a
+    small journal file and periodically rewrites the JSON snapshot atomically.
+    The alert path never touches the disk.
     
-    def __init__(self, config_file: str = "config/timeframe_trends.json"):
+    check_logic_alignment() is a lookup into ALIGNMENT_TABLE by the symbol's
+    trend bitmask. The mask is rebuilt only when update_trend/set_auto_trend
+    touch that symbol, and alignment_version moves only when a mask actually
+    changes, so callers can skip work between trend changes.
+    """
+    
+    def __init__(self, config_file: str = "config/timeframe_trends.json",
+                 debounce_ms: float = 250, snapshot_interval: float = 5.0):
         # Resolve absolute path to ensure persistence works regardless of CWD
         # Assume this file is in src/managers/
         # Root is 2 levels up from src/managers -> src -> root
@@ -22,7 +86,33 @@ class TimeframeTrendManager:
             
         print(f"DEBUG: TimeframeTrendManager using config file: {self.config_file}")
         
+        # Debounced persistence state
+        self.journal_file = self.config_file + ".journal"
+        self.debounce = debounce_ms / 1000.0
+        self.snapshot_interval = snapshot_interval
+        self._lock = threading.RLock()      # Guards self.trends + dirty set
+        self._io_lock = threading.Lock()    # Serializes journal / snapshot writes
+        self._dirty_keys = set()            # (symbol, timeframe) not yet journaled
+        self._snapshot_dirty = False        # Journaled but not yet in the snapshot
+        self._last_snapshot = time.monotonic()
+        self._wakeup = threading.Event()
+        self._flusher = None
+        self._closed = False
+        self.persist_stats = {
+            "updates": 0,
+            "journal_writes": 0,
+            "journal_records": 0,
+            "snapshots": 0
+        }
+        
+        # Alignment cache: symbol -> trend bitmask (see MASK_TIMEFRAMES)
+        self._trend_masks: Dict[str, int] = {}
+        self._symbol_versions: Dict[str, int] = {}
+        self.alignment_version = 0
+        
         self.trends = self.load_trends()
+        self._replay_journal()
+        atexit.register(self.flush)
         
     def load_trends(self) -> Dict[str, Any]:
         """Load trends from file with error handling"""
@@ -62,16 +152,123 @@ class TimeframeTrendManager:
             }
     
     def save_trends(self):
-        """Save trends to file"""
-        try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+        """Write the full snapshot atomically (temp file + rename), then drop the journal"""
+        with self._io_lock:
+            try:
+                with self._lock:
+                    payload = json.dumps(self.trends, indent=4)
+                    self._dirty_keys.clear()  # Snapshot supersedes pending journal records
+                    self._snapshot_dirty = False
+                
+                # Ensure directory exists
+                os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+                
+                tmp_file = self.config_file + ".tmp"
+                with open(tmp_file, 'w') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.config_file)
+                
+                if os.path.exists(self.journal_file):
+                    os.remove(self.journal_file)
+                self._last_snapshot = time.monotonic()
+                self.persist_stats["snapshots"] += 1
+            except Exception as e:
+                print(f"ERROR: Error saving trends to {self.config_file}: {str(e)}")
+    
+    # ==================== DEBOUNCED PERSISTENCE ====================
+    
+    def _mark_dirty(self, symbol: str, timeframe: str):
+        """Record an in-memory change and wake the flusher (no file I/O)"""
+        with self._lock:
+            self._dirty_keys.add((symbol, timeframe))
+            self.persist_stats["updates"] += 1
+            if self._flusher is None and not self._closed:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="trend-flusher", daemon=True
+                )
+                self._flusher.start()
+        self._wakeup.set()
+    
+    def _flush_loop(self):
+        while not self._closed:
+            woken = self._wakeup.wait(timeout=self.snapshot_interval)
+            if self._closed:
+                break
+            if woken:
+                time.sleep(self.debounce)  # Let the burst finish, then write once
+                self._wakeup.clear()
+            self._write_journal()
+            if self._snapshot_dirty and time.monotonic() - self._last_snapshot >= self.snapshot_interval:
+                self.save_trends()
+    
+    def _write_journal(self):
+        """Append changed (symbol, timeframe) entries to the journal and fsync"""
+        with self._io_lock:
+            with self._lock:
+                if not self._dirty_keys:
+                    return
+                records = []
+                for symbol, timeframe in self._dirty_keys:
+                    state = self.trends["symbols"].get(symbol, {}).get(timeframe)
+                    if state is not None:
+                        records.append({"symbol": symbol, "timeframe": timeframe, "state": dict(state)})
+                self._dirty_keys.clear()
+                self._snapshot_dirty = True
             
-            with open(self.config_file, 'w') as f:
-                json.dump(self.trends, f, indent=4)
-            # print(f"DEBUG: Saved trends to {self.config_file}") 
+            try:
+                with open(self.journal_file, 'a') as f:
+                    for record in records:
+                        f.write(json.dumps(record) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.persist_stats["journal_writes"] += 1
+                self.persist_stats["journal_records"] += len(records)
+            except Exception as e:
+                print(f"ERROR: Error writing trend journal {self.journal_file}: {str(e)}")
+    
+    def _replay_journal(self):
+        """Apply journal records left by a crash, then compact into the snapshot"""
+        if not os.path.exists(self.journal_file):
+            return
+        applied = 0
+        try:
+            with open(self.journal_file, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Torn final write - everything before it is intact
+                    self.trends["symbols"].setdefault(record["symbol"], {})[record["timeframe"]] = record["state"]
+                    applied += 1
         except Exception as e:
-            print(f"ERROR: Error saving trends to {self.config_file}: {str(e)}")
+            print(f"WARNING: Could not replay trend journal {self.journal_file}: {str(e)}")
+        if applied:
+            print(f"SUCCESS: Replayed {applied} trend journal records")
+        self.save_trends()
+    
+    def flush(self):
+        """Persist everything now (shutdown / explicit barrier)"""
+        if self._dirty_keys or self._snapshot_dirty:
+            self.save_trends()
+    
+    def close(self):
+        """Stop the flusher and write the final snapshot"""
+        self._closed = True
+        self._wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5.0)
+            self._flusher = None
+        self.flush()
+    
+    def get_persistence_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.persist_stats)
+            stats["pending_keys"] = len(self._dirty_keys)
+            stats["snapshot_dirty"] = self._snapshot_dirty
+        stats["flusher_running"] = self._flusher is not None and self._flusher.is_alive()
+        return stats
     
     def update_trend(self, symbol: str, timeframe: str, signal: str, mode: str = "AUTO"):
         """Update trend for a specific symbol and timeframe"""
@@ -82,14 +279,11 @@ class TimeframeTrendManager:
             # print(f"DEBUG: Ignoring 5m trend update for {symbol} (Unused by logic)")
             return False
 
-        if symbol not in self.trends["symbols"]:
-            self.trends["symbols"][symbol] = {}
-        
-        if timeframe not in self.trends["symbols"][symbol]:
-            self.trends["symbols"][symbol][timeframe] = {}
+        with self._lock:
+            symbol_trends = self.trends["symbols"].setdefault(symbol, {})
+            current = symbol_trends.setdefault(timeframe, {})
         
         # Check if manually locked
-        current = self.trends["symbols"][symbol][timeframe]
         if current.get("mode") == "MANUAL" and mode == "AUTO":
             print(f"WARNING: Manual trend locked for {symbol} {timeframe}, not updating")
             return  # Don't override manual settings
@@ -111,12 +305,14 @@ class TimeframeTrendManager:
             print(f"INFO: Trend already {trend} ({mode}) for {symbol} {timeframe}, ignoring update")
             return False
         
-        self.trends["symbols"][symbol][timeframe] = {
-            "trend": trend,
-            "mode": mode,
-            "last_update": datetime.now().isoformat()
-        }
-        self.save_trends()
+        with self._lock:
+            self.trends["symbols"][symbol][timeframe] = {
+                "trend": trend,
+                "mode": mode,
+                "last_update": datetime.now().isoformat()
+            }
+            self._mark_dirty(symbol, timeframe)
+            self.invalidate_alignment(symbol)
         print(f"SUCCESS: Trend updated: {symbol} {timeframe} -> {trend} ({mode})")
         return True
     
@@ -191,22 +387,62 @@ class TimeframeTrendManager:
         # Cannot detect
         return None
     
+    # ==================== ALIGNMENT CACHE ====================
+    
+    def _compute_mask(self, symbol: str) -> Optional[int]:
+        """Pack the symbol's 15m/1h/4h/1d trends into 2 bits each (None if unknown symbol)"""
+        symbol_trends = self.trends["symbols"].get(symbol)
+        if symbol_trends is None:
+            return None
+        mask = 0
+        for index, timeframe in enumerate(MASK_TIMEFRAMES):
+            trend = symbol_trends.get(timeframe, {}).get("trend", "NEUTRAL")
+            mask |= TREND_CODES.get(trend, 0) << (2 * index)
+        return mask
+    
+    def invalidate_alignment(self, symbol: Optional[str] = None):
+        """
+        Rebuild the trend bitmask for a symbol (all symbols when None)
+        
+        Versions are bumped only for symbols whose mask actually changed.
+        Call this after mutating self.trends outside update_trend/set_auto_trend.
+        """
+        with self._lock:
+            symbols = [symbol] if symbol is not None else set(self._trend_masks) | set(self.trends["symbols"])
+            for sym in symbols:
+                previous = self._trend_masks.pop(sym, None)
+                mask = self._compute_mask(sym)
+                if mask is not None:
+                    self._trend_masks[sym] = mask
+                if mask != previous:
+                    self._symbol_versions[sym] = self._symbol_versions.get(sym, 0) + 1
+                    self.alignment_version += 1
+    
+    def get_alignment_version(self, symbol: Optional[str] = None) -> int:
+        """Counter that changes whenever alignment for the symbol (or any symbol) may have changed"""
+        if symbol is None:
+            return self.alignment_version
+        return self._symbol_versions.get(symbol, 0)
+    
+    def get_trend_mask(self, symbol: str) -> Optional[int]:
+        """Current 2-bit-per-timeframe trend state for a symbol (None if unknown)"""
+        mask = self._trend_masks.get(symbol)
+        if mask is None:
+            with self._lock:
+                mask = self._compute_mask(symbol)
+                if mask is not None:
+                    self._trend_masks[symbol] = mask
+        return mask
+    
     def check_logic_alignment(self, symbol: str, logic: str) -> Dict[str, Any]:
         """Check if trends align for a specific trading logic"""
         
         import logging
         logger = logging.getLogger(__name__)
         
-        result = {
-            "aligned": False,
-            "direction": "NEUTRAL",
-            "details": {},
-            "failure_reason": None
-        }
-        
         # VALIDATE AND NORMALIZE LOGIC: Fix for "Unknown logic" error
         original_logic = logic
-        if logic not in ["combinedlogic-1", "combinedlogic-2", "combinedlogic-3"]:
+        if logic not in ALIGNMENT_TABLE:
             # Try to detect from strategy name
             detected = self.detect_logic_from_strategy_or_timeframe(logic)
             if detected:
@@ -215,127 +451,32 @@ class TimeframeTrendManager:
                 )
                 logic = detected
             else:
-                result["failure_reason"] = f"Unknown logic: {logic} (could not auto-detect)"
                 logger.warning(
                     f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ Unknown logic (no detection possible). "
                     f"Expected: combinedlogic-1/2/3, Got: {original_logic}"
                 )
-                return result
+                return {
+                    "aligned": False,
+                    "direction": "NEUTRAL",
+                    "details": {},
+                    "failure_reason": f"Unknown logic: {logic} (could not auto-detect)"
+                }
         
-        # DIAGNOSTIC: Check if symbol exists in trends
-        if symbol not in self.trends["symbols"]:
-            result["failure_reason"] = f"Symbol {symbol} not found in trends dictionary"
+        mask = self.get_trend_mask(symbol)
+        if mask is None:
             logger.debug(
                 f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ Symbol not in trends. "
                 f"Available symbols: {list(self.trends['symbols'].keys())}"
             )
-            return result
-        
-        symbol_trends = self.trends["symbols"][symbol]
-        
-        if logic == "combinedlogic-1":  # 1H bias + 15M trend for 5M entries
-            h1_trend = symbol_trends.get("1h", {}).get("trend", "NEUTRAL")
-            m15_trend = symbol_trends.get("15m", {}).get("trend", "NEUTRAL")
-            
-            result["details"] = {"1h": h1_trend, "15m": m15_trend}
-            
-            # DIAGNOSTIC: Log alignment check details
-            if h1_trend == "NEUTRAL":
-                result["failure_reason"] = "1H trend is NEUTRAL"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ 1H trend is NEUTRAL "
-                    f"(1H={h1_trend}, 15M={m15_trend})"
-                )
-            elif m15_trend == "NEUTRAL":
-                result["failure_reason"] = "15M trend is NEUTRAL"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ 15M trend is NEUTRAL "
-                    f"(1H={h1_trend}, 15M={m15_trend})"
-                )
-            elif h1_trend != m15_trend:
-                result["failure_reason"] = f"Trends don't match: 1H={h1_trend} != 15M={m15_trend}"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ Trends don't match "
-                    f"(1H={h1_trend}, 15M={m15_trend})"
-                )
-            else:
-                result["aligned"] = True
-                result["direction"] = h1_trend
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ✅ ALIGNED "
-                    f"(1H={h1_trend}, 15M={m15_trend}, Direction={h1_trend})"
-                )
-                
-        elif logic == "combinedlogic-2":  # 1H bias + 15M trend for 15M entries
-            h1_trend = symbol_trends.get("1h", {}).get("trend", "NEUTRAL")
-            m15_trend = symbol_trends.get("15m", {}).get("trend", "NEUTRAL")
-            
-            result["details"] = {"1h": h1_trend, "15m": m15_trend}
-            
-            # DIAGNOSTIC: Log alignment check details
-            if h1_trend == "NEUTRAL":
-                result["failure_reason"] = "1H trend is NEUTRAL"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ 1H trend is NEUTRAL "
-                    f"(1H={h1_trend}, 15M={m15_trend})"
-                )
-            elif m15_trend == "NEUTRAL":
-                result["failure_reason"] = "15M trend is NEUTRAL"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ 15M trend is NEUTRAL "
-                    f"(1H={h1_trend}, 15M={m15_trend})"
-                )
-            elif h1_trend != m15_trend:
-                result["failure_reason"] = f"Trends don't match: 1H={h1_trend} != 15M={m15_trend}"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ Trends don't match "
-                    f"(1H={h1_trend}, 15M={m15_trend})"
-                )
-            else:
-                result["aligned"] = True
-                result["direction"] = h1_trend
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ✅ ALIGNED "
-                    f"(1H={h1_trend}, 15M={m15_trend}, Direction={h1_trend})"
-                )
-                
-        elif logic == "combinedlogic-3":  # 1D bias + 1H trend for 1H entries
-            d1_trend = symbol_trends.get("1d", {}).get("trend", "NEUTRAL")
-            h1_trend = symbol_trends.get("1h", {}).get("trend", "NEUTRAL")
-            
-            result["details"] = {"1d": d1_trend, "1h": h1_trend}
-            
-            # DIAGNOSTIC: Log alignment check details
-            if d1_trend == "NEUTRAL":
-                result["failure_reason"] = "1D trend is NEUTRAL"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ 1D trend is NEUTRAL "
-                    f"(1D={d1_trend}, 1H={h1_trend})"
-                )
-            elif h1_trend == "NEUTRAL":
-                result["failure_reason"] = "1H trend is NEUTRAL"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ 1H trend is NEUTRAL "
-                    f"(1D={d1_trend}, 1H={h1_trend})"
-                )
-            elif d1_trend != h1_trend:
-                result["failure_reason"] = f"Trends don't match: 1D={d1_trend} != 1H={h1_trend}"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ Trends don't match "
-                    f"(1D={d1_trend}, 1H={h1_trend})"
-                )
-            else:
-                result["aligned"] = True
-                result["direction"] = d1_trend
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ✅ ALIGNED "
-                    f"(1D={d1_trend}, 1H={h1_trend}, Direction={d1_trend})"
-                )
-        else:
-            result["failure_reason"] = f"Unknown logic: {logic}"
-            logger.warning(f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ Unknown logic")
+            return {
+                "aligned": False,
+                "direction": "NEUTRAL",
+                "details": {},
+                "failure_reason": f"Symbol {symbol} not found in trends dictionary"
+            }
         
-        return result
+        result = ALIGNMENT_TABLE[logic][mask]
+        return dict(result, details=dict(result["details"]))
     
     def set_manual_trend(self, symbol: str, timeframe: str, trend: str):
         """Manually set a trend that won't be overridden by signals"""
@@ -352,8 +493,10 @@ class TimeframeTrendManager:
     def set_auto_trend(self, symbol: str, timeframe: str):
         """Set trend back to AUTO mode (will be updated by TradingView signals)"""
         if symbol in self.trends["symbols"] and timeframe in self.trends["symbols"][symbol]:
-            self.trends["symbols"][symbol][timeframe]["mode"] = "AUTO"
-            self.save_trends()
+            with self._lock:
+                self.trends["symbols"][symbol][timeframe]["mode"] = "AUTO"
+                self._mark_dirty(symbol, timeframe)
+                self.invalidate_alignment(symbol)
             print(f"SUCCESS: Mode set to AUTO for {symbol} {timeframe}")
     
     def get_all_trends(self, symbol: str) -> Dict[str, str]:
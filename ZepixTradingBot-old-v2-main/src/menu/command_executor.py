@@ -297,6 +297,7 @@ class CommandExecutor:
                 "export_date_range": self._execute_export_date_range,
                 "trading_debug_mode": self._execute_trading_debug_mode,
                 "system_resources": self._execute_system_resources,
+                "loop_lag": self._execute_loop_lag,
                 
                 # Deprecated/alias commands
                 "set_sl_reductions": self._execute_set_sl_reduction,  # Deprecated but kept for compatibility
@@ -855,6 +856,13 @@ class CommandExecutor:
             # Get paused status
             is_paused = self.bot.trading_engine.is_paused
             
+            # Event loop lag (watchdog)
+            loop_line = "N/A"
+            watchdog = getattr(self.bot.trading_engine, "loop_watchdog", None)
+            if watchdog is not None:
+                loop_stats = watchdog.get_stats(limit=1)
+                loop_line = f"p99 {loop_stats['lag']['p99_ms']:.0f} ms, {loop_stats['stalls']} stalls"
+            
             text = (
                 "🏥 *SYSTEM HEALTH DASHBOARD*\n"
                 "━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
@@ -873,6 +881,7 @@ class CommandExecutor:
                 "📈 *System Info:*\n"
                 f"• Uptime: {uptime_hours:.1f} hours\n"
                 f"• Log Size: {log_size:.2f} MB / 10 MB\n"
+                f"• Event Loop Lag: {loop_line}\n"
                 f"• Trading Mode: {trading_mode}\n\n"
                 "💡 *Tip:* Use /reset_health to clear error counts"
             )
@@ -2032,6 +2041,17 @@ class CommandExecutor:
             self.bot.send_message(f"❌ Error changing debug mode: {str(e)}")
             return False
     
+    def _execute_loop_lag(self, params: Dict[str, Any]):
+        """Show event-loop lag and the call sites that blocked it"""
+        try:
+            watchdog = getattr(self.bot.trading_engine, "loop_watchdog", None)
+            if watchdog is None:
+                self.bot.send_message("❌ Event loop watchdog not available")
+                return
+            self.bot.send_message(watchdog.format_report())
+        except Exception as e:
+            self.bot.send_message(f"❌ Error getting loop lag: {str(e)}")
+    
     def _execute_system_resources(self, params: Dict[str, Any]):
         """Show system resource usage"""
         try:
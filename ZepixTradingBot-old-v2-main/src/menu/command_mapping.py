@@ -162,6 +162,7 @@ COMMAND_PARAM_MAP = {
     "clear_old_logs": {"params": [], "type": "direct", "handler": "_execute_clear_old_logs"},
     "trading_debug_mode": {"params": ["mode"], "type": "single", "options": ["on", "off", "status"], "handler": "_execute_trading_debug_mode"},
     "system_resources": {"params": [], "type": "direct", "handler": "_execute_system_resources"},
+    "loop_lag": {"params": [], "type": "direct", "handler": "_execute_loop_lag"},
     
     "autonomous_dashboard": {"params": [], "type": "direct", "handler": "handle_autonomous_dashboard"},
     "autonomous_mode": {"params": ["mode"], "type": "single", "options": ["on", "off", "status"], "handler": "handle_autonomous_mode"},
@@ -308,6 +308,7 @@ def get_command_categories():
             "clear_old_logs": COMMAND_PARAM_MAP["clear_old_logs"],
             "trading_debug_mode": COMMAND_PARAM_MAP["trading_debug_mode"],
             "system_resources": COMMAND_PARAM_MAP["system_resources"],
+            "loop_lag": COMMAND_PARAM_MAP["loop_lag"],
         }
     }
     }
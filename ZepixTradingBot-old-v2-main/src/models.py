@@ -1,4 +1,5 @@
 from typing import Dict, Any, Optional, List
+from dataclasses import make_dataclass, field
 from pydantic import BaseModel, validator
 from datetime import datetime
 import json
@@ -110,6 +111,79 @@ class Trade(BaseModel):
     def from_dict(cls, data):
         return cls(**data)
 
+
+# Slotted runtime twin of Trade: same fields and defaults, generated from the
+# pydantic model so the two cannot drift apart
+_TradeSlots = make_dataclass(
+    "_TradeSlots",
+    [
+        (name, Any) if info.is_required() else (name, Any, field(default=info.default))
+        for name, info in Trade.model_fields.items()
+    ],
+    slots=True,
+    kw_only=True,
+    eq=False
+)
+
+
+class TradeRecord(_TradeSlots):
+    """
+    Lightweight runtime trade used on the hot path (order placement, profit
+    booking, monitor loops). Attribute access matches Trade; no validation,
+    identity equality. Ad-hoc attributes (v3_metadata, close_price, ...) go to
+    a lazily created __dict__. Convert with to_model()/from_model() at the
+    API/DB boundary.
+    """
+    __slots__ = ("__dict__",)
+
+    FIELDS = tuple(Trade.model_fields)
+
+    @property
+    def entry_price(self):
+        return self.entry
+
+    @property
+    def sl_price(self):
+        return self.sl
+
+    @property
+    def ticket(self):
+        return self.trade_id
+
+    @ticket.setter
+    def ticket(self, value):
+        self.trade_id = value
+
+    @property
+    def extra(self) -> Dict[str, Any]:
+        """Ad-hoc attributes set outside the declared fields"""
+        return self.__dict__
+
+    def to_model(self) -> Trade:
+        data = {name: getattr(self, name) for name in self.FIELDS}
+        data.update(self.__dict__)
+        return Trade(**data)
+
+    @classmethod
+    def from_model(cls, trade: Trade) -> "TradeRecord":
+        record = cls(**{name: getattr(trade, name) for name in cls.FIELDS})
+        for name, value in (trade.model_extra or {}).items():
+            setattr(record, name, value)
+        return record
+
+    def to_dict(self):
+        return Trade.to_dict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        known = {name: data[name] for name in cls.FIELDS if name in data}
+        record = cls(**known)
+        for name, value in data.items():
+            if name not in known:
+                setattr(record, name, value)
+        return record
+
+
 class ReEntryChain(BaseModel):
     chain_id: str
     symbol: str
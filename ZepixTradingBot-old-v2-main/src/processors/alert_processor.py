@@ -1,16 +1,84 @@
-from typing import Dict, Any, List, Optional
+import heapq
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from src.config import Config
 from src.models import Alert
 from src.v3_alert_models import ZepixV3Alert
 
+DedupKey = Tuple[str, str, str, str]  # (type, symbol, tf, signal)
+
 class AlertProcessor:
     def __init__(self, config: Config, trend_manager=None, telegram_bot=None):
         self.config = config
         self.trend_manager = trend_manager  # For checking if trend actually changed
         self.telegram_bot = telegram_bot  # For sending notifications
-        self.recent_alerts: List[Alert] = []
-        self.alert_window = timedelta(minutes=5)
+        
+        dedup_config = config.get("alert_dedup", {}) if hasattr(config, "get") else {}
+        if not isinstance(dedup_config, dict):
+            dedup_config = {}
+        self.alert_window = timedelta(seconds=dedup_config.get("default_window_seconds", 300))
+        # Per alert type window overrides, in seconds
+        self.alert_windows: Dict[str, float] = dict(dedup_config.get("windows", {}))
+        
+        # Dedup index: key -> (epoch timestamp, alert); expiry heap of (expires_at, timestamp, key)
+        self._dedup_index: Dict[DedupKey, Tuple[float, Alert]] = {}
+        self._dedup_expiry: List[Tuple[float, float, DedupKey]] = []
+        self.dedup_stats = {"hits": 0, "misses": 0, "stored": 0, "expired": 0}
+    
+    @property
+    def recent_alerts(self) -> List[Alert]:
+        """Alerts still inside their dedup window, oldest first"""
+        self._expire_dedup()
+        entries = sorted(self._dedup_index.values(), key=lambda entry: entry[0])
+        return [alert for _, alert in entries]
+    
+    def _dedup_window(self, alert_type: str) -> float:
+        return float(self.alert_windows.get(alert_type, self.alert_window.total_seconds()))
+    
+    @staticmethod
+    def _dedup_key(alert: Alert) -> DedupKey:
+        return (alert.type, alert.symbol, alert.tf, alert.signal)
+    
+    @staticmethod
+    def _alert_timestamp(alert: Alert, default: float) -> float:
+        """Parse raw_data['timestamp'] once; fall back to default"""
+        if alert.raw_data and isinstance(alert.raw_data, dict):
+            timestamp_str = alert.raw_data.get('timestamp')
+            if timestamp_str:
+                try:
+                    return datetime.fromisoformat(timestamp_str).timestamp()
+                except (ValueError, TypeError):
+                    pass
+        return default
+    
+    def _expire_dedup(self, now: Optional[float] = None):
+        """Pop entries whose window has elapsed (heap ordered by expiry time)"""
+        now = datetime.now().timestamp() if now is None else now
+        expiry = self._dedup_expiry
+        while expiry and expiry[0][0] <= now:
+            _, timestamp, key = heapq.heappop(expiry)
+            entry = self._dedup_index.get(key)
+            # Skip heap records superseded by a newer store of the same key
+            if entry is not None and entry[0] == timestamp:
+                del self._dedup_index[key]
+                self.dedup_stats["expired"] += 1
+    
+    def _remember_alert(self, alert: Alert):
+        now = datetime.now().timestamp()
+        timestamp = self._alert_timestamp(alert, now)
+        key = self._dedup_key(alert)
+        self._dedup_index[key] = (timestamp, alert)
+        heapq.heappush(self._dedup_expiry, (timestamp + self._dedup_window(alert.type), timestamp, key))
+        self.dedup_stats["stored"] += 1
+        self._expire_dedup(now)
+    
+    def get_dedup_stats(self) -> Dict[str, Any]:
+        self._expire_dedup()
+        return {
+            **self.dedup_stats,
+            "size": len(self._dedup_index),
+            "heap_size": len(self._dedup_expiry)
+        }
     
     def process_mtf_trends(self, trend_string: str, symbol: str) -> None:
         """
@@ -173,34 +241,17 @@ class AlertProcessor:
                 # If trend check fails, fall through to normal duplicate detection
                 print(f"WARNING: Trend check failed, using normal duplicate detection: {e}")
         
-        # Get incoming alert's timestamp
-        incoming_timestamp = datetime.now()
-        if alert.raw_data and isinstance(alert.raw_data, dict):
-            timestamp_str = alert.raw_data.get('timestamp')
-            if timestamp_str:
-                try:
-                    incoming_timestamp = datetime.fromisoformat(timestamp_str)
-                except (ValueError, TypeError):
-                    pass
+        # Get incoming alert's timestamp and probe the index (O(1))
+        now = datetime.now().timestamp()
+        self._expire_dedup(now)
+        incoming_timestamp = self._alert_timestamp(alert, now)
         
-        for recent_alert in self.recent_alerts:
-            # Skip alerts older than alert_window relative to incoming alert
-            if recent_alert.raw_data and isinstance(recent_alert.raw_data, dict):
-                recent_timestamp_str = recent_alert.raw_data.get('timestamp')
-                if recent_timestamp_str:
-                    try:
-                        recent_alert_time = datetime.fromisoformat(recent_timestamp_str)
-                        if incoming_timestamp - recent_alert_time >= self.alert_window:
-                            continue  # Skip old alerts (>5 min apart)
-                    except (ValueError, TypeError):
-                        pass  # If timestamp invalid, still check for duplicate
-            
-            if (recent_alert.type == alert.type and
-                recent_alert.symbol == alert.symbol and
-                recent_alert.tf == alert.tf and
-                recent_alert.signal == alert.signal):
-                return True
-                
+        entry = self._dedup_index.get(self._dedup_key(alert))
+        if entry is not None and incoming_timestamp - entry[0] < self._dedup_window(alert.type):
+            self.dedup_stats["hits"] += 1
+            return True
+        
+        self.dedup_stats["misses"] += 1
         return False
     
     def is_valid_symbol(self, symbol: str) -> bool:
@@ -212,27 +263,7 @@ class AlertProcessor:
     def clean_old_alerts(self):
         """Remove alerts older than the alert window"""
         try:
-            current_time = datetime.now()
-            cleaned_alerts = []
-            
-            for alert in self.recent_alerts:
-                timestamp_str = None
-                
-                if alert.raw_data and isinstance(alert.raw_data, dict):
-                    timestamp_str = alert.raw_data.get('timestamp')
-                
-                if timestamp_str:
-                    try:
-                        alert_time = datetime.fromisoformat(timestamp_str)
-                        if current_time - alert_time < self.alert_window:
-                            cleaned_alerts.append(alert)
-                    except (ValueError, TypeError):
-                        cleaned_alerts.append(alert)
-                else:
-                    cleaned_alerts.append(alert)
-            
-            self.recent_alerts = cleaned_alerts
-            
+            self._expire_dedup()
         except Exception as e:
             print(f"WARNING: Error cleaning alerts: {str(e)}")
     
@@ -259,7 +290,7 @@ class AlertProcessor:
         try:
             # Only store if it's actually an entry alert
             if alert.type == 'entry':
-                self.recent_alerts.append(alert)
+                self._remember_alert(alert)
                 print(f"INFO: Entry alert stored after successful execution for duplicate detection")
         except Exception as e:
             print(f"WARNING: Failed to store entry alert: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,249 @@
+"""
+Symbol Alert Pipeline - Per-symbol ordered ingestion with bounded parallelism
+
+Every symbol gets its own FIFO of pending alerts. A fixed pool of worker
+tasks pulls symbols from a round-robin ready queue and handles ONE alert of
+that symbol at a time, so alerts for the same symbol never interleave while
+different symbols proceed in parallel. A burst on one symbol only fills that
+symbol's queue (overflow policy applies there); other symbols keep flowing.
+
+Handlers must not wait on another symbol's lane: with every worker blocked
+in such a wait nothing drains the lanes they wait on. process() called from
+a handler runs inline for the handler's own symbol and raises RuntimeError
+for any other; submit() from a handler is fine as long as the returned
+future is not awaited there. Tasks a handler spawns are detached from the
+worker and may wait on any lane - unless the handler itself awaits them.
+"""
+
+import asyncio
+import contextvars
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from src.utils.optimized_logger import logger
+from src.utils.latency_tracer import LatencyHistogram
+
+OVERFLOW_BLOCK = "block"              # Producer waits for room (backpressure), then rejects
+OVERFLOW_DROP_OLDEST = "drop_oldest"  # Oldest pending alert of that symbol is discarded
+OVERFLOW_REJECT = "reject"            # New alert is refused immediately
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_REJECT)
+
+GLOBAL_KEY = "_global"  # Alerts without a symbol (e.g. raw JSON strings)
+
+# (symbol, worker task) being handled - re-entrant submits from that task run inline
+_active_lane: contextvars.ContextVar = contextvars.ContextVar("active_alert_lane", default=None)
+
+
+class _SymbolLane:
+    __slots__ = ("pending", "active", "space", "wait_hist", "service_hist",
+                 "processed", "dropped", "rejected", "errors", "max_depth")
+
+    def __init__(self):
+        self.pending: Deque[Tuple[Any, asyncio.Future, float]] = deque()
+        self.active = False
+        self.space = asyncio.Event()
+        self.space.set()
+        self.wait_hist = LatencyHistogram()
+        self.service_hist = LatencyHistogram()
+        self.processed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.errors = 0
+        self.max_depth = 0
+
+
+class SymbolAlertPipeline:
+    """
+    Ordered per-symbol queues drained by a bounded worker pool
+
+    handler(data) is awaited for each alert; its return value resolves the
+    future returned by submit(). Dropped/rejected alerts resolve to False.
+    """
+
+    def __init__(self, handler: Callable[[Any], Awaitable[Any]], max_workers: int = 4,
+                 max_queue_per_symbol: int = 50, overflow_policy: str = OVERFLOW_BLOCK,
+                 enqueue_timeout: float = 5.0):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}")
+        self.handler = handler
+        self.max_workers = max(1, max_workers)
+        self.max_queue_per_symbol = max(1, max_queue_per_symbol)
+        self.overflow_policy = overflow_policy
+        self.enqueue_timeout = enqueue_timeout
+
+        self.lanes: Dict[str, _SymbolLane] = {}
+        self._ready: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.is_running = False
+
+    @classmethod
+    def from_config(cls, handler, pipeline_config: Dict[str, Any]) -> "SymbolAlertPipeline":
+        return cls(
+            handler,
+            max_workers=pipeline_config.get("max_workers", 4),
+            max_queue_per_symbol=pipeline_config.get("max_queue_per_symbol", 50),
+            overflow_policy=pipeline_config.get("overflow_policy", OVERFLOW_BLOCK),
+            enqueue_timeout=pipeline_config.get("enqueue_timeout_seconds", 5.0)
+        )
+
+    @staticmethod
+    def symbol_of(data: Any) -> str:
+        """Lane key: dict alerts and Alert model objects both carry a symbol"""
+        if isinstance(data, dict):
+            symbol = data.get("symbol")
+        else:
+            symbol = getattr(data, "symbol", None)
+        return str(symbol).upper() if symbol else GLOBAL_KEY
+
+    # ==================== PRODUCER SIDE ====================
+
+    async def submit(self, data: Any) -> asyncio.Future:
+        """
+        Queue an alert; returns a future resolved with the handler's result
+
+        A handler may submit() follow-up alerts but must not await their
+        futures (see module docstring).
+        """
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        symbol = self.symbol_of(data)
+        lane = self.lanes.get(symbol)
+        if lane is None:
+            lane = self.lanes[symbol] = _SymbolLane()
+
+        future = loop.create_future()
+
+        if len(lane.pending) >= self.max_queue_per_symbol:
+            if self.overflow_policy == OVERFLOW_DROP_OLDEST:
+                _, dropped_future, _ = lane.pending.popleft()
+                if not dropped_future.done():
+                    dropped_future.set_result(False)
+                lane.dropped += 1
+                logger.warning(f"Alert pipeline overflow [{symbol}]: dropped oldest pending alert")
+            elif self.overflow_policy == OVERFLOW_BLOCK:
+                deadline = time.perf_counter() + self.enqueue_timeout
+                while len(lane.pending) >= self.max_queue_per_symbol:
+                    lane.space.clear()
+                    remaining = deadline - time.perf_counter()
+                    try:
+                        await asyncio.wait_for(lane.space.wait(), max(remaining, 0))
+                    except asyncio.TimeoutError:
+                        lane.rejected += 1
+                        logger.warning(f"Alert pipeline backpressure timeout [{symbol}]: alert rejected")
+                        future.set_result(False)
+                        return future
+            else:
+                lane.rejected += 1
+                logger.warning(f"Alert pipeline full [{symbol}]: alert rejected")
+                future.set_result(False)
+                return future
+
+        lane.pending.append((data, future, time.perf_counter()))
+        lane.max_depth = max(lane.max_depth, len(lane.pending))
+        if not lane.active:
+            lane.active = True
+            self._ready.put_nowait(symbol)
+        return future
+
+    async def process(self, data: Any) -> Any:
+        """Submit and wait for the result (inline if already on this symbol's lane)"""
+        active = _active_lane.get()
+        if active is not None and active[1] is asyncio.current_task():
+            active, symbol = active[0], self.symbol_of(data)
+            if active == symbol:
+                # Nested submit from the same symbol's handler would wait on itself
+                return await self.handler(data)
+            raise RuntimeError(
+                f"Alert handler for {active} cannot wait on the {symbol} lane "
+                f"(nested waits can deadlock the worker pool) - use submit() instead"
+            )
+        return await (await self.submit(data))
+
+    # ==================== WORKER SIDE ====================
+
+    def _ensure_started(self):
+        if self.is_running:
+            return
+        self._ready = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"alert-pipeline-{index}")
+            for index in range(self.max_workers)
+        ]
+        self.is_running = True
+
+    async def _worker(self, index: int):
+        while True:
+            symbol = await self._ready.get()
+            lane = self.lanes[symbol]
+            if not lane.pending:
+                lane.active = False
+                continue
+
+            data, future, enqueued = lane.pending.popleft()
+            lane.space.set()
+            started = time.perf_counter()
+            lane.wait_hist.record((started - enqueued) * 1000)
+
+            token = _active_lane.set((symbol, asyncio.current_task()))
+            try:
+                result = await self.handler(data)
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                lane.errors += 1
+                logger.error(f"Alert pipeline handler error [{symbol}]: {str(e)}")
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                _active_lane.reset(token)
+                lane.service_hist.record((time.perf_counter() - started) * 1000)
+                lane.processed += 1
+
+            # Round-robin: requeue behind other ready symbols instead of draining this one
+            if lane.pending:
+                self._ready.put_nowait(symbol)
+            else:
+                lane.active = False
+
+    async def stop(self):
+        """Cancel workers; pending alerts resolve to False"""
+        for task in self._workers:
+            task.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for lane in self.lanes.values():
+            while lane.pending:
+                _, future, _ = lane.pending.popleft()
+                if not future.done():
+                    future.set_result(False)
+            lane.active = False
+        self.is_running = False
+
+    # ==================== STATUS ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        symbols = {}
+        for symbol, lane in self.lanes.items():
+            symbols[symbol] = {
+                "depth": len(lane.pending),
+                "max_depth": lane.max_depth,
+                "processed": lane.processed,
+                "dropped": lane.dropped,
+                "rejected": lane.rejected,
+                "errors": lane.errors,
+                "queue_wait": lane.wait_hist.to_dict(),
+                "service_time": lane.service_hist.to_dict()
+            }
+        return {
+            "running": self.is_running,
+            "workers": self.max_workers,
+            "overflow_policy": self.overflow_policy,
+            "total_depth": sum(len(lane.pending) for lane in self.lanes.values()),
+            "symbols": symbols
+        }
@@ -0,0 +1,386 @@
+"""
+Candle Store - Local OHLCV bars with incrementally maintained trend indicators
+
+Every tick that lands in the MT5 client tick cache is folded into the forming
+bar of each tracked timeframe (M1/M5/M15/H1/H4/D1). When a tick opens a new
+bucket the forming bar is closed into a fixed-size NumPy ring buffer and the
+indicators TrendAnalyzer scores - SMA7/SMA14 running sums, close-to-close
+momentum and the 5-bar higher-high / lower-low checks - are updated from a
+handful of ring reads. get_trend() is then a plain attribute read.
+
+History is bulk loaded once per symbol/timeframe from copy_rates_from_pos, so
+the trend is available at startup instead of after 14 live bars.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Canonical timeframe -> bar length in seconds
+TIMEFRAME_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "4h": 14400,
+    "1d": 86400
+}
+
+# MetaTrader5 constant names and their values (used when the module lacks them)
+MT5_TIMEFRAMES = {
+    "1m": ("TIMEFRAME_M1", 1),
+    "5m": ("TIMEFRAME_M5", 5),
+    "15m": ("TIMEFRAME_M15", 15),
+    "1h": ("TIMEFRAME_H1", 16385),
+    "4h": ("TIMEFRAME_H4", 16388),
+    "1d": ("TIMEFRAME_D1", 16408)
+}
+
+# Spellings used across the bot (TradingView alert "tf", MT5 names, trend manager keys)
+TIMEFRAME_ALIASES = {
+    "1": "1m", "m1": "1m", "1min": "1m",
+    "5": "5m", "m5": "5m", "5min": "5m",
+    "15": "15m", "m15": "15m", "15min": "15m",
+    "60": "1h", "h1": "1h", "1h": "1h",
+    "240": "4h", "h4": "4h", "4h": "4h",
+    "1440": "1d", "d": "1d", "1d": "1d", "d1": "1d"
+}
+
+# Ring buffer columns
+TIME, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+COLUMNS = ("time", "open", "high", "low", "close", "volume")
+
+FAST_SMA = 7
+SLOW_SMA = 14
+MIN_TREND_BARS = SLOW_SMA
+# Drop accumulated float error from the running sums once per this many closes
+RESYNC_EVERY = 1000
+
+
+def normalize_timeframe(timeframe: str) -> str:
+    """Map any supported spelling ("15", "M15", "15m") to the canonical key"""
+    key = str(timeframe).strip().lower()
+    key = TIMEFRAME_ALIASES.get(key, key)
+    if key not in TIMEFRAME_SECONDS:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return key
+
+
+class CandleSeries:
+    """
+    Closed bars of one symbol/timeframe in a ring buffer, plus the forming bar
+
+    Trend scoring matches TrendAnalyzer: +1 each for SMA7 > SMA14, close above
+    the previous close and a high at or above the prior 4 highs; -1 for the
+    mirror conditions. A score of +-2 or beyond is BULLISH/BEARISH.
+    """
+
+    def __init__(self, timeframe: str, capacity: int = 500):
+        self.timeframe = timeframe
+        self.period = TIMEFRAME_SECONDS[timeframe]
+        self.capacity = max(int(capacity), SLOW_SMA + 1)
+        self.data = np.zeros((self.capacity, 6), dtype=np.float64)
+        self.head = 0      # Next write slot
+        self.count = 0     # Closed bars held (<= capacity)
+        self.forming: Optional[List[float]] = None
+
+        self.fast_sum = 0.0
+        self.slow_sum = 0.0
+        self.closes_since_resync = 0
+        self.indicators: Optional[Dict[str, Any]] = None
+        self.trend: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _ago(self, bars_ago: int) -> np.ndarray:
+        """Row of the closed bar `bars_ago` bars back (0 = most recent)"""
+        return self.data[(self.head - 1 - bars_ago) % self.capacity]
+
+    # ==================== TICK AGGREGATION ====================
+
+    def on_tick(self, price: float, when: float, volume: float = 1.0) -> bool:
+        """Fold one tick into the forming bar; returns True when a bar closed"""
+        bucket = when - when % self.period
+        forming = self.forming
+
+        if forming is None:
+            self.forming = [bucket, price, price, price, price, volume]
+            return False
+
+        if bucket == forming[TIME]:
+            if price > forming[HIGH]:
+                forming[HIGH] = price
+            elif price < forming[LOW]:
+                forming[LOW] = price
+            forming[CLOSE] = price
+            forming[VOLUME] += volume
+            return False
+
+        if bucket < forming[TIME]:
+            return False  # Late tick for a bar already closed
+
+        self._close_bar(forming)
+        self.forming = [bucket, price, price, price, price, volume]
+        return True
+
+    def _close_bar(self, bar: List[float]):
+        close = bar[CLOSE]
+        self.data[self.head] = bar
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+        self.closes_since_resync += 1
+        if self.closes_since_resync >= RESYNC_EVERY:
+            self._resync()
+            return
+
+        self.fast_sum += close
+        if self.count > FAST_SMA:
+            self.fast_sum -= self._ago(FAST_SMA)[CLOSE]
+        self.slow_sum += close
+        if self.count > SLOW_SMA:
+            self.slow_sum -= self._ago(SLOW_SMA)[CLOSE]
+        self._score()
+
+    # ==================== INDICATORS ====================
+
+    def _resync(self):
+        """Recompute the running sums exactly from the ring"""
+        self.closes_since_resync = 0
+        self.fast_sum = float(sum(self._ago(i)[CLOSE] for i in range(min(self.count, FAST_SMA))))
+        self.slow_sum = float(sum(self._ago(i)[CLOSE] for i in range(min(self.count, SLOW_SMA))))
+        self._score()
+
+    def _score(self):
+        if self.count < MIN_TREND_BARS:
+            self.indicators = None
+            self.trend = None
+            return
+
+        last, previous = self._ago(0), self._ago(1)
+        prior = [self._ago(i) for i in range(1, 5)]
+        sma_fast = float(self.fast_sum / FAST_SMA)
+        sma_slow = float(self.slow_sum / SLOW_SMA)
+        momentum = float(last[CLOSE] - previous[CLOSE])
+        higher_high = bool(last[HIGH] >= max(row[HIGH] for row in prior))
+        lower_low = bool(last[LOW] <= min(row[LOW] for row in prior))
+
+        score = 0
+        if sma_fast > sma_slow: score += 1
+        if momentum > 0: score += 1
+        if higher_high: score += 1
+
+        if sma_fast < sma_slow: score -= 1
+        if momentum < 0: score -= 1
+        if lower_low: score -= 1
+
+        if score >= 2:
+            trend = "BULLISH"
+        elif score <= -2:
+            trend = "BEARISH"
+        else:
+            trend = "NEUTRAL"
+
+        self.indicators = {
+            "time": float(last[TIME]),
+            "close": float(last[CLOSE]),
+            "sma_fast": sma_fast,
+            "sma_slow": sma_slow,
+            "momentum": momentum,
+            "higher_high": higher_high,
+            "lower_low": lower_low,
+            "score": score,
+            "trend": trend
+        }
+        self.trend = trend
+
+    # ==================== BULK LOAD / READ ====================
+
+    def load(self, rows: np.ndarray):
+        """
+        Replace history with bulk-loaded bars (oldest first, last one forming)
+
+        Live bars newer than the loaded range are kept, and a live forming bar
+        in the same bucket as the loaded forming bar is merged into it.
+        """
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, 6)
+        if not len(rows):
+            return
+
+        live = self.closed_bars()
+        merged = np.concatenate((rows, live[live[:, TIME] > rows[-1, TIME]]))
+        last = merged[-1].tolist()
+        forming = self.forming
+
+        if forming is not None and forming[TIME] > last[TIME]:
+            closed = merged
+        else:
+            closed = merged[:-1]
+            if forming is not None and forming[TIME] == last[TIME]:
+                last[HIGH] = max(last[HIGH], forming[HIGH])
+                last[LOW] = min(last[LOW], forming[LOW])
+                last[CLOSE] = forming[CLOSE]
+                last[VOLUME] = max(last[VOLUME], forming[VOLUME])
+            forming = last
+
+        closed = closed[-self.capacity:]
+        self.count = len(closed)
+        self.data[:self.count] = closed
+        self.head = self.count % self.capacity
+        self.forming = forming
+        self._resync()
+
+    def closed_bars(self, count: Optional[int] = None) -> np.ndarray:
+        """Copy of the last `count` closed bars, oldest first (n x 6)"""
+        count = self.count if count is None else min(count, self.count)
+        if count <= 0:
+            return np.empty((0, 6))
+        idx = (self.head - count + np.arange(count)) % self.capacity
+        return self.data[idx]
+
+
+class CandleStore:
+    """
+    Per-symbol, per-timeframe candle series fed from the tick cache
+
+    Ticks may arrive from the MT5 worker thread while trend reads happen on
+    the event loop, so writes and multi-row reads share one lock. get_trend()
+    reads a value computed at bar close and does no work of its own.
+    """
+
+    def __init__(self, timeframes: Optional[Iterable[str]] = None, capacity: int = 500):
+        self.timeframes = [normalize_timeframe(tf) for tf in (timeframes or TIMEFRAME_SECONDS)]
+        self.capacity = capacity
+        self.series: Dict[str, Dict[str, CandleSeries]] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "ticks": 0,
+            "bars_closed": 0,
+            "bars_loaded": 0
+        }
+
+    @classmethod
+    def from_config(cls, config) -> Optional["CandleStore"]:
+        """Build from the candle_store config section (None when disabled)"""
+        store_config = config.get("candle_store", {})
+        if not store_config.get("enabled", True):
+            return None
+        return cls(
+            timeframes=store_config.get("timeframes"),
+            capacity=store_config.get("capacity", 500)
+        )
+
+    def _symbol_series(self, symbol: str) -> Dict[str, CandleSeries]:
+        series = self.series.get(symbol)
+        if series is None:
+            series = {tf: CandleSeries(tf, self.capacity) for tf in self.timeframes}
+            self.series[symbol] = series
+        return series
+
+    def _get(self, symbol: str, timeframe: str) -> Optional[CandleSeries]:
+        return self.series.get(symbol, {}).get(normalize_timeframe(timeframe))
+
+    # ==================== WRITES ====================
+
+    def on_tick(self, symbol: str, price: float, when: float, volume: float = 1.0) -> int:
+        """Fold a tick into every timeframe; returns the number of bars closed"""
+        with self._lock:
+            closed = 0
+            for series in self._symbol_series(symbol).values():
+                closed += series.on_tick(price, when, volume)
+            self.stats["ticks"] += 1
+            self.stats["bars_closed"] += closed
+            return closed
+
+    def load(self, symbol: str, timeframe: str, rates) -> int:
+        """
+        Bulk load bars from an MT5 rates array (or dict of columns)
+
+        Rates are expected oldest first with the current forming bar last,
+        as copy_rates_from_pos(symbol, timeframe, 0, count) returns them.
+        Returns the number of bars loaded.
+        """
+        timeframe = normalize_timeframe(timeframe)
+        if rates is None:
+            return 0
+
+        names = getattr(getattr(rates, "dtype", None), "names", None) or tuple(rates)
+        times = np.asarray(rates["time"], dtype=np.float64)
+        volume = "tick_volume" if "tick_volume" in names else "volume"
+        rows = np.column_stack([
+            times,
+            np.asarray(rates["open"], dtype=np.float64),
+            np.asarray(rates["high"], dtype=np.float64),
+            np.asarray(rates["low"], dtype=np.float64),
+            np.asarray(rates["close"], dtype=np.float64),
+            np.asarray(rates[volume], dtype=np.float64) if volume in names else np.zeros(len(times))
+        ])
+        if not len(rows):
+            return 0
+
+        with self._lock:
+            series = self._symbol_series(symbol).get(timeframe)
+            if series is None:
+                return 0
+            series.load(rows)
+            self.stats["bars_loaded"] += len(rows)
+        return len(rows)
+
+    def clear(self, symbol: Optional[str] = None):
+        with self._lock:
+            if symbol is None:
+                self.series.clear()
+            else:
+                self.series.pop(symbol, None)
+
+    # ==================== READS ====================
+
+    def get_trend(self, symbol: str, timeframe: str = "15m") -> Optional[str]:
+        """BULLISH / BEARISH / NEUTRAL from closed bars, None until 14 bars exist"""
+        series = self._get(symbol, timeframe)
+        return series.trend if series is not None else None
+
+    def get_indicators(self, symbol: str, timeframe: str = "15m") -> Optional[Dict[str, Any]]:
+        """SMA7/SMA14, momentum, high/low flags and score as of the last closed bar"""
+        series = self._get(symbol, timeframe)
+        if series is None or series.indicators is None:
+            return None
+        return dict(series.indicators)
+
+    def bar_count(self, symbol: str, timeframe: str) -> int:
+        series = self._get(symbol, timeframe)
+        return len(series) if series is not None else 0
+
+    def get_candles(self, symbol: str, timeframe: str, count: int,
+                    include_forming: bool = True) -> List[Dict[str, float]]:
+        """
+        Last `count` bars as dicts, oldest first
+
+        With include_forming the current (incomplete) bar is the last entry,
+        matching copy_rates_from_pos(symbol, timeframe, 0, count).
+        """
+        series = self._get(symbol, timeframe)
+        if series is None or count <= 0:
+            return []
+
+        with self._lock:
+            forming = list(series.forming) if include_forming and series.forming else None
+            rows = series.closed_bars(count - 1 if forming else count)
+
+        candles = [dict(zip(COLUMNS, row)) for row in rows.tolist()]
+        if forming:
+            candles.append(dict(zip(COLUMNS, forming)))
+        return candles
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "timeframes": list(self.timeframes),
+            "capacity": self.capacity,
+            "symbols": {
+                symbol: {tf: len(s) for tf, s in series.items()}
+                for symbol, series in self.series.items()
+            }
+        }
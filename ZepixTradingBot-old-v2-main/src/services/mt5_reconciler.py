@@ -0,0 +1,140 @@
+"""
+MT5 Reconciler - Bulk detection of positions closed on the terminal side
+
+One reconciliation cycle costs at most two terminal calls regardless of how
+many positions closed: positions_get() to diff ticket sets, and ONE ranged
+history_deals_get() covering every missing ticket. PnL and exit price are
+resolved from an in-memory deal index keyed by position id; a per-ticket
+history query is only issued for tickets the ranged query did not cover.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEAL_ENTRY_OUT = 1      # MetaTrader5.DEAL_ENTRY_OUT
+DEAL_ENTRY_OUT_BY = 3   # MetaTrader5.DEAL_ENTRY_OUT_BY
+
+
+def build_deal_index(deals: Iterable[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """
+    Group deals by position id
+
+    profit is summed over all deals of the position (entry + partial/final
+    exits), matching MT5Client.get_closed_trade_profit. close_price/close_time
+    come from the latest exit deal.
+    """
+    index: Dict[int, Dict[str, Any]] = {}
+    for deal in deals:
+        position_id = deal.get("position_id")
+        if not position_id:
+            continue
+        entry = index.get(position_id)
+        if entry is None:
+            entry = index[position_id] = {
+                "profit": 0.0, "commission": 0.0, "swap": 0.0,
+                "close_price": None, "close_time": None, "deals": 0
+            }
+        entry["profit"] += deal.get("profit", 0.0) or 0.0
+        entry["commission"] += deal.get("commission", 0.0) or 0.0
+        entry["swap"] += deal.get("swap", 0.0) or 0.0
+        entry["deals"] += 1
+        if deal.get("entry") in (DEAL_ENTRY_OUT, DEAL_ENTRY_OUT_BY):
+            deal_time = deal.get("time") or 0
+            if entry["close_time"] is None or deal_time >= entry["close_time"]:
+                entry["close_time"] = deal_time
+                entry["close_price"] = deal.get("price")
+    return index
+
+
+class MT5Reconciler:
+    """Diffs bot trades against terminal positions and resolves closes in bulk"""
+
+    def __init__(self, mt5_client, async_mt5, lookback_hours: float = 24.0,
+                 future_margin_hours: float = 24.0):
+        self.mt5_client = mt5_client
+        self.async_mt5 = async_mt5
+        # History times are broker server time - pad both ends of the range
+        self.lookback = timedelta(hours=lookback_hours)
+        self.future_margin = timedelta(hours=future_margin_hours)
+        self.stats = {
+            "cycles": 0,
+            "skipped_cycles": 0,
+            "closed_detected": 0,
+            "history_queries": 0,
+            "fallback_lookups": 0,
+            "estimated": 0
+        }
+
+    async def fetch_open_tickets(self) -> Optional[set]:
+        """Ticket set of live positions, or None if the terminal call failed"""
+        positions = await self.async_mt5.run(self.mt5_client.mt5.positions_get, label="positions_get")
+        if positions is None:
+            return None
+        return {pos.ticket for pos in positions}
+
+    def _history_window(self, trades: List[Any]):
+        opened = []
+        for trade in trades:
+            try:
+                opened.append(datetime.fromisoformat(trade.open_time))
+            except (TypeError, ValueError, AttributeError):
+                continue
+        now = datetime.now()
+        date_from = (min(opened) if opened else now) - self.lookback
+        return date_from, now + self.future_margin
+
+    async def find_closed(self, open_trades: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Return one record per bot trade whose position no longer exists:
+        {"trade", "pnl", "close_price", "source"} where source is
+        "history" (ranged query), "position_history" (per-ticket fallback)
+        or "unresolved" (no deals yet - caller estimates PnL).
+        """
+        self.stats["cycles"] += 1
+        tickets = await self.fetch_open_tickets()
+        if tickets is None:
+            # A failed positions_get must not look like "everything closed"
+            self.stats["skipped_cycles"] += 1
+            logger.warning("Reconciliation skipped: positions_get returned None")
+            return []
+
+        missing = [trade for trade in open_trades
+                   if trade.status != "closed" and trade.trade_id and trade.trade_id not in tickets]
+        if not missing:
+            return []
+
+        date_from, date_to = self._history_window(missing)
+        deals = await self.async_mt5.history_deals_get(date_from, date_to)
+        self.stats["history_queries"] += 1
+        index = build_deal_index(deals)
+
+        results = []
+        for trade in missing:
+            entry = index.get(trade.trade_id)
+            source = "history"
+            if entry is None:
+                # Outside the range (clock skew / very old position) - ask for it directly
+                self.stats["fallback_lookups"] += 1
+                entry = build_deal_index(
+                    await self.async_mt5.history_deals_get(position=trade.trade_id)
+                ).get(trade.trade_id)
+                source = "position_history"
+            if entry is None:
+                self.stats["estimated"] += 1
+                results.append({"trade": trade, "pnl": None, "close_price": None, "source": "unresolved"})
+                continue
+            results.append({
+                "trade": trade,
+                "pnl": entry["profit"],
+                "close_price": entry["close_price"],
+                "source": source
+            })
+
+        self.stats["closed_detected"] += len(results)
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
@@ -1,9 +1,10 @@
 import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
-from src.models import Trade
+from src.models import Trade, TradeRecord
 from src.config import Config
 from src.utils.optimized_logger import logger as opt_logger
+from src.services.price_trigger_engine import PriceTriggerEngine, cross_direction
 import logging
 
 class PriceMonitorService:
@@ -42,9 +43,33 @@ class PriceMonitorService:
         # Exit continuation tracking (Exit Appeared/Reversal signals)
         self.exit_continuation_pending = {}  # symbol -> {'exit_price': ..., 'direction': ..., 'exit_reason': ...}
         
+        # Settings read on every cycle - cached and refreshed by config change events
+        self._load_settings()
+        if isinstance(config, Config):
+            config.subscribe("re_entry_config", self._on_config_changed)
+            config.subscribe("profit_booking_config.enabled", self._on_config_changed)
+        
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
     
+    def _load_settings(self):
+        reentry_config = self.config["re_entry_config"]
+        self.monitor_interval = reentry_config.get("price_monitor_interval_seconds", 30)
+        self.sl_hunt_enabled = reentry_config.get("sl_hunt_reentry_enabled", False)
+        self.tp_reentry_enabled = reentry_config.get("tp_reentry_enabled", False)
+        self.exit_continuation_enabled = reentry_config.get("exit_continuation_enabled", True)
+        self.profit_booking_enabled = self.config.get("profit_booking_config", {}).get("enabled", True)
+    
+    def _on_config_changed(self, path: str, value):
+        """Config change event - refresh the cached monitor settings"""
+        self._load_settings()
+    
+    @property
+    def price_triggers(self) -> Optional[PriceTriggerEngine]:
+        """Shared event-driven trigger engine (None = legacy polling)"""
+        engine = getattr(self.trading_engine, 'price_trigger_engine', None)
+        return engine if isinstance(engine, PriceTriggerEngine) else None
+    
     def get_service_status(self) -> Dict[str, Any]:
         """
         DIAGNOSTIC: Get comprehensive service status for debugging
@@ -129,16 +154,17 @@ class PriceMonitorService:
     async def _monitor_loop(self):
         # Background loop - runs silently in INFO mode, detailed logs in DEBUG mode
         cycle_count = 0
-        interval = self.config["re_entry_config"]["price_monitor_interval_seconds"]
+        interval = self.monitor_interval
         
         self.logger.debug(
             f"🔄 Monitor loop started - Interval: {interval}s, "
-            f"Config: SL Hunt={self.config['re_entry_config'].get('sl_hunt_reentry_enabled', False)}, "
-            f"TP={self.config['re_entry_config'].get('tp_reentry_enabled', False)}, "
-            f"Exit={self.config['re_entry_config'].get('exit_continuation_enabled', False)}"
+            f"Config: SL Hunt={self.sl_hunt_enabled}, "
+            f"TP={self.tp_reentry_enabled}, "
+            f"Exit={self.exit_continuation_enabled}"
         )
         
         while self.is_running:
+            interval = self.monitor_interval  # Picks up interval changes from the menu
             try:
                 cycle_count += 1
                 cycle_start_time = datetime.now()
@@ -222,14 +248,17 @@ class PriceMonitorService:
         # 🆕 CRITICAL: Check margin health and auto-close risky positions if needed
         await self._check_margin_health()
         
-        # Check SL hunt re-entries
-        await self._check_sl_hunt_reentries()
-        
-        # Check TP continuation re-entries
-        await self._check_tp_continuation_reentries()
-        
-        # Check Exit continuation re-entries (NEW)
-        await self._check_exit_continuation_reentries()
+        # SL hunt / TP / Exit continuation are event-driven when the trigger
+        # engine is available - only poll them in legacy mode
+        if self.price_triggers is None:
+            # Check SL hunt re-entries
+            await self._check_sl_hunt_reentries()
+            
+            # Check TP continuation re-entries
+            await self._check_tp_continuation_reentries()
+            
+            # Check Exit continuation re-entries (NEW)
+            await self._check_exit_continuation_reentries()
         
         # Check Profit Booking chains (NEW)
         await self._check_profit_booking_chains()
@@ -283,7 +312,7 @@ class PriceMonitorService:
             lot_size = self.trading_engine.risk_manager.get_fixed_lot_size(account_balance)
             
             # 3. Create Trade Object
-            trade = Trade(
+            trade = TradeRecord(
                 symbol=symbol,
                 entry=price,
                 sl=sl_price,
@@ -549,7 +578,7 @@ class PriceMonitorService:
         Check if price has reached SL + offset for automatic re-entry
         After SL hunt, wait for price to recover to SL + 1 pip, then re-enter
         """
-        if not self.config["re_entry_config"]["sl_hunt_reentry_enabled"]:
+        if not self.sl_hunt_enabled:
             return
         
         for symbol in list(self.sl_hunt_pending.keys()):
@@ -642,7 +671,7 @@ class PriceMonitorService:
         Check if price has moved enough after TP hit for re-entry
         After TP, wait for price gap (e.g., 2 pips), then re-enter with reduced SL
         """
-        if not self.config["re_entry_config"]["tp_reentry_enabled"]:
+        if not self.tp_reentry_enabled:
             return
         
         for symbol in list(self.tp_continuation_pending.keys()):
@@ -737,7 +766,7 @@ class PriceMonitorService:
         After exit (Exit Appeared/Reversal), continue monitoring for re-entry with price gap
         Example: Exit @ 3640.200 -> Monitor -> Re-entry @ 3642.200 (gap required)
         """
-        if not self.config["re_entry_config"].get("exit_continuation_enabled", True):
+        if not self.exit_continuation_enabled:
             return
         
         for symbol in list(self.exit_continuation_pending.keys()):
@@ -884,7 +913,7 @@ class PriceMonitorService:
         )
         
         # Create trade
-        trade = Trade(
+        trade = TradeRecord(
             symbol=symbol,
             entry=price,
             sl=sl_price,
@@ -999,7 +1028,7 @@ class PriceMonitorService:
         )
         
         # Create trade
-        trade = Trade(
+        trade = TradeRecord(
             symbol=symbol,
             entry=price,
             sl=sl_price,
@@ -1152,14 +1181,19 @@ class PriceMonitorService:
                 self.sl_hunt_pending[trade.symbol] = []
                 
             # Add to list (support multiple chains)
-            self.sl_hunt_pending[trade.symbol].append({
+            pending = {
                 'target_price': target_price,
                 'direction': trade.direction,
                 'chain_id': trade.chain_id,
                 'sl_price': trade.sl,
                 'logic': logic,
                 'expiration_time': expiration_time
-            })
+            }
+            self.sl_hunt_pending[trade.symbol].append(pending)
+            self._arm_trigger(
+                trade.symbol, pending, target_price,
+                self._on_sl_hunt_trigger, self._on_sl_hunt_expired
+            )
             
             self.monitored_symbols.add(trade.symbol)
             
@@ -1240,13 +1274,26 @@ class PriceMonitorService:
                 self.tp_continuation_pending[trade.symbol] = []
 
             # Add to list (support multiple chains)
-            self.tp_continuation_pending[trade.symbol].append({
+            pending = {
                 'tp_price': tp_price,
                 'direction': trade.direction,
                 'chain_id': trade.chain_id,
                 'logic': logic,
                 'expiration_time': expiration_time
-            })
+            }
+            self.tp_continuation_pending[trade.symbol].append(pending)
+            
+            if self.price_triggers is not None:
+                pip_size = self.config["symbol_config"][trade.symbol]["pip_size"]
+                gap_pips = self.config["re_entry_config"].get("tp_continuation_price_gap_pips", 2)
+                if trade.direction == 'buy':
+                    target_price = tp_price + (gap_pips * pip_size)
+                else:
+                    target_price = tp_price - (gap_pips * pip_size)
+                self._arm_trigger(
+                    trade.symbol, pending, target_price,
+                    self._on_tp_continuation_trigger, self._on_tp_continuation_expired
+                )
             
             self.monitored_symbols.add(trade.symbol)
             
@@ -1266,6 +1313,8 @@ class PriceMonitorService:
     def stop_tp_continuation(self, symbol: str, reason: str = "Opposite signal received"):
         """Stop TP continuation monitoring for a symbol"""
         if symbol in self.tp_continuation_pending:
+            for pending in self.tp_continuation_pending[symbol]:
+                self._disarm_trigger(pending)
             del self.tp_continuation_pending[symbol]
             self.logger.info(f"STOPPED: TP continuation stopped for {symbol}: {reason}")
     
@@ -1290,13 +1339,29 @@ class PriceMonitorService:
                 f"Exit={exit_price:.5f} Reason={exit_reason} Logic={logic} TF={timeframe}"
             )
             
-            self.exit_continuation_pending[trade.symbol] = {
+            if trade.symbol in self.exit_continuation_pending:
+                self._disarm_trigger(self.exit_continuation_pending[trade.symbol])
+            
+            pending = {
                 'exit_price': exit_price,
                 'direction': trade.direction,
                 'logic': logic,
                 'exit_reason': exit_reason,
                 'timeframe': timeframe
             }
+            self.exit_continuation_pending[trade.symbol] = pending
+            
+            if self.price_triggers is not None:
+                pip_size = self.config["symbol_config"][trade.symbol]["pip_size"]
+                price_gap = self.config["re_entry_config"]["tp_continuation_price_gap_pips"] * pip_size
+                if trade.direction == 'buy':
+                    target_price = exit_price + price_gap
+                else:
+                    target_price = exit_price - price_gap
+                self._arm_trigger(
+                    trade.symbol, pending, target_price,
+                    self._on_exit_continuation_trigger, None
+                )
             
             self.monitored_symbols.add(trade.symbol)
             self.logger.info(
@@ -1312,17 +1377,181 @@ class PriceMonitorService:
     def stop_exit_continuation(self, symbol: str, reason: str = "Alignment lost"):
         """Stop exit continuation monitoring for a symbol"""
         if symbol in self.exit_continuation_pending:
+            self._disarm_trigger(self.exit_continuation_pending[symbol])
             del self.exit_continuation_pending[symbol]
             self.logger.info(f"STOPPED: Exit continuation stopped for {symbol}: {reason}")
     
+    # ==================== EVENT-DRIVEN TRIGGERS ====================
+    
+    def _arm_trigger(self, symbol: str, pending: Dict[str, Any], target_price: float,
+                     callback, on_expire):
+        """Register a pending re-entry with the shared price trigger engine"""
+        engine = self.price_triggers
+        if engine is None:
+            return
+        
+        expiration_time = pending.get('expiration_time')
+        pending['trigger_id'] = engine.add_trigger(
+            symbol=symbol,
+            level=target_price,
+            direction=cross_direction(pending['direction']),
+            callback=callback,
+            expires_at=expiration_time.timestamp() if expiration_time else None,
+            on_expire=on_expire,
+            payload=pending,
+            retry_interval=self.config["re_entry_config"].get("price_monitor_interval_seconds", 30)
+        )
+    
+    def _disarm_trigger(self, pending: Dict[str, Any]):
+        engine = self.price_triggers
+        if engine is not None and pending.get('trigger_id'):
+            engine.remove_trigger(pending['trigger_id'])
+    
+    def _drop_pending(self, pending_map: Dict[str, List], symbol: str, pending: Dict[str, Any]):
+        """Remove one pending item (by identity) from a symbol list"""
+        items = [item for item in pending_map.get(symbol, []) if item is not pending]
+        if items:
+            pending_map[symbol] = items
+        elif symbol in pending_map:
+            del pending_map[symbol]
+            self.monitored_symbols.discard(symbol)
+    
+    @staticmethod
+    def _is_pending(pending_map: Dict[str, List], symbol: str, pending: Dict[str, Any]) -> bool:
+        return any(item is pending for item in pending_map.get(symbol, []))
+    
+    async def _on_sl_hunt_trigger(self, trigger, current_price: float) -> bool:
+        """SL + offset crossed - validate alignment and re-enter"""
+        symbol = trigger.symbol
+        pending = trigger.payload
+        if not self._is_pending(self.sl_hunt_pending, symbol, pending):
+            return True
+        if not self.sl_hunt_enabled:
+            return False
+        
+        logic = pending.get('logic', 'combinedlogic-1')
+        chain_id = pending['chain_id']
+        alignment = self.trend_manager.check_logic_alignment(symbol, logic)
+        if not alignment['aligned']:
+            self.logger.warning(
+                f"⚠️ [SL_HUNT_BLOCKED] {symbol}: Re-entry blocked - "
+                f"Alignment failed: {alignment.get('failure_reason', 'Unknown reason')}"
+            )
+            return False  # Keep checking alignment until timeout
+        
+        self.logger.info(
+            f"🚨 TRIGGERED: SL Hunt Re-Entry Triggered: {symbol} @ {current_price:.5f} "
+            f"(Target: {pending['target_price']:.5f}) Chain: {chain_id}"
+        )
+        success = await self._execute_sl_hunt_reentry(
+            symbol, pending['direction'], current_price, chain_id, logic
+        )
+        if not success:
+            self.logger.error(
+                f"❌ [SL_HUNT_FAIL] Failed to execute re-entry for {symbol} Chain {chain_id}"
+            )
+            return False
+        
+        self.logger.info(f"✅ [SL_HUNT_SUCCESS] Executed re-entry for {symbol} Chain {chain_id}")
+        self._drop_pending(self.sl_hunt_pending, symbol, pending)
+        return True
+    
+    def _on_sl_hunt_expired(self, trigger):
+        self.logger.info(f"⏳ SL Hunt window expired for {trigger.symbol} (Chain: {trigger.payload.get('chain_id')})")
+        self._drop_pending(self.sl_hunt_pending, trigger.symbol, trigger.payload)
+    
+    async def _on_tp_continuation_trigger(self, trigger, current_price: float) -> bool:
+        """TP + gap crossed - validate alignment/direction and re-enter"""
+        symbol = trigger.symbol
+        pending = trigger.payload
+        if not self._is_pending(self.tp_continuation_pending, symbol, pending):
+            return True
+        if not self.tp_reentry_enabled:
+            return False
+        
+        logic = pending.get('logic', 'combinedlogic-1')
+        alignment = self.trend_manager.check_logic_alignment(symbol, logic)
+        if not alignment['aligned']:
+            self.logger.warning(
+                f"⚠️ [TP_CONTINUATION_BLOCKED] {symbol}: Re-entry blocked - "
+                f"Alignment failed: {alignment.get('failure_reason', 'Unknown reason')}"
+            )
+            return False
+        
+        signal_direction = "BULLISH" if pending['direction'] == "buy" else "BEARISH"
+        alignment_direction = alignment['direction'].upper()
+        if alignment_direction != signal_direction:
+            self.logger.warning(
+                f"⚠️ [TP_CONTINUATION_BLOCKED] {symbol}: Re-entry blocked - "
+                f"Direction mismatch: Signal={signal_direction} != Alignment={alignment_direction}"
+            )
+            return False
+        
+        self.logger.info(f"TRIGGERED: TP Continuation Re-Entry Triggered: {symbol} @ {current_price}")
+        success = await self._execute_tp_continuation_reentry(
+            symbol, pending['direction'], current_price, pending['chain_id'], logic
+        )
+        if not success:
+            return False
+        
+        self._drop_pending(self.tp_continuation_pending, symbol, pending)
+        return True
+    
+    def _on_tp_continuation_expired(self, trigger):
+        self.logger.info(f"⏳ TP Continuation window expired for {trigger.symbol} (Chain: {trigger.payload.get('chain_id')})")
+        self._drop_pending(self.tp_continuation_pending, trigger.symbol, trigger.payload)
+    
+    async def _on_exit_continuation_trigger(self, trigger, current_price: float) -> bool:
+        """Exit + gap crossed - one alignment check, then re-enter or drop"""
+        symbol = trigger.symbol
+        pending = trigger.payload
+        if self.exit_continuation_pending.get(symbol) is not pending:
+            return True
+        if not self.exit_continuation_enabled:
+            return False
+        
+        direction = pending['direction']
+        logic = pending.get('logic', 'combinedlogic-1')
+        exit_reason = pending.get('exit_reason', 'EXIT')
+        del self.exit_continuation_pending[symbol]
+        
+        alignment = self.trend_manager.check_logic_alignment(symbol, logic)
+        if not alignment['aligned']:
+            self.logger.warning(
+                f"⚠️ [EXIT_CONTINUATION_BLOCKED] {symbol} ({exit_reason}): Re-entry blocked - "
+                f"Alignment failed: {alignment.get('failure_reason', 'Unknown reason')}"
+            )
+            return True
+        
+        signal_direction = "BULLISH" if direction == "buy" else "BEARISH"
+        alignment_direction = alignment['direction'].upper()
+        if alignment_direction != signal_direction:
+            self.logger.warning(
+                f"⚠️ [EXIT_CONTINUATION_BLOCKED] {symbol} ({exit_reason}): Re-entry blocked - "
+                f"Direction mismatch: Signal={signal_direction} != Alignment={alignment_direction}"
+            )
+            return True
+        
+        self.logger.info(f"TRIGGERED: Exit Continuation Re-Entry Triggered: {symbol} @ {current_price} after {exit_reason}")
+        from src.models import Alert
+        entry_signal = Alert(
+            symbol=symbol,
+            tf=str(pending.get('timeframe', '15M')).lower(),
+            signal='buy' if direction == 'buy' else 'sell',
+            type='entry',
+            price=current_price
+        )
+        await self.trading_engine.process_alert(entry_signal)
+        self.logger.info(f"SUCCESS: Exit continuation re-entry executed for {symbol}")
+        return True
+    
     async def _check_profit_booking_chains(self):
         """
         Check profit booking chains for profit target achievement
         Runs every 30 seconds to monitor combined PnL
         """
         # Check if profit booking enabled
-        profit_config = self.config.get("profit_booking_config", {})
-        if not profit_config.get("enabled", True):
+        if not self.profit_booking_enabled:
             return
         
         # Get profit booking manager from trading engine
@@ -0,0 +1,417 @@
+"""
+Price Trigger Engine - Event-driven price level triggers
+Replaces per-order polling tasks with one sorted index per symbol
+
+Each trigger is "price crosses LEVEL going UP/DOWN". On every new tick only
+the triggers that were actually crossed are popped (O(log n + k)), and
+expiries / retry delays live on a hashed timer wheel instead of sleeping
+tasks - 500 pending recoveries cost the same per tick as 5.
+"""
+
+import asyncio
+import bisect
+import itertools
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.optimized_logger import logger
+
+CROSS_UP = "up"      # Fire when price >= level
+CROSS_DOWN = "down"  # Fire when price <= level
+
+
+def cross_direction(side: str) -> str:
+    """Map a trade side (buy/BUY/sell/SELL) to the crossing direction it waits for"""
+    return CROSS_UP if str(side).lower() == "buy" else CROSS_DOWN
+
+
+class PriceTrigger:
+    """One pending 'price crosses level in direction' condition"""
+
+    def __init__(self, trigger_id: str, symbol: str, level: float, direction: str,
+                 callback: Callable, seq: int, expires_at: Optional[float] = None,
+                 on_expire: Optional[Callable] = None, payload: Any = None,
+                 retry_interval: float = 5.0):
+        self.trigger_id = trigger_id
+        self.symbol = symbol
+        self.level = level
+        self.direction = direction
+        self.callback = callback
+        self.expires_at = expires_at
+        self.on_expire = on_expire
+        self.payload = payload
+        self.retry_interval = retry_interval
+        self.created_at = time.time()
+        self.fire_count = 0
+        self.key = (level, seq)  # Unique sort key inside the symbol index
+        self.armed = False
+        self.timers: List[Tuple[int, Any]] = []  # Wheel entries still scheduled for this trigger
+
+
+class SymbolTriggerIndex:
+    """
+    Two bisect-ordered arrays for one symbol:
+    - up:   ascending levels, crossed prefix fires when price rises
+    - down: ascending levels, crossed suffix fires when price falls
+    """
+
+    def __init__(self):
+        self.up: List[Tuple[float, int]] = []
+        self.down: List[Tuple[float, int]] = []
+        self.by_key: Dict[Tuple[float, int], PriceTrigger] = {}
+
+    def __len__(self):
+        return len(self.by_key)
+
+    def insert(self, trigger: PriceTrigger):
+        keys = self.up if trigger.direction == CROSS_UP else self.down
+        bisect.insort(keys, trigger.key)
+        self.by_key[trigger.key] = trigger
+        trigger.armed = True
+
+    def remove(self, trigger: PriceTrigger) -> bool:
+        if trigger.key not in self.by_key:
+            return False
+        keys = self.up if trigger.direction == CROSS_UP else self.down
+        pos = bisect.bisect_left(keys, trigger.key)
+        if pos < len(keys) and keys[pos] == trigger.key:
+            del keys[pos]
+        del self.by_key[trigger.key]
+        trigger.armed = False
+        return True
+
+    def pop_crossed(self, price: float) -> List[PriceTrigger]:
+        """Pop every trigger crossed at this price"""
+        fired = []
+
+        if self.up:
+            k = bisect.bisect_right(self.up, (price, math.inf))
+            if k:
+                for key in self.up[:k]:
+                    fired.append(self.by_key.pop(key))
+                del self.up[:k]
+
+        if self.down:
+            k = bisect.bisect_left(self.down, (price, -1))
+            if k < len(self.down):
+                for key in self.down[k:]:
+                    fired.append(self.by_key.pop(key))
+                del self.down[k:]
+
+        for trigger in fired:
+            trigger.armed = False
+        return fired
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel for trigger expiries and retry delays
+    Entries store their absolute tick so no per-slot round counters are needed
+    """
+
+    def __init__(self, resolution: float = 1.0, slots: int = 512, now: Optional[float] = None):
+        self.resolution = resolution
+        self.slot_count = slots
+        self.slots: List[List[Tuple[int, Any]]] = [[] for _ in range(slots)]
+        self.current_tick = int((time.time() if now is None else now) / resolution)
+        self.size = 0
+
+    def schedule(self, deadline: float, item: Any) -> int:
+        """Schedule item and return its tick (needed to cancel it)"""
+        tick = max(math.ceil(deadline / self.resolution), self.current_tick + 1)
+        self.slots[tick % self.slot_count].append((tick, item))
+        self.size += 1
+        return tick
+
+    def cancel(self, tick: int, item: Any) -> bool:
+        """Remove a scheduled item before it is due"""
+        slot = self.slots[tick % self.slot_count]
+        for pos, (entry_tick, entry_item) in enumerate(slot):
+            if entry_tick == tick and entry_item is item:
+                del slot[pos]
+                self.size -= 1
+                return True
+        return False
+
+    def advance(self, now: float) -> List[Any]:
+        """Return every item whose deadline is <= now"""
+        target = int(now / self.resolution)
+        if target <= self.current_tick:
+            return []
+
+        due = []
+        steps = min(target - self.current_tick, self.slot_count)
+        for step in range(1, steps + 1):
+            slot_index = (self.current_tick + step) % self.slot_count
+            slot = self.slots[slot_index]
+            if not slot:
+                continue
+            keep = []
+            for tick, item in slot:
+                if tick <= target:
+                    due.append(item)
+                else:
+                    keep.append((tick, item))
+            self.slots[slot_index] = keep
+
+        self.current_tick = target
+        self.size -= len(due)
+        return due
+
+
+class PriceTriggerEngine:
+    """
+    Single trigger engine keyed by symbol, driven by the MT5 client tick cache
+
+    Callbacks receive (trigger, price) and may be sync or async. Returning
+    False means "conditions not met yet" - the trigger is re-armed after its
+    retry_interval. Any other return value consumes the trigger. A callback
+    that raises is treated like False so the owner's pending entry is retried
+    instead of silently leaking.
+    """
+
+    def __init__(self, mt5_client=None, interval_seconds: float = 0.25,
+                 timer_resolution: float = 1.0):
+        self.mt5_client = mt5_client
+        self.interval_seconds = interval_seconds
+        self.indexes: Dict[str, SymbolTriggerIndex] = {}
+        self.triggers: Dict[str, PriceTrigger] = {}
+        self.timers = TimerWheel(resolution=timer_resolution)
+        self.last_prices: Dict[str, float] = {}
+        self.dirty_symbols = set()
+        self._seq = itertools.count()
+        self.task = None
+        self.stats = {
+            "registered": 0,
+            "fired": 0,
+            "expired": 0,
+            "rearmed": 0,
+            "cancelled": 0,
+            "errors": 0,
+            "ticks_evaluated": 0
+        }
+
+    # ==================== REGISTRATION ====================
+
+    def add_trigger(self, symbol: str, level: float, direction: str, callback: Callable,
+                    expires_at: Optional[float] = None, on_expire: Optional[Callable] = None,
+                    payload: Any = None, retry_interval: float = 5.0,
+                    trigger_id: Optional[str] = None) -> str:
+        """
+        Register a price trigger
+
+        Args:
+            symbol: TradingView symbol
+            level: Price level to watch
+            direction: CROSS_UP (price >= level) or CROSS_DOWN (price <= level)
+            callback: Called as callback(trigger, price) when crossed
+            expires_at: Epoch seconds after which on_expire(trigger) is called instead
+            payload: Caller data carried on the trigger
+            retry_interval: Delay before re-arming when callback returns False
+
+        Returns:
+            Trigger ID
+        """
+        if direction not in (CROSS_UP, CROSS_DOWN):
+            raise ValueError(f"Invalid trigger direction: {direction}")
+
+        seq = next(self._seq)
+        trigger_id = trigger_id or f"TRG_{symbol}_{seq}"
+        if trigger_id in self.triggers:
+            self.remove_trigger(trigger_id)
+
+        trigger = PriceTrigger(
+            trigger_id, symbol, level, direction, callback, seq,
+            expires_at=expires_at, on_expire=on_expire, payload=payload,
+            retry_interval=retry_interval
+        )
+        self.triggers[trigger_id] = trigger
+        self.indexes.setdefault(symbol, SymbolTriggerIndex()).insert(trigger)
+        self.dirty_symbols.add(symbol)
+
+        if expires_at is not None:
+            self._schedule(trigger, expires_at, "expire")
+
+        if self.mt5_client is not None and hasattr(self.mt5_client, "subscribe_symbols"):
+            self.mt5_client.subscribe_symbols([symbol])
+
+        self.stats["registered"] += 1
+        return trigger_id
+
+    def remove_trigger(self, trigger_id: Optional[str]) -> bool:
+        """Cancel a trigger (no callback, no expiry)"""
+        trigger = self.triggers.get(trigger_id) if trigger_id else None
+        if trigger is None:
+            return False
+
+        self._discard(trigger)
+        self.stats["cancelled"] += 1
+        return True
+
+    def _schedule(self, trigger: PriceTrigger, deadline: float, kind: str):
+        item = (kind, trigger.trigger_id, trigger)
+        trigger.timers.append((self.timers.schedule(deadline, item), item))
+
+    def _discard(self, trigger: PriceTrigger):
+        """Forget a trigger: registry entry, index entry and its pending timers"""
+        if self.triggers.get(trigger.trigger_id) is trigger:
+            del self.triggers[trigger.trigger_id]
+        self._unindex(trigger)
+        for tick, item in trigger.timers:
+            self.timers.cancel(tick, item)
+        trigger.timers = []
+
+    def _unindex(self, trigger: PriceTrigger):
+        index = self.indexes.get(trigger.symbol)
+        if index is not None:
+            index.remove(trigger)
+            if not len(index):
+                del self.indexes[trigger.symbol]
+
+    def clear(self):
+        """Cancel every trigger"""
+        for trigger_id in list(self.triggers):
+            self.remove_trigger(trigger_id)
+
+    def pending_count(self, symbol: Optional[str] = None) -> int:
+        if symbol is None:
+            return len(self.triggers)
+        return sum(1 for t in self.triggers.values() if t.symbol == symbol)
+
+    # ==================== EVALUATION ====================
+
+    def evaluate_tick(self, symbol: str, price: float) -> List[PriceTrigger]:
+        """Pop the triggers crossed by this tick (no callbacks run)"""
+        self.stats["ticks_evaluated"] += 1
+        self.last_prices[symbol] = price
+        self.dirty_symbols.discard(symbol)
+
+        index = self.indexes.get(symbol)
+        if index is None:
+            return []
+
+        fired = [t for t in index.pop_crossed(price) if self.triggers.get(t.trigger_id) is t]
+        if not len(index):
+            del self.indexes[symbol]
+        return fired
+
+    async def on_tick(self, symbol: str, price: float) -> int:
+        """Evaluate one tick and dispatch crossed triggers; returns count fired"""
+        fired = self.evaluate_tick(symbol, price)
+        for trigger in fired:
+            await self._dispatch(trigger, price)
+        return len(fired)
+
+    async def advance_timers(self, now: Optional[float] = None) -> int:
+        """Process expiries and retry re-arms that are due"""
+        now = time.time() if now is None else now
+        handled = 0
+
+        for item in self.timers.advance(now):
+            kind, trigger_id, trigger = item
+            trigger.timers = [entry for entry in trigger.timers if entry[1] is not item]
+            if self.triggers.get(trigger_id) is not trigger:
+                continue  # Cancelled or replaced
+
+            if kind == "rearm":
+                if not trigger.armed:
+                    self.indexes.setdefault(trigger.symbol, SymbolTriggerIndex()).insert(trigger)
+                    self.dirty_symbols.add(trigger.symbol)
+                    self.stats["rearmed"] += 1
+                continue
+
+            # Expiry
+            self._discard(trigger)
+            self.stats["expired"] += 1
+            handled += 1
+            if trigger.on_expire:
+                await self._call(trigger.on_expire, trigger)
+
+        return handled
+
+    async def process_cycle(self, now: Optional[float] = None) -> int:
+        """One engine cycle: timers, then one cached price read per active symbol"""
+        await self.advance_timers(now)
+
+        fired = 0
+        for symbol in list(self.indexes):
+            price = self._read_price(symbol)
+            if price is None:
+                continue
+            if price == self.last_prices.get(symbol) and symbol not in self.dirty_symbols:
+                continue  # Nothing moved and nothing new armed
+            fired += await self.on_tick(symbol, price)
+        return fired
+
+    def _read_price(self, symbol: str) -> Optional[float]:
+        if self.mt5_client is None:
+            return None
+        tick = self.mt5_client.get_tick(symbol) if hasattr(self.mt5_client, "get_tick") else None
+        if tick:
+            return tick["mid"]
+        return self.mt5_client.get_current_price(symbol)
+
+    async def _dispatch(self, trigger: PriceTrigger, price: float):
+        trigger.fire_count += 1
+        self.stats["fired"] += 1
+        try:
+            result = await self._call(trigger.callback, trigger, price)
+        except Exception as e:
+            logger.error(f"Price trigger {trigger.trigger_id} callback error: {str(e)}")
+            self.stats["errors"] += 1
+            result = False  # Retry like the old polling loops did after an error
+
+        if self.triggers.get(trigger.trigger_id) is not trigger:
+            return  # Callback cancelled it
+
+        if result is False:
+            # Conditions not met yet - re-arm after retry interval
+            self._schedule(trigger, time.time() + trigger.retry_interval, "rearm")
+        else:
+            self._discard(trigger)
+
+    @staticmethod
+    async def _call(func: Callable, *args):
+        result = func(*args)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    # ==================== LIFECYCLE ====================
+
+    async def start(self):
+        """Start the single background evaluation task"""
+        if self.task and not self.task.done():
+            return
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info(f"Price trigger engine started (interval {self.interval_seconds * 1000:.0f}ms)")
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run_loop(self):
+        while True:
+            try:
+                await self.process_cycle()
+                await asyncio.sleep(self.interval_seconds)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Price trigger engine error: {str(e)}")
+                await asyncio.sleep(self.interval_seconds)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "running": self.task is not None and not self.task.done(),
+            "pending": len(self.triggers),
+            "symbols": {symbol: len(index) for symbol, index in self.indexes.items()},
+            "timers_scheduled": self.timers.size,
+            "stats": dict(self.stats)
+        }
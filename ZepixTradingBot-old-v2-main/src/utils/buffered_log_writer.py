@@ -0,0 +1,230 @@
+"""
+Buffered Log Writer - Background batched file output for OptimizedLogger
+
+Log lines are appended to a bounded in-memory queue and written by one daemon
+thread in batches over a file handle that stays open. Rotation is decided
+from a byte counter kept by the writer (seeded with one stat when the file is
+opened) instead of a stat per line. When the queue is full new lines are
+dropped and counted; urgent lines (CRITICAL) bypass the bound and the caller
+can wait until they are on disk with flush().
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+class BufferedLogWriter:
+    """Single background writer for one rotating log file"""
+
+    def __init__(self, settings, max_queue: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 0.2):
+        # settings provides log_file, max_file_size and backup_count (LoggingConfig);
+        # they are re-read per batch so runtime changes take effect
+        self.settings = settings
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: Deque[str] = deque()
+        self._cond = threading.Condition()
+        self._enqueued = 0          # Sequence number of the last accepted line
+        self._written = 0           # Sequence number of the last line on disk (or failed)
+        self._rotate_requested = False
+        self._draining = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._handle = None
+        self._handle_path: Optional[str] = None
+        self._bytes = 0
+
+        self.stats = {
+            "written": 0,
+            "dropped": 0,
+            "batches": 0,
+            "rotations": 0,
+            "write_errors": 0,
+            "max_depth": 0
+        }
+        atexit.register(self.close)
+
+    # ==================== PRODUCER SIDE ====================
+
+    def submit(self, line: str, urgent: bool = False) -> bool:
+        """Queue one line; returns False if it was dropped because the queue is full"""
+        with self._cond:
+            if not urgent and len(self._queue) >= self.max_queue:
+                self.stats["dropped"] += 1
+                return False
+            self._queue.append(line)
+            self._enqueued += 1
+            depth = len(self._queue)
+            if depth > self.stats["max_depth"]:
+                self.stats["max_depth"] = depth
+            if urgent or depth >= self.batch_size:
+                self._cond.notify_all()
+            if self._stopping:
+                # Writer already closed (interpreter shutdown) - write synchronously
+                self._drain_locked()
+                return True
+        self._ensure_thread()
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every line queued so far has been written (True) or timeout (False)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            target = self._enqueued
+            if self._written >= target:
+                return True
+            self._cond.notify_all()
+            while self._written < target:
+                if not self._draining and (self._thread is None or not self._thread.is_alive()):
+                    # No writer (not started yet or already closed) - write inline
+                    self._drain_locked()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def request_rotation(self):
+        """Rotate before the next batch is written"""
+        with self._cond:
+            self._rotate_requested = True
+            self._cond.notify_all()
+
+    def close(self, timeout: float = 5.0):
+        self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        with self._cond:
+            self._drain_locked()
+            self._close_handle()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self.stats)
+            stats["queued"] = len(self._queue)
+            stats["file_bytes"] = self._bytes
+        return stats
+
+    # ==================== WRITER THREAD ====================
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._stopping or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        with self._cond:
+            while not self._stopping:
+                if self._draining or (not self._queue and not self._rotate_requested):
+                    self._cond.wait(self.flush_interval)
+                    continue
+                self._drain_locked()
+
+    def _drain_locked(self):
+        """Write everything queued; called with the condition held"""
+        if self._draining:
+            return
+        self._draining = True
+        try:
+            self._drain_batches()
+        finally:
+            self._draining = False
+
+    def _drain_batches(self):
+        while self._queue or self._rotate_requested:
+            batch = []
+            while self._queue and len(batch) < self.batch_size:
+                batch.append(self._queue.popleft())
+            rotate = self._rotate_requested
+            self._rotate_requested = False
+            # File I/O happens outside the lock so producers never wait on the disk
+            self._cond.release()
+            try:
+                self._write_batch(batch, rotate)
+            finally:
+                self._cond.acquire()
+            self._written += len(batch)
+            self._cond.notify_all()
+
+    def _write_batch(self, batch, rotate: bool):
+        try:
+            path = self.settings.log_file
+            if self._handle is None or self._handle_path != path:
+                self._open(path)
+            if rotate or self._bytes > self.settings.max_file_size:
+                self._rotate()
+            if not batch:
+                return
+            data = "\n".join(batch) + "\n"
+            self._handle.write(data)
+            self._handle.flush()
+            self._bytes += len(data.encode("utf-8"))
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+        except Exception as e:
+            self.stats["write_errors"] += 1
+            self._close_handle()
+            print(f"⚠️ Failed to write log file: {e}")
+
+    def _open(self, path: str):
+        self._close_handle()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._handle = open(path, "a", encoding="utf-8")
+        self._handle_path = path
+        self._bytes = os.path.getsize(path)
+
+    def _close_handle(self):
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except Exception:
+                pass
+        self._handle = None
+        self._handle_path = None
+        self._bytes = 0
+
+    def _rotate(self):
+        """
+        Rotate log files when max size exceeded
+        Keeps backup_count number of old log files
+        """
+        path = self._handle_path or self.settings.log_file
+        self._close_handle()
+        try:
+            # Shift existing backup files
+            for i in range(self.settings.backup_count - 1, 0, -1):
+                old_file = f"{path}.{i}"
+                new_file = f"{path}.{i+1}"
+                if os.path.exists(old_file):
+                    if os.path.exists(new_file):
+                        os.remove(new_file)
+                    os.rename(old_file, new_file)
+
+            # Rename current log to .1
+            if os.path.exists(path):
+                backup_file = f"{path}.1"
+                if os.path.exists(backup_file):
+                    os.remove(backup_file)
+                os.rename(path, backup_file)
+            self.stats["rotations"] += 1
+        except Exception as e:
+            print(f"⚠️ Log rotation failed: {e}")
+        self._open(path)
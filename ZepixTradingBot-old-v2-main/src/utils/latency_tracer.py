@@ -0,0 +1,295 @@
+"""
+Latency Tracer - Alert-to-order stage timings
+
+Each alert handled by TradingEngine._dispatch_alert gets a trace with its own
+ID. Code along the entry path wraps its work in tracer.stage("name"), which
+records a monotonic (perf_counter) duration into the current trace and into a
+per-stage rolling window. The current trace lives in a contextvar, so stages
+recorded across awaits in the same task attach to the right alert without
+threading the trace through every call.
+
+Stats are exposed through get_stats() (JSON), format_report() (Telegram
+/latency) and an optional localhost HTTP endpoint (GET /latency).
+"""
+
+import bisect
+import contextvars
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from src.utils.optimized_logger import logger
+
+STAGE_TOTAL = "total"
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("alert_trace", default=None)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in milliseconds"""
+
+    BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float):
+        self.counts[bisect.bisect_left(self.BOUNDS_MS, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th sample"""
+        if not self.count:
+            return 0.0
+        target = pct / 100.0 * self.count
+        running = 0
+        for index, bucket_count in enumerate(self.counts):
+            running += bucket_count
+            if running >= target:
+                return float(self.BOUNDS_MS[index]) if index < len(self.BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}" for bound in self.BOUNDS_MS] + [f">{self.BOUNDS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": {label: n for label, n in zip(labels, self.counts) if n}
+        }
+
+
+class StageStats:
+    """Exact percentiles over the last `window` samples plus a lifetime histogram"""
+
+    __slots__ = ("window", "histogram")
+
+    def __init__(self, window: int):
+        self.window: Deque[float] = deque(maxlen=window)
+        self.histogram = LatencyHistogram()
+
+    def record(self, value_ms: float):
+        self.window.append(value_ms)
+        self.histogram.record(value_ms)
+
+    def percentiles(self) -> Dict[str, float]:
+        if not self.window:
+            return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+        ordered = sorted(self.window)
+        last = len(ordered) - 1
+
+        def pick(pct):
+            return round(ordered[min(last, int(round(pct / 100.0 * last)))], 3)
+
+        return {"p50_ms": pick(50), "p95_ms": pick(95), "p99_ms": pick(99)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        lifetime = self.histogram.to_dict()
+        return {
+            "count": lifetime["count"],
+            "window": len(self.window),
+            **self.percentiles(),
+            "avg_ms": lifetime["avg_ms"],
+            "max_ms": lifetime["max_ms"],
+            "buckets": lifetime["buckets"]
+        }
+
+
+class AlertTrace:
+    """Stage timings of one alert"""
+
+    __slots__ = ("trace_id", "alert_type", "symbol", "started", "stages")
+
+    def __init__(self, trace_id: str, alert_type: str, symbol: str):
+        self.trace_id = trace_id
+        self.alert_type = alert_type
+        self.symbol = symbol
+        self.started = time.perf_counter()
+        self.stages: List[Tuple[str, float]] = []
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "type": self.alert_type,
+            "symbol": self.symbol,
+            "stages": [{"stage": name, "ms": round(ms, 3)} for name, ms in self.stages]
+        }
+
+
+class LatencyTracer:
+    """Per-alert stage tracing with rolling per-stage percentiles"""
+
+    def __init__(self, enabled: bool = True, window: int = 1024, slow_alert_ms: float = 1000.0,
+                 keep_slow_traces: int = 20):
+        self.enabled = enabled
+        self.window = window
+        self.slow_alert_ms = slow_alert_ms
+        self._stages: Dict[str, StageStats] = {}
+        self._slow: Deque[Dict[str, Any]] = deque(maxlen=keep_slow_traces)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.traces_started = 0
+        self.traces_finished = 0
+
+    @classmethod
+    def from_config(cls, config) -> "LatencyTracer":
+        settings = config.get("latency_tracing", {})
+        return cls(
+            enabled=settings.get("enabled", True),
+            window=settings.get("window", 1024),
+            slow_alert_ms=settings.get("slow_alert_ms", 1000.0),
+            keep_slow_traces=settings.get("keep_slow_traces", 20)
+        )
+
+    # ==================== RECORDING ====================
+
+    def record(self, stage: str, value_ms: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats(self.window)
+            stats.record(value_ms)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.stages.append((stage, value_ms))
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as `name` (attached to the current alert trace, if any)"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000.0)
+
+    @contextmanager
+    def trace(self, data: Any):
+        """Open a trace for one alert; nested alerts (re-entrant dispatch) reuse the outer trace"""
+        if not self.enabled or _current_trace.get() is not None:
+            yield _current_trace.get()
+            return
+        alert_type = data.get("type", "unknown") if isinstance(data, dict) else "unknown"
+        symbol = data.get("symbol", "") if isinstance(data, dict) else ""
+        trace = AlertTrace(f"T{next(self._ids):06d}", alert_type, symbol)
+        self.traces_started += 1
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+            self._finish(trace)
+
+    def _finish(self, trace: AlertTrace):
+        total_ms = trace.elapsed_ms()
+        self.record(STAGE_TOTAL, total_ms)
+        self.record(f"{STAGE_TOTAL}:{trace.alert_type}", total_ms)
+        trace.stages.append((STAGE_TOTAL, total_ms))
+        self.traces_finished += 1
+        if total_ms >= self.slow_alert_ms:
+            self._slow.append(trace.to_dict())
+            breakdown = ", ".join(f"{name}={ms:.1f}ms" for name, ms in trace.stages)
+            logger.warning(f"Slow alert {trace.trace_id} {trace.alert_type} {trace.symbol}: {breakdown}")
+
+    def current_trace(self) -> Optional[AlertTrace]:
+        return _current_trace.get()
+
+    def current_trace_id(self) -> Optional[str]:
+        trace = _current_trace.get()
+        return trace.trace_id if trace is not None else None
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._slow.clear()
+
+    # ==================== REPORTING ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {name: stats.to_dict() for name, stats in self._stages.items()}
+        return {
+            "enabled": self.enabled,
+            "traces_started": self.traces_started,
+            "traces_finished": self.traces_finished,
+            "slow_alert_ms": self.slow_alert_ms,
+            "stages": stages,
+            "slow_traces": list(self._slow)
+        }
+
+    def format_report(self) -> str:
+        """HTML summary for the Telegram /latency command"""
+        stats = self.get_stats()
+        if not stats["enabled"]:
+            return "⏱️ <b>Latency tracing is disabled</b>"
+        if not stats["stages"]:
+            return "⏱️ <b>Alert Latency</b>\n\nNo alerts traced yet."
+        lines = [
+            "⏱️ <b>Alert Latency</b> (ms, last "
+            f"{self.window} per stage)",
+            "━━━━━━━━━━━━━━━━━━━━━━━━",
+            "<code>stage            n    p50    p95    p99</code>"
+        ]
+        for name, data in sorted(stats["stages"].items(), key=lambda item: -item[1]["p95_ms"]):
+            lines.append(
+                f"<code>{name[:14]:<14}{data['count']:>5}{data['p50_ms']:>7.1f}"
+                f"{data['p95_ms']:>7.1f}{data['p99_ms']:>7.1f}</code>"
+            )
+        if stats["slow_traces"]:
+            last = stats["slow_traces"][-1]
+            lines.append(f"\n🐢 Last slow alert {last['trace_id']} ({last['type']} {last['symbol']})")
+        return "\n".join(lines)
+
+
+# ==================== LOCAL JSON ENDPOINT ====================
+
+def create_latency_app(tracer: LatencyTracer):
+    """FastAPI app exposing GET /latency (stats JSON) and POST /latency/reset"""
+    from fastapi import FastAPI
+
+    app = FastAPI(title="Zepix Latency")
+
+    @app.get("/latency")
+    async def latency():
+        return tracer.get_stats()
+
+    @app.post("/latency/reset")
+    async def latency_reset():
+        tracer.reset()
+        return {"reset": True}
+
+    return app
+
+
+def start_latency_server(tracer: LatencyTracer, host: str = "127.0.0.1", port: int = 8765):
+    """Serve create_latency_app() from a daemon thread; returns the uvicorn server or None"""
+    try:
+        import uvicorn
+    except ImportError:
+        logger.warning("uvicorn not installed - latency HTTP endpoint disabled")
+        return None
+
+    server = uvicorn.Server(uvicorn.Config(create_latency_app(tracer), host=host, port=port,
+                                           log_level="warning"))
+    thread = threading.Thread(target=server.run, name="latency-http", daemon=True)
+    thread.start()
+    logger.info(f"Latency endpoint listening on http://{host}:{port}/latency")
+    return server
@@ -0,0 +1,251 @@
+"""
+Event Loop Watchdog - Scheduling lag measurement and blocking-call attribution
+
+A heartbeat task sleeps for a fixed interval on the event loop and records
+how late it wakes up (scheduling lag). A sampler thread watches the heartbeat;
+when the loop has not ticked for longer than the threshold, it grabs the
+loop thread's current Python stack with sys._current_frames(), which points
+at the code holding the loop (time.sleep, requests.post, SQLite, MT5 ...).
+When the heartbeat finally runs, the stall is attributed to that call site
+and aggregated, so the worst offenders can be listed in diagnostics and logs.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+from src.utils.latency_tracer import LatencyHistogram
+from src.utils.optimized_logger import logger
+
+UNATTRIBUTED = "(stall ended before it was sampled)"
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_THIS_FILE = os.path.abspath(__file__)
+
+
+def _call_site(stack: traceback.StackSummary) -> str:
+    """Deepest frame inside the project (the bot code that made the blocking call)"""
+    chosen = None
+    for frame in stack:
+        path = os.path.abspath(frame.filename)
+        if path.startswith(_PROJECT_ROOT) and "site-packages" not in path and path != _THIS_FILE:
+            chosen = frame
+    if chosen is None and len(stack):
+        chosen = stack[-1]
+    if chosen is None:
+        return "unknown"
+    rel = os.path.relpath(chosen.filename, _PROJECT_ROOT) if chosen.filename.startswith(_PROJECT_ROOT) else chosen.filename
+    return f"{rel}:{chosen.lineno} in {chosen.name}"
+
+
+class _Offender:
+    __slots__ = ("site", "count", "total_ms", "max_ms", "last_stack", "last_seen")
+
+    def __init__(self, site: str):
+        self.site = site
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_stack: List[str] = []
+        self.last_seen = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "site": self.site,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 1),
+            "max_ms": round(self.max_ms, 1),
+            "last_stack": self.last_stack
+        }
+
+
+class EventLoopWatchdog:
+    """Measures event-loop lag and aggregates blocking call sites"""
+
+    def __init__(self, interval: float = 0.1, threshold_ms: float = 100.0,
+                 stack_depth: int = 12, max_sites: int = 50, log_cooldown: float = 30.0):
+        self.interval = interval
+        self.threshold_ms = threshold_ms
+        self.stack_depth = stack_depth
+        self.max_sites = max_sites
+        self.log_cooldown = log_cooldown
+
+        self.lag_histogram = LatencyHistogram()
+        self.offenders: Dict[str, _Offender] = {}
+        self.stalls = 0
+        self.unattributed = 0
+        self.worst_lag_ms = 0.0
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._pending: Optional[Dict[str, Any]] = None   # Stack captured for the ongoing stall
+        self._task: Optional[asyncio.Task] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.is_running = False
+
+    @classmethod
+    def from_config(cls, config) -> "EventLoopWatchdog":
+        settings = config.get("loop_watchdog", {})
+        return cls(
+            interval=settings.get("interval_ms", 100) / 1000.0,
+            threshold_ms=settings.get("threshold_ms", 100.0),
+            stack_depth=settings.get("stack_depth", 12),
+            max_sites=settings.get("max_sites", 50),
+            log_cooldown=settings.get("log_cooldown_seconds", 30.0)
+        )
+
+    # ==================== LIFECYCLE ====================
+
+    async def start(self):
+        if self.is_running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self.is_running = True
+        self._task = asyncio.create_task(self._heartbeat())
+        self._sampler = threading.Thread(target=self._sample_loop, name="loop-watchdog", daemon=True)
+        self._sampler.start()
+        logger.info(f"Event loop watchdog started (threshold {self.threshold_ms:.0f}ms)")
+
+    async def stop(self):
+        self.is_running = False
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._sampler is not None:
+            self._sampler.join(timeout=1.0)
+            self._sampler = None
+
+    # ==================== MEASUREMENT ====================
+
+    async def _heartbeat(self):
+        while self.is_running:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            self.record_lag(max(0.0, (now - expected) * 1000.0))
+
+    def _sample_loop(self):
+        # Sample at a fraction of the threshold so stalls just above it are still caught
+        period = max(self.threshold_ms / 4000.0, 0.005)
+        while not self._stop.wait(period):
+            overdue_ms = (time.monotonic() - self._last_beat - self.interval) * 1000.0
+            if overdue_ms >= self.threshold_ms:
+                self.capture_stack()
+
+    def capture_stack(self):
+        """Record the loop thread's stack for the ongoing stall (first sample wins)"""
+        with self._lock:
+            if self._pending is not None:
+                return
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame)
+        del frame
+        pending = {
+            "site": _call_site(stack),
+            "stack": [f"{os.path.basename(f.filename)}:{f.lineno} {f.name}" for f in stack[-self.stack_depth:]]
+        }
+        with self._lock:
+            if self._pending is None:
+                self._pending = pending
+
+    def record_lag(self, lag_ms: float):
+        """Called on the loop after each heartbeat; closes out a stall if lag was high"""
+        self.lag_histogram.record(lag_ms)
+        if lag_ms < self.threshold_ms:
+            with self._lock:
+                self._pending = None
+            return
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self.stalls += 1
+            self.worst_lag_ms = max(self.worst_lag_ms, lag_ms)
+            if pending is None:
+                self.unattributed += 1
+                site, stack = UNATTRIBUTED, []
+            else:
+                site, stack = pending["site"], pending["stack"]
+            offender = self.offenders.get(site)
+            if offender is None:
+                if len(self.offenders) >= self.max_sites:
+                    # Evict the least costly site to bound memory
+                    weakest = min(self.offenders.values(), key=lambda o: o.total_ms)
+                    del self.offenders[weakest.site]
+                offender = self.offenders[site] = _Offender(site)
+            offender.count += 1
+            offender.total_ms += lag_ms
+            offender.max_ms = max(offender.max_ms, lag_ms)
+            if stack:
+                offender.last_stack = stack
+            should_log = time.monotonic() - offender.last_seen >= self.log_cooldown
+            offender.last_seen = time.monotonic()
+
+        if should_log:
+            trace = "\n    ".join(stack) if stack else "(no stack)"
+            logger.warning(f"Event loop blocked {lag_ms:.0f}ms at {site}\n    {trace}")
+
+    # ==================== REPORTING ====================
+
+    def top_blockers(self, limit: int = 5) -> List[Dict[str, Any]]:
+        with self._lock:
+            ranked = sorted(self.offenders.values(), key=lambda o: o.total_ms, reverse=True)
+            return [offender.to_dict() for offender in ranked[:limit]]
+
+    def get_stats(self, limit: int = 5) -> Dict[str, Any]:
+        return {
+            "running": self.is_running,
+            "threshold_ms": self.threshold_ms,
+            "lag": self.lag_histogram.to_dict(),
+            "stalls": self.stalls,
+            "unattributed": self.unattributed,
+            "worst_lag_ms": round(self.worst_lag_ms, 1),
+            "top_blockers": self.top_blockers(limit)
+        }
+
+    def reset(self):
+        with self._lock:
+            self.lag_histogram = LatencyHistogram()
+            self.offenders.clear()
+            self.stalls = 0
+            self.unattributed = 0
+            self.worst_lag_ms = 0.0
+
+    def format_report(self, limit: int = 5) -> str:
+        """Markdown summary for the diagnostics menu"""
+        stats = self.get_stats(limit)
+        lag = stats["lag"]
+        lines = [
+            "⏲️ *EVENT LOOP WATCHDOG*",
+            "━━━━━━━━━━━━━━━━━━━━━━━━",
+            f"• Status: {'✅ Running' if stats['running'] else '⏸️ Stopped'}",
+            f"• Lag p50/p99: {lag['p50_ms']:.0f}/{lag['p99_ms']:.0f} ms (max {lag['max_ms']:.0f} ms)",
+            f"• Stalls > {self.threshold_ms:.0f}ms: {stats['stalls']}",
+        ]
+        if stats["top_blockers"]:
+            lines.append("\n🐢 *Top blockers:*")
+            for index, blocker in enumerate(stats["top_blockers"], 1):
+                lines.append(
+                    f"{index}. `{blocker['site']}`\n"
+                    f"   {blocker['count']}x, total {blocker['total_ms']:.0f}ms, max {blocker['max_ms']:.0f}ms"
+                )
+        else:
+            lines.append("\n✅ No blocking calls detected")
+        return "\n".join(lines)
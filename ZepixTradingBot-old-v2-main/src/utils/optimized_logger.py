@@ -3,15 +3,16 @@ Optimized Logger for Zepix Trading Bot v2.0
 Intelligent logging system with importance-based filtering and error deduplication
 """
 
-import os
 from datetime import datetime
 
 # Import from same utils directory
 try:
     from .logging_config import logging_config, LogLevel
+    from .buffered_log_writer import BufferedLogWriter
 except ImportError:
     # Fallback for direct execution
     from logging_config import logging_config, LogLevel
+    from buffered_log_writer import BufferedLogWriter
 
 
 class OptimizedLogger:
@@ -22,6 +23,7 @@ class OptimizedLogger:
     - Trading debug mode integration
     - Log rotation with size limits
     - Missing order tracking with repeat suppression
+    - Buffered background file writes (CRITICAL lines are flushed before returning)
     """
     
     def __init__(self):
@@ -44,6 +46,10 @@ class OptimizedLogger:
         
         # Missing order deduplication
         self.missing_order_checks = {}
+        
+        # File output goes through one background writer (batched, rotation by byte count)
+        self.file_writer = BufferedLogWriter(logging_config)
+        self.critical_flush_timeout = 2.0
     
     def log_command_execution(self, command: str, user_id: int, params: dict = None):
         """
@@ -187,54 +193,32 @@ class OptimizedLogger:
         
         # File logging
         if logging_config.enable_file_logs:
-            self._write_to_file(formatted_message)
+            self._write_to_file(formatted_message, level)
     
-    def _write_to_file(self, message: str):
+    def _write_to_file(self, message: str, level: LogLevel = LogLevel.INFO):
         """
-        Write log to file with rotation support
+        Queue log line for the background file writer
         
         Args:
             message: Formatted message to write
+            level: CRITICAL lines are on disk before this returns
         """
-        try:
-            # Check if rotation needed
-            if os.path.exists(logging_config.log_file):
-                file_size = os.path.getsize(logging_config.log_file)
-                if file_size > logging_config.max_file_size:
-                    self._rotate_log_file()
-            
-            # Append to log file
-            with open(logging_config.log_file, "a", encoding="utf-8") as f:
-                f.write(message + "\n")
-        
-        except Exception as e:
-            print(f"⚠️ Failed to write log file: {e}")
+        urgent = level == LogLevel.CRITICAL
+        self.file_writer.submit(message, urgent=urgent)
+        if urgent:
+            self.file_writer.flush(self.critical_flush_timeout)
     
     def _rotate_log_file(self):
-        """
-        Rotate log files when max size exceeded
-        Keeps backup_count number of old log files
-        """
-        try:
-            # Shift existing backup files
-            for i in range(logging_config.backup_count - 1, 0, -1):
-                old_file = f"{logging_config.log_file}.{i}"
-                new_file = f"{logging_config.log_file}.{i+1}"
-                
-                if os.path.exists(old_file):
-                    if os.path.exists(new_file):
-                        os.remove(new_file)
-                    os.rename(old_file, new_file)
-            
-            # Rename current log to .1
-            if os.path.exists(logging_config.log_file):
-                backup_file = f"{logging_config.log_file}.1"
-                if os.path.exists(backup_file):
-                    os.remove(backup_file)
-                os.rename(logging_config.log_file, backup_file)
-        
-        except Exception as e:
-            print(f"⚠️ Log rotation failed: {e}")
+        """Rotate log files before the next write (done by the writer thread)"""
+        self.file_writer.request_rotation()
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued log line is written"""
+        return self.file_writer.flush(timeout)
+    
+    def get_file_stats(self) -> dict:
+        """Writer counters: written, dropped, batches, rotations, queued, ..."""
+        return self.file_writer.get_stats()
 
 
 # Global logger instance
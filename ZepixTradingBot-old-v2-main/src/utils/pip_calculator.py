@@ -1,11 +1,15 @@
 from typing import Dict, Tuple
 from src.config import Config
+from src.utils.symbol_specs import account_tier, specs_for
 
 class PipCalculator:
     """
     Accurate pip and SL calculation for all symbols
     Uses TradingView symbol names (XAUUSD) internally
     MT5Client handles the mapping to broker symbols (GOLD)
+    
+    Symbol, SL system and logic multiplier values come from the compiled
+    SymbolSpecTable (config.symbol_specs), rebuilt when those sections change.
     """
     
     def __init__(self, config: Config):
@@ -24,25 +28,16 @@ class PipCalculator:
         logic: Current strategy logic (combinedlogic-1/combinedlogic-2/combinedlogic-3) for timeframe adjustment
         """
         
-        # Get symbol configuration
-        symbol_config = self.config["symbol_config"][symbol]
-        pip_size = symbol_config["pip_size"]
+        # Get symbol spec (one table read for the whole calculation)
+        specs = specs_for(self.config)
+        pip_size = specs[symbol].pip_size
         
         # Get SL in pips from dual SL system
-        sl_pips = self._get_sl_from_dual_system(symbol, account_balance)
+        sl_pips = self._get_sl_from_dual_system(symbol, account_balance, specs)
         
-        # --- NEW: Apply Timeframe Multiplier ---
-        try:
-            timeframe_config = self.config.get("timeframe_specific_config", {})
-            if timeframe_config.get("enabled", False) and logic:
-                logic_config = timeframe_config.get(logic)
-                if logic_config:
-                    tf_multiplier = logic_config.get("sl_multiplier", 1.0)
-                    sl_pips = sl_pips * tf_multiplier
-                    # print(f"Timeframe Config: {logic} SL x{tf_multiplier} -> {sl_pips:.1f} pips")
-        except Exception as e:
-            print(f"Error applying timeframe multiplier: {e}")
-        # ---------------------------------------
+        # Apply timeframe multiplier (table only holds logics while timeframe config is enabled)
+        if logic in specs.logic_sl_multipliers:
+            sl_pips = sl_pips * specs.logic_sl_multipliers[logic]
         
         # Apply SL adjustment (for re-entry progressive reduction)
         sl_pips = sl_pips * sl_adjustment
@@ -62,64 +57,45 @@ class PipCalculator:
             
         return sl_price, sl_distance
     
-    def _get_sl_from_dual_system(self, symbol: str, account_balance: float) -> float:
+    def _get_sl_from_dual_system(self, symbol: str, account_balance: float, specs=None) -> float:
         """
         Get SL in pips from active dual SL system (sl-1 or sl-2)
         Applies symbol-specific reductions if configured
         """
+        specs = specs or specs_for(self.config)
         
         # Check if SL system is enabled
-        if not self.config.get("sl_system_enabled", True):
+        if not specs.sl_system_enabled:
             # Fallback to old risk-cap based calculation
-            return self._fallback_sl_calculation(symbol, account_balance)
+            return self._fallback_sl_calculation(symbol, account_balance, specs)
         
         # Get active system (sl-1 or sl-2)
-        active_system = self.config.get("active_sl_system", "sl-1")
+        active_system = specs.active_sl_system
         
         # Get account tier
-        account_tier = self._get_account_tier(account_balance)
+        tier = self._get_account_tier(account_balance)
         
-        # Get SL pips from active system table
-        try:
-            sl_data = self.config["sl_systems"][active_system]["symbols"][symbol][account_tier]
-            sl_pips = sl_data["sl_pips"]
-        except KeyError:
+        # Get SL pips (reduction already folded in) from the compiled table
+        spec = specs.get(symbol)
+        if spec is None or (active_system, tier) not in spec.sl_pips:
             # Fallback if symbol/tier not found
-            print(f"WARNING: SL not found for {symbol} @ {account_tier} in {active_system}, using fallback")
-            return self._fallback_sl_calculation(symbol, account_balance)
+            print(f"WARNING: SL not found for {symbol} @ {tier} in {active_system}, using fallback")
+            return self._fallback_sl_calculation(symbol, account_balance, specs)
+        sl_pips = spec.reduced_sl_pips(active_system, tier)
         
-        # Apply symbol-specific reduction if configured
-        symbol_reductions = self.config.get("symbol_sl_reductions", {})
-        if symbol in symbol_reductions:
-            reduction_percent = symbol_reductions[symbol]
-            sl_pips = sl_pips * (1 - reduction_percent / 100)
-            print(f"DOWN: {symbol} SL reduced by {reduction_percent}%: {sl_pips:.1f} pips")
+        if spec.reduction_percent is not None:
+            print(f"DOWN: {symbol} SL reduced by {spec.reduction_percent}%: {sl_pips:.1f} pips")
         
         return sl_pips
     
-    def _fallback_sl_calculation(self, symbol: str, account_balance: float) -> float:
+    def _fallback_sl_calculation(self, symbol: str, account_balance: float, specs=None) -> float:
         """
         Fallback SL calculation when dual system is disabled
-        Uses old risk-cap based logic
+        Uses old risk-cap based logic (risk cap / pip value of the tier's fixed lot),
+        precompiled per tier in the symbol spec
         """
-        symbol_config = self.config["symbol_config"][symbol]
-        volatility = symbol_config["volatility"]
-        account_tier = self._get_account_tier(account_balance)
-        
-        # Get risk cap
-        risk_cap = self.config["risk_by_account_tier"][account_tier][volatility]["risk_dollars"]
-        
-        # Get lot size from fixed_lot_sizes
-        lot_size = self.config["fixed_lot_sizes"].get(account_tier, 0.05)
-        
-        # Calculate pip value
-        pip_value_std = symbol_config["pip_value_per_std_lot"]
-        pip_value = pip_value_std * lot_size
-        
-        # Calculate SL in pips
-        sl_pips = risk_cap / pip_value
-        
-        return sl_pips
+        specs = specs or specs_for(self.config)
+        return specs[symbol].fallback_sl_pips[self._get_account_tier(account_balance)]
 
     def _get_pip_value(self, symbol: str, lot_size: float) -> float:
         """
@@ -127,10 +103,8 @@ class PipCalculator:
         Pip value is the monetary value of one pip movement
         """
         
-        symbol_config = self.config["symbol_config"][symbol]
-        
         # Get pip value for 1 standard lot (base value)
-        pip_value_std = symbol_config["pip_value_per_std_lot"]
+        pip_value_std = specs_for(self.config)[symbol].pip_value_per_std_lot
         
         # Scale to actual lot size being traded
         pip_value = pip_value_std * lot_size
@@ -142,12 +116,8 @@ class PipCalculator:
         Get pip size for a symbol
         Returns: float (pip size in price units)
         """
-        try:
-            symbol_config = self.config["symbol_config"][symbol]
-            return symbol_config["pip_size"]
-        except KeyError:
-            # Default pip size if symbol not found
-            return 0.0001
+        # Default pip size if symbol not found
+        return specs_for(self.config).pip_size(symbol, 0.0001)
     
     def get_pip_value(self, symbol: str, lot_size: float) -> float:
         """
@@ -200,16 +170,7 @@ class PipCalculator:
         Determine account tier based on balance
         Aligned with RiskManager logic to prevent risk mismatch
         """
-        if balance < 10000:
-            return "5000"
-        elif balance < 25000:
-            return "10000"
-        elif balance < 50000:
-            return "25000"
-        elif balance < 100000:
-            return "50000"
-        else:
-            return "100000"
+        return account_tier(balance)
     
     def validate_trade_risk(self, symbol: str, lot_size: float, sl_pips: float, 
                            account_balance: float) -> Dict:
@@ -218,24 +179,19 @@ class PipCalculator:
         Returns: {"valid": bool, "expected_loss": float, "risk_cap": float, "message": str}
         """
         # Get pip value
-        symbol_config = self.config["symbol_config"][symbol]
-        pip_value_std = symbol_config["pip_value_per_std_lot"]
-        pip_value = pip_value_std * lot_size
+        specs = specs_for(self.config)
+        spec = specs[symbol]
+        pip_value = spec.pip_value_per_std_lot * lot_size
         
         # Calculate expected loss
         expected_loss = sl_pips * pip_value
         
         # Get risk cap from active SL system
-        account_tier = self._get_account_tier(account_balance)
-        active_system = self.config.get("active_sl_system", "sl-1")
-        
-        try:
-            sl_data = self.config["sl_systems"][active_system]["symbols"][symbol][account_tier]
-            risk_cap = sl_data["risk_dollars"]
-        except KeyError:
+        tier = self._get_account_tier(account_balance)
+        risk_cap = spec.risk_dollars.get((specs.active_sl_system, tier))
+        if risk_cap is None:
             # Fallback to old risk tier system
-            volatility = symbol_config["volatility"]
-            risk_cap = self.config["risk_by_account_tier"][account_tier][volatility]["risk_dollars"]
+            risk_cap = spec.fallback_risk_dollars[tier]
         
         # Validate with 10% tolerance
         tolerance = 0.1
@@ -1,9 +1,17 @@
 from src.config import Config
+from src.utils.symbol_specs import specs_for
 
 class ProfitBookingSLCalculator:
     def __init__(self, config: Config):
         self.config = config
 
+    def _point_size(self, symbol) -> float:
+        """Pip size from the compiled symbol specs (JPY/XAU heuristic for unknown symbols)"""
+        point_size = specs_for(self.config).pip_size(symbol)
+        if point_size is None:
+            point_size = 0.01 if 'JPY' in str(symbol) or 'XAU' in str(symbol) else 0.0001
+        return point_size
+
     def _parse_args(self, args):
         """Smartly map positional arguments to variables based on type"""
         entry, amount, lots = 0.0, 7.0, 0.01  # Defaults
@@ -89,7 +97,7 @@ class ProfitBookingSLCalculator:
             
             # Pip Value Estimation
             pip_val = 10.0 
-            point_size = 0.01 if 'JPY' in str(symbol) or 'XAU' in str(symbol) else 0.0001
+            point_size = self._point_size(symbol)
             
             if lots <= 0: lots = 0.01
             
@@ -155,7 +163,7 @@ class ProfitBookingSLCalculator:
             d = direction.lower()
             is_buy = d in ['buy', 'bullish', 'long']
             pip_val = 10.0
-            point_size = 0.01 if 'JPY' in str(symbol) or 'XAU' in str(symbol) else 0.0001
+            point_size = self._point_size(symbol)
             
             pips = amount / (pip_val * lots)
             dist = pips * point_size
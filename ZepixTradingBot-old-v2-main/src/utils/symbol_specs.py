@@ -0,0 +1,189 @@
+"""
+Symbol Specs - Compiled per-symbol pip and SL table
+
+PipCalculator, ProfitBookingSLCalculator, ReEntryManager and RiskManager used
+to walk symbol_config, sl_systems[system]["symbols"][symbol][tier],
+symbol_sl_reductions and timeframe_specific_config with nested lookups on
+every call. Those sections are compiled here once into immutable SymbolSpec
+records held by a SymbolSpecTable.
+
+Config keeps one table and swaps in a freshly compiled one (by reference)
+whenever one of SPEC_KEYS changes, so a caller that reads config.symbol_specs
+once per calculation always sees one consistent set of values.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+# Top-level config keys the table is compiled from
+SPEC_KEYS = frozenset({
+    "symbol_config",
+    "sl_systems",
+    "active_sl_system",
+    "sl_system_enabled",
+    "symbol_sl_reductions",
+    "timeframe_specific_config",
+    "risk_by_account_tier",
+    "fixed_lot_sizes",
+})
+
+ACCOUNT_TIERS = ("5000", "10000", "25000", "50000", "100000")
+
+# Lot size used by the risk-cap fallback when a tier has no fixed lot size
+DEFAULT_FALLBACK_LOT = 0.05
+
+
+def account_tier(balance: float) -> str:
+    """Account tier for a balance (PipCalculator / RiskManager thresholds)"""
+    if balance < 10000:
+        return "5000"
+    elif balance < 25000:
+        return "10000"
+    elif balance < 50000:
+        return "25000"
+    elif balance < 100000:
+        return "50000"
+    else:
+        return "100000"
+
+
+def _freeze(mapping: Dict) -> Mapping:
+    return MappingProxyType(mapping)
+
+
+@dataclass(frozen=True)
+class SymbolSpec:
+    """
+    Everything the calculators need for one symbol
+
+    sl_pips and risk_dollars are keyed by (sl system, account tier) and hold
+    the configured values before symbol_sl_reductions is applied.
+    reduction_percent is None when the symbol has no reduction entry.
+    fallback_sl_pips / fallback_risk_dollars are the risk-cap based values
+    used when the dual SL system is off or has no entry for the symbol.
+    """
+    symbol: str
+    pip_size: float
+    pip_value_per_std_lot: float
+    contract_size: Optional[float]
+    volatility: Optional[str]
+    sl_pips: Mapping[Tuple[str, str], float]
+    risk_dollars: Mapping[Tuple[str, str], float]
+    reduction_percent: Optional[float]
+    fallback_sl_pips: Mapping[str, float]
+    fallback_risk_dollars: Mapping[str, float]
+
+    def reduced_sl_pips(self, system: str, tier: str) -> float:
+        """SL pips for (system, tier) with the symbol reduction applied (KeyError if not configured)"""
+        sl_pips = self.sl_pips[(system, tier)]
+        if self.reduction_percent is not None:
+            sl_pips = sl_pips * (1 - self.reduction_percent / 100)
+        return sl_pips
+
+
+class SymbolSpecTable:
+    """
+    Immutable per-symbol specs plus the global SL system switches
+
+    Lookups raise KeyError for unknown symbols, as the nested config lookups
+    they replace did.
+    """
+
+    def __init__(self, specs: Dict[str, SymbolSpec], sl_system_enabled: bool, active_sl_system: str,
+                 logic_sl_multipliers: Dict[str, float], logic_lot_multipliers: Dict[str, float]):
+        self.specs = _freeze(specs)
+        self.sl_system_enabled = sl_system_enabled
+        self.active_sl_system = active_sl_system
+        # Only populated while timeframe_specific_config is enabled
+        self.logic_sl_multipliers = _freeze(logic_sl_multipliers)
+        self.logic_lot_multipliers = _freeze(logic_lot_multipliers)
+
+    @classmethod
+    def from_config(cls, config) -> "SymbolSpecTable":
+        """Compile from a Config (or any object with a dict-style get)"""
+        symbol_config = config.get("symbol_config", {}) or {}
+        sl_systems = config.get("sl_systems", {}) or {}
+        reductions = config.get("symbol_sl_reductions", {}) or {}
+        risk_tiers = config.get("risk_by_account_tier", {}) or {}
+        fixed_lots = config.get("fixed_lot_sizes", {}) or {}
+
+        # sl_systems is stored system -> symbol -> tier; flip it to symbol -> (system, tier)
+        sl_pips: Dict[str, Dict[Tuple[str, str], float]] = {}
+        risk_dollars: Dict[str, Dict[Tuple[str, str], float]] = {}
+        for system, system_info in sl_systems.items():
+            for symbol, tiers in (system_info.get("symbols") or {}).items():
+                for tier, sl_data in tiers.items():
+                    if "sl_pips" in sl_data:
+                        sl_pips.setdefault(symbol, {})[(system, tier)] = sl_data["sl_pips"]
+                    if "risk_dollars" in sl_data:
+                        risk_dollars.setdefault(symbol, {})[(system, tier)] = sl_data["risk_dollars"]
+
+        specs = {}
+        for symbol, info in symbol_config.items():
+            pip_size = info.get("pip_size")
+            pip_value_std = info.get("pip_value_per_std_lot")
+            if pip_size is None or pip_value_std is None:
+                continue
+            volatility = info.get("volatility")
+
+            fallback_sl, fallback_risk = {}, {}
+            for tier, by_volatility in risk_tiers.items():
+                risk_cap = (by_volatility.get(volatility) or {}).get("risk_dollars")
+                if risk_cap is None:
+                    continue
+                fallback_risk[tier] = risk_cap
+                pip_value = pip_value_std * fixed_lots.get(tier, DEFAULT_FALLBACK_LOT)
+                if pip_value:
+                    fallback_sl[tier] = risk_cap / pip_value
+
+            reduction = reductions.get(symbol)
+            specs[symbol] = SymbolSpec(
+                symbol=symbol,
+                pip_size=pip_size,
+                pip_value_per_std_lot=pip_value_std,
+                contract_size=info.get("contract_size"),
+                volatility=volatility,
+                sl_pips=_freeze(sl_pips.get(symbol, {})),
+                risk_dollars=_freeze(risk_dollars.get(symbol, {})),
+                reduction_percent=reduction,
+                fallback_sl_pips=_freeze(fallback_sl),
+                fallback_risk_dollars=_freeze(fallback_risk)
+            )
+
+        logic_sl, logic_lot = {}, {}
+        timeframe_config = config.get("timeframe_specific_config", {}) or {}
+        if timeframe_config.get("enabled", False):
+            for logic, logic_config in timeframe_config.items():
+                if isinstance(logic_config, dict) and logic_config:
+                    logic_sl[logic] = logic_config.get("sl_multiplier", 1.0)
+                    logic_lot[logic] = logic_config.get("lot_multiplier", 1.0)
+
+        return cls(specs, config.get("sl_system_enabled", True), config.get("active_sl_system", "sl-1"),
+                   logic_sl, logic_lot)
+
+    def __getitem__(self, symbol: str) -> SymbolSpec:
+        return self.specs[symbol]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.specs
+
+    def get(self, symbol: str) -> Optional[SymbolSpec]:
+        return self.specs.get(symbol)
+
+    def pip_size(self, symbol: str, default: Optional[float] = None) -> Optional[float]:
+        spec = self.specs.get(symbol)
+        return spec.pip_size if spec is not None else default
+
+
+def specs_for(config) -> SymbolSpecTable:
+    """
+    The compiled table for a config
+
+    Config instances cache theirs; other config-like objects (test doubles,
+    plain dicts) get a table compiled on the spot so edits are always seen.
+    """
+    from src.config import Config
+    if isinstance(config, Config):
+        return config.symbol_specs
+    return SymbolSpecTable.from_config(config)
@@ -1,6 +1,4 @@
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 import logging
 
 class TrendAnalyzer:
@@ -17,59 +15,76 @@ class TrendAnalyzer:
         """
         Determines the current trend for a symbol.
         Returns: 'BULLISH', 'BEARISH', or 'NEUTRAL'
+        
+        Read from the MT5 client's candle store, where the score is kept
+        up to date at every bar close; history is backfilled on first use.
         """
         try:
-            # Get last 20 candles
+            store = vars(self.mt5_client).get("candle_store") if self.mt5_client is not None else None
+            if store is not None:
+                trend = store.get_trend(symbol, timeframe)
+                if trend is None and self.mt5_client.backfill_candles(symbol, timeframe):
+                    trend = store.get_trend(symbol, timeframe)
+                if trend is None:
+                    self.logger.warning(f"TrendAnalyzer: Not enough candles for {symbol} {timeframe}")
+                    return "NEUTRAL"
+                return trend
+            
+            # Clients without a candle store: score the last 20 candles directly
             candles = self.mt5_client.get_candles(symbol, timeframe, 20)
             if not candles:
                 self.logger.warning(f"TrendAnalyzer: No candles found for {symbol}")
                 return "NEUTRAL"
             
-            # Convert to DataFrame for easier analysis
-            df = pd.DataFrame(candles)
-            
-            # 1. Price Momentum Check (Last 3 candles)
-            close = df['close'].values
-            momentum_bullish = close[-1] > close [-2]
-            momentum_bearish = close[-1] < close [-2]
-            
-            # 2. Moving Average Check (Simple SMA 7 vs SMA 14)
-            sma_7 = np.mean(close[-7:])
-            sma_14 = np.mean(close[-14:])
-            
-            ma_bullish = sma_7 > sma_14
-            ma_bearish = sma_7 < sma_14
-            
-            # 3. Simple High/Low Check (Price Action)
-            # Recent high higher than previous high?
-            highs = df['high'].values
-            lows = df['low'].values
-            
-            hh_bullish = highs[-1] >= np.max(highs[-5:-1])
-            ll_bearish = lows[-1] <= np.min(lows[-5:-1])
-            
-            # SCORING SYSTEM
-            score = 0
-            if ma_bullish: score += 1
-            if momentum_bullish: score += 1
-            if hh_bullish: score += 1
-            
-            if ma_bearish: score -= 1
-            if momentum_bearish: score -= 1
-            if ll_bearish: score -= 1
-            
-            # Determine Trend
-            if score >= 2:
-                return "BULLISH"
-            elif score <= -2:
-                return "BEARISH"
-            else:
-                return "NEUTRAL"
+            return self.score_candles(candles)
                 
         except Exception as e:
             self.logger.error(f"Error in TrendAnalyzer.get_current_trend: {e}")
             return "NEUTRAL"
 
+    def score_candles(self, candles):
+        """
+        Scores a list of {open, high, low, close} candles (oldest first).
+        Same rules the candle store applies incrementally.
+        """
+        close = np.array([c['close'] for c in candles], dtype=float)
+        highs = np.array([c['high'] for c in candles], dtype=float)
+        lows = np.array([c['low'] for c in candles], dtype=float)
+        
+        # 1. Price Momentum Check
+        momentum_bullish = close[-1] > close[-2]
+        momentum_bearish = close[-1] < close[-2]
+        
+        # 2. Moving Average Check (Simple SMA 7 vs SMA 14)
+        sma_7 = np.mean(close[-7:])
+        sma_14 = np.mean(close[-14:])
+        
+        ma_bullish = sma_7 > sma_14
+        ma_bearish = sma_7 < sma_14
+        
+        # 3. Simple High/Low Check (Price Action)
+        # Recent high higher than previous high?
+        hh_bullish = highs[-1] >= np.max(highs[-5:-1])
+        ll_bearish = lows[-1] <= np.min(lows[-5:-1])
+        
+        # SCORING SYSTEM
+        score = 0
+        if ma_bullish: score += 1
+        if momentum_bullish: score += 1
+        if hh_bullish: score += 1
+        
+        if ma_bearish: score -= 1
+        if momentum_bearish: score -= 1
+        if ll_bearish: score -= 1
+        
+        # Determine Trend
+        if score >= 2:
+            return "BULLISH"
+        elif score <= -2:
+            return "BEARISH"
+        else:
+            return "NEUTRAL"
+
     def is_aligned(self, trade_direction, trend):
         """
         Checks if trade direction matches the detected trend.
@@ -0,0 +1,505 @@
+"""
+Replay Benchmark - End-to-end throughput of TradingEngine.process_alert
+
+Replays recorded or synthetic TradingView payloads (legacy Alert and
+ZepixV3Alert types, mixed symbols) through a fully wired TradingEngine whose
+MT5Client runs on the in-process broker simulator, then reports:
+
+- alerts/sec for the whole replay
+- per-alert latency percentiles, plus the latency tracer's stage timings
+  (total:entry_v3 is the alert->order path)
+- run_monitor_cycle() time with N open trades
+- memory growth over a replay (tracemalloc, measured on a separate pass so
+  tracing overhead does not skew throughput)
+
+Results are written as JSON; a saved baseline can be compared against a new
+run so regressions show up as a non-zero exit code. Baselines are machine
+specific and not committed: run --save-baseline once before --compare.
+
+The engine runs inside a temporary working directory holding a copy of
+config/, so the database, trend files and logs of the real bot are untouched.
+
+Usage:
+    python tests/benchmarks/replay_benchmark.py --alerts 500 --open-trades 200
+    python tests/benchmarks/replay_benchmark.py --payloads recorded.jsonl
+    python tests/benchmarks/replay_benchmark.py --save-baseline
+    python tests/benchmarks/replay_benchmark.py --compare --fail-on-regression
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import gc
+import io
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.clients.mt5_simulator import DEFAULT_PRICES
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "replay_baseline.json")
+
+BENCH_SYMBOLS = ["XAUUSD", "EURUSD", "GBPUSD", "USDJPY", "AUDUSD", "USDCAD"]
+V3_ENTRY_SIGNALS = ["Institutional_Launchpad", "Momentum_Breakout", "Mitigation_Test", "Sideways_Breakout"]
+
+# Share of each payload kind in a synthetic replay
+DEFAULT_MIX = {
+    "entry_v3": 0.35,
+    "trend_pulse_v3": 0.10,
+    "squeeze_v3": 0.05,
+    "bias": 0.10,
+    "trend": 0.20,
+    "entry": 0.20
+}
+
+# Metric -> which direction is better; compared against the baseline with a relative tolerance
+REGRESSION_METRICS = {
+    "alerts_per_sec": "higher",
+    "alert_latency_ms.p50": "lower",
+    "alert_latency_ms.p95": "lower",
+    "alert_to_order_ms.p95": "lower",
+    "monitor_cycle_ms.p50": "lower",
+    "memory_growth_kb": "lower"
+}
+
+
+# ==================== PAYLOADS ====================
+
+def synthetic_payloads(count: int, symbols: Optional[List[str]] = None, seed: int = 42,
+                       mix: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """Deterministic mix of legacy and v3 payloads priced off the simulator's quotes"""
+    rng = random.Random(seed)
+    symbols = symbols or BENCH_SYMBOLS
+    mix = mix or DEFAULT_MIX
+    kinds, weights = list(mix.keys()), list(mix.values())
+    payloads = []
+
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        symbol = rng.choice(symbols)
+        price = DEFAULT_PRICES.get(symbol, 1.0)
+        buy = rng.random() < 0.5
+
+        if kind == "entry_v3":
+            distance = price * 0.004
+            sign = 1 if buy else -1
+            payloads.append({
+                "type": "entry_v3",
+                "signal_type": rng.choice(V3_ENTRY_SIGNALS),
+                "symbol": symbol,
+                "direction": "buy" if buy else "sell",
+                "tf": rng.choice(["5", "15", "60"]),
+                "price": price,
+                "consensus_score": rng.randint(3, 6),
+                "sl_price": round(price - sign * distance, 5),
+                "tp1_price": round(price + sign * distance, 5),
+                "tp2_price": round(price + sign * distance * 2, 5),
+                "mtf_trends": ",".join(rng.choice(["1", "-1"]) for _ in range(6)),
+                "position_multiplier": 1.0
+            })
+        elif kind in ("trend_pulse_v3", "squeeze_v3"):
+            payloads.append({
+                "type": kind,
+                "signal_type": "Trend_Pulse" if kind == "trend_pulse_v3" else "Volatility_Squeeze",
+                "symbol": symbol,
+                "direction": "neutral",
+                "tf": "15",
+                "price": price,
+                "consensus_score": 5,
+                "current_trends": "1,1,1,-1",
+                "previous_trends": "1,1,-1,-1",
+                "changed_timeframes": "1H"
+            })
+        elif kind == "entry":
+            payloads.append({
+                "type": "entry",
+                "symbol": symbol,
+                "signal": "buy" if buy else "sell",
+                "tf": rng.choice(["5m", "15m", "1h"]),
+                "price": price
+            })
+        else:
+            payloads.append({
+                "type": kind,
+                "symbol": symbol,
+                "signal": "bull" if buy else "bear",
+                "tf": "1d" if kind == "bias" else rng.choice(["15m", "1h"])
+            })
+    return payloads
+
+
+def load_payloads(path: str) -> List[Dict[str, Any]]:
+    """Recorded payloads, one JSON object per line (or a JSON list)"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+# ==================== ENGINE UNDER TEST ====================
+
+class _BenchTelegramBot:
+    """Counts notifications; every other TelegramBot method is a no-op"""
+
+    def __init__(self):
+        self.messages_sent = 0
+
+    def send_message(self, *args, **kwargs):
+        self.messages_sent += 1
+        return True
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+@contextlib.contextmanager
+def isolated_workdir():
+    """Temporary cwd with a copy of config/ so the engine's files stay out of the repo"""
+    previous = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="zepix_bench_")
+    shutil.copytree(os.path.join(project_root, "config"), os.path.join(workdir, "config"))
+    os.chdir(workdir)
+    try:
+        yield workdir
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool = True):
+    """Silence the bot's print/logging output so it does not dominate the timings"""
+    if not enabled:
+        yield
+        return
+    from src.utils.optimized_logger import logging_config
+    saved = (logging_config.enable_console_logs, logging_config.enable_file_logs)
+    logging_config.enable_console_logs = False
+    logging_config.enable_file_logs = False
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+        logging_config.enable_console_logs, logging_config.enable_file_logs = saved
+
+
+def build_engine(overrides: Optional[Dict[str, Any]] = None):
+    """TradingEngine wired to the MT5 simulator; call inside isolated_workdir()"""
+    from src.config import Config
+    from src.clients.mt5_client import MT5Client
+    from src.core.trading_engine import TradingEngine
+    from src.managers.risk_manager import RiskManager
+    from src.managers.session_manager import SessionManager
+    from src.managers.timeframe_trend_manager import TimeframeTrendManager
+    from src.processors.alert_processor import AlertProcessor
+
+    config = Config()
+    config.config["simulate_orders"] = False
+    config.config["mt5_backend"] = "simulator"
+    config.config["mt5_simulator"] = {"latency_ms": {}}
+    config.config["latency_tracing"] = {"enabled": True, "http_enabled": False, "slow_alert_ms": 1e9}
+    config.config.update(overrides or {})
+
+    bot = _BenchTelegramBot()
+    mt5_client = MT5Client(config)
+    risk_manager = RiskManager(config)
+    alert_processor = AlertProcessor(config, telegram_bot=bot)
+    # TimeframeTrendManager resolves relative paths against the project root - keep it in the workdir
+    trends_file = os.path.abspath(os.path.join("config", "timeframe_trends.json"))
+    with mock.patch("src.core.trading_engine.TimeframeTrendManager",
+                    functools.partial(TimeframeTrendManager, config_file=trends_file)):
+        engine = TradingEngine(config, risk_manager, mt5_client, bot, alert_processor)
+    # The engine reads telegram_bot.session_manager, which the stub cannot provide
+    engine.session_manager = bot.session_manager = SessionManager(config, engine.db, mt5_client)
+    return engine
+
+
+async def _shutdown_engine(engine):
+    for component in (engine.alert_pipeline, engine.price_monitor, engine.price_trigger_engine,
+                      engine.loop_watchdog):
+        if component is not None:
+            with contextlib.suppress(Exception):
+                await component.stop()
+    with contextlib.suppress(Exception):
+        await engine.mt5_client.stop_tick_refresher()
+    # Flush trend/database/config writers before the scratch directory is removed
+    for closeable in (engine.trend_manager, engine.db, engine.config):
+        with contextlib.suppress(Exception):
+            closeable.close()
+
+
+def seed_open_trades(engine, count: int, symbols: Optional[List[str]] = None):
+    """Open `count` positions on the simulator with SL/TP far from price and register them"""
+    from src.models import TradeRecord
+
+    symbols = symbols or BENCH_SYMBOLS
+    for i in range(count):
+        symbol = symbols[i % len(symbols)]
+        price = engine.mt5_client.get_current_price(symbol) or DEFAULT_PRICES.get(symbol, 1.0)
+        direction = "buy" if i % 2 == 0 else "sell"
+        sign = 1 if direction == "buy" else -1
+        sl = round(price - sign * price * 0.2, 5)
+        tp = round(price + sign * price * 0.2, 5)
+        ticket = engine.mt5_client.place_order(symbol, direction, 0.01, price, sl, tp, comment="bench")
+        engine.open_trades.append(TradeRecord(
+            symbol=symbol, entry=price, sl=sl, tp=tp, lot_size=0.01,
+            direction=direction, strategy="combinedlogic-1", trade_id=ticket,
+            open_time=datetime.now().isoformat()
+        ))
+
+
+# ==================== MEASUREMENT ====================
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    values = np.asarray(samples, dtype=float)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": int(values.size),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(values.max()), 3)
+    }
+
+
+async def _replay(engine, payloads: List[Dict[str, Any]]):
+    latencies: List[float] = []
+
+    async def one(payload):
+        start = time.perf_counter()
+        try:
+            accepted = await engine.process_alert(dict(payload))
+        except Exception:
+            accepted = False
+        latencies.append((time.perf_counter() - start) * 1000.0)
+        return bool(accepted)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(payload) for payload in payloads))
+    return time.perf_counter() - start, latencies, sum(results)
+
+
+async def _run(payloads: List[Dict[str, Any]], open_trades: int, monitor_cycles: int,
+               measure_memory: bool, overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    engine = build_engine(overrides)
+    if not await engine.initialize():
+        raise RuntimeError("TradingEngine failed to initialize against the simulator")
+    try:
+        engine.latency_tracer.reset()
+        elapsed, latencies, accepted = await _replay(engine, payloads)
+        stages = engine.latency_tracer.get_stats()["stages"]
+
+        memory_growth_kb = None
+        if measure_memory:
+            # Second pass under tracemalloc: retained allocations per replay
+            gc.collect()
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            await _replay(engine, payloads)
+            gc.collect()
+            memory_growth_kb = round((tracemalloc.get_traced_memory()[0] - before) / 1024.0, 1)
+            tracemalloc.stop()
+
+        # Monitor cycle with exactly `open_trades` positions
+        for trade in list(engine.open_trades):
+            engine.open_trades.discard(trade)
+        seed_open_trades(engine, open_trades)
+        cycle_times = []
+        for _ in range(monitor_cycles):
+            start = time.perf_counter()
+            await engine.run_monitor_cycle()
+            cycle_times.append((time.perf_counter() - start) * 1000.0)
+
+        def stage(name):
+            data = stages.get(name)
+            if not data:
+                return {"count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+            return {"count": data["count"], "p50": data["p50_ms"], "p95": data["p95_ms"],
+                    "p99": data["p99_ms"], "max": data["max_ms"]}
+
+        return {
+            "alerts": len(payloads),
+            "accepted": accepted,
+            "elapsed_sec": round(elapsed, 4),
+            "alerts_per_sec": round(len(payloads) / elapsed, 1) if elapsed > 0 else 0.0,
+            "alert_latency_ms": _percentiles(latencies),
+            "alert_to_order_ms": stage("total:entry_v3"),
+            "order_send_ms": stage("order_send"),
+            "stages_p95_ms": {name: data["p95_ms"] for name, data in sorted(stages.items())},
+            "monitor_cycle_ms": dict(_percentiles(cycle_times), open_trades=len(engine.open_trades)),
+            "memory_growth_kb": memory_growth_kb,
+            "memory_growth_bytes_per_alert": (
+                round(memory_growth_kb * 1024.0 / len(payloads), 1)
+                if memory_growth_kb is not None and payloads else None
+            )
+        }
+    finally:
+        await _shutdown_engine(engine)
+
+
+def run_benchmark(payloads: List[Dict[str, Any]], open_trades: int = 200, monitor_cycles: int = 20,
+                  measure_memory: bool = True, silent: bool = True,
+                  overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Replay the payloads through a fresh engine and return the result document"""
+    with isolated_workdir(), quiet(silent):
+        metrics = asyncio.run(_run(payloads, open_trades, monitor_cycles, measure_memory, overrides))
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "open_trades": open_trades,
+            "monitor_cycles": monitor_cycles
+        },
+        "metrics": metrics
+    }
+
+
+# ==================== BASELINES ====================
+
+def _metric(metrics: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = metrics
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value if isinstance(value, (int, float)) else None
+
+
+def save_baseline(result: Dict[str, Any], path: str = DEFAULT_BASELINE):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+
+def load_baseline(path: str = DEFAULT_BASELINE) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_to_baseline(result: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    Compare the tracked metrics; returns one row per metric with a
+    `regression` flag when it is worse than baseline by more than `tolerance`
+    (relative). Metrics missing on either side are skipped.
+    """
+    rows = []
+    for path, better in REGRESSION_METRICS.items():
+        current = _metric(result["metrics"], path)
+        previous = _metric(baseline["metrics"], path)
+        if current is None or previous is None:
+            continue
+        change = (current - previous) / previous if previous else 0.0
+        worse = -change if better == "higher" else change
+        rows.append({
+            "metric": path,
+            "baseline": previous,
+            "current": current,
+            "change_pct": round(change * 100.0, 1),
+            "regression": worse > tolerance
+        })
+    return rows
+
+
+def format_summary(result: Dict[str, Any], comparison: Optional[List[Dict[str, Any]]] = None) -> str:
+    m = result["metrics"]
+    latency, order, cycle = m["alert_latency_ms"], m["alert_to_order_ms"], m["monitor_cycle_ms"]
+    lines = [
+        "REPLAY BENCHMARK",
+        "=" * 60,
+        f"Alerts: {m['alerts']} ({m['accepted']} accepted) in {m['elapsed_sec']:.3f}s "
+        f"-> {m['alerts_per_sec']:.1f} alerts/sec",
+        f"Alert latency ms   p50 {latency['p50']:.2f}  p95 {latency['p95']:.2f}  "
+        f"p99 {latency['p99']:.2f}  max {latency['max']:.2f}",
+        f"Alert->order ms    p50 {order['p50']:.2f}  p95 {order['p95']:.2f}  "
+        f"p99 {order['p99']:.2f}  ({order['count']} entries)",
+        f"Monitor cycle ms   p50 {cycle['p50']:.2f}  p95 {cycle['p95']:.2f}  "
+        f"@ {cycle['open_trades']} open trades",
+    ]
+    if m["memory_growth_kb"] is not None:
+        lines.append(f"Memory growth      {m['memory_growth_kb']:.1f} KB "
+                     f"({m['memory_growth_bytes_per_alert']:.0f} B/alert)")
+    if comparison:
+        lines.append("-" * 60)
+        for row in comparison:
+            flag = "REGRESSION" if row["regression"] else "ok"
+            lines.append(f"{row['metric']:<24} {row['baseline']:>10} -> {row['current']:>10} "
+                         f"({row['change_pct']:+.1f}%) {flag}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay TradingView payloads through TradingEngine")
+    parser.add_argument("--alerts", type=int, default=500, help="Synthetic payload count")
+    parser.add_argument("--payloads", help="Recorded payloads (JSONL or JSON list) instead of synthetic ones")
+    parser.add_argument("--symbols", help="Comma separated symbols for synthetic payloads")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--open-trades", type=int, default=200, help="Open trades during the monitor cycle test")
+    parser.add_argument("--monitor-cycles", type=int, default=20)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", help="Write the result JSON here")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.compare and not os.path.exists(args.compare):
+        print(f"No baseline at {args.compare} - run with --save-baseline first", file=sys.stderr)
+        return 2
+
+    if args.payloads:
+        payloads = load_payloads(args.payloads)
+    else:
+        symbols = args.symbols.split(",") if args.symbols else None
+        payloads = synthetic_payloads(args.alerts, symbols=symbols, seed=args.seed)
+
+    result = run_benchmark(payloads, open_trades=args.open_trades, monitor_cycles=args.monitor_cycles,
+                           measure_memory=not args.no_memory)
+
+    comparison = None
+    if args.compare:
+        comparison = compare_to_baseline(result, load_baseline(args.compare), args.tolerance)
+        result["comparison"] = comparison
+
+    print(format_summary(result, comparison))
+
+    if args.output:
+        save_baseline(result, args.output)
+    if args.save_baseline:
+        save_baseline(result, args.save_baseline)
+        print(f"Baseline saved: {args.save_baseline}")
+
+    if args.fail_on_regression and comparison and any(row["regression"] for row in comparison):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
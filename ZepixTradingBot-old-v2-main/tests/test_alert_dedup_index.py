@@ -0,0 +1,84 @@
+"""
+Unit Tests for the AlertProcessor duplicate-alert index
+Tests keyed lookups, per-type windows, TTL expiry and hit/miss counters.
+
+Run tests with:
+    pytest tests/test_alert_dedup_index.py -v
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models import Alert
+from src.processors.alert_processor import AlertProcessor
+
+
+def _alert(signal="buy", symbol="EURUSD", tf="15m", alert_type="entry", at=None):
+    raw = {"timestamp": at.isoformat()} if at else None
+    return Alert(type=alert_type, symbol=symbol, signal=signal, tf=tf, raw_data=raw)
+
+
+@pytest.fixture
+def processor():
+    return AlertProcessor({"alert_dedup": {"default_window_seconds": 300,
+                                           "windows": {"reversal": 60}}})
+
+
+def test_stored_entry_is_duplicate_inside_window(processor):
+    now = datetime.now()
+    processor.store_entry_alert(_alert(at=now))
+
+    assert processor.is_duplicate_alert(_alert(at=now + timedelta(minutes=2)))
+    assert not processor.is_duplicate_alert(_alert(signal="sell", at=now))
+    assert not processor.is_duplicate_alert(_alert(symbol="GBPUSD", at=now))
+    assert not processor.is_duplicate_alert(_alert(at=now + timedelta(minutes=6)))
+
+    stats = processor.get_dedup_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["size"] == 1
+
+
+def test_expired_entries_are_evicted(processor):
+    processor.store_entry_alert(_alert(at=datetime.now() - timedelta(minutes=10)))
+    processor.store_entry_alert(_alert(signal="sell", at=datetime.now()))
+
+    processor.clean_old_alerts()
+    assert [a.signal for a in processor.recent_alerts] == ["sell"]
+    assert processor.get_dedup_stats()["expired"] == 1
+
+
+def test_per_type_window(processor):
+    now = datetime.now()
+    processor._remember_alert(_alert(alert_type="reversal", signal="reversal_bull", at=now))
+
+    later = _alert(alert_type="reversal", signal="reversal_bull", at=now + timedelta(seconds=90))
+    assert not processor.is_duplicate_alert(later)
+    assert processor._dedup_window("entry") == 300
+
+
+def test_restore_refreshes_key_without_early_expiry(processor):
+    old = datetime.now() - timedelta(minutes=4, seconds=59)
+    processor.store_entry_alert(_alert(at=old))
+    processor.store_entry_alert(_alert(at=datetime.now()))
+
+    # The first heap record is superseded - popping it must not drop the key
+    processor._expire_dedup(old.timestamp() + 301)
+    assert processor.is_duplicate_alert(_alert(at=datetime.now()))
+
+
+def test_get_recent_alerts_filters(processor):
+    now = datetime.now()
+    processor.store_entry_alert(_alert(symbol="EURUSD", at=now))
+    processor.store_entry_alert(_alert(symbol="XAUUSD", tf="1h", at=now))
+
+    assert len(processor.get_recent_alerts(alert_type="entry")) == 2
+    assert [a.symbol for a in processor.get_recent_alerts(tf="1h")] == ["XAUUSD"]
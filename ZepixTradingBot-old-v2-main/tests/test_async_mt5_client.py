@@ -0,0 +1,221 @@
+"""
+Unit Tests for AsyncMT5Client
+Tests single-worker execution, timeouts, queue depth and latency stats.
+
+Run tests with:
+    pytest tests/test_async_mt5_client.py -v
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.clients.async_mt5_client import AsyncMT5Client, MT5CallTimeout
+from src.clients.mt5_client import MT5Client
+from src.config import Config
+
+
+class SlowTerminalClient:
+    """Stands in for MT5Client - records which thread each call ran on"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.threads = []
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _enter(self, name):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        self.threads.append(threading.get_ident())
+        self.calls.append(name)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+
+    def place_order(self, symbol, order_type, lot_size, price, sl, tp=None, comment=""):
+        self._enter("place_order")
+        return 123456
+
+    def close_position(self, position_id, percentage=100):
+        self._enter("close_position")
+        return True
+
+    def get_position(self, ticket):
+        self._enter("get_position")
+        return None
+
+    def get_positions(self, symbol=None):
+        self._enter("get_positions")
+        return [{"ticket": 1, "symbol": symbol}]
+
+    def get_history_deals(self, date_from=None, date_to=None, position=None):
+        self._enter("get_history_deals")
+        return [{"position_id": position, "profit": 5.0}]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestAsyncMT5Client:
+    """Test suite for the AsyncMT5Client facade"""
+
+    def test_calls_run_off_the_event_loop_on_one_thread(self):
+        client = SlowTerminalClient()
+        facade = AsyncMT5Client(client)
+
+        async def scenario():
+            await asyncio.gather(
+                facade.place_order("EURUSD", "buy", 0.1, 1.1, 1.09, 1.12),
+                facade.close_position(42),
+                facade.positions_get("EURUSD"),
+                facade.history_deals_get(position=42),
+            )
+
+        run(scenario())
+        facade.shutdown(wait=True)
+
+        assert len(set(client.threads)) == 1
+        assert client.threads[0] != threading.get_ident()
+        assert client.max_active == 1
+
+    def test_results_are_returned(self):
+        facade = AsyncMT5Client(SlowTerminalClient())
+
+        async def scenario():
+            ticket = await facade.place_order("EURUSD", "buy", 0.1, 1.1, 1.09)
+            closed = await facade.close_position(ticket)
+            deals = await facade.history_deals_get(position=ticket)
+            return ticket, closed, deals
+
+        ticket, closed, deals = run(scenario())
+        facade.shutdown()
+        assert ticket == 123456
+        assert closed is True
+        assert deals == [{"position_id": 123456, "profit": 5.0}]
+
+    def test_event_loop_stays_responsive_during_slow_call(self):
+        """Other coroutines keep running while the terminal is busy"""
+        facade = AsyncMT5Client(SlowTerminalClient(delay=0.2))
+        ticks = []
+
+        async def heartbeat():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.02)
+
+        async def scenario():
+            await asyncio.gather(facade.get_position(1), heartbeat())
+
+        run(scenario())
+        facade.shutdown(wait=True)
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.2
+
+    def test_timeout_raises_and_drops_queued_calls(self):
+        client = SlowTerminalClient(delay=0.2)
+        facade = AsyncMT5Client(client)
+
+        async def scenario():
+            first = asyncio.ensure_future(facade.get_position(1, timeout=1.0))
+            await asyncio.sleep(0.01)
+            with pytest.raises(MT5CallTimeout):
+                await facade.place_order("EURUSD", "buy", 0.1, 1.1, 1.09, timeout=0.05)
+            await first
+
+        run(scenario())
+        facade.shutdown(wait=True)
+
+        stats = facade.get_stats()
+        assert stats["stats"]["timeouts"] == 1
+        assert stats["stats"]["dropped"] == 1
+        assert stats["queue_depth"] == 0
+        assert "place_order" not in client.calls  # Never reached the terminal
+
+    def test_started_order_is_awaited_past_timeout(self):
+        """An order already sent to the terminal is never abandoned"""
+        client = SlowTerminalClient(delay=0.2)
+        facade = AsyncMT5Client(client)
+
+        ticket = run(facade.place_order("EURUSD", "buy", 0.1, 1.1, 1.09, timeout=0.05))
+        facade.shutdown(wait=True)
+
+        stats = facade.get_stats()["stats"]
+        assert ticket == 123456
+        assert stats["overran"] == 1 and stats["timeouts"] == 0
+
+    def test_sync_mt5_client_calls_share_the_worker(self):
+        """Direct MT5Client calls and facade calls reach the terminal on one thread"""
+        config = Config()
+        config.config["simulate_orders"] = False
+        config.config["mt5_backend"] = "simulator"
+        config.config["tick_cache"] = {"enabled": False}
+        client = MT5Client(config)
+        terminal_threads = set()
+        for name in ("initialize", "order_send", "positions_get", "symbol_info_tick", "account_info"):
+            method = getattr(client.mt5, name)
+
+            def traced(*args, _method=method, **kwargs):
+                terminal_threads.add(threading.get_ident())
+                return _method(*args, **kwargs)
+            setattr(client.mt5, name, traced)
+
+        assert client.initialize() is True
+        ticket = client.place_order("EURUSD", "buy", 0.1, 1.0850, sl=1.0800)
+        assert client.get_current_price("EURUSD") is not None
+        facade = AsyncMT5Client.for_client(client)
+        assert run(facade.get_position(ticket))["ticket"] == ticket
+        assert client.get_account_balance() > 0
+        assert run(client.check_connection_health()) is True
+        client.shutdown()
+
+        assert terminal_threads == {facade.worker_thread_id}
+        assert threading.get_ident() not in terminal_threads
+        assert client.get_positions()                        # Inline once the worker is stopped
+
+    def test_stats_report_queue_depth_and_latency(self):
+        facade = AsyncMT5Client(SlowTerminalClient(delay=0.01))
+
+        async def scenario():
+            await asyncio.gather(*(facade.get_position(i) for i in range(5)))
+
+        run(scenario())
+        facade.shutdown(wait=True)
+
+        stats = facade.get_stats()
+        assert stats["stats"]["calls"] == 5
+        assert stats["stats"]["completed"] == 5
+        assert stats["max_queue_depth"] >= 2
+        assert stats["methods"]["get_position"]["count"] == 5
+        assert stats["methods"]["get_position"]["avg_ms"] >= 5
+        assert stats["methods"]["get_position"]["max_wait_ms"] > 0
+
+    def test_errors_propagate(self):
+        class Broken(SlowTerminalClient):
+            def get_position(self, ticket):
+                raise RuntimeError("terminal disconnected")
+
+        facade = AsyncMT5Client(Broken())
+        with pytest.raises(RuntimeError):
+            run(facade.get_position(1))
+        facade.shutdown()
+        assert facade.get_stats()["stats"]["errors"] == 1
+
+    def test_for_client_shares_one_facade(self):
+        client = SlowTerminalClient()
+        first = AsyncMT5Client.for_client(client)
+        assert AsyncMT5Client.for_client(client) is first
+        first.shutdown()
@@ -0,0 +1,135 @@
+"""
+Unit Tests for the vectorized ZEPIX backtest engine
+Checks the NumPy indicators against plain loops, the order block logic
+against the bar-by-bar PineScriptEngine, and that the generated payloads are
+valid webhook alerts.
+
+Run tests with:
+    pytest tests/test_backtest_engine.py -v
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.backtest import indicators as ta
+from src.backtest.zepix_engine import ZepixSignalEngine
+from src.v3_alert_models import ZepixV3Alert
+from tests.pine_logic_engine import OrderBlock, PineScriptEngine
+
+
+def random_walk(n=6000, seed=11, bar_minutes=5):
+    rng = np.random.default_rng(seed)
+    close = 2000 + np.cumsum(rng.normal(0, 1.0, n))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    high = np.maximum(open_, close) + rng.random(n)
+    low = np.minimum(open_, close) - rng.random(n)
+    start = 1_700_000_000 // 86400 * 86400
+    return {
+        "time": start + np.arange(n) * bar_minutes * 60,
+        "open": open_, "high": high, "low": low, "close": close,
+        "volume": rng.integers(50, 500, n).astype(float),
+    }
+
+
+def test_moving_averages_match_pine_recurrences():
+    values = random_walk(300)["close"]
+
+    expected_ema = np.full(300, np.nan)
+    expected_rma = np.full(300, np.nan)
+    expected_ema[19] = expected_rma[19] = values[:20].mean()
+    for i in range(20, 300):
+        expected_ema[i] = values[i] * (2 / 21) + expected_ema[i - 1] * (1 - 2 / 21)
+        expected_rma[i] = values[i] / 20 + expected_rma[i - 1] * (1 - 1 / 20)
+
+    np.testing.assert_allclose(ta.ema(values, 20), expected_ema)
+    np.testing.assert_allclose(ta.rma(values, 20), expected_rma)
+    np.testing.assert_allclose(ta.sma(values, 5)[4:], [values[i - 4:i + 1].mean() for i in range(4, 300)])
+    assert np.isnan(ta.sma(values, 5)[:4]).all()
+
+
+def test_state_helpers():
+    up = np.array([0, 1, 0, 0, 0, 1, 0], dtype=bool)
+    down = np.array([0, 0, 0, 1, 0, 1, 0], dtype=bool)
+    assert ta.latch(up, down).tolist() == [0, 1, 1, -1, -1, -1, -1]      # Down wins on the same bar
+
+    cond = np.array([1, 0, 0, 0, 0, 0], dtype=bool)
+    assert ta.any_in_last(cond, 1, 3).tolist() == [False, True, True, True, False, False]
+
+    highs = np.array([1, 2, 5, 2, 1, 3, 3], dtype=float)
+    pivots = ta.pivot_high(highs, 2, 2)
+    assert pivots[4] == 5 and np.isnan(np.delete(pivots, 4)).all()      # Reported on the confirmation bar
+
+
+def test_order_blocks_match_bar_by_bar_reference():
+    data = random_walk(4000)
+    engine = ZepixSignalEngine({"ob_mitigation": "Wick", "zone_max_age": 10_000})
+    frame = engine.compute(data, tf_minutes=5)
+    assert frame["new_bull_ob"].sum() > 10 and frame["new_bear_ob"].sum() > 10
+
+    reference = PineScriptEngine()
+    for i in range(len(data["close"])):
+        if frame["new_bull_ob"][i]:
+            top, btm = frame["bull_ob_top"][i], frame["bull_ob_btm"][i]
+            reference.bullOBs.insert(0, OrderBlock(top, btm, (top + btm) / 2, i))
+        if frame["new_bear_ob"][i]:
+            top, btm = frame["bear_ob_top"][i], frame["bear_ob_btm"][i]
+            reference.bearOBs.insert(0, OrderBlock(top, btm, (top + btm) / 2, i))
+        reference.check_price_in_ob(data["high"][i], data["low"][i])
+        assert reference.priceInBullOB == frame["price_in_bull_ob"][i], i
+        assert reference.priceInBearOB == frame["price_in_bear_ob"][i], i
+        reference.check_mitigation(data["high"][i], data["low"][i], data["close"][i], data["open"][i], i)
+
+
+def test_payloads_are_valid_webhook_alerts(tmp_path):
+    engine = ZepixSignalEngine()
+    frame = engine.compute(random_walk(), tf_minutes=5)
+    payloads = engine.to_payloads(frame, "XAUUSD")
+
+    assert payloads
+    for payload in payloads:
+        ZepixV3Alert(**payload)
+        assert len(payload.get("mtf_trends", "0,0,0,0,0,0").split(",")) == 6
+    assert {p["type"] for p in payloads} >= {"entry_v3", "exit_v3", "trend_pulse_v3"}
+    assert all(p["tf"] == "5" for p in payloads)
+
+    path = tmp_path / "signals.jsonl"
+    engine.save_payloads(payloads, str(path))
+    with open(path) as f:
+        assert [json.loads(line) for line in f] == payloads
+
+
+def test_trades_never_overlap_and_exit_signals_match():
+    frame = ZepixSignalEngine().compute(random_walk(), tf_minutes=5)
+    trades = frame["trades"]
+
+    assert trades
+    for previous, trade in zip(trades, trades[1:]):
+        assert trade["entry_bar"] > previous["exit_bar"]
+    for trade in trades:
+        if trade["exit_reason"] == "signal":
+            key = "signal5_exit" if trade["direction"] == "buy" else "signal6_exit"
+            assert frame[key][trade["exit_bar"]]
+        if trade["direction"] == "buy":
+            assert trade["sl_price"] < trade["entry_price"] < trade["tp1_price"]
+    assert frame["signal5_exit"].sum() + frame["signal6_exit"].sum() == \
+        sum(t["exit_reason"] == "signal" for t in trades)
+
+
+def test_higher_timeframes_use_completed_bars_only():
+    data = random_walk(3000, bar_minutes=1)
+    frame = ZepixSignalEngine().compute(data, tf_minutes=1)
+    mtf = frame["mtf"]
+
+    # The 5m column may only change on the last 1m bar of a 5m bucket
+    changes = np.flatnonzero(mtf[1:, 1] != mtf[:-1, 1]) + 1
+    assert len(changes) > 0
+    assert ((data["time"][changes] // 60) % 5 == 4).all()
+    np.testing.assert_array_equal(mtf[:, 0], frame["zl_trend"])
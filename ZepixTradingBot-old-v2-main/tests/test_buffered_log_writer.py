@@ -0,0 +1,120 @@
+"""
+Unit Tests for the buffered log writer
+Tests batching, byte-counted rotation, overload drops and the CRITICAL
+flush guarantee of OptimizedLogger.
+
+Run tests with:
+    pytest tests/test_buffered_log_writer.py -v
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.utils.buffered_log_writer import BufferedLogWriter
+from src.utils.optimized_logger import OptimizedLogger
+
+
+def _settings(tmp_path, max_file_size=10 * 1024 * 1024, backup_count=3):
+    return SimpleNamespace(log_file=str(tmp_path / "logs" / "bot.log"),
+                           max_file_size=max_file_size, backup_count=backup_count)
+
+
+def _lines(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_lines_are_written_in_order_after_flush(tmp_path):
+    settings = _settings(tmp_path)
+    writer = BufferedLogWriter(settings, batch_size=64)
+    for i in range(1000):
+        writer.submit(f"line {i}")
+    assert writer.flush(5)
+
+    assert _lines(settings.log_file) == [f"line {i}" for i in range(1000)]
+    stats = writer.get_stats()
+    assert stats["written"] == 1000
+    assert stats["batches"] < 1000
+    writer.close()
+
+
+def test_rotation_uses_byte_counter_not_stat_per_line(tmp_path, monkeypatch):
+    settings = _settings(tmp_path, max_file_size=1000, backup_count=2)
+    stat_calls = []
+    real_getsize = os.path.getsize
+    monkeypatch.setattr(os.path, "getsize", lambda p: stat_calls.append(p) or real_getsize(p))
+
+    writer = BufferedLogWriter(settings, batch_size=10)
+    for i in range(300):
+        writer.submit(f"{i:04d} " + "x" * 45)
+    writer.flush(5)
+    writer.close()
+
+    stats = writer.get_stats()
+    assert stats["rotations"] >= 2
+    assert len(stat_calls) <= stats["rotations"] + 1      # One stat per open, not per line
+    assert os.path.exists(settings.log_file + ".1")
+    assert os.path.exists(settings.log_file + ".2")
+    assert not os.path.exists(settings.log_file + ".3")   # backup_count respected
+    assert _lines(settings.log_file)[-1].startswith("0299")
+
+
+def test_overload_drops_are_counted_but_urgent_lines_are_kept(tmp_path, monkeypatch):
+    settings = _settings(tmp_path)
+    writer = BufferedLogWriter(settings, max_queue=5)
+    monkeypatch.setattr(writer, "_ensure_thread", lambda: None)   # Writer stalled
+
+    accepted = [writer.submit(f"line {i}") for i in range(8)]
+    assert accepted == [True] * 5 + [False] * 3
+    assert writer.submit("CRITICAL line", urgent=True) is True
+    assert writer.get_stats()["dropped"] == 3
+
+    assert writer.flush(5)                                       # No thread - drained inline
+    assert _lines(settings.log_file) == [f"line {i}" for i in range(5)] + ["CRITICAL line"]
+    writer.close()
+
+
+def test_requested_rotation_happens_on_next_batch(tmp_path):
+    settings = _settings(tmp_path)
+    writer = BufferedLogWriter(settings)
+    writer.submit("before")
+    writer.flush(5)
+    writer.request_rotation()
+    writer.submit("after")
+    writer.flush(5)
+    writer.close()
+
+    assert _lines(settings.log_file + ".1") == ["before"]
+    assert _lines(settings.log_file) == ["after"]
+
+
+def test_critical_log_is_on_disk_when_call_returns(tmp_path, monkeypatch):
+    settings = _settings(tmp_path)
+    log = OptimizedLogger()
+    log.file_writer = BufferedLogWriter(settings, flush_interval=60)   # Writer would otherwise idle
+    monkeypatch.setattr("src.utils.optimized_logger.logging_config.enable_console_logs", False)
+    monkeypatch.setattr("src.utils.optimized_logger.logging_config.enable_file_logs", True)
+
+    log.info("routine")
+    log.critical("margin call")
+
+    lines = _lines(settings.log_file)
+    assert lines[-2].endswith("routine")
+    assert lines[-1].endswith("🚨 CRITICAL: margin call")
+    assert log.get_file_stats()["written"] == 2
+    log.file_writer.close()
+
+
+def test_write_to_file_defaults_to_non_urgent(tmp_path):
+    log = OptimizedLogger()
+    log.file_writer = BufferedLogWriter(_settings(tmp_path))
+    log._write_to_file("plain line")
+    assert log.flush(5)
+    assert log.get_file_stats()["written"] == 1
+    log.file_writer.close()
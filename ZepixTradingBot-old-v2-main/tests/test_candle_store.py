@@ -0,0 +1,133 @@
+"""
+Unit Tests for the local OHLCV candle store
+Checks tick aggregation across timeframes, that the incrementally maintained
+trend matches TrendAnalyzer's full recomputation, and the copy_rates_from_pos
+backfill path through MT5Client on the simulator backend.
+
+Run tests with:
+    pytest tests/test_candle_store.py -v
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config import Config
+from src.clients.mt5_client import MT5Client
+from src.services.candle_store import CandleStore, normalize_timeframe
+from src.utils.trend_analyzer import TrendAnalyzer
+
+START = 1_700_000_000 // 86400 * 86400
+
+
+def tick_stream(n=20000, seed=3, step=7.0):
+    rng = np.random.default_rng(seed)
+    prices = 2000 + np.cumsum(rng.normal(0, 0.5, n))
+    times = START + np.arange(n) * step + rng.random(n)
+    return times, prices
+
+
+@pytest.fixture
+def config():
+    config = Config()
+    config.config["simulate_orders"] = False
+    config.config["mt5_backend"] = "simulator"
+    config.config["symbol_mapping"] = {"XAUUSD": "GOLD"}
+    config.config["mt5_simulator"] = {"balance": 10000.0, "spread_pips": 0.0, "latency_ms": {}}
+    return config
+
+
+def test_timeframe_spellings():
+    assert normalize_timeframe("15") == normalize_timeframe("M15") == normalize_timeframe("15m") == "15m"
+    assert normalize_timeframe("240") == normalize_timeframe("H4") == "4h"
+    assert normalize_timeframe("D1") == "1d"
+    with pytest.raises(ValueError):
+        normalize_timeframe("7m")
+
+
+def test_ticks_aggregate_into_every_timeframe():
+    times, prices = tick_stream(5000)
+    store = CandleStore(timeframes=["1m", "5m", "1h"], capacity=1000)
+    for when, price in zip(times, prices):
+        store.on_tick("XAUUSD", price, when)
+    store.on_tick("XAUUSD", 1.0, START)           # Late tick for a closed bar is ignored
+
+    for tf, seconds in (("1m", 60), ("5m", 300), ("1h", 3600)):
+        candles = store.get_candles("XAUUSD", tf, 10)
+        assert len(candles) == 10
+        for candle in candles:
+            in_bar = (times >= candle["time"]) & (times < candle["time"] + seconds)
+            assert candle["open"] == prices[in_bar][0]
+            assert candle["high"] == prices[in_bar].max()
+            assert candle["low"] == prices[in_bar].min()
+            assert candle["close"] == prices[in_bar][-1]
+            assert candle["volume"] == in_bar.sum()
+        assert candles[-1]["time"] == times[-1] - times[-1] % seconds   # Forming bar last
+    assert store.get_stats()["symbols"]["XAUUSD"]["1m"] == len(np.unique(times // 60)) - 1
+
+
+def test_incremental_trend_matches_full_recompute():
+    times, prices = tick_stream()
+    store = CandleStore(timeframes=["1m"], capacity=20)   # Small ring - wraps many times
+    analyzer = TrendAnalyzer(None)
+    checked = 0
+
+    for when, price in zip(times, prices):
+        if not store.on_tick("XAUUSD", price, when):
+            continue
+        closed = store.get_candles("XAUUSD", "1m", 20, include_forming=False)
+        if len(closed) < 14:
+            assert store.get_trend("XAUUSD", "1m") is None
+            continue
+        indicators = store.get_indicators("XAUUSD", "1m")
+        closes = np.array([c["close"] for c in closed])
+        assert indicators["sma_fast"] == pytest.approx(closes[-7:].mean())
+        assert indicators["sma_slow"] == pytest.approx(closes[-14:].mean())
+        assert store.get_trend("XAUUSD", "1m") == analyzer.score_candles(closed)
+        checked += 1
+
+    assert checked > 2000
+    assert {store.get_trend("XAUUSD", "1m")} <= {"BULLISH", "BEARISH", "NEUTRAL"}
+
+
+def test_trend_analyzer_backfills_from_terminal(config):
+    client = MT5Client(config)
+    client.initialize()
+    analyzer = TrendAnalyzer(client)
+
+    n = 60
+    close = 2000 + np.arange(n) * 2.0
+    bar_start = START + 10 * 86400
+    client.mt5.load_rates("GOLD", client.mt5.TIMEFRAME_M15, {
+        "time": bar_start + np.arange(n) * 900, "open": close - 1.0,
+        "high": close + 0.5, "low": close - 1.5, "close": close, "tick_volume": np.full(n, 10)
+    })
+
+    assert analyzer.get_current_trend("XAUUSD", "15m") == "BULLISH"
+    assert client.candle_store.bar_count("XAUUSD", "15m") == n - 1     # Last bar is still forming
+    assert client.get_candles("XAUUSD", "15", 3)[-1]["close"] == close[-1]
+
+    # No history for M5 - one terminal request, then throttled until the retry window passes
+    requests = client.mt5.stats["calls"]
+    assert analyzer.get_current_trend("XAUUSD", "5m") == "NEUTRAL"
+    assert analyzer.get_current_trend("XAUUSD", "5m") == "NEUTRAL"
+    assert client.mt5.stats["calls"] == requests + 1
+
+    # Live ticks extend the forming bar and close it into the backfilled history
+    client.subscribe_symbols(["XAUUSD"])
+    last_bar = bar_start + (n - 1) * 900
+    for offset, price in ((60, 2130.0), (120, 2090.0), (900, 1800.0), (1800, 1795.0)):
+        client.mt5.set_price("GOLD", price, when=last_bar + offset)
+        client.refresh_ticks()
+    candles = client.get_candles("XAUUSD", "15m", 4)
+    assert candles[-3]["high"] == 2130.0 and candles[-3]["close"] == 2090.0
+    assert [c["close"] for c in candles[-2:]] == [1800.0, 1795.0]
+    assert client.candle_store.bar_count("XAUUSD", "15m") == n + 1
+    assert analyzer.get_current_trend("XAUUSD", "15m") == "BEARISH"
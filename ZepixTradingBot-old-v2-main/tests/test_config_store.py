@@ -0,0 +1,153 @@
+"""
+Unit Tests for incremental Config persistence and change events
+Checks that updates are journaled per section, replayed after a crash and
+compacted into the snapshot by the debounced writer, and that managers
+holding cached settings are refreshed by change events.
+
+Run tests with:
+    pytest tests/test_config_store.py -v
+"""
+
+import gc
+import json
+import os
+import shutil
+import sys
+import time
+import weakref
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.clients.telegram_bot_fixed import TelegramBot
+from src.config import Config
+from src.managers.profit_booking_manager import ProfitBookingManager
+from src.services.price_monitor_service import PriceMonitorService
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """A copy of config/config.json in a scratch working directory"""
+    (tmp_path / "config").mkdir()
+    shutil.copy(os.path.join(project_root, "config", "config.json"), tmp_path / "config" / "config.json")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def make_config(debounce_ms=10, snapshot_interval=60.0):
+    config = Config()
+    config.config["config_persistence"] = {"debounce_ms": debounce_ms,
+                                           "snapshot_interval_seconds": snapshot_interval}
+    config._mark_persisted()
+    return config
+
+
+def journal_records(workdir):
+    path = workdir / "config" / "config.json.journal"
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_updates_are_journaled_not_rewritten(workdir):
+    config = make_config()
+    snapshot_before = (workdir / "config" / "config.json").read_text()
+
+    for value in range(20):                                     # A burst of menu tweaks
+        config.update("rr_ratio", 1.0 + value / 10)
+    config.update_nested("re_entry_config.max_chain_levels", 3)
+
+    records = journal_records(workdir)                          # One small record per change
+    assert [r["section"] for r in records] == ["rr_ratio"] * 20 + ["re_entry_config"]
+    assert records[-1]["value"]["max_chain_levels"] == 3
+    time.sleep(0.1)                                             # Past the debounce, inside the interval
+    assert (workdir / "config" / "config.json").read_text() == snapshot_before
+    assert config.get_persistence_stats()["snapshot_dirty"] is True
+
+    # Crash before the snapshot: a fresh load replays the journal and compacts it
+    config._closed = True
+    reloaded = Config()
+    assert reloaded["rr_ratio"] == pytest.approx(2.9)
+    assert reloaded["re_entry_config"]["max_chain_levels"] == 3
+    assert not (workdir / "config" / "config.json.journal").exists()
+    on_disk = json.loads((workdir / "config" / "config.json").read_text())
+    assert on_disk["re_entry_config"]["max_chain_levels"] == 3
+    assert list(on_disk) == list(reloaded.config)               # Section order kept
+
+
+def test_save_config_persists_only_changed_sections(workdir):
+    config = make_config()
+    events = []
+    config.subscribe("timeframe_specific_config", lambda path, value: events.append(path))
+    config.subscribe("profit_booking_config.enabled", lambda path, value: events.append((path, value)))
+
+    config.save_config()                                        # Nothing edited
+    assert config.get_persistence_stats()["updates"] == 0
+
+    config.config["timeframe_specific_config"]["combinedlogic-1"]["lot_multiplier"] = 2.0
+    config.save_config()
+    config.update_nested("profit_booking_config.enabled", False)
+    config.update("profit_booking_config", {"enabled": True})
+    config.update_nested("re_entry_config.monitor_interval", 7)  # No subscriber
+    assert events == ["timeframe_specific_config", ("profit_booking_config.enabled", False),
+                      ("profit_booking_config", {"enabled": True})]
+    assert config.symbol_specs.logic_lot_multipliers["combinedlogic-1"] == 2.0
+
+    assert [r["section"] for r in journal_records(workdir)] == [
+        "timeframe_specific_config", "profit_booking_config", "profit_booking_config", "re_entry_config"]
+
+    config.close()
+    on_disk = json.loads((workdir / "config" / "config.json").read_text())
+    assert on_disk["timeframe_specific_config"]["combinedlogic-1"]["lot_multiplier"] == 2.0
+    assert on_disk["re_entry_config"]["monitor_interval"] == 7
+    stats = config.get_persistence_stats()
+    assert stats["snapshots"] == 1 and stats["snapshot_dirty"] is False  # Saves coalesced into one rewrite
+    assert not (workdir / "config" / "config.json.journal").exists()
+
+
+def test_managers_refresh_cached_settings(workdir):
+    config = make_config()
+    manager = ProfitBookingManager(config, None, None, None, None)
+    monitor = PriceMonitorService(config, None, None, None, None, MagicMock())
+
+    config.update_nested("profit_booking_config.enabled", False)
+    config.update_nested("profit_booking_config.min_profit", 12.5)
+    assert manager.is_enabled() is False and manager.min_profit == 12.5
+    assert monitor.profit_booking_enabled is False
+
+    config.config["re_entry_config"]["price_monitor_interval_seconds"] = 17
+    config.config["re_entry_config"]["tp_reentry_enabled"] = False
+    assert monitor.monitor_interval != 17                       # In-place edit seen on save
+    config.save_config()
+    assert monitor.monitor_interval == 17 and monitor.tp_reentry_enabled is False
+    config.close()
+
+
+def test_telegram_toggles_publish_changes(workdir):
+    config = make_config()
+    monitor = PriceMonitorService(config, None, None, None, None, MagicMock())
+    bot = SimpleNamespace(config=config, send_message=MagicMock(), logger=MagicMock())
+
+    TelegramBot.handle_tp_system(bot, {"text": "/tp_system off"})
+    TelegramBot.handle_sl_hunt(bot, {"text": "/sl_hunt off"})
+    TelegramBot.handle_exit_continuation(bot, {"text": "/exit_continuation off"})
+    assert (monitor.tp_reentry_enabled, monitor.sl_hunt_enabled, monitor.exit_continuation_enabled) == \
+        (False, False, False)
+
+    config["rr_ratio"] = 2.5                                    # Item assignment goes through update()
+    assert config["rr_ratio"] == 2.5 and config.get_persistence_stats()["updates"] == 4
+    config.close()
+
+
+def test_discarded_config_is_collectable(workdir):
+    config = make_config()
+    ref = weakref.ref(config)
+    del config
+    gc.collect()
+    assert ref() is None                                        # Exit-time flush holds it weakly
@@ -0,0 +1,119 @@
+"""
+Unit Tests for TradeDatabase schema migrations, pragmas and indexes
+Every filtered query issued by TradeDatabase and SessionManager is captured
+and checked with EXPLAIN QUERY PLAN - none may full-scan its table.
+
+Run tests with:
+    pytest tests/test_database_schema.py -v
+"""
+
+import os
+import sys
+import sqlite3
+from datetime import datetime, date
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.database import TradeDatabase
+from src.managers.session_manager import SessionManager
+from src.models import Trade
+
+
+def make_trade(trade_id, session_id="S1"):
+    trade = Trade(
+        symbol="EURUSD", entry=1.1000, sl=1.0950, tp=1.1050, lot_size=0.1,
+        direction="buy", strategy="combinedlogic-1", status="closed",
+        trade_id=trade_id, open_time=datetime.now().isoformat(),
+        close_time=datetime.now().isoformat(), pnl=12.5
+    )
+    trade.session_id = session_id
+    return trade
+
+
+class TestDatabaseSchema:
+    """Test suite for migrations and query plans"""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "trading_bot.db")
+
+    def test_fresh_database_is_fully_migrated(self, db_path):
+        db = TradeDatabase(db_path, write_behind=False)
+        assert db.get_schema_version() == TradeDatabase.MIGRATIONS[-1][0]
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        indexes = {row[0] for row in db.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+        )}
+        assert "idx_trades_close_time" in indexes
+        assert "idx_sessions_status_start" in indexes
+
+    def test_migrations_run_once(self, db_path):
+        TradeDatabase(db_path, write_behind=False)
+        db = TradeDatabase(db_path, write_behind=False)
+        rows = db.conn.execute("SELECT version FROM schema_version ORDER BY version").fetchall()
+        assert [r[0] for r in rows] == [m[0] for m in TradeDatabase.MIGRATIONS]
+
+    def test_legacy_database_gains_missing_columns(self, db_path):
+        legacy = sqlite3.connect(db_path)
+        legacy.execute("CREATE TABLE trades (id INTEGER PRIMARY KEY, trade_id TEXT, symbol TEXT, "
+                       "entry_price REAL, exit_price REAL, sl_price REAL, tp_price REAL, "
+                       "lot_size REAL, direction TEXT, strategy TEXT, pnl REAL, status TEXT, "
+                       "open_time DATETIME, close_time DATETIME, chain_id TEXT, "
+                       "chain_level INTEGER, is_re_entry BOOLEAN)")
+        legacy.execute("INSERT INTO trades (trade_id, symbol, pnl, status) VALUES ('1', 'EURUSD', 5, 'closed')")
+        legacy.commit()
+        legacy.close()
+
+        db = TradeDatabase(db_path, write_behind=False)
+        columns = {row[1] for row in db.conn.execute("PRAGMA table_info(trades)")}
+        assert {"session_id", "logic_type", "sl_multiplier", "profit_chain_id"} <= columns
+        assert db.conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0] == 1
+
+    def test_every_filtered_query_uses_an_index(self, db_path):
+        db = TradeDatabase(db_path, write_behind=False)
+        statements = []
+        db.conn.set_trace_callback(statements.append)
+
+        # TradeDatabase API
+        db.create_session("S1", "EURUSD", "buy", "BULLISH")
+        db.save_trade(make_trade(1))
+        db.update_session_stats("S1")
+        db.get_trade_history(30)
+        db.get_trades_by_date(date.today())
+        db.get_active_session("EURUSD")
+        db.get_active_session()
+        db.get_sessions_by_date(date.today())
+        db.get_session_details("S1")
+        db.get_active_profit_chains()
+        db.get_sl_recovery_stats()
+        db.get_tp_reentry_stats()
+        db.get_sl_hunt_reentry_stats()
+        db.close_session("S1", "TEST")
+
+        # SessionManager queries
+        manager = SessionManager({}, db, None)
+        session_id = manager.create_session("EURUSD", "buy", "BULLISH")
+        trade = make_trade(2, session_id)
+        trade.logic_type = "combinedlogic-1"
+        manager.update_logic_stats(trade)
+        manager.close_session("TEST")
+
+        db.conn.set_trace_callback(None)
+
+        checked = 0
+        for sql in statements:
+            normalized = " ".join(sql.split()).upper()
+            if " WHERE " not in normalized or not normalized.startswith(("SELECT", "UPDATE", "DELETE")):
+                continue
+            plan = [row[3] for row in db.conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+            scans = [detail for detail in plan if detail.startswith("SCAN ")]
+            assert not scans, f"Full scan in: {normalized}\nplan: {plan}"
+            checked += 1
+
+        assert checked >= 15
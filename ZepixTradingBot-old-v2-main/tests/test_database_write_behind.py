@@ -0,0 +1,127 @@
+"""
+Unit Tests for the TradeDatabase write-behind queue
+Tests batching, flush barrier, read-your-writes and metrics.
+
+Run tests with:
+    pytest tests/test_database_write_behind.py -v
+"""
+
+import os
+import sys
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.database import TradeDatabase
+from src.models import Trade
+
+
+def make_trade(trade_id, status="open", pnl=None, session_id=None):
+    trade = Trade(
+        symbol="EURUSD", entry=1.1000, sl=1.0950, tp=1.1050, lot_size=0.1,
+        direction="buy", strategy="combinedlogic-1", status=status,
+        trade_id=trade_id, open_time=datetime.now().isoformat(), pnl=pnl
+    )
+    trade.session_id = session_id
+    if status == "closed":
+        trade.close_time = datetime.now().isoformat()
+    return trade
+
+
+def count_rows(path, table):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestWriteBehind:
+    """Test suite for batched TradeDatabase persistence"""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "trading_bot.db")
+
+    @pytest.fixture
+    def db(self, db_path):
+        db = TradeDatabase(db_path, batch_interval_ms=200, batch_max_rows=500)
+        yield db
+        db.close()
+
+    def test_writes_are_grouped_into_one_transaction(self, db, db_path):
+        for i in range(16):
+            db.save_profit_booking_order(f"ORD{i}", "PB_1", 2, 10.0, 0, "OPEN")
+
+        assert db.flush() is True
+        stats = db.get_write_stats()
+        assert stats["rows_written"] == 16
+        assert stats["batches"] == 1
+        assert stats["max_batch_size"] == 16
+        assert count_rows(db_path, "profit_booking_orders") == 16
+
+    def test_batch_max_rows_splits_batches(self, db_path):
+        db = TradeDatabase(db_path, batch_interval_ms=1000, batch_max_rows=10)
+        for i in range(25):
+            db.save_sl_event(str(i), "EURUSD", 1.09, 1.10)
+        db.flush()
+        db.close()
+
+        stats = db.get_write_stats()
+        assert stats["rows_written"] == 25
+        assert stats["batches"] == 3
+        assert stats["max_batch_size"] == 10
+
+    def test_flush_is_a_durability_barrier(self, db, db_path):
+        db.save_trade(make_trade(1001, status="closed", pnl=25.0))
+        assert db.flush() is True
+
+        # Visible to an independent connection right after the barrier
+        assert count_rows(db_path, "trades") == 1
+
+    def test_reads_see_queued_writes(self, db):
+        db.create_session("S1", "EURUSD", "buy", "entry")
+        db.save_trade(make_trade(1, status="closed", pnl=10.0, session_id="S1"))
+        db.save_trade(make_trade(2, status="closed", pnl=-4.0, session_id="S1"))
+        db.update_session_stats("S1")
+
+        session = db.get_active_session("EURUSD")
+        assert session["session_id"] == "S1"
+        assert session["total_trades"] == 2
+        assert session["total_pnl"] == pytest.approx(6.0)
+
+        cursor = db.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM trades WHERE session_id = 'S1'")
+        assert cursor.fetchone()[0] == 2
+
+    def test_bad_statement_does_not_lose_the_batch(self, db, db_path):
+        db.save_sl_event("1", "EURUSD", 1.09, 1.10)
+        db._execute_write("INSERT INTO missing_table VALUES (?)", (1,))
+        db.save_sl_event("2", "EURUSD", 1.09, 1.10)
+        db.flush()
+
+        assert count_rows(db_path, "sl_events") == 2
+        assert db.get_write_stats()["errors"] == 1
+
+    def test_metrics_report_lag_and_queue_depth(self, db):
+        db.save_sl_event("1", "EURUSD", 1.09, 1.10)
+        assert db.get_write_stats()["queue_depth"] >= 0
+        db.flush()
+
+        stats = db.get_write_stats()
+        assert stats["queue_depth"] == 0
+        assert stats["last_lag_ms"] > 0
+        assert stats["max_lag_ms"] >= stats["last_lag_ms"]
+        assert stats["avg_batch_size"] == pytest.approx(1.0)
+
+    def test_synchronous_mode(self, db_path):
+        db = TradeDatabase(db_path, write_behind=False)
+        db.save_sl_event("1", "EURUSD", 1.09, 1.10)
+        assert count_rows(db_path, "sl_events") == 1
+        assert db.get_write_stats()["write_behind"] is False
@@ -0,0 +1,130 @@
+"""
+Unit Tests for alert-to-order latency tracing
+Tests per-alert traces across awaits, rolling percentiles, the JSON endpoint
+and the Telegram /latency command.
+
+Run tests with:
+    pytest tests/test_latency_tracer.py -v
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.utils.latency_tracer import LatencyTracer, StageStats, create_latency_app
+
+
+def test_concurrent_alerts_keep_their_own_stages():
+    tracer = LatencyTracer(slow_alert_ms=0)
+
+    async def handle(symbol, delay):
+        with tracer.trace({"type": "entry_v3", "symbol": symbol}) as trace:
+            with tracer.stage("parse"):
+                pass
+            with tracer.stage("order_send"):
+                await asyncio.sleep(delay)
+            return trace
+
+    async def scenario():
+        return await asyncio.gather(handle("XAUUSD", 0.03), handle("EURUSD", 0.0))
+
+    slow, fast = asyncio.run(scenario())
+    assert slow.trace_id != fast.trace_id
+    assert [name for name, _ in slow.stages] == ["parse", "order_send", "total"]
+    assert dict(slow.stages)["order_send"] >= 25
+    assert dict(fast.stages)["order_send"] < 25
+
+    stats = tracer.get_stats()
+    assert stats["traces_finished"] == 2
+    assert stats["stages"]["order_send"]["count"] == 2
+    assert stats["stages"]["total:entry_v3"]["count"] == 2
+    assert len(stats["slow_traces"]) == 2   # slow_alert_ms=0 keeps every trace
+    assert tracer.current_trace() is None
+
+
+def test_nested_trace_reuses_outer_and_untraced_stages_still_count():
+    tracer = LatencyTracer()
+    with tracer.stage("order_send"):
+        pass
+    with tracer.trace({"type": "entry_v3", "symbol": "EURUSD"}) as outer:
+        with tracer.trace({"type": "entry_v3", "symbol": "EURUSD"}) as inner:
+            assert inner is outer
+    stats = tracer.get_stats()
+    assert stats["traces_started"] == 1
+    assert stats["stages"]["order_send"]["count"] == 1
+
+
+def test_rolling_window_percentiles():
+    stats = StageStats(window=100)
+    for value in range(1000):
+        stats.record(float(value))
+    data = stats.to_dict()
+    assert data["count"] == 1000
+    assert data["window"] == 100
+    assert data["p50_ms"] == 950.0
+    assert data["p99_ms"] == 998.0
+    assert data["max_ms"] == 999.0
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = LatencyTracer(enabled=False)
+    with tracer.trace({"type": "entry_v3"}) as trace:
+        with tracer.stage("parse"):
+            pass
+    tracer.record("mt5_call", 5.0)     # Direct recordings are dropped too
+    assert trace is None
+    assert tracer.get_stats()["stages"] == {}
+    assert "disabled" in tracer.format_report()
+
+
+def test_dispatch_alert_wraps_routing_in_a_trace():
+    from src.core.trading_engine import TradingEngine
+
+    tracer = LatencyTracer()
+    seen = {}
+
+    async def route(data):
+        seen["trace_id"] = tracer.current_trace_id()
+        return True
+
+    engine = SimpleNamespace(latency_tracer=tracer, _route_alert=route)
+    assert asyncio.run(TradingEngine._dispatch_alert(engine, {"type": "trend", "symbol": "EURUSD"}))
+    assert seen["trace_id"] == "T000001"
+    assert tracer.get_stats()["stages"]["total:trend"]["count"] == 1
+
+
+def test_json_endpoint():
+    from fastapi.testclient import TestClient
+
+    tracer = LatencyTracer()
+    tracer.record("order_send", 12.5)
+    client = TestClient(create_latency_app(tracer))
+
+    body = client.get("/latency").json()
+    assert body["stages"]["order_send"]["p50_ms"] == 12.5
+    assert client.post("/latency/reset").json() == {"reset": True}
+    assert client.get("/latency").json()["stages"] == {}
+
+
+def test_telegram_latency_command():
+    from src.clients.telegram_bot_fixed import TelegramBot
+
+    tracer = LatencyTracer()
+    tracer.record("order_send", 40.0)
+    tracer.record("parse", 0.2)
+    sent = []
+
+    bot = TelegramBot.__new__(TelegramBot)
+    bot.trading_engine = SimpleNamespace(latency_tracer=tracer)
+    bot.risk_manager = object()
+    bot.send_message = lambda text, **kwargs: sent.append(text)
+
+    bot.handle_latency({})
+    assert "Alert Latency" in sent[0]
+    assert sent[0].index("order_send") < sent[0].index("parse")   # Slowest stage first
@@ -0,0 +1,127 @@
+"""
+Unit Tests for bulk MT5 reconciliation
+Drives MT5Reconciler against the simulator backend and counts terminal calls.
+
+Run tests with:
+    pytest tests/test_mt5_reconciler.py -v
+"""
+
+import asyncio
+import os
+import sys
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config import Config
+from src.clients.mt5_client import MT5Client
+from src.clients.async_mt5_client import AsyncMT5Client
+from src.models import Trade
+from src.services.mt5_reconciler import MT5Reconciler, build_deal_index
+
+
+@pytest.fixture
+def client():
+    config = Config()
+    config.config["simulate_orders"] = False
+    config.config["mt5_backend"] = "simulator"
+    config.config["mt5_simulator"] = {"balance": 100000.0, "leverage": 100,
+                                      "spread_pips": 0.0, "latency_ms": {}}
+    config.config["tick_cache"] = {"enabled": False}
+    client = MT5Client(config)
+    assert client.initialize() is True
+    yield client
+    client.shutdown()
+
+
+def _count_calls(client, monkeypatch):
+    calls = Counter()
+    for name in ("positions_get", "history_deals_get"):
+        original = getattr(client.mt5, name)
+
+        def counted(*args, _name=name, _original=original, **kwargs):
+            calls[_name] += 1
+            return _original(*args, **kwargs)
+        monkeypatch.setattr(client.mt5, name, counted)
+    return calls
+
+
+def _open(client, symbol="EURUSD", direction="buy", price=1.0850):
+    sl, tp = (price - 0.0050, price + 0.0050) if direction == "buy" else (price + 0.0050, price - 0.0050)
+    ticket = client.place_order(symbol, direction, 0.10, price, sl=sl, tp=tp)
+    return Trade(symbol=symbol, entry=price, sl=sl, tp=tp, lot_size=0.10, direction=direction,
+                 strategy="combinedlogic-1", trade_id=ticket, open_time=datetime.now().isoformat())
+
+
+def test_mass_close_uses_one_history_query(client, monkeypatch):
+    client.mt5.set_price("EURUSD", 1.0850)
+    trades = [_open(client) for _ in range(20)]
+    survivor = _open(client, "GBPUSD", price=1.2700)
+
+    client.mt5.set_price("EURUSD", 1.0905)  # News spike - every EURUSD TP fills
+    calls = _count_calls(client, monkeypatch)
+    reconciler = MT5Reconciler(client, AsyncMT5Client.for_client(client))
+
+    closed = asyncio.run(reconciler.find_closed(trades + [survivor]))
+
+    assert calls == Counter({"positions_get": 1, "history_deals_get": 1})
+    assert {c["trade"].trade_id for c in closed} == {t.trade_id for t in trades}
+    for record in closed:
+        assert record["source"] == "history"
+        assert record["pnl"] == pytest.approx(50.0)
+        assert record["close_price"] == pytest.approx(1.0900)
+
+
+def test_no_missing_tickets_skips_history(client, monkeypatch):
+    client.mt5.set_price("EURUSD", 1.0850)
+    trade = _open(client)
+    calls = _count_calls(client, monkeypatch)
+
+    closed = asyncio.run(MT5Reconciler(client, AsyncMT5Client.for_client(client)).find_closed([trade]))
+
+    assert closed == []
+    assert calls == Counter({"positions_get": 1})
+
+
+def test_failed_positions_query_closes_nothing(client, monkeypatch):
+    client.mt5.set_price("EURUSD", 1.0850)
+    trade = _open(client)
+    monkeypatch.setattr(client.mt5, "positions_get", lambda *a, **k: None)
+    reconciler = MT5Reconciler(client, AsyncMT5Client.for_client(client))
+
+    assert asyncio.run(reconciler.find_closed([trade])) == []
+    assert reconciler.get_stats()["skipped_cycles"] == 1
+
+
+def test_ticket_outside_range_falls_back_then_estimates(client):
+    trade = Trade(symbol="EURUSD", entry=1.08, sl=1.07, tp=1.09, lot_size=0.1, direction="buy",
+                  strategy="combinedlogic-1", trade_id=999999, open_time=datetime.now().isoformat())
+    reconciler = MT5Reconciler(client, AsyncMT5Client.for_client(client))
+
+    closed = asyncio.run(reconciler.find_closed([trade]))
+
+    assert closed == [{"trade": trade, "pnl": None, "close_price": None, "source": "unresolved"}]
+    stats = reconciler.get_stats()
+    assert stats["fallback_lookups"] == 1
+    assert stats["estimated"] == 1
+
+
+def test_build_deal_index_sums_partials_and_uses_last_exit():
+    deals = [
+        {"position_id": 7, "entry": 0, "profit": 0.0, "price": 1.10, "time": 100},
+        {"position_id": 7, "entry": 1, "profit": 12.5, "price": 1.11, "time": 200, "commission": -1.0},
+        {"position_id": 7, "entry": 1, "profit": 20.0, "price": 1.12, "time": 300},
+        {"position_id": 0, "entry": 1, "profit": 99.0, "price": 9.99, "time": 300},
+    ]
+    index = build_deal_index(deals)
+    assert list(index) == [7]
+    assert index[7]["profit"] == pytest.approx(32.5)
+    assert index[7]["commission"] == pytest.approx(-1.0)
+    assert index[7]["close_price"] == 1.12
+    assert index[7]["deals"] == 3
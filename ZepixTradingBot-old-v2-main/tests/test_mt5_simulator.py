@@ -0,0 +1,166 @@
+"""
+Unit Tests for the in-process MT5 simulator backend
+Drives MT5Client through the simulator: orders, SL/TP fills, history,
+margin, replayable price streams and latency.
+
+Run tests with:
+    pytest tests/test_mt5_simulator.py -v
+"""
+
+import os
+import sys
+import time
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config import Config
+from src.clients.mt5_client import MT5Client
+from src.clients.mt5_simulator import MT5Simulator
+from src.clients.async_mt5_client import AsyncMT5Client
+
+
+@pytest.fixture
+def config():
+    config = Config()
+    config.config["simulate_orders"] = False
+    config.config["mt5_backend"] = "simulator"
+    config.config["symbol_mapping"] = {"XAUUSD": "GOLD"}
+    config.config["mt5_simulator"] = {
+        "balance": 10000.0,
+        "leverage": 100,
+        "spread_pips": 0.0,
+        "latency_ms": {}
+    }
+    config.config["tick_cache"] = {"enabled": False}
+    return config
+
+
+@pytest.fixture
+def client(config):
+    client = MT5Client(config)
+    assert client.initialize() is True
+    return client
+
+
+class TestMT5Simulator:
+    """Test suite for the simulator backend"""
+
+    def test_backend_selected_from_config(self, client):
+        assert isinstance(client.mt5, MT5Simulator)
+        assert client.mt5_available is True
+
+    def test_order_creates_visible_position(self, client):
+        ticket = client.place_order("EURUSD", "buy", 0.10, 1.0850, sl=1.0800, tp=1.0950)
+        assert ticket is not None
+
+        positions = client.get_positions()
+        assert [p["ticket"] for p in positions] == [ticket]
+        assert client.get_position(ticket)["sl"] == pytest.approx(1.0800)
+        assert client.get_positions(symbol="GBPUSD") == []
+
+    def test_tp_fill_on_tick_records_history(self, client):
+        ticket = client.place_order("EURUSD", "buy", 0.10, 1.0850, sl=1.0800, tp=1.0900)
+
+        client.mt5.set_price("EURUSD", 1.0905)
+
+        assert client.get_position(ticket) is None
+        assert client.get_closed_trade_profit(ticket) == pytest.approx(50.0)
+        assert client.mt5.stats["tp_fills"] == 1
+        assert client.get_account_balance() == pytest.approx(10050.0)
+
+    def test_sl_fill_for_mapped_symbol(self, client):
+        ticket = client.place_order("XAUUSD", "sell", 0.10, 2650.0, sl=2660.0, tp=2600.0)
+        assert client.get_position(ticket)["symbol"] == "GOLD"
+
+        client.mt5.set_price("GOLD", 2661.0)
+
+        assert client.get_position(ticket) is None
+        assert client.get_closed_trade_profit(ticket) == pytest.approx(-100.0)
+        assert client.mt5.stats["sl_fills"] == 1
+
+    def test_close_and_modify_position(self, client):
+        ticket = client.place_order("EURUSD", "sell", 0.20, 1.0850, sl=1.0900)
+        assert client.modify_position(ticket, sl=1.0880, tp=1.0800) is True
+        assert client.get_position(ticket)["tp"] == pytest.approx(1.0800)
+
+        client.mt5.set_price("EURUSD", 1.0840)
+        assert client.close_position(ticket) is True
+        assert client.get_position(ticket) is None
+        assert client.get_closed_trade_profit(ticket) == pytest.approx(20.0)
+
+    def test_history_deals_by_date_range(self, client):
+        first = client.place_order("EURUSD", "buy", 0.10, 1.0850, sl=1.0800)
+        client.close_position(first)
+
+        deals = client.get_history_deals(datetime.now() - timedelta(minutes=1),
+                                         datetime.now() + timedelta(minutes=1))
+        assert {d["position_id"] for d in deals} == {first}
+        assert len(deals) == 2
+        assert client.get_history_deals(datetime.now() + timedelta(hours=1),
+                                        datetime.now() + timedelta(hours=2)) == []
+
+    def test_margin_is_tracked_and_enforced(self, client):
+        client.place_order("EURUSD", "buy", 1.0, 1.0850, sl=1.0800)
+        info = client.get_account_info_detailed()
+        assert info["margin"] == pytest.approx(1085.0)
+        assert info["free_margin"] == pytest.approx(10000.0 - 1085.0)
+
+        # 100 lots needs ~108k margin on a 10k account
+        assert client.place_order("EURUSD", "buy", 100.0, 1.0850, sl=1.0800) is None
+        assert client.mt5.stats["rejected"] == 1
+
+    def test_price_stream_replay(self, client, tmp_path):
+        ticket = client.place_order("EURUSD", "buy", 0.10, 1.0850, sl=1.0800, tp=1.0870)
+
+        stream = tmp_path / "ticks.csv"
+        stream.write_text(
+            "time,symbol,bid,ask\n"
+            "1700000000,EURUSD,1.0855,1.0856\n"
+            "1700000001,EURUSD,1.0862,1.0863\n"
+            "1700000002,EURUSD,1.0871,1.0872\n"
+        )
+        client.mt5.load_price_stream_csv(str(stream))
+
+        assert client.mt5.replay(steps=2) == 2
+        assert client.get_position(ticket) is not None
+        assert client.get_current_price("EURUSD") == pytest.approx(1.08625)
+
+        assert client.mt5.replay() == 1
+        assert client.get_position(ticket) is None
+        assert client.mt5.now() == 1700000002
+
+    def test_configurable_latency(self, config):
+        config.config["mt5_simulator"]["latency_ms"] = {"order_send": 30}
+        client = MT5Client(config)
+        client.initialize()
+
+        started = time.perf_counter()
+        client.place_order("EURUSD", "buy", 0.01, 1.0850, sl=1.0800)
+        assert time.perf_counter() - started >= 0.03
+
+    def test_bulk_orders_through_async_facade(self, client):
+        """Thousands of orders run through the single MT5 worker"""
+        client.mt5.balance = 100000.0
+        facade = AsyncMT5Client(client)
+
+        async def scenario():
+            return await asyncio.gather(*(
+                facade.place_order("EURUSD", "buy", 0.01, 1.0850, sl=1.0800, tp=1.0900)
+                for _ in range(1000)
+            ))
+
+        tickets = asyncio.run(scenario())
+        facade.shutdown(wait=True)
+
+        assert len(set(tickets)) == 1000
+        assert len(client.get_positions()) == 1000
+        client.mt5.set_price("EURUSD", 1.0901)
+        assert client.get_positions() == []
+        assert client.mt5.stats["tp_fills"] == 1000
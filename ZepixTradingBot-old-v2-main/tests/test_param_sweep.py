@@ -0,0 +1,117 @@
+"""
+Unit Tests for the parallel parameter sweep runner
+Replays a small synthetic history through the profit booking / SL logic on
+the MT5 simulator, in-process and across a process pool, and checks resume.
+
+Run tests with:
+    pytest tests/test_param_sweep.py -v
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.backtest.param_sweep import (
+    ChainReplay, apply_params, build_history, format_table, grid_points, load_history, load_results,
+    point_id, random_points, rank_results, run_sweep, save_history
+)
+
+
+@pytest.fixture(scope="module")
+def base_config():
+    with open(os.path.join(project_root, "config", "config.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def history_path(tmp_path_factory):
+    rng = np.random.default_rng(5)
+    n = 3000
+    close = 2000 + np.cumsum(rng.normal(0, 1.0, n))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    rates = {
+        "time": 1_700_000_000 // 86400 * 86400 + np.arange(n) * 300,
+        "open": open_,
+        "high": np.maximum(open_, close) + rng.random(n),
+        "low": np.minimum(open_, close) - rng.random(n),
+        "close": close,
+        "volume": rng.integers(50, 500, n).astype(float),
+    }
+    path = str(tmp_path_factory.mktemp("sweep") / "history.npz")
+    save_history(build_history({"XAUUSD": rates}, tf_minutes=5), path)
+    return path
+
+
+def test_search_space_and_overrides(base_config):
+    space = {"profit_booking_config.min_profit": [5.0, 7.0], "active_sl_system": ["sl-1", "sl-2"],
+             "symbol_sl_reductions.XAUUSD": [0, 20]}
+    grid = grid_points(space)
+    assert len(grid) == 8 and len({point_id(p) for p in grid}) == 8
+    assert point_id({"a": 1, "b": 2}) == point_id({"b": 2, "a": 1})
+
+    sample = random_points(space, 3, seed=1)
+    assert sample == random_points(space, 3, seed=1) and len(sample) == 3
+    assert len(random_points(space, 50)) == 8                    # Capped at the grid size
+
+    config = apply_params(base_config, grid[-1])
+    assert config["symbol_sl_reductions"]["XAUUSD"] == 20
+    assert config["profit_booking_config"]["min_profit"] == 7.0
+    assert config["profit_booking_config"]["multipliers"] == base_config["profit_booking_config"]["multipliers"]
+    assert "XAUUSD" not in base_config["symbol_sl_reductions"]   # Base untouched
+    config.update("active_sl_system", "sl-1")                    # In-memory only, no file write
+
+
+def test_history_round_trip(history_path):
+    history = load_history(history_path)
+    assert history["tf_minutes"] == 5
+    assert set(history["bars"]["XAUUSD"]) == {"time", "open", "high", "low", "close"}
+    assert len(history["bars"]["XAUUSD"]["close"]) == 3000
+    assert history["alerts"] and all("timestamp" in a for a in history["alerts"])
+
+
+def test_replay_reacts_to_profit_booking_settings(base_config, history_path):
+    history = load_history(history_path)
+    tight = ChainReplay(apply_params(base_config, {"profit_booking_config.min_profit": 0.5}), history).run()
+    loose = ChainReplay(apply_params(base_config, {"profit_booking_config.min_profit": 50.0}), history).run()
+
+    assert tight["entries"] > 0 and tight["orders"] >= 2 * tight["entries"]
+    assert tight["booked"] > loose["booked"]
+    assert tight["max_chain_depth"] >= 1
+    assert tight["pnl"] != loose["pnl"]
+    assert tight["max_drawdown"] >= 0
+    assert tight["wins"] + tight["losses"] == tight["orders"]   # Everything flattened at the end
+
+
+def test_parallel_sweep_matches_in_process_and_resumes(base_config, history_path, tmp_path):
+    space = {"profit_booking_config.min_profit": [0.5, 7.0],
+             "sl_reduction_optimization.current_strategy": ["AGGRESSIVE", "CONSERVATIVE"]}
+    points = grid_points(space)
+    output = str(tmp_path / "results.jsonl")
+
+    serial = {r["id"]: r["metrics"]["pnl"] for r in run_sweep(points[:2], history_path, base_config, workers=1)}
+    first = run_sweep(points[:2], history_path, base_config, output=output, workers=2)
+    assert {r["id"]: r["metrics"]["pnl"] for r in first} == serial
+
+    with open(output, "a") as f:
+        f.write('{"id": "cut-off')                              # Simulate an interrupted write
+    computed = []
+    results = run_sweep(points, history_path, base_config, output=output, workers=2, resume=True,
+                        progress=lambda done, total, result: computed.append(result["id"]))
+    assert len(results) == 4
+    assert sorted(computed) == sorted(point_id(p) for p in points[2:])
+    assert {r["id"] for r in load_results(output)} == {point_id(p) for p in points}
+
+    ranked = rank_results(results, "pnl")
+    assert [r["metrics"]["pnl"] for r in ranked] == sorted((r["metrics"]["pnl"] for r in results), reverse=True)
+    assert rank_results(results, "max_drawdown")[0]["metrics"]["max_drawdown"] == \
+        min(r["metrics"]["max_drawdown"] for r in results)
+    table = format_table(ranked)
+    assert "min_profit=" in table and len(table.splitlines()) == 6
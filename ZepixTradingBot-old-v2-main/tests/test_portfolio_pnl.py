@@ -0,0 +1,168 @@
+"""
+Unit Tests for the vectorized portfolio PnL engine
+Checks per-trade and grouped PnL against the original per-trade loops in
+RiskManager and ProfitBookingManager, and the per-tick result cache.
+
+Run tests with:
+    pytest tests/test_portfolio_pnl.py -v
+"""
+
+import os
+import random
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config import Config
+from src.core.portfolio_pnl import PortfolioPnL
+from src.core.trade_arrays import OpenTradeArrays
+from src.core.trade_registry import OpenTradeRegistry
+from src.managers.profit_booking_manager import ProfitBookingManager
+from src.managers.risk_manager import RiskManager
+from src.models import ProfitBookingChain, Trade
+from src.utils.pip_calculator import PipCalculator
+
+PRICES = {"EURUSD": 1.0850, "GBPUSD": 1.2650, "USDJPY": 149.50, "XAUUSD": 2650.0}
+
+
+class Prices:
+    def __init__(self, prices):
+        self.prices = dict(prices)
+        self.reads = 0
+
+    def get_current_price(self, symbol):
+        self.reads += 1
+        return self.prices.get(symbol)
+
+
+@pytest.fixture(scope="module")
+def config():
+    return Config()
+
+
+def make_trades(count=200, seed=4):
+    rng = random.Random(seed)
+    trades = []
+    for ticket in range(count):
+        symbol = rng.choice(list(PRICES) + ["NOSPEC"])
+        price = PRICES.get(symbol, 1.0)
+        trades.append(Trade(
+            symbol=symbol, entry=price * rng.uniform(0.995, 1.005), sl=0.0, tp=0.0,
+            lot_size=rng.choice([0.01, 0.05, 0.1, 0.25]), direction=rng.choice(["buy", "sell"]),
+            strategy="combinedlogic-1", trade_id=ticket, open_time=datetime.now().isoformat(),
+            chain_id=rng.choice([None, "RE_A", "RE_B"]),
+            profit_chain_id=rng.choice([None, "PB_1", "PB_2"]), profit_level=rng.choice([0, 1]),
+            session_id=rng.choice([None, "S1", "S2"])
+        ))
+    return trades
+
+
+def build(config, trades, prices):
+    registry = OpenTradeRegistry(trades)
+    arrays = OpenTradeArrays(registry)
+    feed = Prices(prices)
+    return registry, feed, PortfolioPnL(config, arrays, feed.get_current_price, registry=registry, max_age=60)
+
+
+def test_matches_original_per_trade_loops(config):
+    trades = make_trades()
+    registry, feed, portfolio = build(config, trades, PRICES)
+    snapshot = portfolio.snapshot()
+
+    risk = RiskManager(config)
+    legacy = risk.get_live_open_trades_pnl(SimpleNamespace(get_open_trades=lambda: registry), feed,
+                                           PipCalculator(config))
+    assert snapshot.total == pytest.approx(legacy["total_live_pnl"])
+    expected = {d["trade_id"]: d["live_pnl"] for d in legacy["trade_details"]}
+    assert {d["trade_id"]: d["live_pnl"] for d in snapshot.trade_details()} == pytest.approx(expected)
+    assert all(snapshot.trade_pnl(t) is None for t in trades if t.symbol == "NOSPEC")
+
+    # Engine path of RiskManager serves the same numbers from the snapshot
+    engine = SimpleNamespace(get_open_trades=lambda: registry, portfolio_pnl=portfolio)
+    assert risk.get_live_open_trades_pnl(engine, feed, None)["total_live_pnl"] == pytest.approx(snapshot.total)
+
+    manager = ProfitBookingManager(config, feed, None, risk, None)
+    for chain_id in ("PB_1", "PB_2"):
+        for level in (0, 1):
+            chain = ProfitBookingChain(chain_id=chain_id, symbol="", direction="buy", base_lot=0.01,
+                                       current_level=level, max_level=4, created_at="", updated_at="")
+            chain_trades = [t for t in trades if t.profit_chain_id == chain_id and t.profit_level == level
+                            and t.symbol != "NOSPEC"]
+            for symbol in {t.symbol for t in chain_trades}:
+                chain.symbol = symbol            # The original loop prices every order at chain.symbol
+                legacy_pnl = manager.calculate_combined_pnl(chain, [t for t in chain_trades if t.symbol == symbol])
+                ours = sum(snapshot.trade_pnl(t) for t in chain_trades if t.symbol == symbol)
+                assert ours == pytest.approx(legacy_pnl)
+            manager.attach_portfolio_pnl(portfolio)
+            assert manager.calculate_combined_pnl(chain, registry) == pytest.approx(
+                sum(snapshot.trade_pnl(t) for t in chain_trades))
+            manager.portfolio_pnl = None
+
+    def grouped(field):
+        sums = {}
+        for t in trades:
+            key = getattr(t, field)
+            if key and snapshot.trade_pnl(t) is not None:
+                sums[key] = sums.get(key, 0.0) + snapshot.trade_pnl(t)
+        return sums
+
+    assert snapshot.by_symbol == pytest.approx(grouped("symbol"))
+    assert snapshot.by_chain == pytest.approx(grouped("chain_id"))
+    assert snapshot.by_session == pytest.approx(grouped("session_id"))
+    assert sum(snapshot.by_profit_chain.values()) == pytest.approx(sum(grouped("profit_chain_id").values()))
+
+
+def test_mixed_case_directions(config):
+    """V3 orders use BUY/SELL - they count exactly like buy/sell"""
+    trades = [Trade(symbol="EURUSD", entry=1.0840, sl=0.0, tp=0.0, lot_size=0.1, direction=direction,
+                    strategy="combinedlogic-1", trade_id=ticket, open_time=datetime.now().isoformat())
+              for ticket, direction in enumerate(["buy", "BUY", "sell", "SELL"])]
+    registry, feed, portfolio = build(config, trades, PRICES)
+    snapshot = portfolio.snapshot()
+
+    assert [d["trade_id"] for d in snapshot.trade_details()] == [0, 1, 2, 3]
+    assert snapshot.trade_pnl(trades[1]) == pytest.approx(snapshot.trade_pnl(trades[0]))
+    assert snapshot.trade_pnl(trades[3]) == pytest.approx(snapshot.trade_pnl(trades[2]))
+    legacy = RiskManager(config).get_live_open_trades_pnl(
+        SimpleNamespace(get_open_trades=lambda: registry), feed, PipCalculator(config))
+    assert snapshot.total == pytest.approx(legacy["total_live_pnl"]) == pytest.approx(0.0)
+    assert len(legacy["trade_details"]) == 4
+
+
+def test_one_cached_result_per_tick(config):
+    trades = make_trades(50)
+    registry, feed, portfolio = build(config, trades, PRICES)
+
+    first = portfolio.snapshot()
+    reads = feed.reads
+    assert reads == len({t.symbol for t in trades})             # One price read per symbol
+    assert portfolio.snapshot() is first
+    assert portfolio.stats == {"computes": 1, "cache_hits": 1, "table_builds": 1}
+
+    feed.prices["EURUSD"] += 0.0010                             # +10 pips -> recompute
+    second = portfolio.snapshot()
+    assert second is not first
+    eur_buys = [t for t in trades if t.symbol == "EURUSD" and t.direction == "buy"]
+    assert second.trade_pnl(eur_buys[0]) == pytest.approx(first.trade_pnl(eur_buys[0]) + 100.0 * eur_buys[0].lot_size)
+
+    registry.remove(trades[0])                                  # Trade set changed -> recompute
+    third = portfolio.snapshot()
+    assert third is not second and third.trade_pnl(trades[0]) is None
+
+    trades[1].status = "closed"
+    portfolio.max_age = 0.0                                     # In-place edits show up after max_age
+    assert portfolio.snapshot().trade_pnl(trades[1]) is None
+
+    feed.prices.pop("XAUUSD")                                   # No quote -> left out of every total
+    snapshot = portfolio.snapshot()
+    assert "XAUUSD" not in snapshot.by_symbol
+    assert snapshot.total == pytest.approx(float(np.nansum(
+        [snapshot.trade_pnl(t) or 0.0 for t in registry])))
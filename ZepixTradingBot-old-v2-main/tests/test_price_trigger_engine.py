@@ -0,0 +1,205 @@
+"""
+Unit Tests for the event-driven PriceTriggerEngine
+Tests crossing semantics, expiry via the timer wheel, re-arm and cancellation.
+
+Run tests with:
+    pytest tests/test_price_trigger_engine.py -v
+"""
+
+import os
+import sys
+import asyncio
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.services.price_trigger_engine import (
+    PriceTriggerEngine, TimerWheel, CROSS_UP, CROSS_DOWN, cross_direction
+)
+
+
+class FakeTickSource:
+    """Minimal MT5 client surface used by the engine"""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.subscribed = set()
+        self.reads = 0
+
+    def subscribe_symbols(self, symbols):
+        self.subscribed.update(symbols)
+
+    def get_tick(self, symbol, max_age=None):
+        self.reads += 1
+        price = self.prices.get(symbol)
+        return {"mid": price} if price is not None else None
+
+    def get_current_price(self, symbol):
+        return self.prices.get(symbol)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestPriceTriggerEngine:
+    """Test suite for PriceTriggerEngine"""
+
+    def test_cross_direction(self):
+        assert cross_direction("buy") == CROSS_UP
+        assert cross_direction("BUY") == CROSS_UP
+        assert cross_direction("sell") == CROSS_DOWN
+
+    def test_only_crossed_triggers_fire(self):
+        """Up triggers fire at or above level, down triggers at or below"""
+        engine = PriceTriggerEngine()
+        fired = []
+        callback = lambda trigger, price: fired.append(trigger.trigger_id)
+
+        engine.add_trigger("EURUSD", 1.1010, CROSS_UP, callback, trigger_id="up_1")
+        engine.add_trigger("EURUSD", 1.1020, CROSS_UP, callback, trigger_id="up_2")
+        engine.add_trigger("EURUSD", 1.0990, CROSS_DOWN, callback, trigger_id="down_1")
+        engine.add_trigger("GBPUSD", 1.2000, CROSS_UP, callback, trigger_id="other")
+
+        assert run(engine.on_tick("EURUSD", 1.1000)) == 0
+        assert run(engine.on_tick("EURUSD", 1.1015)) == 1
+        assert fired == ["up_1"]
+        assert run(engine.on_tick("EURUSD", 1.0990)) == 1
+        assert fired == ["up_1", "down_1"]
+
+        assert engine.pending_count() == 2
+        assert engine.pending_count("EURUSD") == 1
+
+    def test_many_triggers_same_level(self):
+        """Equal levels keep distinct entries and all fire together"""
+        engine = PriceTriggerEngine()
+        fired = []
+        for i in range(100):
+            engine.add_trigger("XAUUSD", 2650.0, CROSS_DOWN,
+                               lambda t, p: fired.append(t.payload), payload=i)
+
+        assert run(engine.on_tick("XAUUSD", 2649.5)) == 100
+        assert sorted(fired) == list(range(100))
+        assert engine.pending_count() == 0
+        assert "XAUUSD" not in engine.indexes
+
+    def test_removed_trigger_never_fires(self):
+        engine = PriceTriggerEngine()
+        fired = []
+        trigger_id = engine.add_trigger("EURUSD", 1.1, CROSS_UP, lambda t, p: fired.append(p))
+
+        assert engine.remove_trigger(trigger_id) is True
+        assert engine.remove_trigger(trigger_id) is False
+        assert run(engine.on_tick("EURUSD", 1.2)) == 0
+        assert fired == []
+        assert engine.stats["cancelled"] == 1
+
+    def test_expiry_calls_on_expire(self):
+        """Expired triggers leave the index and call on_expire once"""
+        engine = PriceTriggerEngine(timer_resolution=1.0)
+        expired = []
+        now = engine.timers.current_tick * engine.timers.resolution
+
+        engine.add_trigger("EURUSD", 1.2, CROSS_UP, lambda t, p: None,
+                           expires_at=now + 5, on_expire=lambda t: expired.append(t.trigger_id),
+                           trigger_id="exp")
+
+        assert run(engine.advance_timers(now + 3)) == 0
+        assert run(engine.advance_timers(now + 6)) == 1
+        assert expired == ["exp"]
+        assert engine.pending_count() == 0
+        assert run(engine.on_tick("EURUSD", 1.3)) == 0
+
+    def test_false_result_rearms_after_retry_interval(self):
+        """Callback returning False re-arms the trigger after retry_interval"""
+        engine = PriceTriggerEngine(timer_resolution=0.01)
+        calls = []
+
+        async def callback(trigger, price):
+            calls.append(price)
+            return len(calls) >= 2
+
+        async def scenario():
+            engine.add_trigger("EURUSD", 1.1, CROSS_UP, callback, retry_interval=0.02)
+            await engine.on_tick("EURUSD", 1.2)
+            assert engine.pending_count() == 1
+            # Not re-armed yet
+            assert await engine.on_tick("EURUSD", 1.2) == 0
+            await asyncio.sleep(0.05)
+            await engine.advance_timers()
+            await engine.on_tick("EURUSD", 1.2)
+
+        run(scenario())
+        assert calls == [1.2, 1.2]
+        assert engine.pending_count() == 0
+        assert engine.stats["rearmed"] == 1
+
+    def test_callback_error_rearms_trigger(self):
+        """A raising callback is retried after retry_interval, not dropped"""
+        engine = PriceTriggerEngine(timer_resolution=0.01)
+        calls = []
+
+        def callback(trigger, price):
+            calls.append(price)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return True
+
+        async def scenario():
+            engine.add_trigger("EURUSD", 1.1, CROSS_UP, callback, retry_interval=0.02)
+            await engine.on_tick("EURUSD", 1.2)
+            assert engine.pending_count() == 1
+            await asyncio.sleep(0.05)
+            await engine.advance_timers()
+            await engine.on_tick("EURUSD", 1.2)
+
+        run(scenario())
+        assert calls == [1.2, 1.2]
+        assert engine.pending_count() == 0
+        assert engine.stats["errors"] == 1
+
+    def test_finished_triggers_leave_no_timers(self):
+        """Cancelled, fired and replaced triggers take their wheel entries with them"""
+        engine = PriceTriggerEngine()
+        far = engine.timers.current_tick + 3600
+        for i in range(50):
+            engine.add_trigger("EURUSD", 1.1, CROSS_UP, lambda t, p: True,
+                               expires_at=far, trigger_id=f"t{i}")
+        engine.add_trigger("EURUSD", 1.3, CROSS_UP, lambda t, p: True, expires_at=far, trigger_id="t0")
+        assert engine.timers.size == 50
+
+        engine.remove_trigger("t1")
+        run(engine.on_tick("EURUSD", 1.2))
+        assert engine.pending_count() == 1
+        assert engine.timers.size == 1
+
+    def test_process_cycle_reads_cached_ticks_once_per_symbol(self):
+        """One cycle = one cache read per symbol with armed triggers"""
+        source = FakeTickSource({"EURUSD": 1.1000, "GBPUSD": 1.2500})
+        engine = PriceTriggerEngine(source)
+        fired = []
+        for i in range(20):
+            engine.add_trigger("EURUSD", 1.1005 + i * 0.0001, CROSS_UP,
+                               lambda t, p: fired.append(t.level))
+
+        assert source.subscribed == {"EURUSD"}
+        assert run(engine.process_cycle()) == 0
+        assert source.reads == 1
+
+        source.prices["EURUSD"] = 1.1010
+        assert run(engine.process_cycle()) == 6
+        assert source.reads == 2
+        assert len(fired) == 6
+
+    def test_timer_wheel_wraps_beyond_slot_count(self):
+        """Deadlines farther than one rotation still fire at the right tick"""
+        wheel = TimerWheel(resolution=1.0, slots=8, now=0)
+        wheel.schedule(3, "near")
+        wheel.schedule(20, "far")
+
+        assert wheel.advance(5) == ["near"]
+        assert wheel.advance(13) == []
+        assert wheel.advance(20) == ["far"]
+        assert wheel.size == 0
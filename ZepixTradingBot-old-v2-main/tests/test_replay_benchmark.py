@@ -0,0 +1,97 @@
+"""
+Unit Tests for the replay benchmark harness
+Runs a small replay through the real engine on the MT5 simulator and checks
+the baseline comparison.
+
+Run tests with:
+    pytest tests/test_replay_benchmark.py -v
+"""
+
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models import Alert
+from src.v3_alert_models import ZepixV3Alert
+from tests.benchmarks.replay_benchmark import (
+    compare_to_baseline, load_baseline, main, run_benchmark, save_baseline, synthetic_payloads
+)
+
+
+def test_synthetic_payloads_are_valid_and_mixed():
+    payloads = synthetic_payloads(200, seed=7)
+    assert payloads == synthetic_payloads(200, seed=7)     # Deterministic per seed
+
+    for payload in payloads:
+        if payload["type"].endswith("_v3"):
+            ZepixV3Alert(**payload)
+        else:
+            Alert(**payload)
+    assert {p["type"] for p in payloads} >= {"entry_v3", "trend", "entry", "bias"}
+    assert len({p["symbol"] for p in payloads}) > 3
+
+
+def test_small_replay_reports_every_metric():
+    config_path = os.path.join(project_root, "config", "config.json")
+    before = os.path.getmtime(config_path)
+
+    result = run_benchmark(synthetic_payloads(40, seed=1), open_trades=25, monitor_cycles=2)
+    metrics = result["metrics"]
+
+    assert metrics["alerts"] == 40
+    assert metrics["accepted"] > 0
+    assert metrics["alerts_per_sec"] > 0
+    assert metrics["alert_latency_ms"]["count"] == 40
+    assert metrics["alert_to_order_ms"]["count"] > 0
+    assert "order_send" in metrics["stages_p95_ms"]
+    assert metrics["monitor_cycle_ms"]["open_trades"] == 25
+    assert metrics["monitor_cycle_ms"]["count"] == 2
+    assert metrics["memory_growth_kb"] is not None
+    assert os.path.getmtime(config_path) == before        # Ran in a scratch directory
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = {"metrics": {
+        "alerts_per_sec": 1000.0,
+        "alert_latency_ms": {"p50": 10.0, "p95": 20.0},
+        "monitor_cycle_ms": {"p50": 5.0},
+        "memory_growth_kb": None
+    }}
+    current = {"metrics": {
+        "alerts_per_sec": 700.0,                            # 30% slower -> regression
+        "alert_latency_ms": {"p50": 8.0, "p95": 24.0},      # p95 +20% -> within tolerance
+        "monitor_cycle_ms": {"p50": 2.0},                   # Faster
+        "memory_growth_kb": 50.0
+    }}
+    rows = {row["metric"]: row for row in compare_to_baseline(current, baseline, tolerance=0.25)}
+
+    assert rows["alerts_per_sec"]["regression"]
+    assert not rows["alert_latency_ms.p95"]["regression"]
+    assert not rows["monitor_cycle_ms.p50"]["regression"]
+    assert rows["monitor_cycle_ms.p50"]["change_pct"] == -60.0
+    assert "memory_growth_kb" not in rows                   # Missing in the baseline
+    assert "alert_to_order_ms.p95" not in rows
+
+
+def test_cli_saves_and_compares_baseline(tmp_path, capsys):
+    baseline_path = str(tmp_path / "baseline.json")
+    args = ["--alerts", "20", "--open-trades", "5", "--monitor-cycles", "1", "--no-memory"]
+
+    assert main(args + ["--save-baseline", baseline_path]) == 0
+    assert load_baseline(baseline_path)["metrics"]["alerts"] == 20
+
+    saved = load_baseline(baseline_path)
+    saved["metrics"]["alerts_per_sec"] *= 1000          # Make the next run look far slower
+    save_baseline(saved, baseline_path)
+    assert main(args + ["--compare", baseline_path, "--fail-on-regression"]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+
+
+def test_cli_compare_without_baseline_fails_clearly(tmp_path, capsys):
+    missing = str(tmp_path / "missing.json")
+    assert main(["--alerts", "5", "--no-memory", "--compare", missing]) == 2
+    assert "--save-baseline" in capsys.readouterr().err
@@ -0,0 +1,208 @@
+"""
+Unit Tests for the per-symbol alert pipeline
+Tests per-symbol ordering, cross-symbol parallelism, overflow policies and
+latency histograms.
+
+Run tests with:
+    pytest tests/test_symbol_alert_pipeline.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.processors.symbol_alert_pipeline import (
+    SymbolAlertPipeline, LatencyHistogram, OVERFLOW_DROP_OLDEST, OVERFLOW_REJECT, OVERFLOW_BLOCK
+)
+
+
+def _alert(symbol, seq):
+    return {"type": "entry_v3", "symbol": symbol, "seq": seq}
+
+
+def test_same_symbol_alerts_never_interleave():
+    log = []
+
+    async def handler(data):
+        log.append(("start", data["seq"]))
+        await asyncio.sleep(0.01)
+        log.append(("end", data["seq"]))
+        return data["seq"]
+
+    async def scenario():
+        pipeline = SymbolAlertPipeline(handler, max_workers=4)
+        results = await asyncio.gather(*(pipeline.process(_alert("XAUUSD", i)) for i in range(5)))
+        await pipeline.stop()
+        return results
+
+    assert asyncio.run(scenario()) == [0, 1, 2, 3, 4]
+    assert log == [(phase, i) for i in range(5) for phase in ("start", "end")]
+
+
+def test_burst_on_one_symbol_does_not_delay_another():
+    finished = []
+
+    async def handler(data):
+        await asyncio.sleep(0.05 if data["symbol"] == "XAUUSD" else 0)
+        finished.append(data["symbol"])
+        return True
+
+    async def scenario():
+        pipeline = SymbolAlertPipeline(handler, max_workers=2)
+        burst = [await pipeline.submit(_alert("XAUUSD", i)) for i in range(5)]
+        eurusd = await pipeline.process(_alert("EURUSD", 0))
+        position = len(finished)
+        await asyncio.gather(*burst)
+        await pipeline.stop()
+        return eurusd, position
+
+    eurusd, position = asyncio.run(scenario())
+    assert eurusd is True
+    assert position <= 1  # EURUSD finished before (at most) the first XAUUSD alert
+
+
+def test_drop_oldest_overflow_policy():
+    async def handler(data):
+        await asyncio.sleep(0.02)
+        return data["seq"]
+
+    async def scenario():
+        pipeline = SymbolAlertPipeline(handler, max_workers=1, max_queue_per_symbol=2,
+                                       overflow_policy=OVERFLOW_DROP_OLDEST)
+        futures = [await pipeline.submit(_alert("EURUSD", i)) for i in range(4)]
+        results = await asyncio.gather(*futures)
+        stats = pipeline.get_stats()["symbols"]["EURUSD"]
+        await pipeline.stop()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+    # 0 and 1 queued, 2 evicts 0, 3 evicts 1 (worker has not started yet)
+    assert results == [False, False, 2, 3]
+    assert stats["dropped"] == 2
+    assert stats["processed"] == 2
+
+
+def test_reject_and_block_overflow_policies():
+    gate = None
+
+    async def handler(data):
+        await gate.wait()
+        return True
+
+    async def scenario(policy):
+        nonlocal gate
+        gate = asyncio.Event()
+        pipeline = SymbolAlertPipeline(handler, max_workers=1, max_queue_per_symbol=1,
+                                       overflow_policy=policy, enqueue_timeout=0.05)
+        first = await pipeline.submit(_alert("GBPUSD", 0))
+        await asyncio.sleep(0)      # Worker takes the first alert
+        second = await pipeline.submit(_alert("GBPUSD", 1))
+        third = await pipeline.submit(_alert("GBPUSD", 2))
+        gate.set()
+        results = await asyncio.gather(first, second, third)
+        rejected = pipeline.get_stats()["symbols"]["GBPUSD"]["rejected"]
+        await pipeline.stop()
+        return results, rejected
+
+    assert asyncio.run(scenario(OVERFLOW_REJECT)) == ([True, True, False], 1)
+    assert asyncio.run(scenario(OVERFLOW_BLOCK)) == ([True, True, False], 1)
+
+
+def test_nested_process_for_same_symbol_runs_inline():
+    holder = {}
+
+    async def handler(data):
+        if data["seq"] == 0:
+            return await holder["pipeline"].process(_alert("USDJPY", 1))
+        return "inner"
+
+    async def scenario():
+        pipeline = holder["pipeline"] = SymbolAlertPipeline(handler, max_workers=1)
+        result = await asyncio.wait_for(pipeline.process(_alert("USDJPY", 0)), 1)
+        await pipeline.stop()
+        return result
+
+    assert asyncio.run(scenario()) == "inner"
+
+
+def test_alert_models_use_their_symbol_lane():
+    from src.models import Alert
+    seen = []
+
+    async def handler(alert):
+        seen.append(getattr(alert, "symbol", alert))
+        return True
+
+    async def scenario():
+        pipeline = SymbolAlertPipeline(handler)
+        await pipeline.process(Alert(type="entry", symbol="xauusd", signal="buy", tf="5m"))
+        await pipeline.process("raw json")
+        lanes = set(pipeline.lanes)
+        await pipeline.stop()
+        return lanes
+
+    assert asyncio.run(scenario()) == {"XAUUSD", "_global"}
+    assert seen == ["xauusd", "raw json"]
+
+
+def test_waiting_on_another_lane_from_a_handler_is_refused():
+    holder = {}
+
+    async def handler(data):
+        if data["symbol"] == "EURUSD":
+            return await holder["pipeline"].process(_alert("GBPUSD", 0))
+        return "gbp"
+
+    async def detached(data):
+        task = asyncio.ensure_future(holder["pipeline"].process(_alert("GBPUSD", 1)))
+        holder["task"] = task
+        return True
+
+    async def scenario():
+        pipeline = holder["pipeline"] = SymbolAlertPipeline(handler, max_workers=1)
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(pipeline.process(_alert("EURUSD", 0)), 1)
+        pipeline.handler = lambda data: detached(data) if data["symbol"] == "EURUSD" else handler(data)
+        await pipeline.process(_alert("EURUSD", 1))
+        result = await asyncio.wait_for(holder["task"], 1)   # Spawned task queues normally
+        await pipeline.stop()
+        return result
+
+    assert asyncio.run(scenario()) == "gbp"
+
+
+def test_handler_error_propagates_and_is_counted():
+    async def handler(data):
+        raise RuntimeError("boom")
+
+    async def scenario():
+        pipeline = SymbolAlertPipeline(handler)
+        with pytest.raises(RuntimeError):
+            await pipeline.process(_alert("AUDUSD", 0))
+        stats = pipeline.get_stats()["symbols"]["AUDUSD"]
+        await pipeline.stop()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats["errors"] == 1
+    assert stats["service_time"]["count"] == 1
+
+
+def test_latency_histogram_percentiles():
+    hist = LatencyHistogram()
+    for value in [0.5] * 90 + [30] * 9 + [20000]:
+        hist.record(value)
+    data = hist.to_dict()
+    assert data["count"] == 100
+    assert data["p50_ms"] == 1
+    assert data["p95_ms"] == 50
+    assert data["p99_ms"] == 50
+    assert hist.percentile(100) == 20000
+    assert data["buckets"] == {"<=1": 90, "<=50": 9, ">10000": 1}
@@ -0,0 +1,147 @@
+"""
+Unit Tests for the compiled symbol spec table
+Checks PipCalculator results against the original nested config lookups for
+every symbol, tier, SL system and logic, and that Config swaps in a new table
+only when one of the compiled sections changes.
+
+Run tests with:
+    pytest tests/test_symbol_specs.py -v
+"""
+
+import copy
+import itertools
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.backtest.param_sweep import SweepConfig
+from src.config import Config
+from src.managers.reentry_manager import ReEntryManager
+from src.managers.risk_manager import RiskManager
+from src.models import Trade
+from src.utils.pip_calculator import PipCalculator
+from src.utils.profit_sl_calculator import ProfitBookingSLCalculator
+from src.utils.symbol_specs import SymbolSpecTable
+
+BALANCES = (5000, 12000, 30000, 60000, 150000)
+LOGICS = (None, "combinedlogic-1", "combinedlogic-2", "combinedlogic-3")
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = Config()
+    config.config_file = str(tmp_path / "config.json")
+    return config
+
+
+def reference_sl_pips(cfg, symbol, balance, logic):
+    """The original nested-dict PipCalculator lookups"""
+    tier = PipCalculator(cfg)._get_account_tier(balance)
+
+    def fallback():
+        symbol_config = cfg["symbol_config"][symbol]
+        risk_cap = cfg["risk_by_account_tier"][tier][symbol_config["volatility"]]["risk_dollars"]
+        return risk_cap / (symbol_config["pip_value_per_std_lot"] * cfg["fixed_lot_sizes"].get(tier, 0.05))
+
+    if not cfg.get("sl_system_enabled", True):
+        sl_pips = fallback()
+    else:
+        try:
+            sl_pips = cfg["sl_systems"][cfg.get("active_sl_system", "sl-1")]["symbols"][symbol][tier]["sl_pips"]
+            reductions = cfg.get("symbol_sl_reductions", {})
+            if symbol in reductions:
+                sl_pips = sl_pips * (1 - reductions[symbol] / 100)
+        except KeyError:
+            sl_pips = fallback()
+
+    timeframe_config = cfg.get("timeframe_specific_config", {})
+    if timeframe_config.get("enabled", False) and logic and timeframe_config.get(logic):
+        sl_pips = sl_pips * timeframe_config[logic].get("sl_multiplier", 1.0)
+    return sl_pips
+
+
+def test_matches_original_lookups(config):
+    calculator = PipCalculator(config)
+    symbols = list(config["symbol_config"])
+    del config.config["sl_systems"]["sl-2"]["symbols"]["GBPJPY"]["25000"]   # Missing tier -> fallback
+    config.update_nested("symbol_sl_reductions", {"XAUUSD": 20, "EURUSD": 0})
+
+    scenarios = [("sl_system_enabled", True), ("active_sl_system", "sl-2"),
+                 ("timeframe_specific_config.enabled", False), ("sl_system_enabled", False)]
+    for path, value in scenarios:
+        config.update_nested(path, value)
+        for symbol, balance, logic in itertools.product(symbols, BALANCES, LOGICS):
+            expected = reference_sl_pips(config.config, symbol, balance, logic)
+            sl_price, distance = calculator.calculate_sl_price(symbol, 100.0, "buy", 0.1, balance, logic=logic)
+            pip_size = config["symbol_config"][symbol]["pip_size"]
+            assert distance == pytest.approx(expected * pip_size)
+            assert sl_price == pytest.approx(100.0 - expected * pip_size)
+
+    assert calculator.get_pip_size("NOSPEC") == 0.0001
+    assert calculator.get_pip_value("XAUUSD", 0.5) == 0.5
+    with pytest.raises(KeyError):
+        calculator.calculate_sl_price("NOSPEC", 1.0, "buy", 0.1, 10000)
+
+    # Plain dict-style configs (test doubles) are compiled on the spot
+    assert PipCalculator(copy.deepcopy(config.config))._get_sl_from_dual_system("XAUUSD", 12000) == \
+        pytest.approx(calculator._get_sl_from_dual_system("XAUUSD", 12000))
+
+
+def test_table_swapped_only_on_relevant_changes(config):
+    specs = config.symbol_specs
+    assert config.symbol_specs is specs
+    config.update_nested("re_entry_config.max_chain_levels", 3)
+    assert config.symbol_specs is specs                          # Unrelated section
+
+    config.update_nested("symbol_sl_reductions.XAUUSD", 25)
+    assert config.symbol_specs is not specs
+    assert specs["XAUUSD"].reduction_percent is None             # Old table left untouched
+    assert config.symbol_specs["XAUUSD"].reduction_percent == 25
+
+    # Handlers edit sections in place and then save
+    config.config["timeframe_specific_config"]["enabled"] = True
+    config.config["timeframe_specific_config"]["combinedlogic-1"]["lot_multiplier"] = 2.0
+    config.save_config()
+    assert config.symbol_specs.logic_lot_multipliers["combinedlogic-1"] == 2.0
+    risk = RiskManager(config)
+    assert risk.get_lot_size_for_logic(12000, "combinedlogic-1") == \
+        pytest.approx(round(risk.get_fixed_lot_size(12000) * 2.0, 3))
+
+    config.update("timeframe_specific_config", {"enabled": False})
+    assert risk.get_lot_size_for_logic(12000, "combinedlogic-1") == risk.get_fixed_lot_size(12000)
+
+    sweep = SweepConfig(copy.deepcopy(config.config))
+    sweep.update("active_sl_system", "sl-2")
+    assert sweep.symbol_specs.active_sl_system == "sl-2"
+    with pytest.raises(AttributeError):
+        sweep.symbol_specs["XAUUSD"].pip_size = 1.0
+
+
+def test_reentry_and_profit_sl_read_specs(config):
+    config.update_nested("active_sl_system", "sl-2")
+    config.update_nested("symbol_sl_reductions", {"EURUSD": 30})
+    config.config["account_balance"] = 20000                     # ReEntryManager tiering -> "25000"
+    trade = Trade(symbol="EURUSD", direction="buy", entry=1.1000, sl=1.0965, tp=1.1035, lot_size=0.1,
+                  strategy="combinedlogic-2", open_time="2025-10-10 10:00:00", trade_id=7)
+    chain = ReEntryManager(config).create_chain(trade)
+    original = config["sl_systems"]["sl-2"]["symbols"]["EURUSD"]["25000"]["sl_pips"]
+    assert chain.metadata["sl_system_used"] == "sl-2"
+    assert chain.metadata["sl_reduction_percent"] == 30
+    assert chain.metadata["original_sl_pips"] == original
+    assert chain.metadata["applied_sl_pips"] == pytest.approx(original * 0.7)
+
+    calculator = ProfitBookingSLCalculator(config)
+    for symbol, point in (("EURUSD", 0.0001), ("USDJPY", 0.01), ("XAUUSD", 0.01), ("XAGJPY", 0.01)):
+        price, distance = calculator.calculate_sl_price(100.0, "BUY", symbol, 0.1, "combinedlogic-1")
+        assert distance == pytest.approx(10.0 / (10.0 * 0.1) * point)
+        assert price == pytest.approx(round(100.0 - distance, 5))
+
+    table = SymbolSpecTable.from_config(config.config)
+    assert table["XAUUSD"].contract_size == 100 and table["XAUUSD"].volatility == "HIGH"
+    assert "NOSPEC" not in table and table.pip_size("NOSPEC") is None
@@ -0,0 +1,134 @@
+"""
+Unit Tests for the MT5Client shared tick cache
+Tests cache hits/misses, staleness bound, batched refresh and stats.
+
+Run tests with:
+    pytest tests/test_tick_cache.py -v
+"""
+
+import os
+import sys
+import time
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config import Config
+from src.clients import mt5_client as mt5_client_module
+from src.clients.mt5_client import MT5Client
+
+
+class FakeTerminal:
+    """Counts symbol_info_tick calls so tests can assert terminal traffic"""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.tick_calls = 0
+
+    def symbol_info_tick(self, symbol):
+        self.tick_calls += 1
+        price = self.prices.get(symbol)
+        if price is None:
+            return None
+        return SimpleNamespace(bid=price - 0.0001, ask=price + 0.0001,
+                               time=int(time.time()), time_msc=int(time.time() * 1000))
+
+
+class TestTickCache:
+    """Test suite for MT5Client tick cache"""
+
+    @pytest.fixture
+    def terminal(self, monkeypatch):
+        terminal = FakeTerminal({"EURUSD": 1.1000, "GOLD": 2650.00})
+        monkeypatch.setattr(mt5_client_module, "mt5", terminal, raising=False)
+        monkeypatch.setattr(mt5_client_module, "MT5_AVAILABLE", True)
+        return terminal
+
+    @pytest.fixture
+    def client(self, terminal):
+        config = Config()
+        config.config["simulate_orders"] = False
+        config.config["symbol_mapping"] = {"XAUUSD": "GOLD"}
+        config.config["tick_cache"] = {
+            "enabled": True,
+            "refresh_interval_ms": 10,
+            "max_staleness_ms": 500
+        }
+        client = MT5Client(config)
+        client.initialized = True
+        return client
+
+    def test_cold_read_fetches_once_then_hits_cache(self, client, terminal):
+        """First read seeds the cache, later reads never touch the terminal"""
+        price = client.get_current_price("EURUSD")
+        assert price == pytest.approx(1.1000)
+        assert terminal.tick_calls == 1
+        assert "EURUSD" in client.subscribed_symbols
+
+        for _ in range(50):
+            assert client.get_current_price("EURUSD") == pytest.approx(1.1000)
+        assert terminal.tick_calls == 1
+
+        stats = client.get_tick_cache_stats()
+        assert stats["hits"] == 50
+        assert stats["misses"] == 1
+
+    def test_tick_exposes_bid_ask_mid_time(self, client):
+        """Cached tick carries bid, ask, mid, broker time and age"""
+        tick = client.get_symbol_tick("XAUUSD")
+        assert tick["bid"] == pytest.approx(2649.9999)
+        assert tick["ask"] == pytest.approx(2650.0001)
+        assert tick["mid"] == pytest.approx(2650.00)
+        assert tick["time"] > 0
+        assert tick["age_ms"] >= 0
+
+    def test_get_tick_never_touches_terminal(self, client, terminal):
+        """Cache-only read returns None on miss without a terminal call"""
+        assert client.get_tick("EURUSD") is None
+        assert terminal.tick_calls == 0
+
+    def test_stale_entry_is_not_served(self, client, terminal):
+        """Entries older than the staleness bound are treated as misses"""
+        client.get_current_price("EURUSD")
+        client.tick_cache["EURUSD"]["received"] -= 1.0  # Age beyond 500ms bound
+
+        assert client.get_tick("EURUSD") is None
+        terminal.prices["EURUSD"] = 1.2000
+        assert client.get_current_price("EURUSD") == pytest.approx(1.2000)
+        assert terminal.tick_calls == 2
+
+    def test_refresh_reads_each_subscribed_symbol_once(self, client, terminal):
+        """One refresh cycle costs one terminal read per subscribed symbol"""
+        client.subscribe_symbols(["EURUSD", "XAUUSD"])
+        refreshed = client.refresh_ticks()
+
+        assert refreshed == 2
+        assert terminal.tick_calls == 2
+        assert set(client.get_tick_cache_stats()["tick_age_ms"]) == {"EURUSD", "XAUUSD"}
+
+    def test_background_refresher(self, client, terminal):
+        """Refresher task keeps subscribed symbols warm"""
+        async def run():
+            await client.start_tick_refresher(["EURUSD"])
+            await asyncio.sleep(0.05)
+            running = client.get_tick_cache_stats()["refresher_running"]
+            await client.stop_tick_refresher()
+            return running
+
+        assert asyncio.run(run()) is True
+        assert client.tick_cache_stats["refresh_cycles"] >= 2
+        assert client.get_tick("EURUSD") is not None
+
+    def test_disabled_cache_reads_terminal_every_call(self, client, terminal):
+        """With the cache disabled every price read goes to the terminal"""
+        client.tick_cache_enabled = False
+        client.get_current_price("EURUSD")
+        client.get_current_price("EURUSD")
+        assert terminal.tick_calls == 2
+        assert client.tick_cache == {}
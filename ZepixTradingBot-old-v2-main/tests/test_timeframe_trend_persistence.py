@@ -0,0 +1,117 @@
+"""
+Unit Tests for debounced TimeframeTrendManager persistence
+Tests coalescing, journal crash recovery, atomic snapshots and flush.
+
+Run tests with:
+    pytest tests/test_timeframe_trend_persistence.py -v
+"""
+
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.managers.timeframe_trend_manager import TimeframeTrendManager
+
+
+@pytest.fixture
+def trend_file(tmp_path):
+    path = tmp_path / "timeframe_trends.json"
+    path.write_text(json.dumps({"symbols": {}, "default_mode": "AUTO"}))
+    return str(path)
+
+
+def _read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_update_does_not_write_snapshot_inline(trend_file):
+    manager = TimeframeTrendManager(trend_file, debounce_ms=50, snapshot_interval=60)
+    with patch.object(manager, "save_trends") as save:
+        manager.update_trend("EURUSD", "1h", "bull")
+        save.assert_not_called()
+    assert manager.get_trend("EURUSD", "1h") == "BULLISH"
+    manager.close()
+
+
+def test_burst_is_coalesced_into_one_journal_write(trend_file):
+    manager = TimeframeTrendManager(trend_file, debounce_ms=100, snapshot_interval=60)
+    for i in range(20):
+        manager.update_trend("EURUSD", "1h", "bull" if i % 2 else "bear")
+        manager.update_trend("GBPUSD", "15m", "bear" if i % 2 else "bull")
+
+    assert _wait_for(lambda: manager.get_persistence_stats()["journal_writes"] >= 1)
+    stats = manager.get_persistence_stats()
+    assert stats["updates"] == 40
+    assert stats["journal_writes"] == 1
+    assert stats["journal_records"] == 2
+    manager.close()
+
+
+def test_journal_is_replayed_after_crash(trend_file):
+    manager = TimeframeTrendManager(trend_file, debounce_ms=10, snapshot_interval=60)
+    manager.update_trend("XAUUSD", "4h", "bull")
+    assert _wait_for(lambda: os.path.exists(manager.journal_file))
+
+    # Snapshot still holds the old state - simulate a crash before compaction
+    assert "XAUUSD" not in _read(trend_file)["symbols"]
+    manager._closed = True
+
+    recovered = TimeframeTrendManager(trend_file, debounce_ms=10, snapshot_interval=60)
+    assert recovered.get_trend("XAUUSD", "4h") == "BULLISH"
+    assert _read(trend_file)["symbols"]["XAUUSD"]["4h"]["trend"] == "BULLISH"
+    assert not os.path.exists(recovered.journal_file)
+    recovered.close()
+
+
+def test_torn_journal_tail_is_ignored(trend_file):
+    journal = trend_file + ".journal"
+    with open(journal, "w") as f:
+        f.write(json.dumps({"symbol": "USDJPY", "timeframe": "1d",
+                            "state": {"trend": "BEARISH", "mode": "AUTO"}}) + "\n")
+        f.write('{"symbol": "USDJPY", "timefr')
+
+    manager = TimeframeTrendManager(trend_file)
+    assert manager.get_trend("USDJPY", "1d") == "BEARISH"
+    manager.close()
+
+
+def test_flush_writes_atomic_snapshot(trend_file):
+    manager = TimeframeTrendManager(trend_file, debounce_ms=1000, snapshot_interval=60)
+    manager.set_manual_trend("EURUSD", "1d", "BULLISH")
+    manager.flush()
+
+    data = _read(trend_file)
+    assert data["symbols"]["EURUSD"]["1d"] == {
+        "trend": "BULLISH", "mode": "MANUAL",
+        "last_update": data["symbols"]["EURUSD"]["1d"]["last_update"]
+    }
+    assert not os.path.exists(trend_file + ".tmp")
+    assert manager.get_persistence_stats()["pending_keys"] == 0
+    manager.close()
+
+
+def test_periodic_snapshot_compacts_journal(trend_file):
+    manager = TimeframeTrendManager(trend_file, debounce_ms=10, snapshot_interval=0.05)
+    manager.update_trend("EURUSD", "15m", "sell")
+    assert _wait_for(lambda: "EURUSD" in _read(trend_file)["symbols"])
+    assert _wait_for(lambda: not os.path.exists(manager.journal_file))
+    manager.close()
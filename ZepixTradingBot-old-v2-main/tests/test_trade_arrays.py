@@ -0,0 +1,171 @@
+"""
+Unit Tests for the vectorized exit sweep
+Checks OpenTradeArrays against the per-trade SL/TP/trend-reversal rules it
+replaces in TradingEngine.manage_open_trades.
+
+Run tests with:
+    pytest tests/test_trade_arrays.py -v
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.core.trade_arrays import OpenTradeArrays, EXIT_SL_HIT, EXIT_TP_HIT, EXIT_TREND_REVERSAL
+from src.core.trade_registry import OpenTradeRegistry
+from src.core.trading_engine import TradingEngine
+from src.models import Trade
+
+SYMBOLS = ["EURUSD", "GBPUSD", "XAUUSD"]
+STRATEGIES = ["combinedlogic-1", "combinedlogic-2", "combinedlogic-3"]
+
+
+def _trade(ticket, symbol="EURUSD", direction="buy", entry=1.0, sl=0.99, tp=1.01,
+           strategy="combinedlogic-1", age_minutes=10):
+    return Trade(symbol=symbol, entry=entry, sl=sl, tp=tp, lot_size=0.1, direction=direction,
+                 strategy=strategy, trade_id=ticket,
+                 open_time=(datetime.now() - timedelta(minutes=age_minutes)).isoformat())
+
+
+class FakeTrends:
+    def __init__(self, table):
+        self.table = table
+        self.calls = 0
+
+    def check_logic_alignment(self, symbol, logic):
+        self.calls += 1
+        direction = self.table.get((symbol, logic), "NEUTRAL")
+        return {"aligned": direction != "NEUTRAL", "direction": direction}
+
+
+def _scalar_exit(trade, price, trends):
+    """The original per-trade loop body"""
+    if ((trade.direction == "buy" and price <= trade.sl) or
+            (trade.direction == "sell" and price >= trade.sl)):
+        return EXIT_SL_HIT
+    if ((trade.direction == "buy" and price >= trade.tp) or
+            (trade.direction == "sell" and price <= trade.tp)):
+        return EXIT_TP_HIT
+    if TradingEngine.should_exit_by_trend_reversal(SimpleNamespace(trend_manager=trends), trade):
+        return EXIT_TREND_REVERSAL
+    return None
+
+
+def test_sweep_matches_per_trade_rules():
+    rng = random.Random(7)
+    registry = OpenTradeRegistry()
+    arrays = OpenTradeArrays(registry)
+    for ticket in range(300):
+        direction = rng.choice(["buy", "sell"])
+        entry = rng.uniform(0.9, 1.1)
+        stop, target = (entry - 0.01, entry + 0.01) if direction == "buy" else (entry + 0.01, entry - 0.01)
+        registry.add(_trade(ticket, rng.choice(SYMBOLS), direction, entry, stop, target,
+                            rng.choice(STRATEGIES), age_minutes=rng.choice([1, 4, 6, 30])))
+    trends = FakeTrends({(s, l): rng.choice(["BULLISH", "BEARISH", "NEUTRAL"])
+                         for s in SYMBOLS for l in STRATEGIES})
+    quotes = {symbol: rng.uniform(0.9, 1.1) for symbol in SYMBOLS}
+
+    exits = arrays.sweep(arrays.price_vector(quotes.get), trends.check_logic_alignment)
+
+    expected = [(t, r) for t in registry if (r := _scalar_exit(t, quotes[t.symbol], trends))]
+    assert [(t, r) for t, r, _ in exits] == expected
+    assert {r for _, r in expected} == {EXIT_SL_HIT, EXIT_TP_HIT, EXIT_TREND_REVERSAL}
+    # Alignment is looked up per (symbol, strategy), not per trade
+    assert arrays.get_stats()["alignment_checks"] <= len(SYMBOLS) * len(STRATEGIES)
+
+
+def test_uppercase_directions_sweep_like_lowercase():
+    """V3 orders carry BUY/SELL - they must not drop out of the sweep"""
+    trends = FakeTrends({("EURUSD", "combinedlogic-1"): "BEARISH", ("GBPUSD", "combinedlogic-1"): "BULLISH"})
+    quotes = {"EURUSD": 1.0, "GBPUSD": 1.0, "XAUUSD": 1.0}
+    specs = [("EURUSD", "buy", 0.99, 1.01), ("GBPUSD", "sell", 1.01, 0.99),    # Trend reversals
+             ("XAUUSD", "buy", 1.001, 1.1), ("XAUUSD", "sell", 1.1, 1.0)]    # SL hit, TP hit
+
+    results = {}
+    for case in (str.lower, str.upper):
+        registry = OpenTradeRegistry([_trade(i, symbol, case(direction), 1.0, sl, tp)
+                                      for i, (symbol, direction, sl, tp) in enumerate(specs)])
+        arrays = OpenTradeArrays(registry)
+        exits = arrays.sweep(arrays.price_vector(quotes.get), trends.check_logic_alignment)
+        results[case] = [(t.trade_id, reason) for t, reason, _ in exits]
+        assert all(bool(TradingEngine.should_exit_by_trend_reversal(SimpleNamespace(trend_manager=trends), t))
+                   == (reason == EXIT_TREND_REVERSAL) for t, reason, _ in exits)
+
+    assert results[str.upper] == results[str.lower] == [
+        (0, EXIT_TREND_REVERSAL), (1, EXIT_TREND_REVERSAL), (2, EXIT_SL_HIT), (3, EXIT_TP_HIT)]
+
+
+def test_rows_follow_registry_events_and_in_place_sl_moves():
+    registry = OpenTradeRegistry()
+    arrays = OpenTradeArrays(registry)
+    a = _trade(1)
+    b = _trade(2, symbol="GBPUSD")
+    c = _trade(3)
+    registry.extend([a, b, c])
+
+    registry.discard(a)             # Swap-remove moves c into row 0
+    assert len(arrays) == 2
+    prices = arrays.price_vector({"EURUSD": 0.995, "GBPUSD": 1.0}.get)
+    assert arrays.sweep(prices) == []
+
+    c.sl = 0.998                    # Break-even lock written straight onto the trade
+    assert arrays.sweep(prices) == [(c, EXIT_SL_HIT, 0.995)]
+
+
+def test_missing_price_and_grace_period_skip_rows():
+    registry = OpenTradeRegistry([_trade(1, age_minutes=1), _trade(2, symbol="XAUUSD", sl=0.5, tp=2.0)])
+    arrays = OpenTradeArrays(registry)
+    trends = FakeTrends({("EURUSD", "combinedlogic-1"): "BEARISH"})
+
+    prices = arrays.price_vector({"EURUSD": 1.0, "XAUUSD": 0}.get)
+    assert np.isnan(prices[arrays.symbols.index("XAUUSD")])
+    assert arrays.sweep(prices, trends.check_logic_alignment) == []
+    assert trends.calls == 0        # Young trade is in grace, XAUUSD has no quote
+
+
+def test_unparseable_open_time_is_past_grace():
+    trade = _trade(1)
+    trade.open_time = "not-a-date"
+    arrays = OpenTradeArrays(OpenTradeRegistry([trade]))
+    trends = FakeTrends({("EURUSD", "combinedlogic-1"): "BEARISH"})
+
+    exits = arrays.sweep(arrays.price_vector({"EURUSD": 1.0}.get), trends.check_logic_alignment)
+    assert exits == [(trade, EXIT_TREND_REVERSAL, 1.0)]
+
+
+def test_capacity_grows():
+    registry = OpenTradeRegistry()
+    arrays = OpenTradeArrays(registry)
+    trades = [_trade(i) for i in range(200)]
+    registry.extend(trades)
+    exits = arrays.sweep(arrays.price_vector({"EURUSD": 1.02}.get))
+    assert [t for t, _, _ in exits] == trades
+
+
+def test_alignment_reused_while_version_unchanged():
+    registry = OpenTradeRegistry([_trade(1), _trade(2, symbol="XAUUSD", sl=0.5, tp=2.0)])
+    arrays = OpenTradeArrays(registry)
+    trends = FakeTrends({("EURUSD", "combinedlogic-1"): "BULLISH"})
+    prices = arrays.price_vector({"EURUSD": 1.0, "XAUUSD": 1.0}.get)
+
+    for _ in range(5):
+        assert arrays.sweep(prices, trends.check_logic_alignment, alignment_version=7) == []
+    assert trends.calls == 2                       # One lookup per pair, then reused
+
+    trends.table[("EURUSD", "combinedlogic-1")] = "BEARISH"
+    assert arrays.sweep(prices, trends.check_logic_alignment, alignment_version=8) == \
+        [(registry[0], EXIT_TREND_REVERSAL, 1.0)]
+    assert trends.calls == 4
+
+    arrays.sweep(prices, trends.check_logic_alignment)
+    arrays.sweep(prices, trends.check_logic_alignment)
+    assert trends.calls == 8                       # No version - looked up every sweep
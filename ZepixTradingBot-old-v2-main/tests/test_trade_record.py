@@ -0,0 +1,87 @@
+"""
+Unit Tests for the slotted TradeRecord
+Checks field parity with the pydantic Trade model and lossless conversion.
+
+Run tests with:
+    pytest tests/test_trade_record.py -v
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models import Trade, TradeRecord
+
+BASE = dict(symbol="EURUSD", entry=1.08, sl=1.07, tp=1.09, lot_size=0.1, direction="buy",
+            strategy="combinedlogic-1", open_time=datetime.now().isoformat())
+
+
+def test_defaults_match_trade_model():
+    record = TradeRecord(**BASE)
+    model = Trade(**BASE)
+    assert {name: getattr(record, name) for name in TradeRecord.FIELDS} == \
+           {name: getattr(model, name) for name in Trade.model_fields}
+    assert record.to_dict() == model.to_dict()
+
+
+def test_required_fields_and_slots():
+    with pytest.raises(TypeError):
+        TradeRecord(symbol="EURUSD")
+    record = TradeRecord(**BASE)
+    assert not record.extra             # No __dict__ content until an ad-hoc attribute is set
+    assert record != TradeRecord(**BASE)   # Identity equality
+
+
+def test_round_trip_keeps_ad_hoc_attributes():
+    record = TradeRecord(**BASE, trade_id=42, profit_chain_id="PROFIT_1", profit_level=2)
+    record.v3_metadata = {"sl_source": "V3_SMART"}
+    record.close_price = 1.085
+    record.ticket = 43
+
+    model = record.to_model()
+    assert isinstance(model, Trade)
+    assert model.trade_id == 43
+    assert model.model_extra == {"v3_metadata": {"sl_source": "V3_SMART"}, "close_price": 1.085}
+
+    back = TradeRecord.from_model(model)
+    assert back.to_dict() == record.to_dict()
+    assert back.extra == record.extra
+    assert back.entry_price == back.entry and back.sl_price == back.sl
+
+
+def test_from_dict_splits_known_and_extra_keys():
+    record = TradeRecord.from_dict({**BASE, "status": "closed", "comment": "manual"})
+    assert record.status == "closed"
+    assert record.extra == {"comment": "manual"}
+
+
+
+def test_dual_order_manager_builds_trade_records():
+    from unittest.mock import MagicMock
+    from src.managers.dual_order_manager import DualOrderManager
+    from src.models import Alert
+
+    manager = DualOrderManager.__new__(DualOrderManager)
+    manager.config = {"rr_ratio": 1.0}
+    manager.logger = MagicMock()
+    manager.risk_manager = MagicMock(get_lot_size_for_logic=MagicMock(return_value=0.1))
+    manager.pip_calculator = MagicMock(calculate_sl_price=MagicMock(return_value=(1.07, 0.01)),
+                                       calculate_tp_price=MagicMock(return_value=1.09))
+    manager.profit_sl_calculator = None
+    manager.is_enabled = lambda: True
+    manager.validate_dual_order_risk = lambda *args: {"valid": True}
+    manager._place_single_order = MagicMock(side_effect=[{"success": True, "trade_id": 1},
+                                                         {"success": True, "trade_id": 2}])
+
+    alert = Alert(type="entry", symbol="EURUSD", signal="buy", tf="15m", price=1.08)
+    result = manager.create_dual_orders(alert, "combinedlogic-1", 10000.0)
+    assert result["errors"] == []
+    assert type(result["order_a"]) is TradeRecord and type(result["order_b"]) is TradeRecord
+    assert (result["order_a"].trade_id, result["order_b"].order_type) == (1, "PROFIT_TRAIL")
@@ -0,0 +1,182 @@
+"""
+Unit Tests for the OpenTradeRegistry
+Tests indexes, identity semantics, snapshot iteration, events and the
+RiskManager / ProfitBookingManager subscriptions.
+
+Run tests with:
+    pytest tests/test_trade_registry.py -v
+"""
+
+import os
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.core.trade_registry import OpenTradeRegistry
+from src.models import Trade
+
+
+def _trade(ticket, symbol="EURUSD", lot=0.1, **extra):
+    return Trade(symbol=symbol, entry=1.08, sl=1.07, tp=1.09, lot_size=lot, direction="buy",
+                 strategy="combinedlogic-1", trade_id=ticket,
+                 open_time=datetime.now().isoformat(), **extra)
+
+
+class TestOpenTradeRegistry:
+
+    def test_indexes(self):
+        registry = OpenTradeRegistry()
+        a = _trade(1, chain_id="C1", session_id="S1")
+        b = _trade(2, symbol="XAUUSD", profit_chain_id="P1")
+        c = _trade(3, profit_chain_id="P1", session_id="S1")
+        registry.extend([a, b, c])
+
+        assert registry.get_by_ticket(2) is b
+        assert registry.by_symbol("EURUSD") == [a, c]
+        assert registry.by_chain("C1") == [a]
+        assert registry.by_profit_chain("P1") == [b, c]
+        assert registry.by_session("S1") == [a, c]
+
+        registry.remove(c)
+        assert registry.by_profit_chain("P1") == [b]
+        assert registry.get_by_ticket(3) is None
+        assert sorted(registry.symbols()) == ["EURUSD", "XAUUSD"]
+
+    def test_membership_is_by_identity(self):
+        registry = OpenTradeRegistry()
+        a = _trade(1)
+        twin = a.model_copy()
+        registry.append(a)
+
+        assert a in registry
+        assert twin not in registry
+        assert registry.discard(twin) is False
+        with pytest.raises(ValueError):
+            registry.remove(twin)
+        registry.append(a)
+        assert len(registry) == 1
+
+    def test_iteration_snapshot_survives_mutation(self):
+        trades = [_trade(i) for i in range(5)]
+        registry = OpenTradeRegistry(trades)
+
+        seen = []
+        for trade in registry:
+            seen.append(trade.trade_id)
+            registry.discard(trade)
+            if trade.trade_id == 0:
+                registry.append(_trade(99))
+
+        assert seen == [0, 1, 2, 3, 4]
+        assert [t.trade_id for t in registry] == [99]
+        assert registry[:] == [registry[0]]
+
+    def test_prune_and_replace(self):
+        a, b, c = _trade(1), _trade(2), _trade(3)
+        registry = OpenTradeRegistry([a, b])
+        b.status = "closed"
+
+        assert registry.prune_closed() == [b]
+        registry.replace([a, c])
+        assert list(registry) == [a, c]
+
+    def test_stale_field_does_not_match_until_reindexed(self):
+        registry = OpenTradeRegistry()
+        trade = _trade(1, profit_chain_id="P1")
+        registry.add(trade)
+
+        trade.profit_chain_id = None
+        assert registry.by_profit_chain("P1") == []
+
+        trade.profit_chain_id = "P2"
+        assert registry.by_profit_chain("P2") == []
+        registry.reindex(trade)
+        assert registry.by_profit_chain("P2") == [trade]
+
+    def test_events_and_listener_errors(self):
+        registry = OpenTradeRegistry()
+        events = []
+        registry.subscribe(lambda event, trade: events.append((event, trade.trade_id)))
+        registry.subscribe(MagicMock(side_effect=RuntimeError("listener bug")))
+
+        trade = _trade(7)
+        registry.add(trade)
+        registry.reindex(trade)
+        registry.discard(trade)
+
+        assert events == [("added", 7), ("updated", 7), ("removed", 7)]
+
+
+class TestManagerSubscriptions:
+
+    def test_risk_manager_tracks_exposure_from_events(self):
+        from src.managers.risk_manager import RiskManager
+
+        risk = RiskManager.__new__(RiskManager)
+        risk.open_trades = []
+        registry = OpenTradeRegistry([_trade(1, lot=0.2)])
+        risk.attach_trade_registry(registry)
+
+        second = _trade(2, lot=0.1)
+        registry.append(second)
+        risk.add_open_trade(second)       # Idempotent with the shared registry
+        assert len(registry) == 2
+        assert risk.open_lots_by_symbol == {"EURUSD": pytest.approx(0.3)}
+
+        risk.remove_open_trade(second)
+        assert second not in registry
+        assert risk.open_lots_by_symbol == {"EURUSD": pytest.approx(0.2)}
+
+        risk.remove_open_trade(_trade(1, lot=0.2))  # A copy (e.g. reloaded from the DB) matches by ticket
+        assert len(registry) == 0
+        assert risk.open_lots_by_symbol == {}
+
+    def test_profit_booking_manager_chain_orders(self):
+        from src.managers.profit_booking_manager import ProfitBookingManager
+
+        pbm = ProfitBookingManager.__new__(ProfitBookingManager)
+        registry = OpenTradeRegistry()
+        pbm.attach_trade_registry(registry)
+
+        a = _trade(1, profit_chain_id="P1", profit_level=0)
+        b = _trade(2, profit_chain_id="P1", profit_level=1)
+        registry.extend([a, b, _trade(3)])
+        assert pbm.get_chain_open_orders("P1") == {1, 2}
+        assert pbm._chain_trades(registry, "P1", level=1) == [b]
+
+        registry.discard(a)
+        assert pbm.get_chain_open_orders("P1") == {2}
+
+
+def test_v3_order_b_is_indexed_under_its_profit_chain():
+    """Order B of a V3 dual entry is registered with its profit chain already set"""
+    import asyncio
+    from tests.benchmarks.replay_benchmark import (
+        _shutdown_engine, build_engine, isolated_workdir, quiet, synthetic_payloads
+    )
+
+    async def scenario():
+        engine = build_engine()
+        assert await engine.initialize()
+        try:
+            for payload in synthetic_payloads(30, seed=3):
+                if payload["type"] == "entry_v3":
+                    await engine.process_alert(dict(payload))
+            chained = [t for t in engine.open_trades if t.profit_chain_id]
+            indexed = [t for t in chained if t in engine.open_trades.by_profit_chain(t.profit_chain_id)]
+            open_orders = [engine.profit_booking_manager.get_chain_open_orders(t.profit_chain_id) for t in chained]
+            return chained, indexed, open_orders
+        finally:
+            await _shutdown_engine(engine)
+
+    with isolated_workdir(), quiet():
+        chained, indexed, open_orders = asyncio.run(scenario())
+    assert chained and indexed == chained
+    assert all(orders for orders in open_orders)
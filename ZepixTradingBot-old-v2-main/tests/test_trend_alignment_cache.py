@@ -0,0 +1,106 @@
+"""
+Unit Tests for the TimeframeTrendManager alignment cache
+Checks the precomputed alignment table against the original per-call rules,
+that masks are rebuilt only on trend changes, and the version counters.
+
+Run tests with:
+    pytest tests/test_trend_alignment_cache.py -v
+"""
+
+import itertools
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.managers.timeframe_trend_manager import TimeframeTrendManager
+
+TRENDS = ("BULLISH", "BEARISH", "NEUTRAL")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    path = tmp_path / "timeframe_trends.json"
+    path.write_text(json.dumps({"symbols": {}, "default_mode": "AUTO"}))
+    manager = TimeframeTrendManager(str(path), debounce_ms=10, snapshot_interval=60)
+    yield manager
+    manager.close()
+
+
+def reference_alignment(trends, logic):
+    """The original nested-dict implementation for combinedlogic-1/2/3"""
+    bias_tf, trend_tf = ("1d", "1h") if logic == "combinedlogic-3" else ("1h", "15m")
+    bias, trend = trends.get(bias_tf, "NEUTRAL"), trends.get(trend_tf, "NEUTRAL")
+    result = {"aligned": False, "direction": "NEUTRAL",
+              "details": {bias_tf: bias, trend_tf: trend}, "failure_reason": None}
+    if bias == "NEUTRAL":
+        result["failure_reason"] = f"{bias_tf.upper()} trend is NEUTRAL"
+    elif trend == "NEUTRAL":
+        result["failure_reason"] = f"{trend_tf.upper()} trend is NEUTRAL"
+    elif bias != trend:
+        result["failure_reason"] = f"Trends don't match: {bias_tf.upper()}={bias} != {trend_tf.upper()}={trend}"
+    else:
+        result["aligned"], result["direction"] = True, bias
+    return result
+
+
+def test_table_matches_original_rules(manager):
+    for m15, h1, h4, d1 in itertools.product(TRENDS, repeat=4):
+        trends = {"15m": m15, "1h": h1, "4h": h4, "1d": d1}
+        for timeframe, trend in trends.items():
+            manager.set_manual_trend("XAUUSD", timeframe, trend)
+        for logic in ("combinedlogic-1", "combinedlogic-2", "combinedlogic-3"):
+            assert manager.check_logic_alignment("XAUUSD", logic) == reference_alignment(trends, logic)
+
+    assert manager.check_logic_alignment("XAUUSD", "ZepixPremium_combinedlogic-3") == \
+        manager.check_logic_alignment("XAUUSD", "combinedlogic-3")
+    assert "Unknown logic" in manager.check_logic_alignment("XAUUSD", "Mystery")["failure_reason"]
+    assert "not found" in manager.check_logic_alignment("EURUSD", "combinedlogic-1")["failure_reason"]
+
+
+def test_results_are_copies(manager):
+    manager.update_trend("XAUUSD", "1h", "bull")
+    manager.update_trend("XAUUSD", "15m", "bull")
+    first = manager.check_logic_alignment("XAUUSD", "combinedlogic-1")
+    first["details"]["1h"] = "BEARISH"
+    first["aligned"] = False
+    assert manager.check_logic_alignment("XAUUSD", "combinedlogic-1")["aligned"] is True
+    assert manager.check_logic_alignment("XAUUSD", "combinedlogic-1")["details"]["1h"] == "BULLISH"
+
+
+def test_mask_rebuilt_only_on_change_and_versions(manager):
+    manager.update_trend("XAUUSD", "1h", "bull")
+    manager.update_trend("EURUSD", "1h", "bear")
+    version = manager.get_alignment_version()
+    xau_version = manager.get_alignment_version("XAUUSD")
+
+    with patch.object(manager, "_compute_mask", wraps=manager._compute_mask) as compute:
+        for _ in range(100):
+            manager.check_logic_alignment("XAUUSD", "combinedlogic-1")
+            manager.check_logic_alignment("EURUSD", "combinedlogic-3")
+        assert compute.call_count == 0
+
+        manager.update_trend("XAUUSD", "1h", "bull")            # Same trend/mode - ignored
+        manager.set_manual_trend("XAUUSD", "1h", "BULLISH")     # Mode only - mask unchanged
+        manager.set_auto_trend("XAUUSD", "1h")
+        assert manager.get_alignment_version() == version
+        assert compute.call_count == 2
+
+        manager.update_trend("XAUUSD", "15m", "bull")
+        assert compute.call_count == 3
+    assert manager.get_alignment_version() == version + 1
+    assert manager.get_alignment_version("XAUUSD") == xau_version + 1
+    assert manager.check_logic_alignment("XAUUSD", "combinedlogic-1")["aligned"] is True
+
+    manager.trends["symbols"]["EURUSD"]["1d"] = {"trend": "BEARISH", "mode": "AUTO"}
+    assert manager.check_logic_alignment("EURUSD", "combinedlogic-3")["aligned"] is False  # Stale until told
+    manager.invalidate_alignment()
+    assert manager.check_logic_alignment("EURUSD", "combinedlogic-3")["aligned"] is True
+    assert manager.get_alignment_version() == version + 2